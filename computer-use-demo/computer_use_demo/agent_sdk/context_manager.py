@@ -5,9 +5,9 @@ Implements Agent SDK's context management to prevent context window exhaustion
 while preserving important information.
 """
 
-from typing import cast
+from anthropic.types.beta import BetaMessageParam
 
-from anthropic.types.beta import BetaMessageParam, BetaToolResultBlockParam
+from ..compaction import ImageIndex, PruneMode
 
 
 class ContextManager:
@@ -21,17 +21,24 @@ class ContextManager:
     - Context statistics tracking
     """
 
-    def __init__(self, max_images: int = 10, min_removal_threshold: int = 5):
+    def __init__(
+        self,
+        max_images: int = 10,
+        min_removal_threshold: int = 5,
+        image_prune_mode: PruneMode = "drop",
+    ):
         """
         Initialize context manager.
 
         Args:
             max_images: Maximum number of images to keep
             min_removal_threshold: Minimum images to remove at once (for cache optimization)
+            image_prune_mode: What removed screenshots become ("drop", "thumbnail", "reference")
         """
         self.max_images = max_images
         self.min_removal_threshold = min_removal_threshold
         self.compaction_count = 0
+        self.image_index = ImageIndex(mode=image_prune_mode)
 
     async def maybe_compact_context(
         self,
@@ -73,46 +80,16 @@ class ContextManager:
         """
         Remove old screenshots, keeping only the most recent ones.
 
-        This preserves prompt cache by removing in chunks.
+        This preserves prompt cache by removing in chunks. Only messages added
+        since the previous call are scanned for images.
 
         Args:
             messages: Messages to filter (modified in place)
             images_to_keep: Number of images to retain
             min_removal_threshold: Minimum to remove at once
         """
-        tool_result_blocks = cast(
-            list[BetaToolResultBlockParam],
-            [
-                item
-                for message in messages
-                for item in (
-                    message["content"] if isinstance(message["content"], list) else []
-                )
-                if isinstance(item, dict) and item.get("type") == "tool_result"
-            ],
-        )
-
-        total_images = sum(
-            1
-            for tool_result in tool_result_blocks
-            for content in tool_result.get("content", [])
-            if isinstance(content, dict) and content.get("type") == "image"
-        )
-
-        images_to_remove = total_images - images_to_keep
-        # Remove in chunks for better cache behavior
-        images_to_remove -= images_to_remove % min_removal_threshold
-
-        for tool_result in tool_result_blocks:
-            if isinstance(tool_result.get("content"), list):
-                new_content = []
-                for content in tool_result.get("content", []):
-                    if isinstance(content, dict) and content.get("type") == "image":
-                        if images_to_remove > 0:
-                            images_to_remove -= 1
-                            continue
-                    new_content.append(content)
-                tool_result["content"] = new_content
+        self.image_index.sync(messages)
+        self.image_index.prune(images_to_keep, min_removal_threshold)
 
     def get_context_stats(self, messages: list[BetaMessageParam]) -> dict:
         """
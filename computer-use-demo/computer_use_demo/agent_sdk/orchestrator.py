@@ -35,6 +35,7 @@ from anthropic.types.beta import (
 )
 
 from ..tools import ToolCollection, ToolResult, ToolVersion, TOOL_GROUPS_BY_VERSION
+from ..tools.screen_capture import image_media_type
 from .session import SessionManager
 from .context_manager import ContextManager
 from .subagents import SubagentCoordinator, SubagentType
@@ -403,7 +404,8 @@ class AgentOrchestrator:
             })
 
             # Execute tools with verification
-            tool_result_content: list[BetaToolResultBlockParam] = []
+            tool_calls: list[tuple[str, dict[str, Any]]] = []
+            tool_use_ids: list[str] = []
             has_verification_needed = False
 
             for content_block in response_params:
@@ -417,20 +419,24 @@ class AgentOrchestrator:
                     # Log tool call for debugging
                     self.tool_logger.log_tool_call(tool_name, tool_input)
 
-                    # Execute tool
-                    result = await tool_collection.run(
-                        name=tool_name,
-                        tool_input=tool_input,
-                    )
-
                     # Check if verification needed
                     if self.enable_verification and self._needs_verification(tool_name, tool_input):
                         has_verification_needed = True
 
-                    tool_result_content.append(
-                        self._make_api_tool_result(result, tool_use_block["id"])
-                    )
-                    tool_output_callback(result, tool_use_block["id"])
+                    tool_calls.append((tool_name, tool_input))
+                    tool_use_ids.append(tool_use_block["id"])
+
+            # Execute tools; read-only calls run concurrently, results keep their order.
+            # on_result is only called before run_many returns, so the late
+            # binding of tool_use_ids is safe.
+            results = await tool_collection.run_many(
+                tool_calls,
+                on_result=lambda index, result: tool_output_callback(result, tool_use_ids[index]),  # noqa: B023
+            )
+            tool_result_content: list[BetaToolResultBlockParam] = [
+                self._make_api_tool_result(result, tool_use_id)
+                for result, tool_use_id in zip(results, tool_use_ids)
+            ]
 
             # Save session after each iteration
             await self.session_manager.save_session(messages)
@@ -577,7 +583,7 @@ class AgentOrchestrator:
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": image_media_type(result.base64_image),
                         "data": result.base64_image,
                     },
                 })
@@ -3,388 +3,242 @@ Proto Multi-Agent System.
 
 Provides CEO agent for orchestration and specialist agents
 for domain-specific expertise.
+
+Agent classes are imported on first use: ``AGENT_REGISTRY`` maps agent
+names to "module:Class" paths and loads a class when it is looked up, and
+the classes exported here are resolved on first attribute access. Importing
+this package (e.g. for ``create_agent_by_name``) therefore loads neither
+the Anthropic client nor the ~150 specialist modules.
 """
 
-from typing import Optional
+import importlib
+from typing import TYPE_CHECKING, Any, Optional
 
-from .base_agent import AgentConfig, AgentMessage, AgentResult, AgentRole, BaseAgent
-from .ceo_agent import CEOAgent
-from .specialists import (
-    # Base
-    BaseSpecialist,
-    # ===== EXISTING AGENTS =====
-    # Core SaaS Agents
-    AdminCoordinatorAgent,
-    BusinessOperationsAgent,
-    ContentMarketingAgent,
-    CustomerSuccessAgent,
-    DataAnalystAgent,
-    DevOpsAgent,
-    FinanceAgent,
-    GrowthAnalyticsAgent,
-    HRPeopleAgent,
-    LegalComplianceAgent,
-    MarketingStrategyAgent,
-    ProductManagerAgent,
-    ProductStrategyAgent,
-    QATestingAgent,
-    SalesAgent,
-    SecurityAgent,
-    SeniorDeveloperAgent,
-    TechnicalWriterAgent,
-    UXDesignerAgent,
-    # ===== NEW AGENTS =====
-    # C-Suite Executives
-    CTOAgent,
-    CPOAgent,
-    CMOAgent,
-    CROAgent,
-    CCOAgent,
-    CDOAgent,
-    CFOAgent,
-    CLOAgent,
-    CHROAgent,
-    # Chief of Staff
-    InboxTriageAgent,
-    DecisionMemoAgent,
-    MeetingAgendaAgent,
-    ActionTrackerAgent,
-    WeeklyBriefAgent,
-    PriorityResolverAgent,
-    # Strategy & Planning
-    VisionKeeperAgent,
-    OKRCoachAgent,
-    KPIDefinitionAgent,
-    ResourceAllocationAgent,
-    ScenarioPlanningAgent,
-    CompetitiveStrategyAgent,
-    StrategicInitiativeAgent,
-    BusinessModelAgent,
-    PartnershipStrategyAgent,
-    InvestmentThesisAgent,
-    # Company Operating System
-    OKRTrackerAgent,
-    WBRAgent,
-    MetricPackAgent,
-    AnomalyExplanationAgent,
-    ProgramManagementAgent,
-    QualityGovernanceAgent,
-    PolicyEnforcementAgent,
-    IncidentCommanderAgent,
-    PostmortemAgent,
-    RunbookAgent,
-    ChangeManagementAgent,
-    CommunicationAgent,
-    # Experimentation & Learning
-    HypothesisGeneratorAgent,
-    VariantGeneratorAgent,
-    ExperimentDesignAgent,
-    TrafficAllocationAgent,
-    ResultsInterpretationAgent,
-    RolloutControllerAgent,
-    LearningSynthesisAgent,
-    # Internal Knowledge
-    WikiCuratorAgent,
-    FAQMaintainerAgent,
-    SearchEnhancerAgent,
-    GlossaryTaxonomyAgent,
-    # Additional Product
-    RoadmapPriorityAgent,
-    FeatureSpecAgent,
-    CompetitorTrackerAgent,
-    UserStoryAgent,
-    ReleaseNotesAgent,
-    BetaProgramAgent,
-    ProductAnalyticsAgent,
-    FeatureFlagAgent,
-    LocalizationAgent,
-    PlatformAPIAgent,
-    # Core Orchestration
-    COOExecutionAgent,
-    PMOProgramAgent,
-    SchedulerAgent,
-    PolicyGuardrailsAgent,
-    QualityAuditAgent,
-    ObservabilityAgent,
-    ExperimentationAgent,
-    # Product & Design
-    UserResearchAgent,
-    ProductDiscoveryAgent,
-    PRDSpecAgent,
-    UIVisualDesignAgent,
-    ContentDesignAgent,
-    AccessibilityAgent,
-    UsabilityTestingAgent,
-    # Engineering
-    FrontendDeveloperAgent,
-    BackendDeveloperAgent,
-    MobileDeveloperAgent,
-    DatabaseAgent,
-    CodeReviewAgent,
-    BuildCIAgent,
-    ReleaseAgent,
-    BugTriageAgent,
-    # Infrastructure / DevOps / IT
-    SREAgent,
-    MonitoringAgent,
-    CostOptimizationAgent,
-    ITSupportAgent,
-    AssetLicenseAgent,
-    # Data / Analytics / ML
-    DataEngineeringAgent,
-    ExperimentAnalysisAgent,
-    BIReportingAgent,
-    ForecastingAgent,
-    MLEngineerAgent,
-    DataQualityAgent,
-    PrivacyPIIAgent,
-    # Marketing & Growth
-    MarketResearchAgent,
-    BrandAgent,
-    SEOAgent,
-    PaidAcquisitionAgent,
-    LifecycleCRMAgent,
-    SocialMediaAgent,
-    PRCommsAgent,
-    CreativeProductionAgent,
-    # Sales
-    LeadEnrichmentAgent,
-    ProspectingAgent,
-    SDRQualificationAgent,
-    SalesOpsAgent,
-    DealDeskAgent,
-    SalesEnablementAgent,
-    PartnerChannelAgent,
-    # Customer Success & Support
-    OnboardingAgent,
-    SupportTriageAgent,
-    SupportResolutionAgent,
-    KnowledgeBaseAgent,
-    ChurnPreventionAgent,
-    VoiceOfCustomerAgent,
-    CommunityAgent,
-    # Operations
-    VendorManagementAgent,
-    ProcurementAgent,
-    InternalToolingAgent,
-    # Finance & Accounting
-    BookkeepingAgent,
-    InvoicingARAgent,
-    AccountsPayableAgent,
-    RevenueOpsAgent,
-    TaxAgent,
-    FraudDetectionAgent,
-    # Legal, Compliance, Risk
-    ContractAgent,
-    PolicyAgent,
-    IntellectualPropertyAgent,
-    RegulatoryAgent,
-    RiskAgent,
-    # People (HR) & Talent
-    RecruitingAgent,
-    InterviewLoopAgent,
-    PerformanceAgent,
-    LearningDevelopmentAgent,
-    CompensationBenefitsAgent,
-    # Security
-    AccessControlAgent,
-    VulnerabilityManagementAgent,
-    IncidentResponseAgent,
-    SecureSDLCAgent,
-)
+from . import specialists
+from .registry import LazyAgentRegistry
+
+if TYPE_CHECKING:
+    from .base_agent import AgentConfig, AgentMessage, AgentResult, AgentRole, BaseAgent
+    from .ceo_agent import CEOAgent
+    from .specialists import BaseSpecialist
+
+# Classes exported by this package, by defining module
+_LAZY_EXPORTS = {
+    "BaseAgent": ".base_agent",
+    "AgentConfig": ".base_agent",
+    "AgentMessage": ".base_agent",
+    "AgentResult": ".base_agent",
+    "AgentRole": ".base_agent",
+    "CEOAgent": ".ceo_agent",
+}
 
-# Agent registry mapping names to classes
-AGENT_REGISTRY = {
+# Agent registry mapping names to "module:Class" paths
+AGENT_MODULES = {
     # CEO
-    "ceo-agent": CEOAgent,
+    "ceo-agent": ".ceo_agent:CEOAgent",
     # ===== EXISTING AGENTS =====
     # Core SaaS Agents
-    "product-manager": ProductManagerAgent,
-    "qa-testing": QATestingAgent,
-    "devops": DevOpsAgent,
-    "technical-writer": TechnicalWriterAgent,
-    "data-analyst": DataAnalystAgent,
-    "customer-success": CustomerSuccessAgent,
-    "sales": SalesAgent,
+    "product-manager": ".specialists.product_manager_agent:ProductManagerAgent",
+    "qa-testing": ".specialists.qa_testing_agent:QATestingAgent",
+    "devops": ".specialists.devops_agent:DevOpsAgent",
+    "technical-writer": ".specialists.technical_writer_agent:TechnicalWriterAgent",
+    "data-analyst": ".specialists.data_analyst_agent:DataAnalystAgent",
+    "customer-success": ".specialists.customer_success_agent:CustomerSuccessAgent",
+    "sales": ".specialists.sales_agent:SalesAgent",
     # Extended SaaS Agents
-    "finance": FinanceAgent,
-    "security": SecurityAgent,
-    "content-marketing": ContentMarketingAgent,
-    "growth-analytics": GrowthAnalyticsAgent,
-    "legal-compliance": LegalComplianceAgent,
-    "hr-people": HRPeopleAgent,
-    "business-operations": BusinessOperationsAgent,
-    "product-strategy": ProductStrategyAgent,
-    "admin-coordinator": AdminCoordinatorAgent,
+    "finance": ".specialists.finance_agent:FinanceAgent",
+    "security": ".specialists.security_agent:SecurityAgent",
+    "content-marketing": ".specialists.content_marketing_agent:ContentMarketingAgent",
+    "growth-analytics": ".specialists.growth_analytics_agent:GrowthAnalyticsAgent",
+    "legal-compliance": ".specialists.legal_compliance_agent:LegalComplianceAgent",
+    "hr-people": ".specialists.hr_people_agent:HRPeopleAgent",
+    "business-operations": ".specialists.business_operations_agent:BusinessOperationsAgent",
+    "product-strategy": ".specialists.product_strategy_agent:ProductStrategyAgent",
+    "admin-coordinator": ".specialists.admin_coordinator_agent:AdminCoordinatorAgent",
     # Original Agents
-    "marketing-strategy": MarketingStrategyAgent,
-    "senior-developer": SeniorDeveloperAgent,
-    "ux-designer": UXDesignerAgent,
+    "marketing-strategy": ".specialists.marketing_strategy_agent:MarketingStrategyAgent",
+    "senior-developer": ".specialists.senior_developer_agent:SeniorDeveloperAgent",
+    "ux-designer": ".specialists.ux_designer_agent:UXDesignerAgent",
     # ===== NEW AGENTS =====
     # C-Suite Executives
-    "cto": CTOAgent,
-    "cpo": CPOAgent,
-    "cmo": CMOAgent,
-    "cro": CROAgent,
-    "cco": CCOAgent,
-    "cdo": CDOAgent,
-    "cfo": CFOAgent,
-    "clo": CLOAgent,
-    "chro": CHROAgent,
+    "cto": ".specialists.cto_agent:CTOAgent",
+    "cpo": ".specialists.cpo_agent:CPOAgent",
+    "cmo": ".specialists.cmo_agent:CMOAgent",
+    "cro": ".specialists.cro_agent:CROAgent",
+    "cco": ".specialists.cco_agent:CCOAgent",
+    "cdo": ".specialists.cdo_agent:CDOAgent",
+    "cfo": ".specialists.cfo_agent:CFOAgent",
+    "clo": ".specialists.clo_agent:CLOAgent",
+    "chro": ".specialists.chro_agent:CHROAgent",
     # Chief of Staff
-    "inbox-triage": InboxTriageAgent,
-    "decision-memo": DecisionMemoAgent,
-    "meeting-agenda": MeetingAgendaAgent,
-    "action-tracker": ActionTrackerAgent,
-    "weekly-brief": WeeklyBriefAgent,
-    "priority-resolver": PriorityResolverAgent,
+    "inbox-triage": ".specialists.inbox_triage_agent:InboxTriageAgent",
+    "decision-memo": ".specialists.decision_memo_agent:DecisionMemoAgent",
+    "meeting-agenda": ".specialists.meeting_agenda_agent:MeetingAgendaAgent",
+    "action-tracker": ".specialists.action_tracker_agent:ActionTrackerAgent",
+    "weekly-brief": ".specialists.weekly_brief_agent:WeeklyBriefAgent",
+    "priority-resolver": ".specialists.priority_resolver_agent:PriorityResolverAgent",
     # Strategy & Planning
-    "vision-keeper": VisionKeeperAgent,
-    "okr-coach": OKRCoachAgent,
-    "kpi-definition": KPIDefinitionAgent,
-    "resource-allocation": ResourceAllocationAgent,
-    "scenario-planning": ScenarioPlanningAgent,
-    "competitive-strategy": CompetitiveStrategyAgent,
-    "strategic-initiative": StrategicInitiativeAgent,
-    "business-model": BusinessModelAgent,
-    "partnership-strategy": PartnershipStrategyAgent,
-    "investment-thesis": InvestmentThesisAgent,
+    "vision-keeper": ".specialists.vision_keeper_agent:VisionKeeperAgent",
+    "okr-coach": ".specialists.okr_coach_agent:OKRCoachAgent",
+    "kpi-definition": ".specialists.kpi_definition_agent:KPIDefinitionAgent",
+    "resource-allocation": ".specialists.resource_allocation_agent:ResourceAllocationAgent",
+    "scenario-planning": ".specialists.scenario_planning_agent:ScenarioPlanningAgent",
+    "competitive-strategy": ".specialists.competitive_strategy_agent:CompetitiveStrategyAgent",
+    "strategic-initiative": ".specialists.strategic_initiative_agent:StrategicInitiativeAgent",
+    "business-model": ".specialists.business_model_agent:BusinessModelAgent",
+    "partnership-strategy": ".specialists.partnership_strategy_agent:PartnershipStrategyAgent",
+    "investment-thesis": ".specialists.investment_thesis_agent:InvestmentThesisAgent",
     # Company Operating System
-    "okr-tracker": OKRTrackerAgent,
-    "wbr": WBRAgent,
-    "metric-pack": MetricPackAgent,
-    "anomaly-explanation": AnomalyExplanationAgent,
-    "program-management": ProgramManagementAgent,
-    "quality-governance": QualityGovernanceAgent,
-    "policy-enforcement": PolicyEnforcementAgent,
-    "incident-commander": IncidentCommanderAgent,
-    "postmortem": PostmortemAgent,
-    "runbook": RunbookAgent,
-    "change-management": ChangeManagementAgent,
-    "communication": CommunicationAgent,
+    "okr-tracker": ".specialists.okr_tracker_agent:OKRTrackerAgent",
+    "wbr": ".specialists.wbr_agent:WBRAgent",
+    "metric-pack": ".specialists.metric_pack_agent:MetricPackAgent",
+    "anomaly-explanation": ".specialists.anomaly_explanation_agent:AnomalyExplanationAgent",
+    "program-management": ".specialists.program_management_agent:ProgramManagementAgent",
+    "quality-governance": ".specialists.quality_governance_agent:QualityGovernanceAgent",
+    "policy-enforcement": ".specialists.policy_enforcement_agent:PolicyEnforcementAgent",
+    "incident-commander": ".specialists.incident_commander_agent:IncidentCommanderAgent",
+    "postmortem": ".specialists.postmortem_agent:PostmortemAgent",
+    "runbook": ".specialists.runbook_agent:RunbookAgent",
+    "change-management": ".specialists.change_management_agent:ChangeManagementAgent",
+    "communication": ".specialists.communication_agent:CommunicationAgent",
     # Experimentation & Learning
-    "hypothesis-generator": HypothesisGeneratorAgent,
-    "variant-generator": VariantGeneratorAgent,
-    "experiment-design": ExperimentDesignAgent,
-    "traffic-allocation": TrafficAllocationAgent,
-    "results-interpretation": ResultsInterpretationAgent,
-    "rollout-controller": RolloutControllerAgent,
-    "learning-synthesis": LearningSynthesisAgent,
+    "hypothesis-generator": ".specialists.hypothesis_generator_agent:HypothesisGeneratorAgent",
+    "variant-generator": ".specialists.variant_generator_agent:VariantGeneratorAgent",
+    "experiment-design": ".specialists.experiment_design_agent:ExperimentDesignAgent",
+    "traffic-allocation": ".specialists.traffic_allocation_agent:TrafficAllocationAgent",
+    "results-interpretation": ".specialists.results_interpretation_agent:ResultsInterpretationAgent",
+    "rollout-controller": ".specialists.rollout_controller_agent:RolloutControllerAgent",
+    "learning-synthesis": ".specialists.learning_synthesis_agent:LearningSynthesisAgent",
     # Internal Knowledge
-    "wiki-curator": WikiCuratorAgent,
-    "faq-maintainer": FAQMaintainerAgent,
-    "search-enhancer": SearchEnhancerAgent,
-    "glossary-taxonomy": GlossaryTaxonomyAgent,
+    "wiki-curator": ".specialists.wiki_curator_agent:WikiCuratorAgent",
+    "faq-maintainer": ".specialists.faq_maintainer_agent:FAQMaintainerAgent",
+    "search-enhancer": ".specialists.search_enhancer_agent:SearchEnhancerAgent",
+    "glossary-taxonomy": ".specialists.glossary_taxonomy_agent:GlossaryTaxonomyAgent",
     # Additional Product
-    "roadmap-priority": RoadmapPriorityAgent,
-    "feature-spec": FeatureSpecAgent,
-    "competitor-tracker": CompetitorTrackerAgent,
-    "user-story": UserStoryAgent,
-    "release-notes": ReleaseNotesAgent,
-    "beta-program": BetaProgramAgent,
-    "product-analytics": ProductAnalyticsAgent,
-    "feature-flag": FeatureFlagAgent,
-    "localization": LocalizationAgent,
-    "platform-api": PlatformAPIAgent,
+    "roadmap-priority": ".specialists.roadmap_priority_agent:RoadmapPriorityAgent",
+    "feature-spec": ".specialists.feature_spec_agent:FeatureSpecAgent",
+    "competitor-tracker": ".specialists.competitor_tracker_agent:CompetitorTrackerAgent",
+    "user-story": ".specialists.user_story_agent:UserStoryAgent",
+    "release-notes": ".specialists.release_notes_agent:ReleaseNotesAgent",
+    "beta-program": ".specialists.beta_program_agent:BetaProgramAgent",
+    "product-analytics": ".specialists.product_analytics_agent:ProductAnalyticsAgent",
+    "feature-flag": ".specialists.feature_flag_agent:FeatureFlagAgent",
+    "localization": ".specialists.localization_agent:LocalizationAgent",
+    "platform-api": ".specialists.platform_api_agent:PlatformAPIAgent",
     # Core Orchestration
-    "coo-execution": COOExecutionAgent,
-    "pmo-program": PMOProgramAgent,
-    "scheduler": SchedulerAgent,
-    "policy-guardrails": PolicyGuardrailsAgent,
-    "quality-audit": QualityAuditAgent,
-    "observability": ObservabilityAgent,
-    "experimentation": ExperimentationAgent,
+    "coo-execution": ".specialists.coo_execution_agent:COOExecutionAgent",
+    "pmo-program": ".specialists.pmo_program_agent:PMOProgramAgent",
+    "scheduler": ".specialists.scheduler_agent:SchedulerAgent",
+    "policy-guardrails": ".specialists.policy_guardrails_agent:PolicyGuardrailsAgent",
+    "quality-audit": ".specialists.quality_audit_agent:QualityAuditAgent",
+    "observability": ".specialists.observability_agent:ObservabilityAgent",
+    "experimentation": ".specialists.experimentation_agent:ExperimentationAgent",
     # Product & Design
-    "user-research": UserResearchAgent,
-    "product-discovery": ProductDiscoveryAgent,
-    "prd-spec": PRDSpecAgent,
-    "ui-visual-design": UIVisualDesignAgent,
-    "content-design": ContentDesignAgent,
-    "accessibility": AccessibilityAgent,
-    "usability-testing": UsabilityTestingAgent,
+    "user-research": ".specialists.user_research_agent:UserResearchAgent",
+    "product-discovery": ".specialists.product_discovery_agent:ProductDiscoveryAgent",
+    "prd-spec": ".specialists.prd_spec_agent:PRDSpecAgent",
+    "ui-visual-design": ".specialists.ui_visual_design_agent:UIVisualDesignAgent",
+    "content-design": ".specialists.content_design_agent:ContentDesignAgent",
+    "accessibility": ".specialists.accessibility_agent:AccessibilityAgent",
+    "usability-testing": ".specialists.usability_testing_agent:UsabilityTestingAgent",
     # Engineering
-    "frontend-developer": FrontendDeveloperAgent,
-    "backend-developer": BackendDeveloperAgent,
-    "mobile-developer": MobileDeveloperAgent,
-    "database": DatabaseAgent,
-    "code-review": CodeReviewAgent,
-    "build-ci": BuildCIAgent,
-    "release": ReleaseAgent,
-    "bug-triage": BugTriageAgent,
+    "frontend-developer": ".specialists.frontend_developer_agent:FrontendDeveloperAgent",
+    "backend-developer": ".specialists.backend_developer_agent:BackendDeveloperAgent",
+    "mobile-developer": ".specialists.mobile_developer_agent:MobileDeveloperAgent",
+    "database": ".specialists.database_agent:DatabaseAgent",
+    "code-review": ".specialists.code_review_agent:CodeReviewAgent",
+    "build-ci": ".specialists.build_ci_agent:BuildCIAgent",
+    "release": ".specialists.release_agent:ReleaseAgent",
+    "bug-triage": ".specialists.bug_triage_agent:BugTriageAgent",
     # Infrastructure / DevOps / IT
-    "sre": SREAgent,
-    "monitoring": MonitoringAgent,
-    "cost-optimization": CostOptimizationAgent,
-    "it-support": ITSupportAgent,
-    "asset-license": AssetLicenseAgent,
+    "sre": ".specialists.sre_agent:SREAgent",
+    "monitoring": ".specialists.monitoring_agent:MonitoringAgent",
+    "cost-optimization": ".specialists.cost_optimization_agent:CostOptimizationAgent",
+    "it-support": ".specialists.it_support_agent:ITSupportAgent",
+    "asset-license": ".specialists.asset_license_agent:AssetLicenseAgent",
     # Data / Analytics / ML
-    "data-engineering": DataEngineeringAgent,
-    "experiment-analysis": ExperimentAnalysisAgent,
-    "bi-reporting": BIReportingAgent,
-    "forecasting": ForecastingAgent,
-    "ml-engineer": MLEngineerAgent,
-    "data-quality": DataQualityAgent,
-    "privacy-pii": PrivacyPIIAgent,
+    "data-engineering": ".specialists.data_engineering_agent:DataEngineeringAgent",
+    "experiment-analysis": ".specialists.experiment_analysis_agent:ExperimentAnalysisAgent",
+    "bi-reporting": ".specialists.bi_reporting_agent:BIReportingAgent",
+    "forecasting": ".specialists.forecasting_agent:ForecastingAgent",
+    "ml-engineer": ".specialists.ml_engineer_agent:MLEngineerAgent",
+    "data-quality": ".specialists.data_quality_agent:DataQualityAgent",
+    "privacy-pii": ".specialists.privacy_pii_agent:PrivacyPIIAgent",
     # Marketing & Growth
-    "market-research": MarketResearchAgent,
-    "brand": BrandAgent,
-    "seo": SEOAgent,
-    "paid-acquisition": PaidAcquisitionAgent,
-    "lifecycle-crm": LifecycleCRMAgent,
-    "social-media": SocialMediaAgent,
-    "pr-comms": PRCommsAgent,
-    "creative-production": CreativeProductionAgent,
+    "market-research": ".specialists.market_research_agent:MarketResearchAgent",
+    "brand": ".specialists.brand_agent:BrandAgent",
+    "seo": ".specialists.seo_agent:SEOAgent",
+    "paid-acquisition": ".specialists.paid_acquisition_agent:PaidAcquisitionAgent",
+    "lifecycle-crm": ".specialists.lifecycle_crm_agent:LifecycleCRMAgent",
+    "social-media": ".specialists.social_media_agent:SocialMediaAgent",
+    "pr-comms": ".specialists.pr_comms_agent:PRCommsAgent",
+    "creative-production": ".specialists.creative_production_agent:CreativeProductionAgent",
     # Sales
-    "lead-enrichment": LeadEnrichmentAgent,
-    "prospecting": ProspectingAgent,
-    "sdr-qualification": SDRQualificationAgent,
-    "sales-ops": SalesOpsAgent,
-    "deal-desk": DealDeskAgent,
-    "sales-enablement": SalesEnablementAgent,
-    "partner-channel": PartnerChannelAgent,
+    "lead-enrichment": ".specialists.lead_enrichment_agent:LeadEnrichmentAgent",
+    "prospecting": ".specialists.prospecting_agent:ProspectingAgent",
+    "sdr-qualification": ".specialists.sdr_qualification_agent:SDRQualificationAgent",
+    "sales-ops": ".specialists.sales_ops_agent:SalesOpsAgent",
+    "deal-desk": ".specialists.deal_desk_agent:DealDeskAgent",
+    "sales-enablement": ".specialists.sales_enablement_agent:SalesEnablementAgent",
+    "partner-channel": ".specialists.partner_channel_agent:PartnerChannelAgent",
     # Customer Success & Support
-    "onboarding": OnboardingAgent,
-    "support-triage": SupportTriageAgent,
-    "support-resolution": SupportResolutionAgent,
-    "knowledge-base": KnowledgeBaseAgent,
-    "churn-prevention": ChurnPreventionAgent,
-    "voice-of-customer": VoiceOfCustomerAgent,
-    "community": CommunityAgent,
+    "onboarding": ".specialists.onboarding_agent:OnboardingAgent",
+    "support-triage": ".specialists.support_triage_agent:SupportTriageAgent",
+    "support-resolution": ".specialists.support_resolution_agent:SupportResolutionAgent",
+    "knowledge-base": ".specialists.knowledge_base_agent:KnowledgeBaseAgent",
+    "churn-prevention": ".specialists.churn_prevention_agent:ChurnPreventionAgent",
+    "voice-of-customer": ".specialists.voice_of_customer_agent:VoiceOfCustomerAgent",
+    "community": ".specialists.community_agent:CommunityAgent",
     # Operations
-    "vendor-management": VendorManagementAgent,
-    "procurement": ProcurementAgent,
-    "internal-tooling": InternalToolingAgent,
+    "vendor-management": ".specialists.vendor_management_agent:VendorManagementAgent",
+    "procurement": ".specialists.procurement_agent:ProcurementAgent",
+    "internal-tooling": ".specialists.internal_tooling_agent:InternalToolingAgent",
     # Finance & Accounting
-    "bookkeeping": BookkeepingAgent,
-    "invoicing-ar": InvoicingARAgent,
-    "accounts-payable": AccountsPayableAgent,
-    "revenue-ops": RevenueOpsAgent,
-    "tax": TaxAgent,
-    "fraud-detection": FraudDetectionAgent,
+    "bookkeeping": ".specialists.bookkeeping_agent:BookkeepingAgent",
+    "invoicing-ar": ".specialists.invoicing_ar_agent:InvoicingARAgent",
+    "accounts-payable": ".specialists.accounts_payable_agent:AccountsPayableAgent",
+    "revenue-ops": ".specialists.revenue_ops_agent:RevenueOpsAgent",
+    "tax": ".specialists.tax_agent:TaxAgent",
+    "fraud-detection": ".specialists.fraud_detection_agent:FraudDetectionAgent",
     # Legal, Compliance, Risk
-    "contract": ContractAgent,
-    "policy": PolicyAgent,
-    "intellectual-property": IntellectualPropertyAgent,
-    "regulatory": RegulatoryAgent,
-    "risk": RiskAgent,
+    "contract": ".specialists.contract_agent:ContractAgent",
+    "policy": ".specialists.policy_agent:PolicyAgent",
+    "intellectual-property": ".specialists.intellectual_property_agent:IntellectualPropertyAgent",
+    "regulatory": ".specialists.regulatory_agent:RegulatoryAgent",
+    "risk": ".specialists.risk_agent:RiskAgent",
     # People (HR) & Talent
-    "recruiting": RecruitingAgent,
-    "interview-loop": InterviewLoopAgent,
-    "performance": PerformanceAgent,
-    "learning-development": LearningDevelopmentAgent,
-    "compensation-benefits": CompensationBenefitsAgent,
+    "recruiting": ".specialists.recruiting_agent:RecruitingAgent",
+    "interview-loop": ".specialists.interview_loop_agent:InterviewLoopAgent",
+    "performance": ".specialists.performance_agent:PerformanceAgent",
+    "learning-development": ".specialists.learning_development_agent:LearningDevelopmentAgent",
+    "compensation-benefits": ".specialists.compensation_benefits_agent:CompensationBenefitsAgent",
     # Security
-    "access-control": AccessControlAgent,
-    "vulnerability-management": VulnerabilityManagementAgent,
-    "incident-response": IncidentResponseAgent,
-    "secure-sdlc": SecureSDLCAgent,
+    "access-control": ".specialists.access_control_agent:AccessControlAgent",
+    "vulnerability-management": ".specialists.vulnerability_management_agent:VulnerabilityManagementAgent",
+    "incident-response": ".specialists.incident_response_agent:IncidentResponseAgent",
+    "secure-sdlc": ".specialists.secure_sdlc_agent:SecureSDLCAgent",
 }
 
+AGENT_REGISTRY = LazyAgentRegistry(AGENT_MODULES, package=__name__)
 
-def create_agent_by_name(agent_name: str, **kwargs) -> Optional[BaseAgent]:
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    elif name in specialists.SPECIALIST_MODULES:
+        value = getattr(specialists, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def create_agent_by_name(agent_name: str, **kwargs) -> Optional["BaseAgent"]:
     """
     Create an agent instance by name.
 
+    Only the module of the requested agent is imported.
+
     Args:
         agent_name: Name of agent (e.g., "ceo-agent", "senior-developer")
         **kwargs: Additional arguments to pass to agent constructor
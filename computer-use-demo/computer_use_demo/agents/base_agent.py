@@ -13,6 +13,7 @@ from anthropic.types import Message, TextBlock
 
 from ..proto_logging import get_logger
 from ..tools.collection import ToolCollection
+from ..tools.scheduler import run_tool_calls
 
 # Import thinking module for auto-detection
 try:
@@ -136,6 +137,11 @@ class BaseAgent(ABC):
         self.stop_flag: Any = None  # Function that returns True when execution should stop
         self.progress_callback: Any = None  # Function to report progress during execution
 
+        # Lease shells under this agent's name so pool metrics show who holds them
+        for tool in config.tools:
+            if hasattr(tool, "owner") and getattr(tool, "name", None) == "bash" and not tool.owner:
+                tool.owner = self.session_id
+
         # Log agent creation
         self.logger.log_event(
             event_type="session_created",
@@ -698,30 +704,32 @@ class BaseAgent(ABC):
         Returns:
             List of tool result blocks
         """
-        tool_results = []
-
-        for block in response.content:
-            if block.type == "tool_use":
-                tool_name = block.name
-                tool_input = block.input
-                tool_id = block.id
+        tool_use_blocks = [block for block in response.content if block.type == "tool_use"]
 
-                # Log tool execution start
-                self.logger.log_event(
-                    event_type="tool_selected",
-                    session_id=self.session_id,
-                    data={
-                        "agent_role": self.config.role,
-                        "tool_name": tool_name,
-                        "tool_id": tool_id,
-                    },
-                )
+        for block in tool_use_blocks:
+            # Log tool execution start
+            self.logger.log_event(
+                event_type="tool_selected",
+                session_id=self.session_id,
+                data={
+                    "agent_role": self.config.role,
+                    "tool_name": block.name,
+                    "tool_id": block.id,
+                },
+            )
 
-                # Find and execute tool
-                tool_result = await self._execute_tool(tool_name, tool_input, tool_id)
-                tool_results.append(tool_result)
+        # Read-only calls run concurrently; results keep the original order
+        return await run_tool_calls(
+            tool_use_blocks,
+            lambda block: self._execute_tool(block.name, block.input, block.id),
+            self._is_parallel_safe,
+        )
 
-        return tool_results
+    def _is_parallel_safe(self, block: Any) -> bool:
+        """Whether a tool_use block may run concurrently with other safe calls."""
+        tool = next((t for t in self.config.tools if t.name == block.name), None)
+        is_parallel_safe = getattr(tool, "is_parallel_safe", None)
+        return bool(is_parallel_safe and is_parallel_safe(block.input))
 
     async def _execute_tool(
         self, tool_name: str, tool_input: dict[str, Any], tool_id: str
@@ -0,0 +1,52 @@
+"""
+Lazy agent registry.
+
+Maps agent names to "module:Class" paths and imports an agent's module the
+first time the agent is looked up, so listing agents or creating one does
+not import every agent module.
+"""
+
+import importlib
+import threading
+from collections.abc import Iterator, Mapping
+
+
+class LazyAgentRegistry(Mapping[str, type]):
+    """A read-only mapping of agent names to classes, imported on lookup."""
+
+    def __init__(self, paths: Mapping[str, str], package: str | None = None):
+        """
+        Args:
+            paths: Agent names mapped to "module:Class" paths
+            package: Package that relative module paths are resolved against
+        """
+        self._paths = dict(paths)
+        self._package = package
+        self._classes: dict[str, type] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> type:
+        agent_class = self._classes.get(name)
+        if agent_class is None:
+            module_path, _, class_name = self._paths[name].partition(":")
+            with self._lock:
+                module = importlib.import_module(module_path, self._package)
+                agent_class = self._classes[name] = getattr(module, class_name)
+        return agent_class
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def path(self, name: str) -> str:
+        """The "module:Class" path of an agent, without importing it."""
+        return self._paths[name]
+
+    def loaded(self) -> list[str]:
+        """Names of the agents whose classes have been imported."""
+        return list(self._classes)
@@ -3,211 +3,233 @@ Specialist Agents for Proto multi-agent system.
 
 Each specialist has domain-specific expertise and can be
 delegated tasks by the CEO agent or other specialists.
+
+Specialists are imported on first access (``specialists.CTOAgent``), so
+importing this package does not load the ~150 specialist modules.
 """
 
-from .base_specialist import BaseSpecialist
+import importlib
+from typing import Any
+
+# Class names mapped to the module defining them
+SPECIALIST_MODULES: dict[str, str] = {
+    "BaseSpecialist": "base_specialist",
+
+    # ===== EXISTING AGENTS =====
+    # Core SaaS Agents
+    "CustomerSuccessAgent": "customer_success_agent",
+    "DataAnalystAgent": "data_analyst_agent",
+    "DevOpsAgent": "devops_agent",
+    "ProductManagerAgent": "product_manager_agent",
+    "QATestingAgent": "qa_testing_agent",
+    "SalesAgent": "sales_agent",
+    "TechnicalWriterAgent": "technical_writer_agent",
+    # Extended SaaS Agents
+    "AdminCoordinatorAgent": "admin_coordinator_agent",
+    "BusinessOperationsAgent": "business_operations_agent",
+    "ContentMarketingAgent": "content_marketing_agent",
+    "FinanceAgent": "finance_agent",
+    "GrowthAnalyticsAgent": "growth_analytics_agent",
+    "HRPeopleAgent": "hr_people_agent",
+    "LegalComplianceAgent": "legal_compliance_agent",
+    "ProductStrategyAgent": "product_strategy_agent",
+    "SecurityAgent": "security_agent",
+    # Original Agents
+    "MarketingStrategyAgent": "marketing_strategy_agent",
+    "SeniorDeveloperAgent": "senior_developer_agent",
+    "UXDesignerAgent": "ux_designer_agent",
+
+    # ===== NEW AGENTS =====
+    # C-Suite Executives
+    "CTOAgent": "cto_agent",
+    "CPOAgent": "cpo_agent",
+    "CMOAgent": "cmo_agent",
+    "CROAgent": "cro_agent",
+    "CCOAgent": "cco_agent",
+    "CDOAgent": "cdo_agent",
+    "CFOAgent": "cfo_agent",
+    "CLOAgent": "clo_agent",
+    "CHROAgent": "chro_agent",
+
+    # Chief of Staff
+    "InboxTriageAgent": "inbox_triage_agent",
+    "DecisionMemoAgent": "decision_memo_agent",
+    "MeetingAgendaAgent": "meeting_agenda_agent",
+    "ActionTrackerAgent": "action_tracker_agent",
+    "WeeklyBriefAgent": "weekly_brief_agent",
+    "PriorityResolverAgent": "priority_resolver_agent",
 
-# ===== EXISTING AGENTS =====
-# Core SaaS Agents
-from .customer_success_agent import CustomerSuccessAgent
-from .data_analyst_agent import DataAnalystAgent
-from .devops_agent import DevOpsAgent
-from .product_manager_agent import ProductManagerAgent
-from .qa_testing_agent import QATestingAgent
-from .sales_agent import SalesAgent
-from .technical_writer_agent import TechnicalWriterAgent
-# Extended SaaS Agents
-from .admin_coordinator_agent import AdminCoordinatorAgent
-from .business_operations_agent import BusinessOperationsAgent
-from .content_marketing_agent import ContentMarketingAgent
-from .finance_agent import FinanceAgent
-from .growth_analytics_agent import GrowthAnalyticsAgent
-from .hr_people_agent import HRPeopleAgent
-from .legal_compliance_agent import LegalComplianceAgent
-from .product_strategy_agent import ProductStrategyAgent
-from .security_agent import SecurityAgent
-# Original Agents
-from .marketing_strategy_agent import MarketingStrategyAgent
-from .senior_developer_agent import SeniorDeveloperAgent
-from .ux_designer_agent import UXDesignerAgent
+    # Strategy & Planning
+    "VisionKeeperAgent": "vision_keeper_agent",
+    "OKRCoachAgent": "okr_coach_agent",
+    "KPIDefinitionAgent": "kpi_definition_agent",
+    "ResourceAllocationAgent": "resource_allocation_agent",
+    "ScenarioPlanningAgent": "scenario_planning_agent",
+    "CompetitiveStrategyAgent": "competitive_strategy_agent",
+    "StrategicInitiativeAgent": "strategic_initiative_agent",
+    "BusinessModelAgent": "business_model_agent",
+    "PartnershipStrategyAgent": "partnership_strategy_agent",
+    "InvestmentThesisAgent": "investment_thesis_agent",
 
-# ===== NEW AGENTS =====
-# C-Suite Executives
-from .cto_agent import CTOAgent
-from .cpo_agent import CPOAgent
-from .cmo_agent import CMOAgent
-from .cro_agent import CROAgent
-from .cco_agent import CCOAgent
-from .cdo_agent import CDOAgent
-from .cfo_agent import CFOAgent
-from .clo_agent import CLOAgent
-from .chro_agent import CHROAgent
+    # Company Operating System
+    "OKRTrackerAgent": "okr_tracker_agent",
+    "WBRAgent": "wbr_agent",
+    "MetricPackAgent": "metric_pack_agent",
+    "AnomalyExplanationAgent": "anomaly_explanation_agent",
+    "ProgramManagementAgent": "program_management_agent",
+    "QualityGovernanceAgent": "quality_governance_agent",
+    "PolicyEnforcementAgent": "policy_enforcement_agent",
+    "IncidentCommanderAgent": "incident_commander_agent",
+    "PostmortemAgent": "postmortem_agent",
+    "RunbookAgent": "runbook_agent",
+    "ChangeManagementAgent": "change_management_agent",
+    "CommunicationAgent": "communication_agent",
 
-# Chief of Staff
-from .inbox_triage_agent import InboxTriageAgent
-from .decision_memo_agent import DecisionMemoAgent
-from .meeting_agenda_agent import MeetingAgendaAgent
-from .action_tracker_agent import ActionTrackerAgent
-from .weekly_brief_agent import WeeklyBriefAgent
-from .priority_resolver_agent import PriorityResolverAgent
+    # Experimentation & Learning
+    "HypothesisGeneratorAgent": "hypothesis_generator_agent",
+    "VariantGeneratorAgent": "variant_generator_agent",
+    "ExperimentDesignAgent": "experiment_design_agent",
+    "TrafficAllocationAgent": "traffic_allocation_agent",
+    "ResultsInterpretationAgent": "results_interpretation_agent",
+    "RolloutControllerAgent": "rollout_controller_agent",
+    "LearningSynthesisAgent": "learning_synthesis_agent",
+
+    # Internal Knowledge
+    "WikiCuratorAgent": "wiki_curator_agent",
+    "FAQMaintainerAgent": "faq_maintainer_agent",
+    "SearchEnhancerAgent": "search_enhancer_agent",
+    "GlossaryTaxonomyAgent": "glossary_taxonomy_agent",
 
-# Strategy & Planning
-from .vision_keeper_agent import VisionKeeperAgent
-from .okr_coach_agent import OKRCoachAgent
-from .kpi_definition_agent import KPIDefinitionAgent
-from .resource_allocation_agent import ResourceAllocationAgent
-from .scenario_planning_agent import ScenarioPlanningAgent
-from .competitive_strategy_agent import CompetitiveStrategyAgent
-from .strategic_initiative_agent import StrategicInitiativeAgent
-from .business_model_agent import BusinessModelAgent
-from .partnership_strategy_agent import PartnershipStrategyAgent
-from .investment_thesis_agent import InvestmentThesisAgent
+    # Additional Product
+    "RoadmapPriorityAgent": "roadmap_priority_agent",
+    "FeatureSpecAgent": "feature_spec_agent",
+    "CompetitorTrackerAgent": "competitor_tracker_agent",
+    "UserStoryAgent": "user_story_agent",
+    "ReleaseNotesAgent": "release_notes_agent",
+    "BetaProgramAgent": "beta_program_agent",
+    "ProductAnalyticsAgent": "product_analytics_agent",
+    "FeatureFlagAgent": "feature_flag_agent",
+    "LocalizationAgent": "localization_agent",
+    "PlatformAPIAgent": "platform_api_agent",
 
-# Company Operating System
-from .okr_tracker_agent import OKRTrackerAgent
-from .wbr_agent import WBRAgent
-from .metric_pack_agent import MetricPackAgent
-from .anomaly_explanation_agent import AnomalyExplanationAgent
-from .program_management_agent import ProgramManagementAgent
-from .quality_governance_agent import QualityGovernanceAgent
-from .policy_enforcement_agent import PolicyEnforcementAgent
-from .incident_commander_agent import IncidentCommanderAgent
-from .postmortem_agent import PostmortemAgent
-from .runbook_agent import RunbookAgent
-from .change_management_agent import ChangeManagementAgent
-from .communication_agent import CommunicationAgent
+    # Core Orchestration
+    "COOExecutionAgent": "coo_execution_agent",
+    "PMOProgramAgent": "pmo_program_agent",
+    "SchedulerAgent": "scheduler_agent",
+    "PolicyGuardrailsAgent": "policy_guardrails_agent",
+    "QualityAuditAgent": "quality_audit_agent",
+    "ObservabilityAgent": "observability_agent",
+    "ExperimentationAgent": "experimentation_agent",
 
-# Experimentation & Learning
-from .hypothesis_generator_agent import HypothesisGeneratorAgent
-from .variant_generator_agent import VariantGeneratorAgent
-from .experiment_design_agent import ExperimentDesignAgent
-from .traffic_allocation_agent import TrafficAllocationAgent
-from .results_interpretation_agent import ResultsInterpretationAgent
-from .rollout_controller_agent import RolloutControllerAgent
-from .learning_synthesis_agent import LearningSynthesisAgent
+    # Product & Design
+    "UserResearchAgent": "user_research_agent",
+    "ProductDiscoveryAgent": "product_discovery_agent",
+    "PRDSpecAgent": "prd_spec_agent",
+    "UIVisualDesignAgent": "ui_visual_design_agent",
+    "ContentDesignAgent": "content_design_agent",
+    "AccessibilityAgent": "accessibility_agent",
+    "UsabilityTestingAgent": "usability_testing_agent",
 
-# Internal Knowledge
-from .wiki_curator_agent import WikiCuratorAgent
-from .faq_maintainer_agent import FAQMaintainerAgent
-from .search_enhancer_agent import SearchEnhancerAgent
-from .glossary_taxonomy_agent import GlossaryTaxonomyAgent
+    # Engineering
+    "FrontendDeveloperAgent": "frontend_developer_agent",
+    "BackendDeveloperAgent": "backend_developer_agent",
+    "MobileDeveloperAgent": "mobile_developer_agent",
+    "DatabaseAgent": "database_agent",
+    "CodeReviewAgent": "code_review_agent",
+    "BuildCIAgent": "build_ci_agent",
+    "ReleaseAgent": "release_agent",
+    "BugTriageAgent": "bug_triage_agent",
 
-# Additional Product
-from .roadmap_priority_agent import RoadmapPriorityAgent
-from .feature_spec_agent import FeatureSpecAgent
-from .competitor_tracker_agent import CompetitorTrackerAgent
-from .user_story_agent import UserStoryAgent
-from .release_notes_agent import ReleaseNotesAgent
-from .beta_program_agent import BetaProgramAgent
-from .product_analytics_agent import ProductAnalyticsAgent
-from .feature_flag_agent import FeatureFlagAgent
-from .localization_agent import LocalizationAgent
-from .platform_api_agent import PlatformAPIAgent
+    # Infrastructure / DevOps / IT
+    "SREAgent": "sre_agent",
+    "MonitoringAgent": "monitoring_agent",
+    "CostOptimizationAgent": "cost_optimization_agent",
+    "ITSupportAgent": "it_support_agent",
+    "AssetLicenseAgent": "asset_license_agent",
 
-# Core Orchestration
-from .coo_execution_agent import COOExecutionAgent
-from .pmo_program_agent import PMOProgramAgent
-from .scheduler_agent import SchedulerAgent
-from .policy_guardrails_agent import PolicyGuardrailsAgent
-from .quality_audit_agent import QualityAuditAgent
-from .observability_agent import ObservabilityAgent
-from .experimentation_agent import ExperimentationAgent
+    # Data / Analytics / ML
+    "DataEngineeringAgent": "data_engineering_agent",
+    "ExperimentAnalysisAgent": "experiment_analysis_agent",
+    "BIReportingAgent": "bi_reporting_agent",
+    "ForecastingAgent": "forecasting_agent",
+    "MLEngineerAgent": "ml_engineer_agent",
+    "DataQualityAgent": "data_quality_agent",
+    "PrivacyPIIAgent": "privacy_pii_agent",
 
-# Product & Design
-from .user_research_agent import UserResearchAgent
-from .product_discovery_agent import ProductDiscoveryAgent
-from .prd_spec_agent import PRDSpecAgent
-from .ui_visual_design_agent import UIVisualDesignAgent
-from .content_design_agent import ContentDesignAgent
-from .accessibility_agent import AccessibilityAgent
-from .usability_testing_agent import UsabilityTestingAgent
+    # Marketing & Growth
+    "MarketResearchAgent": "market_research_agent",
+    "BrandAgent": "brand_agent",
+    "SEOAgent": "seo_agent",
+    "PaidAcquisitionAgent": "paid_acquisition_agent",
+    "LifecycleCRMAgent": "lifecycle_crm_agent",
+    "SocialMediaAgent": "social_media_agent",
+    "PRCommsAgent": "pr_comms_agent",
+    "CreativeProductionAgent": "creative_production_agent",
 
-# Engineering
-from .frontend_developer_agent import FrontendDeveloperAgent
-from .backend_developer_agent import BackendDeveloperAgent
-from .mobile_developer_agent import MobileDeveloperAgent
-from .database_agent import DatabaseAgent
-from .code_review_agent import CodeReviewAgent
-from .build_ci_agent import BuildCIAgent
-from .release_agent import ReleaseAgent
-from .bug_triage_agent import BugTriageAgent
+    # Sales
+    "LeadEnrichmentAgent": "lead_enrichment_agent",
+    "ProspectingAgent": "prospecting_agent",
+    "SDRQualificationAgent": "sdr_qualification_agent",
+    "SalesOpsAgent": "sales_ops_agent",
+    "DealDeskAgent": "deal_desk_agent",
+    "SalesEnablementAgent": "sales_enablement_agent",
+    "PartnerChannelAgent": "partner_channel_agent",
 
-# Infrastructure / DevOps / IT
-from .sre_agent import SREAgent
-from .monitoring_agent import MonitoringAgent
-from .cost_optimization_agent import CostOptimizationAgent
-from .it_support_agent import ITSupportAgent
-from .asset_license_agent import AssetLicenseAgent
+    # Customer Success & Support
+    "OnboardingAgent": "onboarding_agent",
+    "SupportTriageAgent": "support_triage_agent",
+    "SupportResolutionAgent": "support_resolution_agent",
+    "KnowledgeBaseAgent": "knowledge_base_agent",
+    "ChurnPreventionAgent": "churn_prevention_agent",
+    "VoiceOfCustomerAgent": "voice_of_customer_agent",
+    "CommunityAgent": "community_agent",
 
-# Data / Analytics / ML
-from .data_engineering_agent import DataEngineeringAgent
-from .experiment_analysis_agent import ExperimentAnalysisAgent
-from .bi_reporting_agent import BIReportingAgent
-from .forecasting_agent import ForecastingAgent
-from .ml_engineer_agent import MLEngineerAgent
-from .data_quality_agent import DataQualityAgent
-from .privacy_pii_agent import PrivacyPIIAgent
+    # Operations
+    "VendorManagementAgent": "vendor_management_agent",
+    "ProcurementAgent": "procurement_agent",
+    "InternalToolingAgent": "internal_tooling_agent",
 
-# Marketing & Growth
-from .market_research_agent import MarketResearchAgent
-from .brand_agent import BrandAgent
-from .seo_agent import SEOAgent
-from .paid_acquisition_agent import PaidAcquisitionAgent
-from .lifecycle_crm_agent import LifecycleCRMAgent
-from .social_media_agent import SocialMediaAgent
-from .pr_comms_agent import PRCommsAgent
-from .creative_production_agent import CreativeProductionAgent
+    # Finance & Accounting
+    "BookkeepingAgent": "bookkeeping_agent",
+    "InvoicingARAgent": "invoicing_ar_agent",
+    "AccountsPayableAgent": "accounts_payable_agent",
+    "RevenueOpsAgent": "revenue_ops_agent",
+    "TaxAgent": "tax_agent",
+    "FraudDetectionAgent": "fraud_detection_agent",
 
-# Sales
-from .lead_enrichment_agent import LeadEnrichmentAgent
-from .prospecting_agent import ProspectingAgent
-from .sdr_qualification_agent import SDRQualificationAgent
-from .sales_ops_agent import SalesOpsAgent
-from .deal_desk_agent import DealDeskAgent
-from .sales_enablement_agent import SalesEnablementAgent
-from .partner_channel_agent import PartnerChannelAgent
+    # Legal, Compliance, Risk
+    "ContractAgent": "contract_agent",
+    "PolicyAgent": "policy_agent",
+    "IntellectualPropertyAgent": "intellectual_property_agent",
+    "RegulatoryAgent": "regulatory_agent",
+    "RiskAgent": "risk_agent",
 
-# Customer Success & Support
-from .onboarding_agent import OnboardingAgent
-from .support_triage_agent import SupportTriageAgent
-from .support_resolution_agent import SupportResolutionAgent
-from .knowledge_base_agent import KnowledgeBaseAgent
-from .churn_prevention_agent import ChurnPreventionAgent
-from .voice_of_customer_agent import VoiceOfCustomerAgent
-from .community_agent import CommunityAgent
+    # People (HR) & Talent
+    "RecruitingAgent": "recruiting_agent",
+    "InterviewLoopAgent": "interview_loop_agent",
+    "PerformanceAgent": "performance_agent",
+    "LearningDevelopmentAgent": "learning_development_agent",
+    "CompensationBenefitsAgent": "compensation_benefits_agent",
 
-# Operations
-from .vendor_management_agent import VendorManagementAgent
-from .procurement_agent import ProcurementAgent
-from .internal_tooling_agent import InternalToolingAgent
+    # Security
+    "AccessControlAgent": "access_control_agent",
+    "VulnerabilityManagementAgent": "vulnerability_management_agent",
+    "IncidentResponseAgent": "incident_response_agent",
+    "SecureSDLCAgent": "secure_sdlc_agent",
+}
 
-# Finance & Accounting
-from .bookkeeping_agent import BookkeepingAgent
-from .invoicing_ar_agent import InvoicingARAgent
-from .accounts_payable_agent import AccountsPayableAgent
-from .revenue_ops_agent import RevenueOpsAgent
-from .tax_agent import TaxAgent
-from .fraud_detection_agent import FraudDetectionAgent
 
-# Legal, Compliance, Risk
-from .contract_agent import ContractAgent
-from .policy_agent import PolicyAgent
-from .intellectual_property_agent import IntellectualPropertyAgent
-from .regulatory_agent import RegulatoryAgent
-from .risk_agent import RiskAgent
+def __getattr__(name: str) -> Any:
+    module = SPECIALIST_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
-# People (HR) & Talent
-from .recruiting_agent import RecruitingAgent
-from .interview_loop_agent import InterviewLoopAgent
-from .performance_agent import PerformanceAgent
-from .learning_development_agent import LearningDevelopmentAgent
-from .compensation_benefits_agent import CompensationBenefitsAgent
 
-# Security
-from .access_control_agent import AccessControlAgent
-from .vulnerability_management_agent import VulnerabilityManagementAgent
-from .incident_response_agent import IncidentResponseAgent
-from .secure_sdlc_agent import SecureSDLCAgent
+def __dir__() -> list[str]:
+    return sorted([*globals(), *SPECIALIST_MODULES])
 
 
 __all__ = [
@@ -0,0 +1,50 @@
+"""
+Proto Compaction Module - keeps agent conversations under the context limit.
+
+Usage:
+    from computer_use_demo.compaction import ContextCompactor
+
+    compactor = ContextCompactor(token_budget=120_000)
+
+    # Before every API call
+    messages = compactor.maybe_compact(messages)
+
+    # After every response
+    usage = response.usage
+    compactor.record_usage(
+        usage.input_tokens, usage.cache_read_input_tokens, usage.cache_creation_input_tokens
+    )
+
+    # On request_too_large errors
+    messages = compactor.compact(messages)
+
+    # Screenshots: index new messages, then drop all but the newest 3
+    images = ImageIndex(mode="thumbnail")
+    images.sync(messages)
+    images.prune(images_to_keep=3)
+
+Compaction folds the oldest turns into a rolling summary message at the
+head of the history. Token estimates are cached per message, so checking
+the budget each turn only costs the messages added since the last turn.
+The image index likewise only scans new messages, and pruning touches only
+the tool_result blocks whose screenshots are removed.
+"""
+
+from .compactor import (
+    DEFAULT_TOKEN_BUDGET,
+    ContextCompactor,
+    estimate_tokens,
+    extract_text,
+    has_tool_results,
+)
+from .images import ImageIndex, PruneMode
+
+__all__ = [
+    "DEFAULT_TOKEN_BUDGET",
+    "ContextCompactor",
+    "ImageIndex",
+    "PruneMode",
+    "estimate_tokens",
+    "extract_text",
+    "has_tool_results",
+]
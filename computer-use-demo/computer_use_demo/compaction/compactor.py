@@ -0,0 +1,261 @@
+"""
+Token-aware context compaction for the sampling loop.
+
+The compactor keeps an approximate token count for every message, cached
+by identity so that each turn only estimates the messages added since the
+previous call. When the history exceeds the token budget, the oldest
+messages are folded into a rolling summary message at the head of the
+history. The summary is extended with the newly folded turns instead of
+being rebuilt, and compaction always brings the history well below the
+budget so the (cached) prefix stays stable for many turns afterwards.
+"""
+
+import json
+from typing import Any
+
+# Rough characters-per-token ratio for English text and JSON
+CHARS_PER_TOKEN = 4
+
+# Approximate cost of one screenshot (1280x800 image ~ 1600 tokens)
+IMAGE_TOKENS = 1600
+
+# Estimated history size that triggers compaction (context window is 200k)
+DEFAULT_TOKEN_BUDGET = 120_000
+
+SUMMARY_HEADER = "Previous conversation summary:\n\n"
+
+
+def estimate_tokens(message: dict[str, Any]) -> int:
+    """Approximate the number of input tokens a message costs."""
+    return 4 + _content_tokens(message.get("content", ""))
+
+
+def _content_tokens(content: Any) -> int:
+    if isinstance(content, str):
+        return len(content) // CHARS_PER_TOKEN + 1
+    if not isinstance(content, list):
+        return 0
+
+    tokens = 0
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+        block_type = block.get("type")
+        if block_type == "text":
+            tokens += len(block.get("text", "")) // CHARS_PER_TOKEN + 1
+        elif block_type == "image":
+            tokens += IMAGE_TOKENS
+        elif block_type == "tool_use":
+            tokens += len(json.dumps(block.get("input", {}))) // CHARS_PER_TOKEN + 10
+        elif block_type == "tool_result":
+            tokens += 10 + _content_tokens(block.get("content", ""))
+        elif block_type == "thinking":
+            tokens += len(block.get("thinking") or "") // CHARS_PER_TOKEN + 1
+    return tokens
+
+
+def has_tool_results(message: dict[str, Any]) -> bool:
+    """Check if a message contains tool_result blocks."""
+    content = message.get("content", [])
+
+    if isinstance(content, list):
+        for item in content:
+            if isinstance(item, dict) and item.get("type") == "tool_result":
+                return True
+
+    return False
+
+
+def extract_text(message: dict[str, Any]) -> str:
+    """Extract text content from a message, ignoring images and tool calls."""
+    content = message.get("content", [])
+
+    if isinstance(content, str):
+        return content
+
+    if isinstance(content, list):
+        text_parts = []
+        for item in content:
+            if isinstance(item, dict):
+                if item.get("type") == "text":
+                    text_parts.append(item.get("text", ""))
+                elif item.get("type") == "tool_use":
+                    # Summarize tool use
+                    tool_name = item.get("name", "unknown")
+                    text_parts.append(f"[Used tool: {tool_name}]")
+        return " ".join(text_parts)
+
+    return ""
+
+
+class ContextCompactor:
+    """
+    Keeps a message history under a token budget with a rolling summary.
+
+    One compactor is used per sampling loop run; it remembers the summary
+    message it created and the token estimate of every message it has seen.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        target_ratio: float = 0.6,
+        keep_recent: int = 4,
+        max_summary_tokens: int = 4_000,
+        summary_chars_per_message: int = 300,
+    ):
+        """
+        Args:
+            token_budget: Compact when the history is estimated above this.
+            target_ratio: Fraction of the budget to compact down to, so the
+                next compaction is many turns away.
+            keep_recent: Messages that are never folded into the summary.
+            max_summary_tokens: Oldest summary lines are dropped beyond this.
+            summary_chars_per_message: Truncation length of a folded message.
+        """
+        self.token_budget = token_budget
+        self.target_ratio = target_ratio
+        self.keep_recent = keep_recent
+        self.max_summary_tokens = max_summary_tokens
+        self.summary_chars_per_message = summary_chars_per_message
+
+        self._summary_lines: list[str] = []
+        self._summary_message: dict[str, Any] | None = None
+        # Token estimates for the history seen last, matched by identity
+        self._seen: list[Any] = []
+        self._tokens: list[int] = []
+        self._reported_tokens: int | None = None
+
+    # ==================== Accounting ====================
+
+    def message_tokens(self, messages: list[Any]) -> list[int]:
+        """Per-message token estimates, only estimating messages not seen before."""
+        common = 0
+        for old, new in zip(self._seen, messages):
+            if old is not new:
+                break
+            common += 1
+
+        del self._seen[common:], self._tokens[common:]
+        for message in messages[common:]:
+            self._seen.append(message)
+            self._tokens.append(estimate_tokens(message))
+        return self._tokens
+
+    def total_tokens(self, messages: list[Any]) -> int:
+        """Estimated input tokens of the whole history."""
+        return sum(self.message_tokens(messages))
+
+    def record_usage(
+        self,
+        input_tokens: Any,
+        cache_read_input_tokens: Any = None,
+        cache_creation_input_tokens: Any = None,
+    ) -> None:
+        """
+        Remember the input token count the API reported for the last request.
+
+        With prompt caching, ``input_tokens`` only counts the uncached part of
+        the prompt, so the cache read and cache creation counts are added.
+        """
+        if not isinstance(input_tokens, int):
+            return
+        self._reported_tokens = input_tokens + sum(
+            count
+            for count in (cache_read_input_tokens, cache_creation_input_tokens)
+            if isinstance(count, int)
+        )
+
+    # ==================== Compaction ====================
+
+    def maybe_compact(self, messages: list[Any]) -> list[Any]:
+        """Compact ``messages`` if they are over the token budget."""
+        estimated = self.total_tokens(messages)
+        actual = max(estimated, self._reported_tokens or 0)
+        if actual <= self.token_budget:
+            return messages
+        # The API count also covers system prompt and tools; scale the target
+        # so that the estimate-based folding lands under budget for real
+        target = self.token_budget * self.target_ratio * estimated / actual
+        return self.compact(messages, int(target))
+
+    def compact(self, messages: list[Any], target_tokens: int | None = None) -> list[Any]:
+        """
+        Fold the oldest messages into the rolling summary.
+
+        Messages are folded until the history is estimated at or below
+        ``target_tokens`` (default: half of the current estimate), never
+        touching the last ``keep_recent`` messages and never separating a
+        tool_result from the tool_use it answers.
+
+        Returns:
+            The compacted history (a new list), or ``messages`` unchanged
+            if nothing could be folded.
+        """
+        tokens = self.message_tokens(messages)
+        total = before = sum(tokens)
+        if target_tokens is None:
+            target_tokens = total // 2
+
+        start = 0
+        if messages and messages[0] is self._summary_message:
+            start = 1
+        elif messages and not self._summary_lines and self._adopt_summary(messages[0]):
+            start = 1  # History compacted by an earlier run
+        limit = max(len(messages) - self.keep_recent, start)
+
+        # Fold messages until under target, counting what the summary grows
+        # by, and only cut where no kept tool_result loses its tool_use
+        new_lines: list[str] = []
+        cut, folded_lines = start, 0
+        for index in range(start, limit):
+            total -= tokens[index]
+            line = self._summary_line(messages[index])
+            if line:
+                new_lines.append(line)
+                total += len(line) // CHARS_PER_TOKEN + 1
+            if index + 1 < len(messages) and has_tool_results(messages[index + 1]):
+                continue
+            cut, folded_lines = index + 1, len(new_lines)
+            if total <= target_tokens:
+                break
+        if cut == start:
+            return messages
+
+        self._summary_lines.extend(new_lines[:folded_lines])
+        self._trim_summary()
+
+        self._summary_message = {
+            "role": "user",
+            "content": [{"type": "text", "text": SUMMARY_HEADER + "\n".join(self._summary_lines)}],
+        }
+        compacted = [self._summary_message, *messages[cut:]]
+        self._reported_tokens = None
+
+        print(f"[Compact] Reduced {len(messages)} messages to {len(compacted)} messages "
+              f"(~{before} -> ~{self.total_tokens(compacted)} tokens)")
+        return compacted
+
+    def _summary_line(self, message: dict[str, Any]) -> str | None:
+        text = extract_text(message)
+        if not text or text.startswith("[Used tool:"):
+            return None
+        role_label = "User" if message["role"] == "user" else "Assistant"
+        # Truncate long messages
+        if len(text) > self.summary_chars_per_message:
+            text = text[: self.summary_chars_per_message] + "..."
+        return f"{role_label}: {text}"
+
+    def _adopt_summary(self, message: dict[str, Any]) -> bool:
+        text = extract_text(message) if message.get("role") == "user" else ""
+        if not text.startswith(SUMMARY_HEADER):
+            return False
+        self._summary_lines = text[len(SUMMARY_HEADER):].split("\n")
+        self._summary_message = message
+        return True
+
+    def _trim_summary(self) -> None:
+        max_chars = self.max_summary_tokens * CHARS_PER_TOKEN
+        size = sum(len(line) + 1 for line in self._summary_lines)
+        while size > max_chars and len(self._summary_lines) > 1:
+            size -= len(self._summary_lines.pop(0)) + 1
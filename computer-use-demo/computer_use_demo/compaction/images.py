@@ -0,0 +1,149 @@
+"""
+Index of screenshot locations in a message history.
+
+Screenshots arrive as image blocks inside tool_result blocks. Instead of
+walking every message and tool_result on each turn to count and strip
+them, ``ImageIndex`` records where each image lives as messages are
+appended, oldest first. Pruning then pops the oldest entries and only
+touches the tool_result blocks that hold them.
+
+Pruned screenshots can be dropped (the previous behaviour), swapped for a
+downscaled thumbnail (needs Pillow), or swapped for a short text
+reference carrying the screenshot's hash.
+"""
+
+import base64
+import hashlib
+from collections import deque
+from io import BytesIO
+from typing import Any, Literal
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+PruneMode = Literal["drop", "thumbnail", "reference"]
+
+THUMBNAIL_SIZE = (320, 200)
+
+
+class ImageIndex:
+    """Locations of tool_result images in a message history, oldest first."""
+
+    def __init__(self, mode: PruneMode = "drop"):
+        """
+        Args:
+            mode: What pruned screenshots become: nothing ("drop"), a small
+                thumbnail ("thumbnail", falls back to "reference" without
+                Pillow) or a text reference with the image hash ("reference").
+        """
+        if mode == "thumbnail" and not PIL_AVAILABLE:
+            mode = "reference"
+        self.mode = mode
+        self._messages: list[Any] = []
+        self._entries: deque[tuple[dict[str, Any], dict[str, Any]]] = deque()
+        # Thumbnails this index put in place of pruned images, by id, so they
+        # aren't pruned again; only those still in the history are kept
+        self._replacements: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, messages: list[Any]) -> None:
+        """
+        Index messages appended since the last call.
+
+        If the history was rewritten instead of extended (e.g. compacted),
+        it is indexed again from scratch.
+        """
+        seen = len(self._messages)
+        previous: dict[int, dict[str, Any]] = {}
+        if seen > len(messages) or (seen and messages[seen - 1] is not self._messages[-1]):
+            self._messages.clear()
+            self._entries.clear()
+            previous, self._replacements = self._replacements, {}
+            seen = 0
+        for message in messages[seen:]:
+            self._add(message, previous)
+
+    def _add(self, message: Any, previous: dict[int, dict[str, Any]] | None = None) -> None:
+        self._messages.append(message)
+        content = message.get("content") if isinstance(message, dict) else None
+        if not isinstance(content, list):
+            return
+        for block in content:
+            if not isinstance(block, dict) or block.get("type") != "tool_result":
+                continue
+            items = block.get("content")
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict) or item.get("type") != "image":
+                    continue
+                if previous and previous.get(id(item)) is item:
+                    self._replacements[id(item)] = item  # Survived the rewrite
+                elif id(item) not in self._replacements:
+                    self._entries.append((block, item))
+
+    def prune(self, images_to_keep: int, min_removal_threshold: int = 1) -> int:
+        """
+        Remove all but the newest ``images_to_keep`` images, in place.
+
+        Images are removed in multiples of ``min_removal_threshold`` to
+        reduce how often the implicit prompt cache is broken.
+
+        Returns:
+            Number of images removed
+        """
+        images_to_remove = len(self._entries) - images_to_keep
+        if min_removal_threshold > 1:
+            images_to_remove -= images_to_remove % min_removal_threshold
+        if images_to_remove <= 0:
+            return 0
+
+        by_block: dict[int, tuple[dict[str, Any], set[int]]] = {}
+        for _ in range(images_to_remove):
+            block, item = self._entries.popleft()
+            by_block.setdefault(id(block), (block, set()))[1].add(id(item))
+
+        for block, removed in by_block.values():
+            new_content = []
+            for item in block["content"]:
+                if id(item) not in removed:
+                    new_content.append(item)
+                elif (replacement := self._replacement(item)) is not None:
+                    if replacement["type"] == "image":
+                        self._replacements[id(replacement)] = replacement
+                    new_content.append(replacement)
+            block["content"] = new_content
+        return images_to_remove
+
+    def _replacement(self, image: dict[str, Any]) -> dict[str, Any] | None:
+        if self.mode == "drop":
+            return None
+        source = image.get("source", {})
+        data = source.get("data", "") if source.get("type") == "base64" else ""
+
+        if self.mode == "thumbnail" and data:
+            try:
+                with Image.open(BytesIO(base64.b64decode(data))) as img:
+                    img.thumbnail(THUMBNAIL_SIZE)
+                    buffer = BytesIO()
+                    img.convert("RGB").save(buffer, format="JPEG", quality=60)
+                return {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": "image/jpeg",
+                        "data": base64.b64encode(buffer.getvalue()).decode(),
+                    },
+                }
+            except Exception:
+                pass  # Fall back to a reference
+
+        digest = hashlib.sha256(data.encode()).hexdigest()[:12] if data else "unknown"
+        return {"type": "text", "text": f"[Earlier screenshot omitted (sha256:{digest})]"}
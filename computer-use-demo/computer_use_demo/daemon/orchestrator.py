@@ -6,16 +6,22 @@ monitoring, and recovery capabilities.
 """
 
 import asyncio
+import itertools
 import signal
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
 from ..agents import create_agent_by_name
 from ..proto_logging import get_logger
+from ..proto_logging.segments import tail_stream
 from ..planning import ProjectManager
 from .work_queue import WorkItem, WorkPriority, WorkQueue, WorkStatus
 
+# Pending items inspected per project when looking for one whose agent has a free slot
+SCAN_LIMIT = 50
+
 
 class CompanyOrchestrator:
     """
@@ -23,7 +29,10 @@ class CompanyOrchestrator:
 
     Manages the event loop that continuously:
     - Monitors work queue for pending tasks
-    - Assigns work to appropriate agents
+    - Assigns work to appropriate agents, filling up to ``max_concurrent_work``
+      worker slots with per-agent / per-project caps and fair sharing of
+      slots between projects
+    - Cancels work that exceeds its timeout
     - Handles failures and retries
     - Maintains system health
     - Persists state for recovery
@@ -36,6 +45,9 @@ class CompanyOrchestrator:
         state_path: Optional[Path] = None,
         check_interval: int = 10,
         max_concurrent_work: int = 5,
+        max_per_agent: Optional[int] = None,
+        max_per_project: Optional[int] = None,
+        work_timeout: float = 3600,
     ):
         """
         Initialize orchestrator.
@@ -45,7 +57,11 @@ class CompanyOrchestrator:
             project_manager: Project manager (creates default if None)
             state_path: Path for state persistence
             check_interval: Seconds between queue checks
-            max_concurrent_work: Maximum concurrent work items
+            max_concurrent_work: Maximum concurrent work items (worker slots)
+            max_per_agent: Maximum concurrent work items per agent (None = no cap)
+            max_per_project: Maximum concurrent work items per project (None = no cap)
+            work_timeout: Seconds before running work is cancelled and retried;
+                a work item can override it with ``context["timeout_seconds"]``
         """
         self.logger = get_logger()
 
@@ -60,10 +76,18 @@ class CompanyOrchestrator:
         self.state_path = Path(state_path)
         self.check_interval = check_interval
         self.max_concurrent_work = max_concurrent_work
+        self.max_per_agent = max_per_agent
+        self.max_per_project = max_per_project
+        self.work_timeout = work_timeout
 
         # Runtime state
         self.running = False
         self.active_work: dict[str, WorkItem] = {}  # work_id -> WorkItem
+        self._tasks: dict[str, asyncio.Task] = {}  # work_id -> execution task
+        self._cancel_requests: dict[str, tuple[str, bool]] = {}  # work_id -> (reason, requeue)
+        self._last_served: dict[Optional[str], int] = {}  # project -> dispatch sequence
+        self._dispatch_seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
         self.agent_status: dict[str, dict[str, Any]] = {}  # agent_name -> status
         self.stats = {
             "started_at": None,
@@ -96,6 +120,7 @@ class CompanyOrchestrator:
 
         self.running = True
         self.stats["started_at"] = datetime.now().isoformat()
+        self._wakeup = asyncio.Event()
 
         self.logger.log_event(
             event_type="orchestrator_started",
@@ -103,6 +128,8 @@ class CompanyOrchestrator:
             data={
                 "check_interval": self.check_interval,
                 "max_concurrent": self.max_concurrent_work,
+                "max_per_agent": self.max_per_agent,
+                "max_per_project": self.max_per_project,
             },
         )
 
@@ -125,6 +152,7 @@ class CompanyOrchestrator:
     def stop(self):
         """Stop the orchestrator."""
         self.running = False
+        self._wake()
         self.logger.log_event(
             event_type="orchestrator_stopped",
             session_id="orchestrator",
@@ -133,29 +161,34 @@ class CompanyOrchestrator:
 
     async def _run_event_loop(self):
         """Main event loop for continuous operation."""
+        loop = asyncio.get_running_loop()
         loop_count = 0
+        next_check = loop.time()
 
         while self.running:
             try:
-                # 1. Check work queue for pending work
+                # 1. Fill free worker slots with pending work
                 await self._process_work_queue()
 
-                # 2. Monitor active work
-                await self._monitor_active_work()
+                if loop.time() >= next_check:
+                    next_check = loop.time() + self.check_interval
 
-                # 3. Perform health checks
-                await self._health_check()
+                    # 2. Monitor active work (timeouts)
+                    await self._monitor_active_work()
 
-                # 4. Background self-improvement (every 10 loops = ~100 seconds)
-                loop_count += 1
-                if loop_count % 10 == 0:
-                    await self._background_self_improvement()
+                    # 3. Perform health checks
+                    await self._health_check()
 
-                # 5. Save state
-                await self._save_state()
+                    # 4. Background self-improvement (every 10 checks = ~100 seconds)
+                    loop_count += 1
+                    if loop_count % 10 == 0:
+                        await self._background_self_improvement()
 
-                # 6. Sleep before next iteration
-                await asyncio.sleep(self.check_interval)
+                    # 5. Save state
+                    await self._save_state()
+
+                # 6. Sleep until the next check, or until a slot frees up / work arrives
+                await self._wait_for_wakeup(next_check - loop.time())
 
             except Exception as e:
                 self.logger.log_event(
@@ -166,34 +199,86 @@ class CompanyOrchestrator:
                 # Continue running on errors
                 await asyncio.sleep(self.check_interval)
 
-    async def _process_work_queue(self):
-        """Process pending work from queue."""
-        # Check if we can take more work
-        if len(self.active_work) >= self.max_concurrent_work:
-            return
+    def _wake(self):
+        """Make the event loop run a scheduling pass now."""
+        if self._wakeup is not None:
+            self._wakeup.set()
 
-        # Get next work item
-        work_item = self.work_queue.get_next_work()
-        if not work_item:
+    async def _wait_for_wakeup(self, timeout: float):
+        """Sleep for ``timeout`` seconds or until ``_wake`` is called."""
+        if self._wakeup is None:
+            await asyncio.sleep(max(timeout, 0))
             return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
 
-        # Determine which agent to assign
-        agent_name = await self._select_agent_for_work(work_item)
-        if not agent_name:
-            self.logger.log_event(
-                event_type="no_agent_available",
-                session_id="orchestrator",
-                data={"work_id": work_item.id},
-            )
-            return
+    async def _process_work_queue(self):
+        """Process pending work from queue until all worker slots are busy."""
+        while len(self.active_work) < self.max_concurrent_work:
+            choice = await self._pick_next_work()
+            if choice is None:
+                return
+            work_item, agent_name = choice
+            self._dispatch_work(work_item, agent_name)
+
+    async def _pick_next_work(self) -> Optional[tuple[WorkItem, str]]:
+        """
+        Choose the next work item to start, respecting concurrency caps.
+
+        Each project with pending work offers its best item whose agent has
+        a free slot. Among those, the project with the fewest running items
+        wins, then the one served longest ago, then the higher priority, so
+        busy high-priority projects cannot starve the others.
 
-        # Assign and start work
+        Returns:
+            (work item, agent name), or None if nothing can be started
+        """
+        running_agents = Counter(item.assigned_agent for item in self.active_work.values())
+        running_projects = Counter(item.project_name for item in self.active_work.values())
+
+        best = None
+        for project in self.work_queue.get_pending_projects():
+            if self.max_per_project and running_projects[project] >= self.max_per_project:
+                continue
+
+            candidates = itertools.islice(self.work_queue.iter_project_work(project), SCAN_LIMIT)
+            for work_item in candidates:
+                # Determine which agent to assign
+                agent_name = await self._select_agent_for_work(work_item)
+                if not agent_name:
+                    self.logger.log_event(
+                        event_type="no_agent_available",
+                        session_id="orchestrator",
+                        data={"work_id": work_item.id},
+                    )
+                    continue
+                if self.max_per_agent and running_agents[agent_name] >= self.max_per_agent:
+                    continue
+
+                rank = (
+                    running_projects[project],
+                    self._last_served.get(project, -1),
+                    -work_item.priority.value_score(),
+                    work_item.created_at,
+                )
+                if best is None or rank < best[0]:
+                    best = (rank, work_item, agent_name)
+                break
+
+        return (best[1], best[2]) if best else None
+
+    def _dispatch_work(self, work_item: WorkItem, agent_name: str):
+        """Assign work to an agent and start executing it in the background."""
         self.work_queue.mark_assigned(work_item.id, agent_name)
         self.work_queue.mark_in_progress(work_item.id)
         self.active_work[work_item.id] = work_item
+        self._last_served[work_item.project_name] = next(self._dispatch_seq)
 
         # Execute work asynchronously
-        asyncio.create_task(self._execute_work(work_item, agent_name))
+        self._tasks[work_item.id] = asyncio.create_task(self._execute_work(work_item, agent_name))
 
         self.logger.log_event(
             event_type="work_dispatched",
@@ -257,6 +342,25 @@ class CompanyOrchestrator:
                 data={"work_id": work_item.id, "agent": agent_name},
             )
 
+        except asyncio.CancelledError:
+            reason, requeue = self._cancel_requests.pop(work_item.id, ("Work interrupted", True))
+            if requeue:
+                self.work_queue.mark_failed(work_item.id, reason, retry=True)
+                self.stats["total_work_failed"] += 1
+            else:
+                self.work_queue.mark_cancelled(work_item.id, reason)
+
+            self.logger.log_event(
+                event_type="work_execution_cancelled",
+                session_id="orchestrator",
+                data={
+                    "work_id": work_item.id,
+                    "agent": agent_name,
+                    "reason": reason,
+                    "requeued": requeue,
+                },
+            )
+
         except Exception as e:
             # Mark failed (with retry)
             error_msg = str(e)
@@ -274,9 +378,11 @@ class CompanyOrchestrator:
             )
 
         finally:
-            # Remove from active work
-            if work_item.id in self.active_work:
-                del self.active_work[work_item.id]
+            # Remove from active work and let the loop refill the slot
+            self.active_work.pop(work_item.id, None)
+            self._tasks.pop(work_item.id, None)
+            self._cancel_requests.pop(work_item.id, None)
+            self._wake()
 
     async def _run_agent_on_work(self, agent: Any, work_item: WorkItem) -> str:
         """
@@ -299,29 +405,23 @@ class CompanyOrchestrator:
         return f"Work completed by {agent.name}: {work_item.description}"
 
     async def _monitor_active_work(self):
-        """Monitor active work for stuck items."""
-        from datetime import datetime, timedelta
-
+        """Monitor active work and cancel items that exceeded their timeout."""
         now = datetime.now()
-        timeout = timedelta(hours=1)  # 1 hour timeout
 
         for work_id, work_item in list(self.active_work.items()):
-            if not work_item.started_at:
+            if not work_item.started_at or work_id in self._cancel_requests:
                 continue
 
             started = datetime.fromisoformat(work_item.started_at)
             elapsed = now - started
+            timeout = work_item.context.get("timeout_seconds", self.work_timeout)
 
-            if elapsed > timeout:
-                # Work item is stuck - mark as failed
-                self.work_queue.mark_failed(
-                    work_id,
-                    f"Work timed out after {elapsed.total_seconds():.0f}s",
-                    retry=True,
-                )
-
-                if work_id in self.active_work:
-                    del self.active_work[work_id]
+            if elapsed.total_seconds() > timeout:
+                # Work item is stuck - cancel it; _execute_work requeues it
+                reason = f"Work timed out after {elapsed.total_seconds():.0f}s"
+                if not self._cancel_task(work_id, reason, requeue=True):
+                    self.work_queue.mark_failed(work_id, reason, retry=True)
+                    self.active_work.pop(work_id, None)
 
                 self.logger.log_event(
                     event_type="work_timeout",
@@ -329,6 +429,35 @@ class CompanyOrchestrator:
                     data={"work_id": work_id, "elapsed_seconds": elapsed.total_seconds()},
                 )
 
+    def _cancel_task(self, work_id: str, reason: str, requeue: bool) -> bool:
+        """Cancel the running task of a work item; False if it has none."""
+        task = self._tasks.get(work_id)
+        if task is None or task.done():
+            return False
+        self._cancel_requests[work_id] = (reason, requeue)
+        task.cancel()
+        return True
+
+    def cancel_work(self, work_id: str, reason: str = "Cancelled by user") -> bool:
+        """
+        Cancel a work item, whether it is running or still pending.
+
+        Args:
+            work_id: Work item ID
+            reason: Reason recorded on the work item
+
+        Returns:
+            True if the item was running or pending
+        """
+        if self._cancel_task(work_id, reason, requeue=False):
+            return True
+
+        work_item = self.work_queue.get_work_by_id(work_id)
+        if work_item is None or work_item.status != WorkStatus.PENDING:
+            return False
+        self.work_queue.mark_cancelled(work_id, reason)
+        return True
+
     async def _health_check(self):
         """Perform health checks on system."""
         self.stats["last_health_check"] = datetime.now().isoformat()
@@ -414,6 +543,13 @@ class CompanyOrchestrator:
 
     async def _cleanup(self):
         """Cleanup on shutdown."""
+        # Stop running work; it is requeued for the next start
+        tasks = list(self._tasks.values())
+        for work_id in list(self._tasks):
+            self._cancel_task(work_id, "Orchestrator stopped", requeue=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
         # Save final state
         await self._save_state()
 
@@ -448,13 +584,15 @@ class CompanyOrchestrator:
         Returns:
             Created work item
         """
-        return self.work_queue.add_work(
+        work_item = self.work_queue.add_work(
             description=description,
             priority=priority,
             project_name=project_name,
             assigned_agent=assigned_agent,
             context=context,
         )
+        self._wake()
+        return work_item
 
     def get_stats(self) -> dict[str, Any]:
         """Get orchestrator statistics."""
@@ -464,6 +602,7 @@ class CompanyOrchestrator:
             "running": self.running,
             "started_at": self.stats["started_at"],
             "active_work_count": len(self.active_work),
+            "max_concurrent_work": self.max_concurrent_work,
             "work_queue": queue_summary,
             "total_completed": self.stats["total_work_completed"],
             "total_failed": self.stats["total_work_failed"],
@@ -530,25 +669,8 @@ class CompanyOrchestrator:
         - Successful task completions (→ best_practice)
         """
         try:
-            import json
-            from pathlib import Path
-            from collections import Counter
-
-            # Read recent session logs
-            log_file = Path("logs/proto_sessions.jsonl")
-            if not log_file.exists():
-                return
-
-            # Analyze last 100 lines
-            recent_events = []
-            with open(log_file, "r") as f:
-                lines = f.readlines()
-                for line in lines[-100:]:
-                    try:
-                        event = json.loads(line)
-                        recent_events.append(event)
-                    except:
-                        continue
+            # Last 100 entries, including rotated segments
+            recent_events = tail_stream(self.logger.log_dir, "proto_sessions", 100)
 
             # Extract tool usage patterns
             tool_sequences = []
@@ -599,24 +721,8 @@ class CompanyOrchestrator:
         Helps system learn which errors are common and how to prevent them.
         """
         try:
-            import json
-            from pathlib import Path
-            from collections import Counter
-
-            error_log = Path("logs/proto_errors.jsonl")
-            if not error_log.exists():
-                return
-
-            # Read recent errors
-            recent_errors = []
-            with open(error_log, "r") as f:
-                lines = f.readlines()
-                for line in lines[-50:]:  # Last 50 errors
-                    try:
-                        event = json.loads(line)
-                        recent_errors.append(event)
-                    except:
-                        continue
+            # Last 50 errors, including rotated segments
+            recent_errors = tail_stream(self.logger.log_dir, "proto_errors", 50)
 
             if not recent_errors:
                 return
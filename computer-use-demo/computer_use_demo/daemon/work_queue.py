@@ -4,7 +4,11 @@ Work Queue System for Continuous Multi-Agent Operation.
 Provides priority-based work queue with persistence for autonomous task processing.
 """
 
+import heapq
+import itertools
 import json
+import os
+from collections.abc import Iterator
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -13,6 +17,16 @@ from uuid import uuid4
 
 from ..proto_logging import get_logger
 
+# Journal records after which the queue is re-snapshotted
+SNAPSHOT_EVERY = 1000
+
+# Heap key components meaning "no filter" and "item has no project"
+_ANY = ""
+_NO_PROJECT = "\x00"
+
+# Stale entries a heap may hold beyond its live ones before it is rebuilt
+_HEAP_SLACK = 16
+
 
 class WorkStatus(str, Enum):
     """Status of a work item."""
@@ -151,14 +165,21 @@ class WorkQueue:
 
     Manages work items for autonomous agent execution with priority ordering
     and persistent storage.
+
+    Pending items are indexed by lazily-cleaned priority heaps, one per
+    (agent, project) filter combination, so ``get_next_work`` is O(log n)
+    amortized. Every state change is appended to a journal next to the
+    snapshot file; the journal is folded into a new snapshot every
+    ``snapshot_every`` records.
     """
 
-    def __init__(self, queue_path: Optional[Path] = None):
+    def __init__(self, queue_path: Optional[Path] = None, snapshot_every: int = SNAPSHOT_EVERY):
         """
         Initialize work queue.
 
         Args:
             queue_path: Path to queue storage file (defaults to .proto/daemon/work_queue.json)
+            snapshot_every: Journal records after which a new snapshot is written
         """
         self.logger = get_logger()
 
@@ -169,44 +190,246 @@ class WorkQueue:
 
         self.queue_path = Path(queue_path)
         self.queue_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.queue_path.with_suffix(".journal.jsonl")
+        self.snapshot_every = snapshot_every
 
         self.items: dict[str, WorkItem] = {}
+        # Ids by status, as insertion-ordered dicts (values unused)
+        self._by_status: dict[WorkStatus, dict[str, None]] = {status: {} for status in WorkStatus}
+        self._heaps: dict[tuple[str, str], list[tuple[int, str, int, str]]] = {}
+        # Valid entries per heap, and the heaps each pending item is in
+        self._live: dict[tuple[str, str], int] = {}
+        self._heap_keys_of: dict[str, list[tuple[str, str]]] = {}
+        self._versions: dict[str, int] = {}
+        self._pending_projects: dict[Optional[str], set[str]] = {}
+        self._pending_project_of: dict[str, Optional[str]] = {}
+        self._seq = itertools.count()
+        self._journal_offset = 0
+        self._journal_records = 0
         self._load_queue()
 
-    def _load_queue(self):
-        """Load queue from disk."""
-        if not self.queue_path.exists():
+    # ==================== Indexes ====================
+
+    def _index(self, item: WorkItem):
+        """(Re)index an item after it was added or changed."""
+        self._unindex(item.id)
+        self._by_status[item.status][item.id] = None
+
+        # Bumping the version invalidates the item's previous heap entries
+        version = next(self._seq)
+        self._versions[item.id] = version
+        if item.status != WorkStatus.PENDING:
             return
 
-        try:
-            with open(self.queue_path, "r") as f:
-                data = json.load(f)
+        self._pending_projects.setdefault(item.project_name, set()).add(item.id)
+        self._pending_project_of[item.id] = item.project_name
+        entry = (-item.priority.value_score(), item.created_at, version, item.id)
+        keys = self._heap_keys(item.assigned_agent, item.project_name, all_combinations=True)
+        self._heap_keys_of[item.id] = keys
+        for key in keys:
+            heapq.heappush(self._heaps.setdefault(key, []), entry)
+            self._live[key] = self._live.get(key, 0) + 1
+
+    def _unindex(self, work_id: str):
+        for ids in self._by_status.values():
+            ids.pop(work_id, None)
+        self._versions.pop(work_id, None)
+        for key in self._heap_keys_of.pop(work_id, ()):
+            self._live[key] -= 1
+            self._compact(key)
+        if work_id in self._pending_project_of:
+            project = self._pending_project_of.pop(work_id)
+            self._pending_projects[project].discard(work_id)
+            if not self._pending_projects[project]:
+                del self._pending_projects[project]
+
+    @staticmethod
+    def _heap_keys(
+        agent_name: Optional[str], project_name: Optional[str], all_combinations: bool = False
+    ) -> list[tuple[str, str]]:
+        """
+        Heap keys for a filter (or, with ``all_combinations``, every filter
+        an item with these fields must be visible to).
+        """
+        agent, project = agent_name or _ANY, project_name or _ANY
+        if not all_combinations:
+            return [(agent, project)]
+        keys = {(_ANY, _ANY), (agent, _ANY), (_ANY, project), (agent, project)}
+        if not project_name:
+            keys.add((_ANY, _NO_PROJECT))
+        return list(keys)
+
+    def _is_valid(self, entry: tuple[int, str, int, str]) -> bool:
+        _, _, version, work_id = entry
+        return self._versions.get(work_id) == version
+
+    def _compact(self, key: tuple[str, str]):
+        """
+        Rebuild a heap once most of its entries are stale.
+
+        Stale entries are otherwise only popped off the top, so heaps that
+        are never peeked would keep every entry ever pushed. Rebuilding when
+        stale entries outnumber live ones keeps each heap within twice its
+        live size at amortized O(1) cost per stale entry.
+        """
+        heap = self._heaps.get(key)
+        if heap is None:
+            return
+        live = self._live[key]
+        if not live:
+            del self._heaps[key]
+            del self._live[key]
+        elif len(heap) > 2 * live + _HEAP_SLACK:
+            heap[:] = [entry for entry in heap if self._is_valid(entry)]
+            heapq.heapify(heap)
+
+    def _peek(self, key: tuple[str, str]) -> Optional[WorkItem]:
+        """Top valid entry of a heap, discarding stale entries on the way."""
+        heap = self._heaps.get(key)
+        while heap:
+            if self._is_valid(heap[0]):
+                return self.items[heap[0][3]]
+            heapq.heappop(heap)
+        return None
+
+    def _iter_heap(self, key: tuple[str, str]) -> Iterator[WorkItem]:
+        """
+        Valid entries of a heap in priority order, without popping them.
+
+        Walks the heap array best-first, so reading the first k items
+        costs O(k log k) regardless of the heap size. Stale entries on top
+        are popped first; ``_compact`` bounds the ones further down.
+        """
+        if self._peek(key) is None:
+            return
+        heap = self._heaps[key]
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, index = heapq.heappop(frontier)
+            if self._is_valid(entry):
+                yield self.items[entry[3]]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    # ==================== Persistence ====================
+
+    def _load_queue(self):
+        """Load the snapshot from disk and replay the journal on top."""
+        if self.queue_path.exists():
+            try:
+                with open(self.queue_path, "r") as f:
+                    data = json.load(f)
                 for item_data in data.get("items", []):
                     item = WorkItem.from_dict(item_data)
                     self.items[item.id] = item
-
+            except Exception as e:
+                self.logger.log_event(
+                    event_type="work_queue_load_error",
+                    session_id="work-queue",
+                    data={"error": str(e)},
+                )
+
+        self._replay_journal()
+        for item in self.items.values():
+            self._index(item)
+
+        if self.items:
             self.logger.log_event(
                 event_type="work_queue_loaded",
                 session_id="work-queue",
-                data={"count": len(self.items)},
+                data={"count": len(self.items), "journal_records": self._journal_records},
             )
+
+    def _replay_journal(self) -> list[str]:
+        """
+        Apply journal records written after ``_journal_offset``.
+
+        Records may come from other WorkQueue instances sharing the file.
+        A torn last record (crash mid-write) is left for the next replay.
+
+        Returns:
+            IDs of the items that were touched
+        """
+        touched = []
+        try:
+            with open(self.journal_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self._journal_offset:
+                    self._journal_offset = 0  # Another instance wrote a snapshot
+                f.seek(self._journal_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    self._journal_offset += len(line)
+                    try:
+                        record = json.loads(line)
+                        if record["op"] == "put":
+                            item = WorkItem.from_dict(record["item"])
+                            if item.id in self.items:
+                                # Keep object identity for callers holding the item
+                                vars(self.items[item.id]).update(vars(item))
+                            else:
+                                self.items[item.id] = item
+                            touched.append(item.id)
+                        elif record["op"] == "remove":
+                            self.items.pop(record["id"], None)
+                            touched.append(record["id"])
+                    except (json.JSONDecodeError, KeyError, ValueError):
+                        continue
+                    self._journal_records += 1
+        except FileNotFoundError:
+            pass
+        return touched
+
+    def _append_journal(self, records: list[dict[str, Any]]):
+        """Append state-transition records; snapshot when the journal is long."""
+        try:
+            with open(self.journal_path, "ab") as f:
+                payload = "".join(json.dumps(r) + "\n" for r in records).encode()
+                f.write(payload)
+                if f.tell() == self._journal_offset + len(payload):
+                    # Nobody else appended in between: no need to replay ourselves
+                    self._journal_offset = f.tell()
+            self._journal_records += len(records)
         except Exception as e:
             self.logger.log_event(
-                event_type="work_queue_load_error",
+                event_type="work_queue_save_error",
                 session_id="work-queue",
                 data={"error": str(e)},
             )
+            return
+
+        if self._journal_records >= self.snapshot_every:
+            self._save_queue()
+
+    def _record(self, item: WorkItem):
+        """Persist the current state of one item."""
+        self._append_journal([{"op": "put", "item": item.to_dict()}])
 
     def _save_queue(self):
-        """Save queue to disk."""
+        """Fold the journal into a new snapshot file."""
         try:
+            # Pick up changes other instances appended since our last read
+            for work_id in self._replay_journal():
+                if work_id in self.items:
+                    self._index(self.items[work_id])
+                else:
+                    self._unindex(work_id)
+
             data = {
                 "items": [item.to_dict() for item in self.items.values()],
                 "updated_at": datetime.now().isoformat(),
             }
-
-            with open(self.queue_path, "w") as f:
-                json.dump(data, f, indent=2)
+            tmp = self.queue_path.with_suffix(".json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.queue_path)
+            # Replaying the journal over the new snapshot would be idempotent,
+            # so a crash between these two steps loses nothing
+            with open(self.journal_path, "w"):
+                pass
+            self._journal_offset = 0
+            self._journal_records = 0
 
             self.logger.log_event(
                 event_type="work_queue_saved",
@@ -250,7 +473,8 @@ class WorkQueue:
         )
 
         self.items[item.id] = item
-        self._save_queue()
+        self._index(item)
+        self._record(item)
 
         self.logger.log_event(
             event_type="work_added",
@@ -279,27 +503,9 @@ class WorkQueue:
         Returns:
             Highest priority pending work item, or None
         """
-        # Filter pending items
-        pending = [
-            item for item in self.items.values()
-            if item.status == WorkStatus.PENDING
-        ]
-
-        # Apply filters
-        if agent_name:
-            pending = [item for item in pending if item.assigned_agent == agent_name]
-        if project_name:
-            pending = [item for item in pending if item.project_name == project_name]
-
-        if not pending:
-            return None
-
-        # Sort by priority (highest first), then by creation time (oldest first)
-        pending.sort(
-            key=lambda x: (-x.priority.value_score(), x.created_at)
-        )
-
-        return pending[0]
+        # Heaps order by priority (highest first), then creation time (oldest first)
+        (key,) = self._heap_keys(agent_name, project_name)
+        return self._peek(key)
 
     def mark_assigned(self, work_id: str, agent_name: str):
         """Mark work item as assigned to agent."""
@@ -311,7 +517,8 @@ class WorkQueue:
         item.assigned_agent = agent_name
         item.updated_at = datetime.now().isoformat()
 
-        self._save_queue()
+        self._index(item)
+        self._record(item)
 
         self.logger.log_event(
             event_type="work_assigned",
@@ -329,7 +536,8 @@ class WorkQueue:
         item.started_at = datetime.now().isoformat()
         item.updated_at = item.started_at
 
-        self._save_queue()
+        self._index(item)
+        self._record(item)
 
         self.logger.log_event(
             event_type="work_started",
@@ -348,7 +556,8 @@ class WorkQueue:
         item.updated_at = item.completed_at
         item.result = result
 
-        self._save_queue()
+        self._index(item)
+        self._record(item)
 
         self.logger.log_event(
             event_type="work_completed",
@@ -396,15 +605,37 @@ class WorkQueue:
                 data={"work_id": work_id, "error": error},
             )
 
-        self._save_queue()
+        self._index(item)
+        self._record(item)
+
+    def mark_cancelled(self, work_id: str, reason: Optional[str] = None):
+        """Mark work item as cancelled (it will not be retried)."""
+        if work_id not in self.items:
+            return
+
+        item = self.items[work_id]
+        item.status = WorkStatus.CANCELLED
+        item.error = reason
+        item.updated_at = datetime.now().isoformat()
+
+        self._index(item)
+        self._record(item)
+
+        self.logger.log_event(
+            event_type="work_cancelled",
+            session_id="work-queue",
+            data={"work_id": work_id, "reason": reason},
+        )
 
     def get_work_by_id(self, work_id: str) -> Optional[WorkItem]:
         """Get work item by ID."""
         return self.items.get(work_id)
 
     def get_work_by_status(self, status: WorkStatus) -> list[WorkItem]:
-        """Get all work items with given status."""
-        return [item for item in self.items.values() if item.status == status]
+        """Get all work items with given status, oldest first."""
+        items = [self.items[work_id] for work_id in self._by_status[status]]
+        items.sort(key=lambda item: item.created_at)
+        return items
 
     def get_work_by_project(self, project_name: str) -> list[WorkItem]:
         """Get all work items for project."""
@@ -413,6 +644,19 @@ class WorkQueue:
             if item.project_name == project_name
         ]
 
+    def get_pending_projects(self) -> list[Optional[str]]:
+        """Projects that have pending work (None for work without a project)."""
+        return list(self._pending_projects)
+
+    def iter_project_work(self, project_name: Optional[str]) -> Iterator[WorkItem]:
+        """
+        Pending work of one project in priority order, lazily.
+
+        Args:
+            project_name: Project to list (None for work without a project)
+        """
+        return self._iter_heap((_ANY, project_name or _NO_PROJECT))
+
     def get_pending_work(self) -> list[WorkItem]:
         """Get all pending work items."""
         return self.get_work_by_status(WorkStatus.PENDING)
@@ -427,16 +671,12 @@ class WorkQueue:
 
         # Count by status
         for status in WorkStatus:
-            count = len([i for i in self.items.values() if i.status == status])
-            summary["by_status"][status.value] = count
+            summary["by_status"][status.value] = len(self._by_status[status])
 
         # Count by priority (pending only)
-        for priority in WorkPriority:
-            count = len([
-                i for i in self.items.values()
-                if i.status == WorkStatus.PENDING and i.priority == priority
-            ])
-            summary["by_priority"][priority.value] = count
+        summary["by_priority"] = {priority.value: 0 for priority in WorkPriority}
+        for item in self.get_pending_work():
+            summary["by_priority"][item.priority.value] += 1
 
         return summary
 
@@ -453,19 +693,17 @@ class WorkQueue:
         cutoff_iso = cutoff.isoformat()
 
         to_remove = []
-        for work_id, item in self.items.items():
-            if (
-                item.status == WorkStatus.COMPLETED
-                and item.completed_at
-                and item.completed_at < cutoff_iso
-            ):
+        for work_id in self._by_status[WorkStatus.COMPLETED]:
+            item = self.items[work_id]
+            if item.completed_at and item.completed_at < cutoff_iso:
                 to_remove.append(work_id)
 
         for work_id in to_remove:
             del self.items[work_id]
+            self._unindex(work_id)
 
         if to_remove:
-            self._save_queue()
+            self._append_journal([{"op": "remove", "id": work_id} for work_id in to_remove])
 
             self.logger.log_event(
                 event_type="work_queue_cleared",
@@ -38,9 +38,18 @@ Configuration (hooks.json):
                 "command": "npm run lint -- {{file_path}}",
                 "blocking": true,
                 "fail_behavior": "warn"
+            },
+            {
+                "event": "post_edit",
+                "command": "python ~/.claude/format_worker.py",
+                "persistent": true,
+                "blocking": false
             }
         ]
     }
+
+Non-blocking hooks run in the background from a bounded queue. Persistent
+hooks stay running and get one JSON line per invocation (see worker.py).
 """
 
 from .executor import HookExecutor, get_hook_executor
@@ -53,6 +62,7 @@ from .types import (
     HookFailBehavior,
     HookResult,
 )
+from .worker import HookWorker
 
 __all__ = [
     # Executor
@@ -61,6 +71,8 @@ __all__ = [
     # Registry
     "HookRegistry",
     "get_hook_registry",
+    # Worker
+    "HookWorker",
     # Template
     "substitute_variables",
     "extract_file_path_from_input",
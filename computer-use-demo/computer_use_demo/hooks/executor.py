@@ -2,16 +2,38 @@
 Hook executor for running hooks.
 
 Executes shell commands with proper timeout, error handling, and logging.
+
+Blocking hooks run inline, in order. Non-blocking hooks can't gate the
+tool call, so they are put on a bounded queue and run in the background,
+off the tool call's critical path, several at a time so that one slow hook
+doesn't hold up the rest; a full queue makes callers wait rather than
+dropping hooks. Persistent hooks keep one worker process per command
+(see worker.py), and queued invocations of the same worker are sent to it
+as one batch. Per-hook latency is reported by ``get_stats()``.
 """
 
 import asyncio
-import subprocess
+import os
+import signal
 import time
+from dataclasses import dataclass
 from typing import Any
 
 from .registry import HookRegistry, get_hook_registry
 from .template import extract_file_path_from_input, substitute_variables
 from .types import HookConfig, HookContext, HookEvent, HookFailBehavior, HookResult
+from .worker import HookWorker
+
+
+@dataclass
+class _HookStats:
+    """Latency and outcome counters of one hook."""
+
+    calls: int = 0
+    failures: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
 
 
 class HookExecutor:
@@ -25,9 +47,37 @@ class HookExecutor:
     - Error handling and fail behavior
     """
 
-    def __init__(self, registry: HookRegistry | None = None):
+    def __init__(
+        self,
+        registry: HookRegistry | None = None,
+        queue_size: int = 256,
+        batch_size: int = 32,
+        concurrency: int = 8,
+    ):
+        """
+        Args:
+            registry: Hook registry (default: the global registry)
+            queue_size: Non-blocking hook invocations that may wait to run
+            batch_size: Queued invocations taken (and sent to a worker) at once
+            concurrency: Queued hooks (or worker batches) running at once
+        """
         self._registry = registry or get_hook_registry()
         self._enabled = True
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+        # Background state, bound to the event loop it was created on
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[tuple[HookConfig, HookContext]] | None = None
+        self._consumer: asyncio.Task | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._running: set[asyncio.Task] = set()
+        self._workers: dict[str, HookWorker] = {}
+
+        self._stats: dict[str, _HookStats] = {}
+        self._batches = 0
+        self._largest_batch = 0
 
     def enable(self) -> None:
         """Enable hook execution."""
@@ -63,18 +113,20 @@ class HookExecutor:
         if not self._enabled:
             return True, None
 
-        context = HookContext(
-            event=HookEvent.PRE_TOOL_CALL,
+        hooks = self._registry.get_hooks_for_event(
+            HookEvent.PRE_TOOL_CALL,
             tool_name=tool_name,
             tool_input=tool_input,
-            session_id=session_id,
-            file_path=extract_file_path_from_input(tool_input),
         )
+        if not hooks:
+            return True, None
 
-        hooks = self._registry.get_hooks_for_event(
-            HookEvent.PRE_TOOL_CALL,
+        context = HookContext(
+            event=HookEvent.PRE_TOOL_CALL,
             tool_name=tool_name,
             tool_input=tool_input,
+            session_id=session_id,
+            file_path=extract_file_path_from_input(tool_input),
         )
 
         for hook in hooks:
@@ -107,6 +159,14 @@ class HookExecutor:
         if not self._enabled:
             return
 
+        hooks = self._registry.get_hooks_for_event(
+            HookEvent.POST_TOOL_CALL,
+            tool_name=tool_name,
+            tool_input=tool_input,
+        )
+        if not hooks:
+            return
+
         context = HookContext(
             event=HookEvent.POST_TOOL_CALL,
             tool_name=tool_name,
@@ -116,12 +176,6 @@ class HookExecutor:
             file_path=extract_file_path_from_input(tool_input),
         )
 
-        hooks = self._registry.get_hooks_for_event(
-            HookEvent.POST_TOOL_CALL,
-            tool_name=tool_name,
-            tool_input=tool_input,
-        )
-
         for hook in hooks:
             await self._execute_hook(hook, context)
 
@@ -144,6 +198,14 @@ class HookExecutor:
         if not self._enabled:
             return
 
+        hooks = self._registry.get_hooks_for_event(
+            HookEvent.ON_TOOL_ERROR,
+            tool_name=tool_name,
+            tool_input=tool_input,
+        )
+        if not hooks:
+            return
+
         context = HookContext(
             event=HookEvent.ON_TOOL_ERROR,
             tool_name=tool_name,
@@ -153,12 +215,6 @@ class HookExecutor:
             file_path=extract_file_path_from_input(tool_input),
         )
 
-        hooks = self._registry.get_hooks_for_event(
-            HookEvent.ON_TOOL_ERROR,
-            tool_name=tool_name,
-            tool_input=tool_input,
-        )
-
         for hook in hooks:
             await self._execute_hook(hook, context)
 
@@ -195,7 +251,7 @@ class HookExecutor:
 
     async def _execute_hook(self, hook: HookConfig, context: HookContext) -> HookResult:
         """
-        Execute a single hook.
+        Execute a single hook, or queue it if it is non-blocking.
 
         Args:
             hook: Hook configuration
@@ -204,61 +260,59 @@ class HookExecutor:
         Returns:
             HookResult with execution details
         """
+        if not hook.blocking:
+            await self._enqueue(hook, context)
+            return HookResult(success=True, output="Queued for background execution")
+        return await self._run_hook(hook, context)
+
+    async def _run_hook(self, hook: HookConfig, context: HookContext) -> HookResult:
+        """Run a hook and wait for its result."""
         start_time = time.time()
 
         try:
-            # Substitute template variables
-            command = substitute_variables(hook.command, context)
-
-            # Execute the command
-            if hook.blocking:
-                result = await self._run_blocking(command, hook.timeout)
+            if hook.persistent:
+                result = (await self._run_worker(hook, [context]))[0]
             else:
-                result = await self._run_non_blocking(command)
-
-            duration = time.time() - start_time
-            result.duration = duration
-
-            # Log result if needed
-            if not result.success:
-                self._log_hook_result(hook, result)
+                # Substitute template variables
+                command = substitute_variables(hook.command, context)
+                result = await self._run_blocking(command, hook.timeout)
 
-            return result
+            result.duration = time.time() - start_time
 
         except asyncio.TimeoutError:
-            duration = time.time() - start_time
             result = HookResult(
                 success=False,
                 error=f"Hook timed out after {hook.timeout} seconds",
                 return_code=-1,
-                duration=duration,
+                duration=time.time() - start_time,
                 should_abort=hook.fail_behavior == HookFailBehavior.ABORT,
             )
-            self._log_hook_result(hook, result)
-            return result
 
         except Exception as e:
-            duration = time.time() - start_time
             result = HookResult(
                 success=False,
                 error=str(e),
                 return_code=-1,
-                duration=duration,
+                duration=time.time() - start_time,
                 should_abort=hook.fail_behavior == HookFailBehavior.ABORT,
             )
+
+        self._record(hook, result)
+        # Log result if needed
+        if not result.success:
             self._log_hook_result(hook, result)
-            return result
+        return result
 
     async def _run_blocking(self, command: str, timeout: int) -> HookResult:
         """Run a command and wait for it to complete."""
-        try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                shell=True,
-            )
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
 
+        try:
             if timeout > 0:
                 stdout, stderr = await asyncio.wait_for(
                     process.communicate(),
@@ -266,47 +320,182 @@ class HookExecutor:
                 )
             else:
                 stdout, stderr = await process.communicate()
+        except BaseException:
+            # Don't leave a timed-out (or cancelled) hook, or anything it
+            # started, running
+            if process.returncode is None:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+            raise
 
-            output = stdout.decode() if stdout else ""
-            error_output = stderr.decode() if stderr else ""
-
-            return HookResult(
-                success=process.returncode == 0,
-                output=output,
-                error=error_output if error_output else None,
-                return_code=process.returncode or 0,
-                should_abort=False,
-            )
+        output = stdout.decode() if stdout else ""
+        error_output = stderr.decode() if stderr else ""
 
-        except asyncio.TimeoutError:
-            raise
+        return HookResult(
+            success=process.returncode == 0,
+            output=output,
+            error=error_output if error_output else None,
+            return_code=process.returncode or 0,
+            should_abort=False,
+        )
 
-    async def _run_non_blocking(self, command: str) -> HookResult:
-        """Start a command without waiting for it to complete."""
-        try:
-            # Start process in background
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.DEVNULL,
-                shell=True,
+    async def _run_worker(self, hook: HookConfig, contexts: list[HookContext]) -> list[HookResult]:
+        """Send invocations of a persistent hook to its worker process."""
+        self._bind_loop()
+        worker = self._workers.get(hook.command)
+        if worker is None:
+            worker = self._workers[hook.command] = HookWorker(hook.command)
+        timeout = hook.timeout * len(contexts) if hook.timeout > 0 else 0
+        responses = await worker.request(contexts, timeout)
+
+        results = []
+        for response in responses:
+            error = response.get("error")
+            success = bool(response.get("success", not error))
+            results.append(
+                HookResult(
+                    success=success,
+                    output=str(response.get("output") or ""),
+                    error=str(error) if error else None,
+                    return_code=0 if success else 1,
+                    should_abort=bool(response.get("abort", False)),
+                )
             )
+        return results
 
-            # Don't wait for completion
-            return HookResult(
-                success=True,
-                output=f"Started background process (PID: {process.pid})",
-                return_code=0,
-                should_abort=False,
-            )
+    # ==================== Background queue ====================
 
+    def _bind_loop(self) -> None:
+        """Reset background state created on another (closed) event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        for worker in self._workers.values():
+            worker.kill()
+        self._workers = {}
+        self._loop = loop
+        self._queue = None
+        self._consumer = None
+        self._slots = None
+        self._running = set()
+
+    async def _enqueue(self, hook: HookConfig, context: HookContext) -> None:
+        self._bind_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume(self._queue))
+        await self._queue.put((hook, context))
+
+    async def _consume(self, queue: "asyncio.Queue[tuple[HookConfig, HookContext]]") -> None:
+        """Start queued hooks, taking up to ``batch_size`` at a time."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, len(batch))
+
+            # Invocations of one persistent hook go to its worker together
+            by_worker: dict[int, tuple[HookConfig, list[HookContext]]] = {}
+            for hook, context in batch:
+                if hook.persistent:
+                    by_worker.setdefault(id(hook), (hook, []))[1].append(context)
+                else:
+                    await self._start(queue, self._run_hook(hook, context), 1)
+            for hook, contexts in by_worker.values():
+                await self._start(queue, self._run_worker_batch(hook, contexts), len(contexts))
+
+    async def _start(
+        self, queue: "asyncio.Queue[tuple[HookConfig, HookContext]]", coro: Any, items: int
+    ) -> None:
+        """Run queued work once one of the ``concurrency`` slots is free."""
+        assert self._slots is not None
+        slots = self._slots
+        await slots.acquire()
+        task = asyncio.create_task(coro)
+        self._running.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            self._running.discard(task)
+            slots.release()
+            for _ in range(items):
+                queue.task_done()
+            if not task.cancelled() and task.exception() is not None:
+                print(f"[Hook] Background hooks failed: {task.exception()}")
+
+        task.add_done_callback(done)
+
+    async def _run_worker_batch(self, hook: HookConfig, contexts: list[HookContext]) -> None:
+        start_time = time.time()
+        try:
+            results = await self._run_worker(hook, contexts)
         except Exception as e:
-            return HookResult(
-                success=False,
-                error=str(e),
-                return_code=-1,
-                should_abort=False,
-            )
+            error = f"Hook timed out after {hook.timeout} seconds" if isinstance(
+                e, asyncio.TimeoutError
+            ) else str(e)
+            results = [HookResult(success=False, error=error, return_code=-1) for _ in contexts]
+        duration = (time.time() - start_time) / len(contexts)
+        for result in results:
+            result.duration = duration
+            self._record(hook, result)
+            if not result.success:
+                self._log_hook_result(hook, result)
+
+    async def flush(self) -> None:
+        """Wait until all queued hooks have run."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Stop the background queue and the worker processes."""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        running, self._running = self._running, set()
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._queue = None
+        self._slots = None
+        workers, self._workers = self._workers, {}
+        await asyncio.gather(*(worker.close() for worker in workers.values()), return_exceptions=True)
+
+    # ==================== Metrics ====================
+
+    def _record(self, hook: HookConfig, result: HookResult) -> None:
+        stats = self._stats.setdefault(hook.description or hook.command, _HookStats())
+        stats.calls += 1
+        stats.failures += not result.success
+        stats.total += result.duration
+        stats.max = max(stats.max, result.duration)
+        stats.last = result.duration
+
+    def get_stats(self) -> dict[str, Any]:
+        """Per-hook latency and the state of the background queue."""
+        return {
+            "hooks": {
+                name: {
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "avg_ms": stats.total / stats.calls * 1000 if stats.calls else 0.0,
+                    "max_ms": stats.max * 1000,
+                    "last_ms": stats.last * 1000,
+                }
+                for name, stats in self._stats.items()
+            },
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "batches": self._batches,
+            "largest_batch": self._largest_batch,
+            "running": len(self._running),
+            "workers": sum(worker.alive for worker in self._workers.values()),
+        }
 
     def _log_hook_result(self, hook: HookConfig, result: HookResult) -> None:
         """Log hook execution result."""
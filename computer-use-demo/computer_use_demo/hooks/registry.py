@@ -27,6 +27,9 @@ class HookRegistry:
     def __init__(self):
         self._hooks: list[HookConfig] = []
         self._loaded = False
+        # (event, tool name) -> hooks passing the event and tool filters
+        self._lookup_cache: dict[tuple[HookEvent, str | None], list[HookConfig]] = {}
+        self._pattern_cache: dict[str, re.Pattern[str] | None] = {}
 
     def load(self, project_path: str | None = None) -> None:
         """
@@ -36,6 +39,7 @@ class HookRegistry:
             project_path: Path to the project root (for project-level hooks)
         """
         self._hooks = []
+        self._lookup_cache.clear()
 
         # Load user-level hooks first
         user_hooks_path = Path.home() / ".claude" / "hooks.json"
@@ -91,6 +95,7 @@ class HookRegistry:
                 tool=data.get("tool"),
                 pattern=data.get("pattern"),
                 blocking=data.get("blocking", True),
+                persistent=data.get("persistent", False),
                 fail_behavior=fail_behavior,
                 timeout=data.get("timeout", 30),
                 description=data.get("description", ""),
@@ -118,31 +123,44 @@ class HookRegistry:
         if not self._loaded:
             self.load()
 
-        matching_hooks = []
+        key = (event, tool_name)
+        candidates = self._lookup_cache.get(key)
+        if candidates is None:
+            candidates = self._lookup_cache[key] = [
+                hook for hook in self._hooks if self._applies(hook, event, tool_name)
+            ]
 
-        for hook in self._hooks:
+        matching_hooks = []
+        input_str = None
+        for hook in candidates:
             if not hook.enabled:
                 continue
 
-            # Check event matches
-            if hook.event != event:
-                # Also check for specific tool events
-                if not self._is_tool_specific_event(hook.event, event, tool_name):
-                    continue
-
-            # Check tool filter
-            if hook.tool and tool_name and hook.tool != tool_name:
-                continue
-
             # Check pattern filter
             if hook.pattern and tool_input:
-                if not self._matches_pattern(hook.pattern, tool_input):
+                if input_str is None:
+                    input_str = self._input_string(tool_input)
+                if not self._matches_pattern(hook.pattern, input_str):
                     continue
 
             matching_hooks.append(hook)
 
         return matching_hooks
 
+    def _applies(self, hook: HookConfig, event: HookEvent, tool_name: str | None) -> bool:
+        """Check the event and tool filters of a hook."""
+        # Check event matches
+        if hook.event != event:
+            # Also check for specific tool events
+            if not self._is_tool_specific_event(hook.event, event, tool_name):
+                return False
+
+        # Check tool filter
+        if hook.tool and tool_name and hook.tool != tool_name:
+            return False
+
+        return True
+
     def _is_tool_specific_event(self, hook_event: HookEvent, actual_event: HookEvent, tool_name: str | None) -> bool:
         """Check if a tool-specific event matches the actual event and tool."""
         if not tool_name:
@@ -163,28 +181,42 @@ class HookRegistry:
         expected_specific_event = tool_event_map.get((tool_name, actual_event))
         return hook_event == expected_specific_event
 
-    def _matches_pattern(self, pattern: str, tool_input: dict[str, Any]) -> bool:
-        """Check if tool input matches a regex pattern."""
+    @staticmethod
+    def _input_string(tool_input: dict[str, Any]) -> str | None:
+        """Tool input as the JSON text patterns are matched against."""
         try:
-            # Convert tool input to string for pattern matching
-            input_str = json.dumps(tool_input, default=str)
-            return bool(re.search(pattern, input_str))
+            return json.dumps(tool_input, default=str)
         except Exception:
+            return None
+
+    def _matches_pattern(self, pattern: str, input_str: str | None) -> bool:
+        """Check if tool input (as JSON) matches a regex pattern."""
+        if input_str is None:
             return False
+        if pattern not in self._pattern_cache:
+            try:
+                self._pattern_cache[pattern] = re.compile(pattern)
+            except re.error:
+                self._pattern_cache[pattern] = None
+        regex = self._pattern_cache[pattern]
+        return regex is not None and regex.search(input_str) is not None
 
     def add_hook(self, hook: HookConfig) -> None:
         """Add a hook programmatically."""
         self._hooks.append(hook)
+        self._lookup_cache.clear()
 
     def remove_hook(self, hook: HookConfig) -> None:
         """Remove a hook."""
         if hook in self._hooks:
             self._hooks.remove(hook)
+            self._lookup_cache.clear()
 
     def clear(self) -> None:
         """Clear all hooks."""
         self._hooks = []
         self._loaded = False
+        self._lookup_cache.clear()
 
     @property
     def hooks(self) -> list[HookConfig]:
@@ -54,9 +54,14 @@ class HookConfig:
     # Optional: regex pattern to match against tool input/command
     pattern: str | None = None
 
-    # Should this hook block execution until complete?
+    # Should this hook block execution until complete? Non-blocking hooks
+    # are queued and run in the background
     blocking: bool = True
 
+    # Keep the command running and send it one JSON line per invocation
+    # (see hooks/worker.py) instead of starting it for every tool call
+    persistent: bool = False
+
     # What to do if hook fails
     fail_behavior: HookFailBehavior = HookFailBehavior.WARN
 
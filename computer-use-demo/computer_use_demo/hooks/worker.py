@@ -0,0 +1,137 @@
+"""
+Long-lived hook worker processes.
+
+A hook configured with ``"persistent": true`` is started once and then
+receives one JSON line per invocation on stdin instead of being spawned for
+every tool call. A request carries the hook context:
+
+    {"id": 1, "event": "post_edit", "tool_name": "str_replace_editor",
+     "tool_input": {...}, "file_path": "/src/app.py", "result": "...",
+     "error": null, "session_id": "...", "metadata": {}}
+
+and the worker answers every request, in order, with one JSON line:
+
+    {"id": 1, "success": true, "output": "formatted", "abort": false}
+
+``success`` defaults to true; ``error`` carries a failure message and
+``abort`` blocks the tool call (pre-tool hooks only). Anything the worker
+prints to stderr is ignored.
+"""
+
+import asyncio
+import json
+import os
+import signal
+from typing import Any
+
+from .template import _get_result_output
+from .types import HookContext
+
+# Maximum length of one response line
+MAX_RESPONSE_BYTES = 2**20
+
+
+def build_request(request_id: int, context: HookContext) -> dict[str, Any]:
+    """The JSON request sent to a worker for one hook invocation."""
+    return {
+        "id": request_id,
+        "event": context.event.value if context.event else None,
+        "tool_name": context.tool_name,
+        "tool_input": context.tool_input,
+        "file_path": context.file_path,
+        "result": _get_result_output(context.tool_result),
+        "error": context.error,
+        "session_id": context.session_id,
+        "metadata": context.metadata,
+    }
+
+
+class HookWorker:
+    """A hook process that answers one JSON line per request line."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self._process: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_shell(
+            self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=MAX_RESPONSE_BYTES,
+            start_new_session=True,
+        )
+
+    async def request(self, contexts: list[HookContext], timeout: float) -> list[dict[str, Any]]:
+        """
+        Send a batch of requests and read their responses.
+
+        All requests are written before the first response is read, so a
+        batch costs one round trip. A worker that times out, exits or
+        answers out of order is killed and started again on the next request.
+
+        Args:
+            contexts: Hook contexts, one request each
+            timeout: Seconds for the whole batch (0 = no timeout)
+
+        Returns:
+            The responses, in request order
+        """
+        async with self._lock:
+            if not self.alive:
+                await self.start()
+            try:
+                return await asyncio.wait_for(
+                    self._exchange(contexts), timeout=timeout if timeout > 0 else None
+                )
+            except BaseException:
+                self.kill()
+                # Forget the worker before reaping it, so the next request
+                # starts a new one even if this wait is cancelled
+                process, self._process = self._process, None
+                await process.wait()
+                raise
+
+    async def _exchange(self, contexts: list[HookContext]) -> list[dict[str, Any]]:
+        assert self._process is not None and self._process.stdin and self._process.stdout
+        ids = []
+        lines = []
+        for context in contexts:
+            self._next_id += 1
+            ids.append(self._next_id)
+            lines.append(json.dumps(build_request(self._next_id, context), default=str) + "\n")
+        self._process.stdin.write("".join(lines).encode())
+        await self._process.stdin.drain()
+
+        responses = []
+        for request_id in ids:
+            line = await self._process.stdout.readline()
+            if not line:
+                raise RuntimeError("Hook worker exited")
+            response = json.loads(line)
+            if response.get("id") != request_id:
+                raise RuntimeError(f"Hook worker answered request {response.get('id')}, expected {request_id}")
+            responses.append(response)
+        return responses
+
+    def kill(self) -> None:
+        """Kill the worker and everything it started."""
+        if self.alive:
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    async def close(self) -> None:
+        if self._process is None:
+            return
+        self.kill()
+        await self._process.wait()
+        self._process = None
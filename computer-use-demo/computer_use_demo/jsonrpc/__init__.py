@@ -0,0 +1,26 @@
+"""
+JSON-RPC 2.0 transport shared by the MCP and LSP clients.
+
+Usage:
+    from computer_use_demo.jsonrpc import StdioTransport
+
+    transport = StdioTransport(["my-server", "--stdio"], framing="newline")
+    await transport.start()
+    result = await transport.request("tools/list")
+"""
+
+from .transport import (
+    Framing,
+    JSONRPCError,
+    StdioTransport,
+    encode_message,
+    read_message,
+)
+
+__all__ = [
+    "Framing",
+    "JSONRPCError",
+    "StdioTransport",
+    "encode_message",
+    "read_message",
+]
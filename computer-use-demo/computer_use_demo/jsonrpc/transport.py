@@ -0,0 +1,349 @@
+"""
+JSON-RPC 2.0 over a child process's stdio.
+
+Shared by the MCP and LSP clients. Messages are framed either with
+``Content-Length`` headers (LSP) or as one JSON document per line (MCP's
+stdio transport). The reader works on the bytes of an asyncio stream: a
+frame is located in the stream's buffer (``readuntil``/``readexactly``)
+and parsed from bytes, so large messages cost one copy instead of repeated
+string concatenation, and no thread is involved.
+
+Any number of requests may be in flight; responses are matched to them by
+id. A request that times out or is cancelled sends the protocol's cancel
+notification. Backpressure works in both directions: writers wait for the
+pipe to drain, at most ``max_in_flight`` requests are outstanding, and the
+reader does not read further while a notification handler runs.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
+
+Framing = Literal["content-length", "newline"]
+
+# Largest message accepted from the server
+MAX_MESSAGE_BYTES = 64 * 2**20
+
+# Last stderr lines kept for error messages
+STDERR_LINES = 50
+
+METHOD_NOT_FOUND = -32601
+
+# Header lines that start a Content-Length framed message
+_HEADER = re.compile(rb"content-(length|type)\s*:", re.IGNORECASE)
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[Any] | Any]
+
+
+class JSONRPCError(RuntimeError):
+    """An error response, or a failure of the connection."""
+
+    def __init__(self, message: str, code: int = -32000, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    def to_dict(self) -> dict[str, Any]:
+        error: dict[str, Any] = {"code": self.code, "message": str(self)}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def encode_message(message: dict[str, Any], framing: Framing) -> bytes:
+    """Serialize and frame one message."""
+    body = json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode()
+    if framing == "newline":
+        return body + b"\n"
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> bytes | None:
+    """
+    Read the body of the next message, in either framing.
+
+    A ``Content-Length``/``Content-Type`` header line begins a header-framed
+    message and a line starting with ``{`` or ``[`` is a JSON document; any
+    other line (e.g. a server's log output on stdout) is skipped.
+
+    Returns:
+        The message body, or None at end of stream
+    """
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            line = e.partial
+            if not line.strip():
+                return None
+        stripped = line.strip()
+        if stripped[:1] in (b"{", b"["):
+            return stripped
+        if not _HEADER.match(stripped):
+            continue
+
+        # Headers, up to an empty line
+        length = None
+        while stripped:
+            name, _, value = stripped.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+            stripped = (await reader.readuntil(b"\n")).strip()
+        if length is None:
+            raise JSONRPCError("Message without Content-Length")
+        if length > MAX_MESSAGE_BYTES:
+            raise JSONRPCError(f"Message of {length} bytes exceeds the limit")
+        return await reader.readexactly(length)
+
+
+class StdioTransport:
+    """
+    A JSON-RPC connection to a server started as a child process.
+
+    Usage:
+        transport = StdioTransport(["pyright-langserver", "--stdio"])
+        await transport.start()
+        result = await transport.request("initialize", {...})
+        await transport.close()
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        env: dict[str, str] | None = None,
+        cwd: str | None = None,
+        framing: Framing = "content-length",
+        on_notification: MessageHandler | None = None,
+        on_request: MessageHandler | None = None,
+        cancel_notification: Callable[[int], tuple[str, dict[str, Any]]] | None = None,
+        max_in_flight: int = 64,
+    ):
+        """
+        Args:
+            command: Server command and arguments
+            env: Extra environment variables
+            cwd: Working directory of the server
+            framing: How outgoing messages are framed (incoming messages
+                may use either)
+            on_notification: Called with each server notification
+            on_request: Called with each server request; returns the
+                result, or raises JSONRPCError (unset: "method not found")
+            cancel_notification: Builds the (method, params) notification
+                sent for a request id that is abandoned
+            max_in_flight: Requests outstanding at once
+        """
+        self.command = command
+        self.env = env or {}
+        self.cwd = cwd
+        self.framing = framing
+        self.on_notification = on_notification
+        self.on_request = on_request
+        self.cancel_notification = cancel_notification
+        self.process: asyncio.subprocess.Process | None = None
+        self.stderr_tail: deque[str] = deque(maxlen=STDERR_LINES)
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._tasks: list[asyncio.Task] = []
+        self._closed_error: JSONRPCError | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process else None
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and self._closed_error is None
+
+    async def start(self) -> None:
+        """Start the server and begin reading its output."""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, **self.env},
+            cwd=self.cwd,
+            limit=MAX_MESSAGE_BYTES,
+        )
+        self._closed_error = None
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._read_stderr()),
+        ]
+
+    async def request(self, method: str, params: dict[str, Any] | None = None, timeout: float | None = 30.0) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            The response's result
+
+        Raises:
+            JSONRPCError: For an error response or a closed connection
+            asyncio.TimeoutError: If no response arrives in time
+        """
+        async with self._in_flight:
+            self._next_id += 1
+            request_id = self._next_id
+            message: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+            if params is not None:
+                message["params"] = params
+
+            future: asyncio.Future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            answered = False
+            try:
+                await self._write(message)
+                result = await asyncio.wait_for(future, timeout=timeout)
+                answered = True
+                return result
+            except JSONRPCError:
+                answered = True
+                raise
+            finally:
+                self._pending.pop(request_id, None)
+                if not answered:
+                    await self._cancel(request_id)
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a notification (no response expected)."""
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._write(message)
+
+    async def _write(self, message: dict[str, Any]) -> None:
+        if not self.is_alive or self.process.stdin is None:
+            raise self._closed_error or JSONRPCError("Server is not running")
+        try:
+            self.process.stdin.write(encode_message(message, self.framing))
+            await self.process.stdin.drain()
+        except (ConnectionError, RuntimeError) as e:
+            raise JSONRPCError(f"Failed to send message: {e}") from e
+
+    async def _cancel(self, request_id: int) -> None:
+        """Tell the server an abandoned request's result is no longer wanted."""
+        if self.cancel_notification is None or not self.is_alive:
+            return
+        method, params = self.cancel_notification(request_id)
+        with contextlib.suppress(Exception):
+            await asyncio.shield(self.notify(method, params))
+
+    async def _read_loop(self) -> None:
+        assert self.process is not None and self.process.stdout is not None
+        reader = self.process.stdout
+        error = JSONRPCError("Server closed the connection")
+        try:
+            while True:
+                body = await read_message(reader)
+                if body is None:
+                    break
+                try:
+                    message = json.loads(body)
+                except json.JSONDecodeError:
+                    continue  # Not a JSON-RPC message (e.g. a stray log line)
+                for item in message if isinstance(message, list) else [message]:
+                    if isinstance(item, dict):
+                        await self._dispatch(item)
+        except asyncio.CancelledError:
+            error = JSONRPCError("Connection closed")
+            raise
+        except Exception as e:
+            error = JSONRPCError(f"Failed to read from server: {e}")
+        finally:
+            self._fail_pending(error)
+
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        message_id = message.get("id")
+
+        if method is None:
+            # A response
+            future = self._pending.get(message_id)
+            if future is not None and not future.done():
+                if message.get("error") is not None:
+                    error = message["error"]
+                    future.set_exception(
+                        JSONRPCError(str(error.get("message", error)), error.get("code", -32000), error.get("data"))
+                        if isinstance(error, dict)
+                        else JSONRPCError(str(error))
+                    )
+                else:
+                    future.set_result(message.get("result"))
+            return
+
+        if message_id is None:
+            if self.on_notification is not None:
+                with contextlib.suppress(Exception):
+                    result = self.on_notification(message)
+                    if asyncio.iscoroutine(result):
+                        await result
+            return
+
+        # A request from the server, answered without blocking the reader
+        self._tasks.append(asyncio.create_task(self._answer(message)))
+        self._tasks = [task for task in self._tasks if not task.done()]
+
+    async def _answer(self, message: dict[str, Any]) -> None:
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        try:
+            if self.on_request is None:
+                raise JSONRPCError(f"Method not found: {message['method']}", METHOD_NOT_FOUND)
+            result = self.on_request(message)
+            if asyncio.iscoroutine(result):
+                result = await result
+            response["result"] = result
+        except JSONRPCError as e:
+            response["error"] = e.to_dict()
+        except Exception as e:
+            response["error"] = {"code": -32603, "message": str(e)}
+        with contextlib.suppress(JSONRPCError):
+            await self._write(response)
+
+    async def _read_stderr(self) -> None:
+        assert self.process is not None and self.process.stderr is not None
+        with contextlib.suppress(Exception):
+            async for line in self.process.stderr:
+                self.stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    def _fail_pending(self, error: JSONRPCError) -> None:
+        if self.stderr_tail:
+            error = JSONRPCError(f"{error} (stderr: {self.stderr_tail[-1]})", error.code)
+        self._closed_error = error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop reading, fail pending requests and stop the server."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._fail_pending(JSONRPCError("Connection closed"))
+
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        if process.stdin is not None:
+            process.stdin.close()
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=timeout)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
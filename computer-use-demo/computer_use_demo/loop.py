@@ -29,12 +29,15 @@ from anthropic.types.beta import (
     BetaToolUseBlockParam,
 )
 
+from .compaction import DEFAULT_TOKEN_BUDGET, ContextCompactor, ImageIndex, PruneMode
 from .tools import (
     TOOL_GROUPS_BY_VERSION,
     ToolCollection,
     ToolResult,
     ToolVersion,
 )
+from .tools.scheduler import run_tool_calls
+from .tools.screen_capture import image_media_type
 
 # Import reliability module
 try:
@@ -276,9 +279,15 @@ async def sampling_loop(
     computer_registry: Any = None,
     ssh_manager: Any = None,
     smart_selection: bool = True,  # Enable smart model + thinking selection
+    context_token_budget: int | None = None,
+    image_prune_mode: PruneMode = "drop",
 ):
     """
     Agentic sampling loop for the assistant/tool interaction of computer use.
+
+    ``context_token_budget`` is the estimated history size (in tokens) above
+    which older turns are folded into a rolling summary. ``image_prune_mode``
+    decides what screenshots beyond ``only_n_most_recent_images`` become.
     """
     tool_group = TOOL_GROUPS_BY_VERSION[tool_version]
 
@@ -604,6 +613,9 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
         text="".join(prompt_parts),
     )
 
+    compactor = ContextCompactor(token_budget=context_token_budget or DEFAULT_TOKEN_BUDGET)
+    image_index = ImageIndex(mode=image_prune_mode)
+
     # Track compaction retries to prevent infinite loops
     compact_retry_count = 0
     max_compact_retries = 2
@@ -641,12 +653,11 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
                 messages,
                 only_n_most_recent_images,
                 min_removal_threshold=image_truncation_threshold,
+                image_index=image_index,
             )
 
-        # Proactive compacting: if we have many messages (>15), compact to prevent 413 errors
-        if len(messages) > 15:
-            print(f"[Compact] Proactively compacting {len(messages)} messages to prevent request_too_large error...")
-            messages = _compact_messages(messages, keep_recent=6)
+        # Proactive compacting: fold old turns into the summary once over the token budget
+        messages = compactor.maybe_compact(messages)
 
         extra_body = {}
         # Dynamically adjust max_tokens for thinking
@@ -745,7 +756,7 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
             if (status_code == 413 or error_type == 'request_too_large') and len(messages) > 4 and compact_retry_count < max_compact_retries:
                 compact_retry_count += 1
                 print(f"[Compact] Request too large error detected. Auto-compacting messages (attempt {compact_retry_count}/{max_compact_retries})...")
-                messages = _compact_messages(messages, keep_recent=4)
+                messages = compactor.compact(messages)
                 print(f"[Compact] Retrying with compacted messages...")
                 # Continue the loop to retry with compacted messages
                 continue
@@ -766,7 +777,7 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
             if error_type == 'request_too_large' and len(messages) > 4 and compact_retry_count < max_compact_retries:
                 compact_retry_count += 1
                 print(f"[Compact] Request too large error detected. Auto-compacting messages (attempt {compact_retry_count}/{max_compact_retries})...")
-                messages = _compact_messages(messages, keep_recent=4)
+                messages = compactor.compact(messages)
                 print(f"[Compact] Retrying with compacted messages...")
                 # Continue the loop to retry with compacted messages
                 continue
@@ -785,6 +796,12 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
 
         # Reset compact retry counter on successful API call
         compact_retry_count = 0
+        usage = getattr(response, "usage", None)
+        compactor.record_usage(
+            getattr(usage, "input_tokens", None),
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "cache_creation_input_tokens", None),
+        )
 
         response_params = _response_to_params(response)
         messages.append(
@@ -794,25 +811,40 @@ Remember: You're the CEO - orchestrate, delegate, and track progress in TASKS.md
             }
         )
 
-        tool_result_content: list[BetaToolResultBlockParam] = []
+        tool_use_blocks: list[BetaToolUseBlockParam] = []
         for content_block in response_params:
             output_callback(content_block)
             if isinstance(content_block, dict) and content_block.get("type") == "tool_use":
                 # Type narrowing for tool use blocks
-                tool_use_block = cast(BetaToolUseBlockParam, content_block)
-                result = await tool_collection.run(
-                    name=tool_use_block["name"],
-                    tool_input=cast(dict[str, Any], tool_use_block.get("input", {})),
-                )
-                tool_result_content.append(
-                    _make_api_tool_result(result, tool_use_block["id"])
-                )
-                tool_output_callback(
-                    result,
-                    tool_use_block["id"],
-                    tool_use_block["name"],
-                    cast(dict[str, Any], tool_use_block.get("input", {}))
-                )
+                tool_use_blocks.append(cast(BetaToolUseBlockParam, content_block))
+
+        # Read-only calls of this turn run concurrently; results keep their order.
+        # Only called while this turn's run_tool_calls runs, so binding the
+        # loop's tool_use_blocks late is safe.
+        def report_tool_result(index: int, result: ToolResult):
+            tool_use_block = tool_use_blocks[index]  # noqa: B023
+            tool_output_callback(
+                result,
+                tool_use_block["id"],
+                tool_use_block["name"],
+                cast(dict[str, Any], tool_use_block.get("input", {}))
+            )
+
+        results = await run_tool_calls(
+            tool_use_blocks,
+            lambda block: tool_collection.run(
+                name=block["name"],
+                tool_input=cast(dict[str, Any], block.get("input", {})),
+            ),
+            lambda block: tool_collection.is_parallel_safe(
+                block["name"], cast(dict[str, Any], block.get("input", {}))
+            ),
+            on_result=report_tool_result,
+        )
+        tool_result_content: list[BetaToolResultBlockParam] = [
+            _make_api_tool_result(result, block["id"])
+            for result, block in zip(results, tool_use_blocks)
+        ]
 
         if not tool_result_content:
             return messages
@@ -824,163 +856,23 @@ def _maybe_filter_to_n_most_recent_images(
     messages: list[BetaMessageParam],
     images_to_keep: int,
     min_removal_threshold: int,
+    image_index: ImageIndex | None = None,
 ):
     """
     With the assumption that images are screenshots that are of diminishing value as
     the conversation progresses, remove all but the final `images_to_keep` tool_result
     images in place, with a chunk of min_removal_threshold to reduce the amount we
     break the implicit prompt cache.
-    """
-    if images_to_keep is None:
-        return messages
-
-    tool_result_blocks = cast(
-        list[BetaToolResultBlockParam],
-        [
-            item
-            for message in messages
-            for item in (
-                message["content"] if isinstance(message["content"], list) else []
-            )
-            if isinstance(item, dict) and item.get("type") == "tool_result"
-        ],
-    )
-
-    total_images = sum(
-        1
-        for tool_result in tool_result_blocks
-        for content in tool_result.get("content", [])
-        if isinstance(content, dict) and content.get("type") == "image"
-    )
-
-    images_to_remove = total_images - images_to_keep
-    # for better cache behavior, we want to remove in chunks
-    images_to_remove -= images_to_remove % min_removal_threshold
-
-    for tool_result in tool_result_blocks:
-        if isinstance(tool_result.get("content"), list):
-            new_content = []
-            for content in tool_result.get("content", []):
-                if isinstance(content, dict) and content.get("type") == "image":
-                    if images_to_remove > 0:
-                        images_to_remove -= 1
-                        continue
-                new_content.append(content)
-            tool_result["content"] = new_content
-
-
-def _compact_messages(
-    messages: list[BetaMessageParam],
-    keep_recent: int = 4,
-) -> list[BetaMessageParam]:
-    """
-    Compact older messages to reduce token usage, similar to Claude Code's auto-compact.
-    Keeps the most recent messages intact and summarizes older conversation turns.
-
-    Args:
-        messages: The full message history
-        keep_recent: Number of recent message turns to keep intact (default: 4)
 
-    Returns:
-        Compacted message list with older messages summarized
+    Pass the same `image_index` on every turn so only new messages are scanned.
     """
-    if len(messages) <= keep_recent:
-        return messages
-
-    # Find a safe split point that doesn't break tool_use/tool_result pairs
-    # We need to ensure that if a recent message has tool_result, we keep the previous tool_use
-    split_index = len(messages) - keep_recent
-
-    # Look back to ensure we don't split tool_use/tool_result pairs
-    # Check if the message at split_index contains tool_result blocks
-    while split_index > 0:
-        msg_at_split = messages[split_index]
-        if _has_tool_results(msg_at_split):
-            # This message has tool results, need to include previous assistant message with tool_use
-            split_index -= 1
-            # Continue checking in case there are multiple tool results
-            continue
-        break
-
-    # Ensure we always keep at least 2 messages (minimum valid conversation)
-    if split_index >= len(messages) - 2:
-        split_index = max(0, len(messages) - 2)
-
-    # Split into old (to summarize) and recent (to keep)
-    old_messages = messages[:split_index]
-    recent_messages = messages[split_index:]
-
-    # If nothing to compact, return original
-    if len(old_messages) == 0:
+    if images_to_keep is None:
         return messages
 
-    # Create a summary of old messages - only text, no tools
-    summary_parts = []
-
-    for msg in old_messages:
-        text = _extract_text_from_message(msg)
-        if text and not text.startswith("[Used tool:"):
-            role_label = "User" if msg["role"] == "user" else "Assistant"
-            # Truncate long messages
-            if len(text) > 300:
-                text = text[:300] + "..."
-            summary_parts.append(f"{role_label}: {text}")
-
-    # Create a single summary message if we have content
-    if summary_parts:
-        summary_text = "Previous conversation summary:\n\n" + "\n".join(summary_parts)
-        compacted = [
-            {
-                "role": "user",
-                "content": [{"type": "text", "text": summary_text}],
-            }
-        ]
-    else:
-        compacted = []
-
-    # Add recent messages
-    compacted.extend(recent_messages)
-
-    print(f"[Compact] Reduced {len(messages)} messages to {len(compacted)} messages")
-
-    return compacted
-
-
-def _has_tool_results(msg: BetaMessageParam) -> bool:
-    """Check if a message contains tool_result blocks."""
-    content = msg.get("content", [])
-
-    if isinstance(content, list):
-        for item in content:
-            if isinstance(item, dict) and item.get("type") == "tool_result":
-                return True
-
-    return False
-
-
-def _extract_text_from_message(msg: BetaMessageParam) -> str:
-    """Extract text content from a message, ignoring images and tool calls."""
-    content = msg.get("content", [])
-
-    if isinstance(content, str):
-        return content
-
-    if isinstance(content, list):
-        text_parts = []
-        for item in content:
-            if isinstance(item, dict):
-                if item.get("type") == "text":
-                    text_parts.append(item.get("text", ""))
-                elif item.get("type") == "tool_use":
-                    # Summarize tool use
-                    tool_name = item.get("name", "unknown")
-                    text_parts.append(f"[Used tool: {tool_name}]")
-                elif item.get("type") == "tool_result":
-                    # Skip tool results in summary to save space
-                    continue
-        return " ".join(text_parts)
-
-    return ""
+    if image_index is None:
+        image_index = ImageIndex()
+    image_index.sync(messages)
+    image_index.prune(images_to_keep, min_removal_threshold)
 
 
 def _response_to_params(
@@ -1056,7 +948,7 @@ def _make_api_tool_result(
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": image_media_type(result.base64_image),
                         "data": result.base64_image,
                     },
                 }
@@ -5,12 +5,11 @@ Communicates with Language Servers using JSON-RPC 2.0 over stdio.
 """
 
 import asyncio
-import json
 import os
-import subprocess
 from pathlib import Path
 from typing import Any
 
+from ..jsonrpc import StdioTransport
 from .types import (
     CompletionItem,
     Diagnostic,
@@ -34,10 +33,7 @@ class LSPClient:
     def __init__(self, config: LSPServerConfig, workspace_root: Path | None = None):
         self.config = config
         self.workspace_root = workspace_root or Path.cwd()
-        self._process: subprocess.Popen | None = None
-        self._request_id = 0
-        self._pending_requests: dict[int, asyncio.Future] = {}
-        self._reader_task: asyncio.Task | None = None
+        self._transport: StdioTransport | None = None
         self._status = LSPServerStatus.STOPPED
         self._capabilities: dict[str, Any] = {}
         self._lock = asyncio.Lock()
@@ -55,6 +51,10 @@ class LSPClient:
     def capabilities(self) -> dict[str, Any]:
         return self._capabilities
 
+    @property
+    def pid(self) -> int | None:
+        return self._transport.pid if self._transport else None
+
     async def start(self) -> bool:
         """Start the LSP server process."""
         async with self._lock:
@@ -64,26 +64,14 @@ class LSPClient:
             self._status = LSPServerStatus.STARTING
 
             try:
-                # Build environment
-                env = os.environ.copy()
-                env.update(self.config.env)
-
-                # Build command
-                cmd = [self.config.command] + self.config.args
-
                 # Start process
-                self._process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    env=env,
-                    text=True,
-                    bufsize=1,
+                self._transport = StdioTransport(
+                    [self.config.command] + self.config.args,
+                    env=self.config.env,
+                    on_notification=self._handle_notification,
+                    cancel_notification=lambda request_id: ("$/cancelRequest", {"id": request_id}),
                 )
-
-                # Start reader task
-                self._reader_task = asyncio.create_task(self._read_responses())
+                await self._transport.start()
 
                 # Initialize the server
                 await self._initialize()
@@ -107,31 +95,10 @@ class LSPClient:
                 except Exception:
                     pass
 
-            # Cancel reader task
-            if self._reader_task:
-                self._reader_task.cancel()
-                try:
-                    await self._reader_task
-                except asyncio.CancelledError:
-                    pass
-                self._reader_task = None
-
-            # Terminate process
-            if self._process:
-                try:
-                    self._process.terminate()
-                    self._process.wait(timeout=5)
-                except Exception:
-                    try:
-                        self._process.kill()
-                    except Exception:
-                        pass
-                self._process = None
-
-            # Cancel pending requests
-            for future in self._pending_requests.values():
-                future.cancel()
-            self._pending_requests.clear()
+            # Pending requests fail and the process is terminated
+            if self._transport:
+                await self._transport.close()
+                self._transport = None
 
             self._status = LSPServerStatus.STOPPED
 
@@ -182,30 +149,13 @@ class LSPClient:
         if not self.is_running and self._status != LSPServerStatus.STARTING:
             raise RuntimeError("LSP server is not running")
 
-        self._request_id += 1
-        request_id = self._request_id
-
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-        }
-        if params:
-            request["params"] = params
-
-        future: asyncio.Future[Any] = asyncio.get_event_loop().create_future()
-        self._pending_requests[request_id] = future
+        if self._transport is None:
+            raise RuntimeError("Process not running")
 
         try:
-            await self._send(request)
-            result = await asyncio.wait_for(future, timeout=timeout)
-            return result
+            return await self._transport.request(method, params or None, timeout=timeout)
         except asyncio.TimeoutError:
-            self._pending_requests.pop(request_id, None)
             return None
-        except Exception as e:
-            self._pending_requests.pop(request_id, None)
-            raise
 
     async def notify(
         self,
@@ -213,100 +163,17 @@ class LSPClient:
         params: dict[str, Any] | None = None,
     ) -> None:
         """Send a notification (no response expected)."""
-        notification = {
-            "jsonrpc": "2.0",
-            "method": method,
-        }
-        if params:
-            notification["params"] = params
-
-        await self._send(notification)
-
-    async def _send(self, message: dict[str, Any]) -> None:
-        """Send a message to the server."""
-        if not self._process or not self._process.stdin:
+        if self._transport is None:
             raise RuntimeError("Process not running")
+        await self._transport.notify(method, params or None)
 
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-
-        try:
-            self._process.stdin.write(header + content)
-            self._process.stdin.flush()
-        except Exception as e:
-            raise RuntimeError(f"Failed to send message: {e}")
-
-    async def _read_responses(self) -> None:
-        """Background task to read responses from server."""
-        if not self._process or not self._process.stdout:
-            return
-
-        buffer = ""
-
-        while True:
-            try:
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, self._process.stdout.readline
-                )
+    async def _handle_notification(self, message: dict[str, Any]) -> None:
+        """Handle a server notification."""
+        method = message["method"]
+        params = message.get("params", {})
 
-                if not line:
-                    break
-
-                buffer += line
-
-                while "\r\n\r\n" in buffer:
-                    header_end = buffer.index("\r\n\r\n")
-                    header = buffer[:header_end]
-                    buffer = buffer[header_end + 4:]
-
-                    content_length = 0
-                    for line in header.split("\r\n"):
-                        if line.startswith("Content-Length:"):
-                            content_length = int(line.split(":")[1].strip())
-                            break
-
-                    if content_length > 0:
-                        while len(buffer) < content_length:
-                            more = await asyncio.get_event_loop().run_in_executor(
-                                None, lambda: self._process.stdout.read(content_length - len(buffer))
-                            )
-                            if not more:
-                                break
-                            buffer += more
-
-                        content = buffer[:content_length]
-                        buffer = buffer[content_length:]
-
-                        try:
-                            message = json.loads(content)
-                            await self._handle_message(message)
-                        except json.JSONDecodeError:
-                            pass
-
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                break
-
-    async def _handle_message(self, message: dict[str, Any]) -> None:
-        """Handle an incoming message."""
-        if "id" in message and message["id"] is not None:
-            request_id = message["id"]
-            future = self._pending_requests.pop(request_id, None)
-
-            if future and not future.done():
-                if "error" in message:
-                    future.set_exception(RuntimeError(str(message["error"])))
-                else:
-                    future.set_result(message.get("result"))
-
-        elif "method" in message:
-            # Handle server notifications
-            method = message["method"]
-            params = message.get("params", {})
-
-            if method == "textDocument/publishDiagnostics":
-                self._handle_diagnostics(params)
+        if method == "textDocument/publishDiagnostics":
+            self._handle_diagnostics(params)
 
     def _handle_diagnostics(self, params: dict[str, Any]) -> None:
         """Handle diagnostics notification."""
@@ -168,7 +168,7 @@ class LSPManager:
                     name=name,
                     languages=config.languages,
                     status=client.status if client else LSPServerStatus.STOPPED,
-                    pid=client._process.pid if client and client._process else None,
+                    pid=client.pid if client else None,
                     capabilities=client.capabilities if client else {},
                 )
                 servers.append(info)
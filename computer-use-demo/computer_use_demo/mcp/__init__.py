@@ -38,6 +38,8 @@ Usage:
     result = await registry.call_tool("read_file", {"path": "/etc/hosts"})
 """
 
+from .cache import MCPResultCache
+
 from .client import MCPClient
 
 from .config import (
@@ -85,6 +87,7 @@ __all__ = [
     "MCPTool",
     # Client
     "MCPClient",
+    "MCPResultCache",
     # Config
     "get_settings_paths",
     "load_mcp_configs",
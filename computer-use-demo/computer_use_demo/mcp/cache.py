@@ -0,0 +1,165 @@
+"""
+Per-server cache of MCP results.
+
+Each MCPClient keeps one ``MCPResultCache`` for tool, resource and prompt
+listings, resource reads and, when enabled, results of tools the server
+declares idempotent. Entries expire after a TTL and are dropped early when
+the server sends a ``list_changed`` or ``resources/updated`` notification
+or restarts. Concurrent misses for the same entry share one request.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+# Entry kinds
+TOOLS = "tools"
+RESOURCES = "resources"
+PROMPTS = "prompts"
+RESOURCE = "resource"  # A resource read, keyed by URI
+TOOL_CALL = "tool_call"  # A tool result, keyed by (name, arguments)
+
+KINDS = (TOOLS, RESOURCES, PROMPTS, RESOURCE, TOOL_CALL)
+
+# Server notifications and the entry kinds they invalidate
+INVALIDATING_NOTIFICATIONS = {
+    "notifications/tools/list_changed": (TOOLS, TOOL_CALL),
+    "notifications/resources/list_changed": (RESOURCES,),
+    "notifications/prompts/list_changed": (PROMPTS,),
+}
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counts for one entry kind."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MCPResultCache:
+    """TTL cache of one server's results."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Resource reads and tool results kept; the least
+                recently used are dropped
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._loading: dict[tuple[str, Hashable], asyncio.Future] = {}
+        # Bumped by invalidation, so loads started before it are not stored
+        self._generation = {kind: 0 for kind in KINDS}
+        self.stats = {kind: CacheStats() for kind in KINDS}
+
+    async def get_or_load(
+        self,
+        kind: str,
+        key: Hashable,
+        ttl: float,
+        load: Callable[[], Awaitable[tuple[Any, bool]]],
+    ) -> Any:
+        """
+        A cached value, or the result of ``load`` (stored if cacheable).
+
+        Args:
+            kind: Entry kind (``TOOLS``, ``RESOURCE``, ...)
+            key: Entry key within the kind
+            ttl: Seconds the value stays valid (0 disables caching)
+            load: Returns (value, cacheable); errors should not be cached
+
+        Returns:
+            The value
+        """
+        if ttl <= 0:
+            value, _ = await load()
+            return value
+
+        entry_key = (kind, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                self.stats[kind].hits += 1
+                return entry[1]
+            del self._entries[entry_key]
+
+        loading = self._loading.get(entry_key)
+        if loading is not None:
+            self.stats[kind].hits += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                if not loading.done() or loading.cancelled():
+                    raise  # This caller was cancelled
+                # The caller doing the load was cancelled; load again
+                self.stats[kind].hits -= 1
+                return await self.get_or_load(kind, key, ttl, load)
+
+        self.stats[kind].misses += 1
+        generation = self._generation[kind]
+        future = asyncio.get_running_loop().create_future()
+        self._loading[entry_key] = future
+        try:
+            value, cacheable = await load()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here if no one else waits
+            raise
+        finally:
+            self._loading.pop(entry_key, None)
+        future.set_result(value)
+
+        if cacheable and self._generation[kind] == generation:
+            self._entries[entry_key] = (time.monotonic() + ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, kind: str | None = None, key: Hashable | None = None) -> None:
+        """
+        Drop entries: one (kind and key), one kind, or everything (no arguments).
+        """
+        kinds = KINDS if kind is None else (kind,)
+        for name in kinds:
+            self._generation[name] += 1
+        if kind is not None and key is not None:
+            self._entries.pop((kind, key), None)
+            return
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] in kinds]:
+            del self._entries[entry_key]
+
+    def handle_notification(self, method: str, params: dict[str, Any] | None) -> bool:
+        """
+        Invalidate what a server notification says has changed.
+
+        Returns:
+            True if the notification affected the cache
+        """
+        if method == "notifications/resources/updated":
+            uri = (params or {}).get("uri")
+            if uri is None:
+                self.invalidate(RESOURCE)
+            else:
+                self.invalidate(RESOURCE, uri)
+            return True
+        kinds = INVALIDATING_NOTIFICATIONS.get(method)
+        for kind in kinds or ():
+            self.invalidate(kind)
+        return kinds is not None
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """Hits, misses and hit rate per entry kind."""
+        return {
+            kind: {"hits": stats.hits, "misses": stats.misses, "hit_rate": round(stats.hit_rate, 3)}
+            for kind, stats in self.stats.items()
+        }
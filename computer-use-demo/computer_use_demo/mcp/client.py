@@ -6,10 +6,10 @@ Communicates with MCP servers using JSON-RPC 2.0 over stdio.
 
 import asyncio
 import json
-import os
-import subprocess
-from typing import Any, AsyncIterator
+from typing import Any
 
+from ..jsonrpc import JSONRPCError, StdioTransport
+from .cache import PROMPTS, RESOURCE, RESOURCES, TOOL_CALL, TOOLS, MCPResultCache
 from .types import (
     MCPPrompt,
     MCPRequest,
@@ -25,17 +25,18 @@ class MCPClient:
     """
     Client for communicating with an MCP server.
 
-    Uses JSON-RPC 2.0 over stdio (stdin/stdout).
+    Uses JSON-RPC 2.0 over stdio (stdin/stdout), newline-delimited by
+    default (see ``MCPServerConfig.framing``).
     """
 
     def __init__(self, config: MCPServerConfig):
         self.config = config
-        self._process: subprocess.Popen | None = None
-        self._request_id = 0
-        self._pending_requests: dict[int, asyncio.Future] = {}
-        self._reader_task: asyncio.Task | None = None
+        self._transport: StdioTransport | None = None
         self._status = MCPServerStatus.STOPPED
         self._lock = asyncio.Lock()
+        # Listings and results, cleared whenever the server (re)starts or stops
+        self.cache = MCPResultCache()
+        self._idempotent_tools: set[str] = set()
 
     @property
     def status(self) -> MCPServerStatus:
@@ -45,6 +46,10 @@ class MCPClient:
     def is_running(self) -> bool:
         return self._status == MCPServerStatus.RUNNING
 
+    @property
+    def pid(self) -> int | None:
+        return self._transport.pid if self._transport else None
+
     async def start(self) -> bool:
         """
         Start the MCP server process.
@@ -59,72 +64,46 @@ class MCPClient:
             self._status = MCPServerStatus.STARTING
 
             try:
-                # Build environment
-                env = os.environ.copy()
-                env.update(self.config.env)
-
-                # Build command
-                cmd = [self.config.command] + self.config.args
-
                 # Start process
-                self._process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    env=env,
+                self._transport = StdioTransport(
+                    [self.config.command] + self.config.args,
+                    env=self.config.env,
                     cwd=self.config.cwd,
-                    text=True,
-                    bufsize=1,  # Line buffered
+                    framing=self.config.framing,
+                    on_notification=self._handle_notification,
+                    cancel_notification=lambda request_id: (
+                        "notifications/cancelled",
+                        {"requestId": request_id, "reason": "Request abandoned by client"},
+                    ),
                 )
-
-                # Start reader task
-                self._reader_task = asyncio.create_task(self._read_responses())
+                await self._transport.start()
 
                 # Initialize the server
-                await self._initialize()
+                await asyncio.wait_for(self._initialize(), timeout=self.config.startup_timeout)
 
                 self._status = MCPServerStatus.RUNNING
                 return True
 
             except Exception as e:
                 self._status = MCPServerStatus.ERROR
-                await self.stop()
+                await self._close_transport()
                 raise RuntimeError(f"Failed to start MCP server '{self.config.name}': {e}")
 
     async def stop(self) -> None:
         """Stop the MCP server process."""
         async with self._lock:
             self._status = MCPServerStatus.STOPPING
-
-            # Cancel reader task
-            if self._reader_task:
-                self._reader_task.cancel()
-                try:
-                    await self._reader_task
-                except asyncio.CancelledError:
-                    pass
-                self._reader_task = None
-
-            # Terminate process
-            if self._process:
-                try:
-                    self._process.terminate()
-                    self._process.wait(timeout=5)
-                except Exception:
-                    try:
-                        self._process.kill()
-                    except Exception:
-                        pass
-                self._process = None
-
-            # Cancel pending requests
-            for future in self._pending_requests.values():
-                future.cancel()
-            self._pending_requests.clear()
-
+            await self._close_transport()
             self._status = MCPServerStatus.STOPPED
 
+    async def _close_transport(self) -> None:
+        # Pending requests fail and the process is terminated
+        if self._transport:
+            await self._transport.close()
+            self._transport = None
+        self.cache.invalidate()
+        self._idempotent_tools = set()
+
     async def _initialize(self) -> None:
         """Initialize the MCP server connection."""
         # Send initialize request
@@ -158,6 +137,9 @@ class MCPClient:
         """
         Send a request to the MCP server and wait for response.
 
+        Any number of requests may be in flight at once. A request that
+        times out or is cancelled is cancelled on the server too.
+
         Args:
             method: JSON-RPC method name
             params: Method parameters
@@ -168,38 +150,18 @@ class MCPClient:
         """
         if not self.is_running and self._status != MCPServerStatus.STARTING:
             raise RuntimeError("MCP server is not running")
-
-        self._request_id += 1
-        request_id = self._request_id
-
-        # Create request
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-        }
-        if params:
-            request["params"] = params
-
-        # Create future for response
-        future: asyncio.Future[MCPResponse] = asyncio.get_event_loop().create_future()
-        self._pending_requests[request_id] = future
+        if self._transport is None:
+            raise RuntimeError("Process not running")
 
         try:
-            # Send request
-            await self._send(request)
-
-            # Wait for response
-            response = await asyncio.wait_for(future, timeout=timeout)
-            return response
+            result = await self._transport.request(method, params or None, timeout=timeout)
+            return MCPResponse(result=result)
 
         except asyncio.TimeoutError:
-            self._pending_requests.pop(request_id, None)
             return MCPResponse(error={"code": -32000, "message": "Request timeout"})
 
-        except Exception as e:
-            self._pending_requests.pop(request_id, None)
-            return MCPResponse(error={"code": -32000, "message": str(e)})
+        except JSONRPCError as e:
+            return MCPResponse(error=e.to_dict())
 
     async def notify(
         self,
@@ -213,129 +175,44 @@ class MCPClient:
             method: JSON-RPC method name
             params: Method parameters
         """
-        notification = {
-            "jsonrpc": "2.0",
-            "method": method,
-        }
-        if params:
-            notification["params"] = params
-
-        await self._send(notification)
-
-    async def _send(self, message: dict[str, Any]) -> None:
-        """Send a message to the server."""
-        if not self._process or not self._process.stdin:
+        if self._transport is None:
             raise RuntimeError("Process not running")
-
-        content = json.dumps(message)
-        # MCP uses Content-Length header like LSP
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-
         try:
-            self._process.stdin.write(header + content)
-            self._process.stdin.flush()
-        except Exception as e:
-            raise RuntimeError(f"Failed to send message: {e}")
-
-    async def _read_responses(self) -> None:
-        """Background task to read responses from server."""
-        if not self._process or not self._process.stdout:
-            return
-
-        buffer = ""
-
-        while True:
-            try:
-                # Read a line
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, self._process.stdout.readline
-                )
+            await self._transport.notify(method, params or None)
+        except JSONRPCError as e:
+            raise RuntimeError(str(e))
 
-                if not line:
-                    # Process ended
-                    break
-
-                buffer += line
-
-                # Check for complete message
-                while "\r\n\r\n" in buffer:
-                    header_end = buffer.index("\r\n\r\n")
-                    header = buffer[:header_end]
-                    buffer = buffer[header_end + 4:]
-
-                    # Parse Content-Length
-                    content_length = 0
-                    for line in header.split("\r\n"):
-                        if line.startswith("Content-Length:"):
-                            content_length = int(line.split(":")[1].strip())
-                            break
-
-                    if content_length > 0:
-                        # Read content
-                        while len(buffer) < content_length:
-                            more = await asyncio.get_event_loop().run_in_executor(
-                                None, lambda: self._process.stdout.read(content_length - len(buffer))
-                            )
-                            if not more:
-                                break
-                            buffer += more
-
-                        content = buffer[:content_length]
-                        buffer = buffer[content_length:]
-
-                        # Parse JSON
-                        try:
-                            message = json.loads(content)
-                            await self._handle_message(message)
-                        except json.JSONDecodeError:
-                            pass
-
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                break
-
-    async def _handle_message(self, message: dict[str, Any]) -> None:
-        """Handle an incoming message from the server."""
-        # Check if it's a response
-        if "id" in message and message["id"] is not None:
-            request_id = message["id"]
-            future = self._pending_requests.pop(request_id, None)
-
-            if future and not future.done():
-                response = MCPResponse(
-                    result=message.get("result"),
-                    error=message.get("error"),
-                    id=request_id,
-                )
-                future.set_result(response)
-
-        # Handle notifications (no id or id is null)
-        # For now, we just log them
-        elif "method" in message:
-            # Server notification
-            pass
+    async def _handle_notification(self, message: dict[str, Any]) -> None:
+        """Handle a notification from the server."""
+        # Change notifications invalidate cached results; others are ignored
+        self.cache.handle_notification(message["method"], message.get("params"))
 
     # High-level API methods
 
     async def list_tools(self) -> list[MCPTool]:
-        """Get list of tools provided by this server."""
-        response = await self.request("tools/list")
+        """Get list of tools provided by this server (cached for ``cache_ttl``)."""
+
+        async def load() -> tuple[list[MCPTool], bool]:
+            response = await self.request("tools/list")
+
+            if response.is_error:
+                return [], False
+
+            tools = []
+            for tool_data in response.result.get("tools", []):
+                tool = MCPTool(
+                    name=tool_data.get("name", ""),
+                    description=tool_data.get("description", ""),
+                    input_schema=tool_data.get("inputSchema", {}),
+                    server_name=self.config.name,
+                    annotations=tool_data.get("annotations") or {},
+                )
+                tools.append(tool)
 
-        if response.is_error:
-            return []
-
-        tools = []
-        for tool_data in response.result.get("tools", []):
-            tool = MCPTool(
-                name=tool_data.get("name", ""),
-                description=tool_data.get("description", ""),
-                input_schema=tool_data.get("inputSchema", {}),
-                server_name=self.config.name,
-            )
-            tools.append(tool)
+            self._idempotent_tools = {tool.name for tool in tools if tool.idempotent}
+            return tools, True
 
-        return tools
+        return list(await self.cache.get_or_load(TOOLS, None, self.config.cache_ttl, load))
 
     async def call_tool(
         self,
@@ -345,6 +222,10 @@ class MCPClient:
         """
         Call a tool on the server.
 
+        With ``cache_tool_results`` set, results of tools the server
+        declares idempotent (``idempotentHint``) are reused for identical
+        arguments for ``cache_ttl`` seconds; error results never are.
+
         Args:
             name: Tool name
             arguments: Tool arguments
@@ -352,66 +233,93 @@ class MCPClient:
         Returns:
             Tool result
         """
-        response = await self.request(
-            "tools/call",
-            {
-                "name": name,
-                "arguments": arguments or {},
-            },
-        )
 
-        if response.is_error:
-            raise RuntimeError(f"Tool call failed: {response.error}")
+        async def load() -> tuple[Any, bool]:
+            response = await self.request(
+                "tools/call",
+                {
+                    "name": name,
+                    "arguments": arguments or {},
+                },
+            )
 
-        return response.result
+            if response.is_error:
+                raise RuntimeError(f"Tool call failed: {response.error}")
+
+            result = response.result
+            return result, not (isinstance(result, dict) and result.get("isError"))
+
+        if not self.config.cache_tool_results or name not in self._idempotent_tools:
+            value, _ = await load()
+            return value
+
+        key = (name, json.dumps(arguments or {}, sort_keys=True, default=str))
+        return await self.cache.get_or_load(TOOL_CALL, key, self.config.cache_ttl, load)
 
     async def list_resources(self) -> list[MCPResource]:
-        """Get list of resources provided by this server."""
-        response = await self.request("resources/list")
+        """Get list of resources provided by this server (cached for ``cache_ttl``)."""
+
+        async def load() -> tuple[list[MCPResource], bool]:
+            response = await self.request("resources/list")
+
+            if response.is_error:
+                return [], False
+
+            resources = []
+            for res_data in response.result.get("resources", []):
+                resource = MCPResource(
+                    uri=res_data.get("uri", ""),
+                    name=res_data.get("name", ""),
+                    description=res_data.get("description", ""),
+                    mime_type=res_data.get("mimeType", "text/plain"),
+                    server_name=self.config.name,
+                )
+                resources.append(resource)
 
-        if response.is_error:
-            return []
-
-        resources = []
-        for res_data in response.result.get("resources", []):
-            resource = MCPResource(
-                uri=res_data.get("uri", ""),
-                name=res_data.get("name", ""),
-                description=res_data.get("description", ""),
-                mime_type=res_data.get("mimeType", "text/plain"),
-                server_name=self.config.name,
-            )
-            resources.append(resource)
+            return resources, True
 
-        return resources
+        return list(await self.cache.get_or_load(RESOURCES, None, self.config.cache_ttl, load))
 
     async def read_resource(self, uri: str) -> Any:
-        """Read a resource from the server."""
-        response = await self.request("resources/read", {"uri": uri})
+        """
+        Read a resource from the server.
 
-        if response.is_error:
-            raise RuntimeError(f"Resource read failed: {response.error}")
+        Reads are cached for ``resource_cache_ttl`` seconds, or until the
+        server reports the resource updated. Don't modify the result.
+        """
 
-        return response.result
+        async def load() -> tuple[Any, bool]:
+            response = await self.request("resources/read", {"uri": uri})
+
+            if response.is_error:
+                raise RuntimeError(f"Resource read failed: {response.error}")
+
+            return response.result, True
+
+        return await self.cache.get_or_load(RESOURCE, uri, self.config.resource_cache_ttl, load)
 
     async def list_prompts(self) -> list[MCPPrompt]:
-        """Get list of prompts provided by this server."""
-        response = await self.request("prompts/list")
+        """Get list of prompts provided by this server (cached for ``cache_ttl``)."""
 
-        if response.is_error:
-            return []
-
-        prompts = []
-        for prompt_data in response.result.get("prompts", []):
-            prompt = MCPPrompt(
-                name=prompt_data.get("name", ""),
-                description=prompt_data.get("description", ""),
-                arguments=prompt_data.get("arguments", []),
-                server_name=self.config.name,
-            )
-            prompts.append(prompt)
+        async def load() -> tuple[list[MCPPrompt], bool]:
+            response = await self.request("prompts/list")
+
+            if response.is_error:
+                return [], False
+
+            prompts = []
+            for prompt_data in response.result.get("prompts", []):
+                prompt = MCPPrompt(
+                    name=prompt_data.get("name", ""),
+                    description=prompt_data.get("description", ""),
+                    arguments=prompt_data.get("arguments", []),
+                    server_name=self.config.name,
+                )
+                prompts.append(prompt)
+
+            return prompts, True
 
-        return prompts
+        return list(await self.cache.get_or_load(PROMPTS, None, self.config.cache_ttl, load))
 
     async def get_prompt(
         self,
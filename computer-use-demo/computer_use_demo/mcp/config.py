@@ -87,6 +87,10 @@ def parse_mcp_servers(settings: dict[str, Any]) -> list[MCPServerConfig]:
             auto_start=server_config.get("autoStart", True),
             startup_timeout=server_config.get("startupTimeout", 30.0),
             enabled=server_config.get("enabled", True),
+            framing=server_config.get("framing", "newline"),
+            cache_ttl=server_config.get("cacheTtl", 300.0),
+            resource_cache_ttl=server_config.get("resourceCacheTtl", 30.0),
+            cache_tool_results=server_config.get("cacheToolResults", False),
         )
         configs.append(config)
 
@@ -168,6 +172,10 @@ def save_mcp_config(
         "autoStart": config.auto_start,
         "startupTimeout": config.startup_timeout,
         "enabled": config.enabled,
+        "framing": config.framing,
+        "cacheTtl": config.cache_ttl,
+        "resourceCacheTtl": config.resource_cache_ttl,
+        "cacheToolResults": config.cache_tool_results,
     }
 
     # Save
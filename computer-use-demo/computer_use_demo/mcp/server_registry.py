@@ -160,7 +160,7 @@ class MCPServerRegistry:
         info = MCPServerInfo(
             name=name,
             status=client.status if client else MCPServerStatus.STOPPED,
-            pid=client._process.pid if client and client._process else None,
+            pid=client.pid if client else None,
         )
 
         return info
@@ -177,12 +177,18 @@ class MCPServerRegistry:
                 info = MCPServerInfo(
                     name=name,
                     status=client.status if client else MCPServerStatus.STOPPED,
-                    pid=client._process.pid if client and client._process else None,
+                    pid=client.pid if client else None,
                 )
                 servers.append(info)
 
         return servers
 
+    def get_cache_stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Result cache hits, misses and hit rate per server and entry kind."""
+        with self._lock:
+            clients = dict(self._clients)
+        return {name: client.cache.get_stats() for name, client in clients.items()}
+
     async def list_all_tools(self) -> list[MCPTool]:
         """List tools from all running servers."""
         all_tools = []
@@ -45,6 +45,19 @@ class MCPServerConfig:
     # Whether this server is enabled
     enabled: bool = True
 
+    # Message framing on stdio: "newline" (one JSON message per line, the
+    # MCP stdio transport) or "content-length" (LSP-style headers)
+    framing: str = "newline"
+
+    # Seconds tool/resource/prompt listings stay cached (0 = no caching)
+    cache_ttl: float = 300.0
+
+    # Seconds resource reads stay cached (0 = no caching)
+    resource_cache_ttl: float = 30.0
+
+    # Reuse results of tools annotated with idempotentHint for cache_ttl
+    cache_tool_results: bool = False
+
 
 @dataclass
 class MCPTool:
@@ -62,6 +75,14 @@ class MCPTool:
     # Server that provides this tool
     server_name: str = ""
 
+    # Behaviour hints (readOnlyHint, idempotentHint, destructiveHint, ...)
+    annotations: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def idempotent(self) -> bool:
+        """Whether the server declares repeated identical calls safe."""
+        return bool(self.annotations.get("idempotentHint"))
+
 
 @dataclass
 class MCPResource:
@@ -6,9 +6,13 @@ Provides comprehensive, AI-readable logging for:
 - Agent behavior (tool selection, execution)
 - System events (server lifecycle, errors)
 
-All logs are in JSON Lines format for easy parsing and analysis.
+All logs are in JSON Lines format for easy parsing and analysis. Logs are
+rotated into time-partitioned (optionally compressed) segments; see
+``segments.py``.
 """
 
+from .segments import LogSegmenter, SegmentInfo, list_segments
+from .session_index import SessionIndex
 from .structured_logger import (
     EventType,
     LogLevel,
@@ -19,6 +23,10 @@ from .structured_logger import (
 __all__ = [
     "EventType",
     "LogLevel",
+    "LogSegmenter",
+    "SegmentInfo",
+    "SessionIndex",
     "StructuredLogger",
     "get_logger",
+    "list_segments",
 ]
@@ -0,0 +1,386 @@
+"""
+Segment rotation for the proto_*.jsonl logs.
+
+Each log stream (``proto_sessions``, ``proto_errors``, ...) is written to an
+active file in the log directory. When the active file grows past a size
+limit, or its entries belong to a different time partition (day/hour) than
+the entry about to be written, it is moved into ``segments/`` and a new
+active file is started. Closed segments are optionally compressed (gzip, or
+zstd when the ``zstandard`` package is installed) on a background thread,
+and described in ``segments/manifest.json`` with their min/max timestamps,
+entry count and session ids, so readers can skip segments that cannot
+contain what they are looking for.
+
+Layout:
+    logs/
+        proto_sessions.jsonl                          active file
+        segments/
+            manifest.json
+            proto_sessions.20250101T000000.jsonl.gz  closed segment
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+Partition = Literal["daily", "hourly"]
+Compression = Literal["gzip", "zstd"]
+
+SEGMENTS_DIR = "segments"
+MANIFEST_FILE = "manifest.json"
+
+_PARTITION_LENGTH = {"daily": 10, "hourly": 13}  # Prefix of the ISO timestamp
+_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+
+@dataclass
+class SegmentInfo:
+    """Manifest entry for one closed segment."""
+
+    file: str
+    stream: str
+    min_ts: str | None = None
+    max_ts: str | None = None
+    entries: int = 0
+    bytes: int = 0
+    compression: str | None = None
+    sessions: list[str] = field(default_factory=list)
+
+    def overlaps(self, start: str | None = None, end: str | None = None) -> bool:
+        """Whether the segment may hold entries in [start, end]."""
+        if start and self.max_ts and self.max_ts < start:
+            return False
+        if end and self.min_ts and self.min_ts > end:
+            return False
+        return True
+
+
+def segment_stream(path: Path) -> str:
+    """Stream name of a segment or active file ("proto_sessions", ...)."""
+    return path.name.split(".", 1)[0]
+
+
+def open_segment(path: Path) -> io.BufferedIOBase:
+    """Open a plain or compressed log file for binary reading."""
+    name = path.name
+    if name.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if name.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.BufferedReader(reader)  # type: ignore[arg-type]
+    return open(path, "rb")
+
+
+def iter_file(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream the JSON entries of one log file (plain or compressed)."""
+    try:
+        f = open_segment(path)
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class LogSegmenter:
+    """Rotates active log files into segments and maintains the manifest."""
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_bytes: int | None = 64 * 1024 * 1024,
+        partition: Partition | None = "daily",
+        compression: Compression | None = None,
+    ):
+        """
+        Args:
+            log_dir: Directory holding the active proto_*.jsonl files.
+            max_bytes: Rotate when the active file reaches this size.
+            partition: Rotate when the day/hour of the next entry differs
+                from the first entry of the active file.
+            compression: Compress closed segments ("gzip" or "zstd").
+        """
+        self.log_dir = Path(log_dir)
+        self.segments_dir = self.log_dir / SEGMENTS_DIR
+        self.max_bytes = max_bytes
+        self.partition = partition
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            print("zstandard not installed - compressing log segments with gzip")
+            compression = "gzip"
+        self.compression = compression
+
+        self._first_keys: dict[Path, str | None] = {}
+        self._manifest_lock = threading.Lock()
+        self._finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log_segmenter")
+
+    # ==================== Writing side ====================
+
+    def should_rotate(self, log_file: Path, next_timestamp: str | None) -> bool:
+        """Check (with one stat) whether ``log_file`` must be rotated first."""
+        try:
+            size = log_file.stat().st_size
+        except FileNotFoundError:
+            return False
+        if size == 0:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.partition and next_timestamp:
+            first_key = self._first_key(log_file)
+            return first_key is not None and first_key != self._partition_key(next_timestamp)
+        return False
+
+    def rotate(self, log_file: Path) -> Path | None:
+        """
+        Move the active file into ``segments/`` and schedule finalization.
+
+        Callers holding an open handle on ``log_file`` must close it first.
+        """
+        first_ts = self._first_timestamp(log_file)
+        self._first_keys.pop(log_file, None)
+        if first_ts is None:
+            return None
+
+        self.segments_dir.mkdir(exist_ok=True)
+        stamp = "".join(ch for ch in first_ts[:19] if ch.isalnum())
+        stream = segment_stream(log_file)
+        target = self.segments_dir / f"{stream}.{stamp}.jsonl"
+        counter = 1
+        while any(target.with_name(target.name + ext).exists() for ext in ("", ".gz", ".zst")):
+            target = self.segments_dir / f"{stream}.{stamp}-{counter}.jsonl"
+            counter += 1
+
+        try:
+            os.replace(log_file, target)
+        except FileNotFoundError:
+            return None  # Another process rotated it first
+        log_file.touch()
+        self._finalizer.submit(self._finalize, target)
+        return target
+
+    def close(self) -> None:
+        """Wait for pending compressions / manifest updates."""
+        self._finalizer.shutdown(wait=True)
+        self._finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log_segmenter")
+
+    def _finalize(self, segment: Path) -> None:
+        """Collect segment stats, compress it and record it in the manifest."""
+        try:
+            info = SegmentInfo(file=segment.name, stream=segment_stream(segment))
+            sessions: set[str] = set()
+            for entry in iter_file(segment):
+                ts = entry.get("timestamp")
+                if ts:
+                    info.min_ts = ts if info.min_ts is None else min(info.min_ts, ts)
+                    info.max_ts = ts if info.max_ts is None else max(info.max_ts, ts)
+                if entry.get("session_id"):
+                    sessions.add(entry["session_id"])
+                info.entries += 1
+            info.sessions = sorted(sessions)
+
+            if self.compression:
+                segment = self._compress(segment)
+                info.file = segment.name
+                info.compression = self.compression
+            info.bytes = segment.stat().st_size
+
+            with self._manifest_lock:
+                manifest = self._read_manifest()
+                manifest = [s for s in manifest if s.file != info.file]
+                manifest.append(info)
+                self._write_manifest(manifest)
+        except Exception as e:
+            print(f"Failed to finalize log segment {segment}: {e}")
+
+    def _compress(self, segment: Path) -> Path:
+        suffix = ".gz" if self.compression == "gzip" else ".zst"
+        target = segment.with_name(segment.name + suffix)
+        tmp = target.with_name(target.name + ".tmp")
+        with open(segment, "rb") as src, open(tmp, "wb") as raw:
+            if self.compression == "gzip":
+                with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                    while chunk := src.read(1024 * 1024):
+                        dst.write(chunk)
+            else:
+                zstandard.ZstdCompressor().copy_stream(src, raw)
+        os.replace(tmp, target)
+        segment.unlink()
+        return target
+
+    # ==================== Reading side ====================
+
+    def segments(
+        self,
+        stream: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        session_id: str | None = None,
+    ) -> list[Path]:
+        """Closed segments that may hold matching entries, oldest first."""
+        return list_segments(self.log_dir, stream, start=start, end=end, session_id=session_id)
+
+    def _first_key(self, log_file: Path) -> str | None:
+        if log_file not in self._first_keys:
+            first_ts = self._first_timestamp(log_file)
+            self._first_keys[log_file] = self._partition_key(first_ts) if first_ts else None
+        return self._first_keys[log_file]
+
+    def _partition_key(self, timestamp: str) -> str:
+        return timestamp[: _PARTITION_LENGTH[self.partition]] if self.partition else ""
+
+    @staticmethod
+    def _first_timestamp(log_file: Path) -> str | None:
+        try:
+            with open(log_file, "rb") as f:
+                for line in f:
+                    try:
+                        return json.loads(line).get("timestamp")
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return None
+
+    def _read_manifest(self) -> list[SegmentInfo]:
+        return read_manifest(self.log_dir)
+
+    def _write_manifest(self, manifest: list[SegmentInfo]) -> None:
+        manifest.sort(key=lambda s: (s.stream, s.min_ts or "", s.file))
+        path = self.segments_dir / MANIFEST_FILE
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps([asdict(s) for s in manifest], indent=2))
+        os.replace(tmp, path)
+
+
+def read_manifest(log_dir: Path) -> list[SegmentInfo]:
+    """Manifest entries of ``log_dir`` (empty if there are no segments yet)."""
+    path = Path(log_dir) / SEGMENTS_DIR / MANIFEST_FILE
+    try:
+        return [SegmentInfo(**s) for s in json.loads(path.read_text())]
+    except (OSError, json.JSONDecodeError, TypeError):
+        return []
+
+
+def list_segments(
+    log_dir: Path,
+    stream: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    session_id: str | None = None,
+) -> list[Path]:
+    """
+    Closed segments of ``log_dir`` overlapping the requested range/session.
+
+    Segments that are not in the manifest yet (still being finalized) are
+    always included, since nothing is known about their contents.
+    """
+    segments_dir = Path(log_dir) / SEGMENTS_DIR
+    if not segments_dir.exists():
+        return []
+
+    known = {info.file: info for info in read_manifest(log_dir)}
+    selected: list[Path] = []
+    for path in segments_dir.iterdir():
+        if not path.name.endswith(_SUFFIXES):
+            continue
+        if stream and segment_stream(path) != stream:
+            continue
+        info = known.get(path.name)
+        if info:
+            if not info.overlaps(start, end):
+                continue
+            if session_id and session_id not in info.sessions:
+                continue
+        selected.append(path)
+    return sorted(selected, key=_segment_order)
+
+
+def _segment_order(path: Path) -> tuple[str, str, int]:
+    """Sort key: names embed the first timestamp plus a collision counter."""
+    stream, rest = path.name.split(".", 1)
+    stamp, _, counter = rest.split(".", 1)[0].partition("-")
+    return stream, stamp, int(counter or 0)
+
+
+def iter_stream(
+    log_dir: Path,
+    stream: str,
+    start: str | None = None,
+    end: str | None = None,
+    session_id: str | None = None,
+    event_types: Collection[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream one log (closed segments, then the active file) in write order.
+
+    Segments outside [start, end] or without ``session_id`` are skipped
+    using the manifest; remaining entries are filtered individually.
+    """
+    log_dir = Path(log_dir)
+    files = list_segments(log_dir, stream, start=start, end=end, session_id=session_id)
+    files.append(log_dir / f"{stream}.jsonl")
+    for path in files:
+        for entry in iter_file(path):
+            if entry_matches(entry, start, end, session_id, event_types):
+                yield entry
+
+
+def tail_stream(log_dir: Path, stream: str, limit: int) -> list[dict[str, Any]]:
+    """
+    The last ``limit`` entries of one log, oldest first.
+
+    The active file is read first and closed segments only as far back as
+    needed, so a rotation doesn't hide recent entries.
+    """
+    log_dir = Path(log_dir)
+    files = [log_dir / f"{stream}.jsonl", *reversed(list_segments(log_dir, stream))]
+    collected: list[dict[str, Any]] = []
+    for path in files:
+        needed = limit - len(collected)
+        if needed <= 0:
+            break
+        collected = list(deque(iter_file(path), maxlen=needed)) + collected
+    return collected
+
+
+def entry_matches(
+    entry: dict[str, Any],
+    start: str | None = None,
+    end: str | None = None,
+    session_id: str | None = None,
+    event_types: Collection[str] | None = None,
+) -> bool:
+    """Whether a log entry passes the time range / session / event filters."""
+    ts = entry.get("timestamp", "")
+    if start and ts < start:
+        return False
+    if end and ts > end:
+        return False
+    if session_id and entry.get("session_id") != session_id:
+        return False
+    if event_types and entry.get("event_type") not in event_types:
+        return False
+    return True
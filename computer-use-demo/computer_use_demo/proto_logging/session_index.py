@@ -0,0 +1,278 @@
+"""
+Persistent SQLite index over the session JSONL log.
+
+The index records, per session, the creation time, the first user message
+(preview) and the byte offset of every entry, so the web UI can list
+history and fetch one session's messages with a single query and a few
+seeks instead of parsing the whole log on every request.
+
+Indexing is incremental: the index remembers how many bytes of each log
+file it has seen and only parses what was appended since. This keeps it
+correct when several processes (web UI, daemon, CLI) append to the same
+log, and avoids a SQLite transaction per log line on the write path.
+
+Closed (rotated) segments are indexed once; offsets into compressed
+segments refer to the decompressed stream. The active file is tracked by
+inode, so a file rotated away and recreated is re-indexed from the start
+even if it has already grown past the old offset.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from .segments import open_segment
+
+# Bumped on schema changes; the index is rebuilt from the logs
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    indexed_bytes INTEGER NOT NULL,
+    st_dev INTEGER,
+    st_ino INTEGER
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    preview TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    session_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp TEXT,
+    event_type TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_by_session ON entries (session_id, timestamp, offset);
+CREATE INDEX IF NOT EXISTS sessions_by_created ON sessions (created_at);
+"""
+
+# Events that make up the conversation shown in the history view
+MESSAGE_EVENTS = ("message_sent", "assistant_response", "tool_use")
+
+
+class SessionIndex:
+    """Offset index of session log entries keyed by session_id."""
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS sessions; "
+                "DROP TABLE IF EXISTS entries;"
+            )
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def sync(self, log_file: Path, segments: list[Path] | tuple[Path, ...] = ()) -> int:
+        """
+        Index entries appended to ``log_file`` since the last sync.
+
+        Args:
+            log_file: Active log file (may still be appended to).
+            segments: Closed segments of the same log. Each is indexed once;
+                entries of segments that no longer exist are dropped.
+
+        Returns:
+            Number of new entries indexed.
+        """
+        with self._lock:
+            # Also drops entries of segments removed by retention
+            count = self._sync_segments(log_file, segments)
+            count += self._sync_file(Path(log_file))
+            self._conn.commit()
+            return count
+
+    def _sync_segments(self, log_file: Path, segments: list[Path] | tuple[Path, ...]) -> int:
+        live = {str(Path(segment).resolve()) for segment in segments}
+        active = str(Path(log_file).resolve())
+        known = dict(self._conn.execute("SELECT path, indexed_bytes FROM files").fetchall())
+        for path in known:
+            if path != active and path not in live and not Path(path).exists():
+                self._conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+        count = 0
+        for segment in segments:
+            segment = Path(segment)
+            path = str(segment.resolve())
+            try:
+                stat = segment.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(path) == stat.st_size:
+                continue  # Closed segments never change once indexed
+
+            # The segment may be the former active file, renamed: its entries
+            # are indexed under the old path up to some offset. Re-index fully.
+            self._conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+            offset = 0
+            with open_segment(segment) as f:
+                for line in f:
+                    self._index_line(path, offset, line)
+                    offset += len(line)
+                    count += 1
+            self._set_indexed(path, stat.st_size, stat)
+        return count
+
+    def _sync_file(self, log_file: Path) -> int:
+        path = str(log_file.resolve())
+        row = self._conn.execute(
+            "SELECT indexed_bytes, st_dev, st_ino FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        start = row[0] if row else 0
+
+        try:
+            stat = log_file.stat()
+        except FileNotFoundError:
+            return 0
+        replaced = row is not None and (row[1], row[2]) != (stat.st_dev, stat.st_ino)
+        if replaced or stat.st_size < start:
+            # File was truncated, replaced or rotated: rebuild its entries
+            self._conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+            start = 0
+        if stat.st_size == start:
+            if replaced:
+                self._set_indexed(path, 0, stat)
+            return 0
+
+        count = 0
+        offset = start
+        with open(log_file, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partial line still being written
+                self._index_line(path, offset, line)
+                offset += len(line)
+                count += 1
+        self._set_indexed(path, offset, stat)
+        return count
+
+    def _set_indexed(self, path: str, indexed_bytes: int, stat: os.stat_result) -> None:
+        self._conn.execute(
+            "INSERT INTO files (path, indexed_bytes, st_dev, st_ino) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET indexed_bytes = excluded.indexed_bytes, "
+            "st_dev = excluded.st_dev, st_ino = excluded.st_ino",
+            (path, indexed_bytes, stat.st_dev, stat.st_ino),
+        )
+
+    def _index_line(self, path: str, offset: int, line: bytes) -> None:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        session_id = entry.get("session_id")
+        if not session_id:
+            return
+
+        event_type = entry.get("event_type")
+        timestamp = entry.get("timestamp")
+        self._conn.execute(
+            "INSERT INTO entries (session_id, path, offset, length, timestamp, event_type) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, path, offset, len(line), timestamp, event_type),
+        )
+        # Counts and the last timestamp are aggregated from entries when
+        # listing, so re-indexing a file (truncation, rotation) can't skew them
+        self._conn.execute(
+            "INSERT OR IGNORE INTO sessions (session_id) VALUES (?)", (session_id,)
+        )
+
+        if event_type == "session_created":
+            self._conn.execute(
+                "UPDATE sessions SET created_at = ? WHERE session_id = ?",
+                (timestamp, session_id),
+            )
+        elif event_type == "message_sent":
+            data = entry.get("data") or {}
+            if data.get("role") == "user":
+                self._conn.execute(
+                    "UPDATE sessions SET preview = ? WHERE session_id = ? AND preview IS NULL",
+                    ((data.get("message") or "")[:100], session_id),
+                )
+
+    def list_sessions(self, prefix: str = "", limit: int = 50) -> list[dict[str, Any]]:
+        """Sessions with a creation event, a preview and entries, newest first."""
+        # Pick the page first, then aggregate entries of those sessions only
+        events = ", ".join("?" for _ in MESSAGE_EVENTS)
+        with self._lock:
+            rows = self._conn.execute(
+                "WITH page AS ("
+                "SELECT session_id, created_at, preview FROM sessions s "
+                "WHERE session_id LIKE ? AND created_at IS NOT NULL AND preview IS NOT NULL "
+                "AND EXISTS (SELECT 1 FROM entries e WHERE e.session_id = s.session_id) "
+                "ORDER BY created_at DESC LIMIT ?) "
+                "SELECT p.session_id, p.created_at, MAX(e.timestamp), p.preview, "
+                f"SUM(e.event_type IN ({events})) "
+                "FROM page p JOIN entries e ON e.session_id = p.session_id "
+                "GROUP BY p.session_id ORDER BY p.created_at DESC",
+                (f"{prefix}%", limit, *MESSAGE_EVENTS),
+            ).fetchall()
+        return [
+            {
+                "session_id": session_id,
+                "created_at": created_at,
+                "last_timestamp": last_timestamp,
+                "preview": preview,
+                "message_count": message_count,
+            }
+            for session_id, created_at, last_timestamp, preview, message_count in rows
+        ]
+
+    def read_entries(
+        self,
+        session_id: str,
+        event_types: tuple[str, ...] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Read a session's log entries by seeking to their offsets."""
+        query = "SELECT path, offset, length FROM entries WHERE session_id = ?"
+        params: list[Any] = [session_id]
+        if event_types:
+            query += f" AND event_type IN ({', '.join('?' for _ in event_types)})"
+            params.extend(event_types)
+        query += " ORDER BY timestamp, offset"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        # Read each file front to back (compressed segments can only be
+        # read forward), then restore the requested order
+        by_path: dict[str, list[tuple[int, int, int]]] = {}
+        for position, (path, offset, length) in enumerate(rows):
+            by_path.setdefault(path, []).append((offset, length, position))
+
+        found: list[tuple[int, dict[str, Any]]] = []
+        for path, spans in by_path.items():
+            try:
+                f = open_segment(Path(path))
+            except FileNotFoundError:
+                continue
+            with f:
+                seekable = not path.endswith((".gz", ".zst"))
+                current = 0
+                for offset, length, position in sorted(spans):
+                    if seekable:
+                        f.seek(offset)
+                    elif offset > current:
+                        f.read(offset - current)
+                    data = f.read(length)
+                    current = offset + len(data)
+                    try:
+                        found.append((position, json.loads(data)))
+                    except json.JSONDecodeError:
+                        continue
+        found.sort(key=lambda item: item[0])
+        return [entry for _, entry in found]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -5,14 +5,21 @@ Provides AI-readable JSON logs for debugging, session replay, and analysis.
 All events are logged in JSONL format (JSON Lines) for easy parsing.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
+import threading
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal
 
+from .segments import Compression, LogSegmenter, Partition
+from .session_index import MESSAGE_EVENTS, SessionIndex
+
 # Event types for structured logging
 EventType = Literal[
     # User actions
@@ -56,6 +63,178 @@ EventType = Literal[
 
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
+# What the buffered writer does when its queue is full
+OverflowPolicy = Literal["drop", "block"]
+
+
+def _is_stale(handle, path: Path) -> bool:
+    """Whether an open handle no longer refers to the file at ``path``."""
+    try:
+        return os.fstat(handle.fileno()).st_ino != os.stat(path).st_ino
+    except FileNotFoundError:
+        return True
+
+
+class _BufferedWriter:
+    """
+    Background thread that batches log lines per file.
+
+    Callers only enqueue; formatting, sanitization and I/O happen on the
+    writer thread. Lines are flushed when a file's buffer reaches
+    ``flush_bytes`` or every ``flush_interval`` seconds, through file
+    handles that stay open for the lifetime of the writer.
+    """
+
+    def __init__(
+        self,
+        prepare,
+        max_queue: int = 10000,
+        flush_interval: float = 0.5,
+        flush_bytes: int = 64 * 1024,
+        overflow: OverflowPolicy = "drop",
+        segmenter: LogSegmenter | None = None,
+    ):
+        self._prepare = prepare
+        self._segmenter = segmenter
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.overflow = overflow
+
+        self._buffers: dict[Path, list[str]] = {}
+        self._buffered_bytes: dict[Path, int] = {}
+        self._first_timestamps: dict[Path, str] = {}
+        self._handles: dict[Path, Any] = {}
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.flushes = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="proto_log_writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: tuple, critical: bool = False) -> bool:
+        """
+        Enqueue an item for the writer thread.
+
+        Critical items (errors) are never dropped: when the queue is full the
+        caller blocks until there is room, as it does under the "block" policy.
+        """
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == "drop" and not critical:
+                self.dropped += 1
+                return False
+            self.blocked += 1
+            self._queue.put(item)
+        self.enqueued += 1
+        return True
+
+    def flush(self, timeout: float | None = 5.0) -> None:
+        """Block until everything enqueued so far is on disk."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(("close", None))
+            self._thread.join(timeout=5.0)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "flushes": self.flushes,
+            "write_errors": self.write_errors,
+            "queue_depth": self._queue.qsize(),
+        }
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                kind = item[0]
+                if kind == "flush":
+                    self._flush_all()
+                    item[1].set()
+                    last_flush = time.monotonic()
+                    continue
+                if kind == "close":
+                    self._flush_all()
+                    for handle in self._handles.values():
+                        handle.close()
+                    self._handles.clear()
+                    return
+                self._buffer(item)
+
+            if item is None or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_all()
+                last_flush = time.monotonic()
+
+    def _buffer(self, item: tuple) -> None:
+        try:
+            prepared = self._prepare(*item[1:])
+        except Exception as e:
+            self.write_errors += 1
+            print(f"Failed to format log: {e}")
+            return
+        log_file, line, timestamp = prepared
+        if log_file not in self._buffers:
+            self._buffers[log_file] = []
+            self._first_timestamps[log_file] = timestamp
+        self._buffers[log_file].append(line)
+        size = self._buffered_bytes.get(log_file, 0) + len(line)
+        self._buffered_bytes[log_file] = size
+        if size >= self.flush_bytes:
+            self._flush_file(log_file)
+
+    def _flush_all(self) -> None:
+        for log_file in list(self._buffers):
+            self._flush_file(log_file)
+
+    def _flush_file(self, log_file: Path) -> None:
+        lines = self._buffers.pop(log_file, None)
+        self._buffered_bytes.pop(log_file, None)
+        first_timestamp = self._first_timestamps.pop(log_file, None)
+        if not lines:
+            return
+        try:
+            handle = self._handles.get(log_file)
+            if self._segmenter and self._segmenter.should_rotate(log_file, first_timestamp):
+                if handle is not None:
+                    self._handles.pop(log_file).close()
+                    handle = None
+                self._segmenter.rotate(log_file)
+            elif handle is not None and _is_stale(handle, log_file):
+                # Rotated (or removed) by another process: reopen by name
+                self._handles.pop(log_file).close()
+                handle = None
+            if handle is None:
+                handle = self._handles[log_file] = open(log_file, "a")
+            handle.write("".join(lines))
+            handle.flush()
+            self.written += len(lines)
+            self.flushes += 1
+        except Exception as e:
+            # Fail silently - don't break the application
+            self.write_errors += 1
+            self._handles.pop(log_file, None)
+            print(f"Failed to write log: {e}")
+
 
 class StructuredLogger:
     """
@@ -71,6 +250,14 @@ class StructuredLogger:
         log_level: LogLevel = "INFO",
         enable_console: bool = True,
         enable_sanitization: bool = True,
+        buffered: bool = False,
+        flush_interval: float = 0.5,
+        flush_bytes: int = 64 * 1024,
+        max_queue: int = 10000,
+        overflow: OverflowPolicy = "drop",
+        rotate_bytes: int | None = None,
+        rotate_interval: Partition | None = None,
+        compression: Compression | None = None,
     ):
         """
         Initialize structured logger.
@@ -80,6 +267,16 @@ class StructuredLogger:
             log_level: Minimum log level to record
             enable_console: Also print logs to console
             enable_sanitization: Redact sensitive data
+            buffered: Hand entries to a background writer thread instead of
+                writing them on the caller's thread
+            flush_interval: Buffered mode: max seconds before lines hit disk
+            flush_bytes: Buffered mode: per-file buffer size that forces a flush
+            max_queue: Buffered mode: entries that may wait for the writer
+            overflow: Buffered mode: "drop" non-error entries or "block" the
+                caller when the queue is full
+            rotate_bytes: Move a log into segments/ once it reaches this size
+            rotate_interval: Start a new segment every "daily" or "hourly"
+            compression: Compress closed segments with "gzip" or "zstd"
         """
         # Determine log directory
         if log_dir is None:
@@ -103,6 +300,71 @@ class StructuredLogger:
         for log_file in [self.session_log, self.error_log, self.tool_log, self.system_log]:
             log_file.touch(exist_ok=True)
 
+        # Offset index over the session log (opened on first query)
+        self._session_index: SessionIndex | None = None
+
+        self.segmenter: LogSegmenter | None = None
+        if rotate_bytes or rotate_interval:
+            self.segmenter = LogSegmenter(
+                self.log_dir,
+                max_bytes=rotate_bytes,
+                partition=rotate_interval,
+                compression=compression,
+            )
+
+        self._writer: _BufferedWriter | None = None
+        if buffered:
+            self._writer = _BufferedWriter(
+                self._prepare_entry,
+                max_queue=max_queue,
+                flush_interval=flush_interval,
+                flush_bytes=flush_bytes,
+                overflow=overflow,
+                segmenter=self.segmenter,
+            )
+        if self._writer or self.segmenter:
+            atexit.register(self.close)
+
+    def flush(self) -> None:
+        """Wait until all buffered entries are written (no-op when unbuffered)."""
+        if self._writer:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush and stop the background writer, finish pending segments."""
+        if self._writer:
+            self._writer.close()
+        if self.segmenter:
+            self.segmenter.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Writer counters (enqueued/written/dropped/blocked/flushes/queue_depth)."""
+        if self._writer:
+            return {"buffered": True, **self._writer.stats()}
+        return {"buffered": False}
+
+    @property
+    def session_index(self) -> SessionIndex:
+        """Index of the session log, caught up with everything written so far."""
+        self.flush()
+        if self._session_index is None:
+            self._session_index = SessionIndex(self.log_dir / "proto_sessions.index.sqlite")
+        segments = self.segmenter.segments("proto_sessions") if self.segmenter else []
+        self._session_index.sync(self.session_log, segments=segments)
+        return self._session_index
+
+    def list_session_history(self, prefix: str = "", limit: int = 50) -> list[dict[str, Any]]:
+        """Sessions recorded in the session log, newest first."""
+        return self.session_index.list_sessions(prefix=prefix, limit=limit)
+
+    def get_session_entries(
+        self,
+        session_id: str,
+        event_types: tuple[str, ...] | None = MESSAGE_EVENTS,
+    ) -> list[dict[str, Any]]:
+        """Logged entries of one session (conversation events by default)."""
+        return self.session_index.read_entries(session_id, event_types=event_types)
+
     def log_event(
         self,
         event_type: EventType,
@@ -133,28 +395,63 @@ class StructuredLogger:
             "context": context or {},
         }
 
+        if self._writer:
+            # Formatting and I/O happen on the writer thread. The traceback
+            # object travels with the exception, so it can be rendered there.
+            # The caller's dicts are copied, as it may change them meanwhile.
+            log_entry["data"] = dict(log_entry["data"])
+            log_entry["context"] = dict(log_entry["context"])
+            self._writer.submit(
+                ("entry", event_type, log_entry, error),
+                critical=level in ("ERROR", "CRITICAL"),
+            )
+            return
+
+        try:
+            prepared = self._prepare_entry(event_type, log_entry, error)
+        except Exception as e:
+            # Fail silently - don't break the application
+            print(f"Failed to write log: {e}")
+            return
+        self._write_to_file(*prepared)
+
+    def _prepare_entry(
+        self,
+        event_type: EventType,
+        log_entry: dict[str, Any],
+        error: Exception | None,
+    ) -> tuple[Path, str, str]:
+        """Finish an entry and return (log file, JSON line, timestamp)."""
         # Add error information if present
         if error:
+            if error.__traceback__ is not None:
+                stack_trace = "".join(
+                    traceback.format_exception(type(error), error, error.__traceback__)
+                )
+            else:
+                stack_trace = traceback.format_exc()
             log_entry["error"] = {
                 "type": type(error).__name__,
                 "message": str(error),
-                "stack_trace": traceback.format_exc(),
+                "stack_trace": stack_trace,
             }
 
         # Sanitize sensitive data if enabled
         if self.enable_sanitization:
             log_entry = self._sanitize(log_entry)
 
-        # Write to appropriate log file
-        self._write_to_file(event_type, log_entry)
-
         # Also print to console if enabled
         if self.enable_console:
             self._print_to_console(log_entry)
 
-    def _write_to_file(self, event_type: EventType, log_entry: dict[str, Any]) -> None:
-        """Write log entry to appropriate file based on event type."""
-        # Determine which file to write to
+        return (
+            self._log_file_for(event_type, log_entry),
+            json.dumps(log_entry) + "\n",
+            log_entry["timestamp"],
+        )
+
+    def _log_file_for(self, event_type: EventType, log_entry: dict[str, Any]) -> Path:
+        """Determine which file an entry belongs to based on event type."""
         if event_type.startswith("error_") or log_entry["level"] == "ERROR":
             log_file = self.error_log
         elif event_type.startswith("tool_"):
@@ -163,11 +460,15 @@ class StructuredLogger:
             log_file = self.system_log
         else:
             log_file = self.session_log
+        return log_file
 
-        # Write as JSON line
+    def _write_to_file(self, log_file: Path, line: str, timestamp: str) -> None:
+        """Write a JSON line synchronously (unbuffered mode)."""
         try:
+            if self.segmenter and self.segmenter.should_rotate(log_file, timestamp):
+                self.segmenter.rotate(log_file)
             with open(log_file, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
+                f.write(line)
         except Exception as e:
             # Fail silently - don't break the application
             print(f"Failed to write log: {e}")
@@ -291,11 +592,21 @@ def get_logger() -> StructuredLogger:
         log_level = os.getenv("PROTO_LOG_LEVEL", "INFO")
         enable_console = os.getenv("PROTO_LOG_CONSOLE", "true").lower() == "true"
         enable_sanitization = os.getenv("PROTO_LOG_SANITIZE", "true").lower() == "true"
+        buffered = os.getenv("PROTO_LOG_BUFFERED", "true").lower() == "true"
+        rotate_mb = float(os.getenv("PROTO_LOG_ROTATE_MB", "64"))
+        rotate_interval = os.getenv("PROTO_LOG_ROTATE_INTERVAL", "daily").lower()
+        compression = os.getenv("PROTO_LOG_COMPRESSION", "").lower()
 
         _logger = StructuredLogger(
             log_dir=log_dir,
             log_level=log_level,  # type: ignore
             enable_console=enable_console,
             enable_sanitization=enable_sanitization,
+            buffered=buffered,
+            flush_interval=float(os.getenv("PROTO_LOG_FLUSH_INTERVAL", "0.5")),
+            overflow=os.getenv("PROTO_LOG_OVERFLOW", "drop"),  # type: ignore
+            rotate_bytes=int(rotate_mb * 1024 * 1024) or None,
+            rotate_interval=rotate_interval if rotate_interval in ("daily", "hourly") else None,  # type: ignore
+            compression=compression if compression in ("gzip", "zstd") else None,  # type: ignore
         )
     return _logger
@@ -2,52 +2,198 @@
 Unified log viewer - merges all log files into chronological order.
 
 This makes it easy for AI to understand what happened by viewing a single timeline.
+
+Every log stream is already time-ordered, so the timeline is produced by a
+lazy k-way heap merge: memory use is bounded by the number of streams, not
+by the total log volume, and filters are pushed down to the segment reader.
 """
 
+import heapq
+import itertools
 import json
+import os
+import time
+from collections.abc import Collection, Iterator
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
+
+from .segments import entry_matches, iter_stream
+
+LOG_STREAMS = ("proto_sessions", "proto_errors", "proto_tools", "proto_system")
+
 
+def _timestamp(entry: dict[str, Any]) -> str:
+    return entry.get("timestamp", "")
 
-def merge_all_logs(log_dir: Path) -> list[dict[str, Any]]:
+
+def iter_merged_logs(
+    log_dir: Path,
+    start: str | None = None,
+    end: str | None = None,
+    session_id: str | None = None,
+    event_types: Collection[str] | None = None,
+    streams: tuple[str, ...] = LOG_STREAMS,
+) -> Iterator[dict[str, Any]]:
     """
-    Merge all log files into a single chronological list.
+    Lazily merge all log streams in chronological order.
+
+    Each log (rotated segments plus active file) is already in time order,
+    so the streams are k-way merged with a heap holding one entry per
+    stream. Segments outside the time range or session are never opened.
 
     Args:
         log_dir: Directory containing log files
+        start: Only include entries at or after this ISO timestamp
+        end: Only include entries at or before this ISO timestamp
+        session_id: Only include entries of this session
+        event_types: Only include entries with one of these event types
+        streams: Log streams to merge
+
+    Yields:
+        Log entries sorted by timestamp
+    """
+    if event_types is not None:
+        event_types = frozenset(event_types)
+    sources = [
+        iter_stream(
+            log_dir, stream, start=start, end=end, session_id=session_id, event_types=event_types
+        )
+        for stream in streams
+    ]
+    return heapq.merge(*sources, key=_timestamp)
+
+
+def merge_all_logs(
+    log_dir: Path,
+    start: str | None = None,
+    end: str | None = None,
+    session_id: str | None = None,
+    streams: tuple[str, ...] = LOG_STREAMS,
+    event_types: Collection[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Merge all log files into a single chronological list.
+
+    Prefer ``iter_merged_logs`` when the result does not need to be held
+    in memory at once.
 
     Returns:
         List of all log entries sorted by timestamp
     """
-    all_logs = []
-
-    # Load all log files
-    log_files = [
-        "proto_sessions.jsonl",
-        "proto_errors.jsonl",
-        "proto_tools.jsonl",
-        "proto_system.jsonl",
-    ]
+    return list(
+        iter_merged_logs(
+            log_dir,
+            start=start,
+            end=end,
+            session_id=session_id,
+            event_types=event_types,
+            streams=streams,
+        )
+    )
 
-    for log_file in log_files:
-        file_path = log_dir / log_file
-        if not file_path.exists():
-            continue
 
-        with open(file_path) as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    entry = json.loads(line)
-                    all_logs.append(entry)
-                except json.JSONDecodeError:
-                    continue
+def follow_logs(
+    log_dir: Path,
+    session_id: str | None = None,
+    event_types: Collection[str] | None = None,
+    streams: tuple[str, ...] = LOG_STREAMS,
+    poll_interval: float = 0.5,
+    stop_after: float | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Tail the active log files, yielding entries written from now on.
 
-    # Sort by timestamp
-    all_logs.sort(key=lambda x: x.get("timestamp", ""))
+    Entries appended to the different streams during one poll are merged
+    by timestamp. Rotation is detected by the active file changing inode;
+    the rest of the rotated file is drained before switching over.
 
-    return all_logs
+    Args:
+        log_dir: Directory containing log files
+        session_id: Only include entries of this session
+        event_types: Only include entries with one of these event types
+        streams: Log streams to follow
+        poll_interval: Seconds to sleep when no new entries were found
+        stop_after: Stop after this many seconds (None = follow forever)
+    """
+    log_dir = Path(log_dir)
+    if event_types is not None:
+        event_types = frozenset(event_types)
+    tails = [_Tail(log_dir / f"{stream}.jsonl") for stream in streams]
+    deadline = None if stop_after is None else time.monotonic() + stop_after
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            batches = [tail.read_new() for tail in tails]
+            new_entries = [
+                entry
+                for entry in heapq.merge(*batches, key=_timestamp)
+                if entry_matches(entry, session_id=session_id, event_types=event_types)
+            ]
+            yield from new_entries
+            if not any(batches):
+                time.sleep(poll_interval)
+    finally:
+        for tail in tails:
+            tail.close()
+
+
+class _Tail:
+    """Incremental reader of one active log file that survives rotation."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: IO[bytes] | None = None
+        self._partial = b""
+        self._open(seek_end=True)
+
+    def _open(self, seek_end: bool = False) -> None:
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            self._file = None
+            return
+        if seek_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _rotated(self) -> bool:
+        assert self._file is not None
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def read_new(self) -> list[dict[str, Any]]:
+        if self._file is None:
+            self._open()
+            if self._file is None:
+                return []
+        entries = self._drain()
+        if self._rotated():
+            self._file.close()
+            self._partial = b""
+            self._open()
+            entries.extend(self._drain())
+        return entries
+
+    def _drain(self) -> list[dict[str, Any]]:
+        assert self._file is not None
+        entries = []
+        for line in self._file.readlines():
+            if not line.endswith(b"\n"):
+                self._partial += line  # Writer is mid-line; finish it next poll
+                continue
+            line, self._partial = self._partial + line, b""
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
 def create_unified_log(log_dir: Path, output_file: Path | None = None) -> None:
@@ -63,19 +209,50 @@ def create_unified_log(log_dir: Path, output_file: Path | None = None) -> None:
     if output_file is None:
         output_file = log_dir / "proto_unified.jsonl"
 
-    all_logs = merge_all_logs(log_dir)
-
     # Write unified log
+    total = 0
     with open(output_file, "w") as f:
-        for entry in all_logs:
+        for entry in iter_merged_logs(log_dir):
             f.write(json.dumps(entry) + "\n")
+            total += 1
 
     print(f"✅ Created unified log: {output_file}")
-    print(f"   Total events: {len(all_logs)}")
+    print(f"   Total events: {total}")
     print(f"\nAI can now read this single file to see everything that happened in chronological order.")
 
 
-def view_timeline(log_dir: Path, session_id: str | None = None, limit: int | None = None) -> None:
+def format_timeline_entry(index: int, entry: dict[str, Any]) -> str:
+    """Format one timeline line (with sequence number) for display."""
+    timestamp = entry.get("timestamp", "N/A")
+    level = entry.get("level", "INFO")
+    event_type = entry.get("event_type", "unknown")
+    session = entry.get("session_id")
+    session_str = session[:8] if session else "N/A"
+
+    # Format with sequence number
+    line = f"{index:4}. [{timestamp}] {level:8} {event_type:25} session={session_str}"
+
+    # Add key data
+    if entry.get("data"):
+        data = entry["data"]
+        # Show first 100 chars of data
+        data_str = json.dumps(data)
+        if len(data_str) > 100:
+            data_str = data_str[:100] + "..."
+        line += f" | {data_str}"
+
+    return line
+
+
+def view_timeline(
+    log_dir: Path,
+    session_id: str | None = None,
+    limit: int | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    event_types: Collection[str] | None = None,
+    follow: bool = False,
+) -> None:
     """
     View complete timeline across all log sources.
 
@@ -83,16 +260,18 @@ def view_timeline(log_dir: Path, session_id: str | None = None, limit: int | Non
         log_dir: Directory containing log files
         session_id: Filter by session ID
         limit: Maximum number of entries to show
+        start: Only show entries at or after this ISO timestamp
+        end: Only show entries at or before this ISO timestamp
+        event_types: Only show entries with one of these event types
+        follow: Keep printing new entries as they are written
     """
-    all_logs = merge_all_logs(log_dir)
-
-    # Filter by session if requested
-    if session_id:
-        all_logs = [log for log in all_logs if log.get("session_id") == session_id]
+    entries = iter_merged_logs(
+        log_dir, start=start, end=end, session_id=session_id, event_types=event_types
+    )
 
     # Limit if requested
     if limit:
-        all_logs = all_logs[:limit]
+        entries = itertools.islice(entries, limit)
 
     # Display
     print(f"\n{'=' * 80}")
@@ -101,29 +280,21 @@ def view_timeline(log_dir: Path, session_id: str | None = None, limit: int | Non
         print(f"Session: {session_id}")
     print(f"{'=' * 80}\n")
 
-    for i, entry in enumerate(all_logs, 1):
-        timestamp = entry.get("timestamp", "N/A")
-        level = entry.get("level", "INFO")
-        event_type = entry.get("event_type", "unknown")
-        session = entry.get("session_id")
-        session_str = session[:8] if session else "N/A"
-
-        # Format with sequence number
-        line = f"{i:4}. [{timestamp}] {level:8} {event_type:25} session={session_str}"
-
-        # Add key data
-        if entry.get("data"):
-            data = entry["data"]
-            # Show first 100 chars of data
-            data_str = json.dumps(data)
-            if len(data_str) > 100:
-                data_str = data_str[:100] + "..."
-            line += f" | {data_str}"
+    total = 0
+    for entry in entries:
+        total += 1
+        print(format_timeline_entry(total, entry))
 
-        print(line)
+    if follow:
+        try:
+            for entry in follow_logs(log_dir, session_id=session_id, event_types=event_types):
+                total += 1
+                print(format_timeline_entry(total, entry), flush=True)
+        except KeyboardInterrupt:
+            pass
 
     print(f"\n{'=' * 80}")
-    print(f"Total events: {len(all_logs)}")
+    print(f"Total events: {total}")
     print(f"{'=' * 80}\n")
 
 
@@ -137,6 +308,12 @@ def main():
     parser.add_argument("--log-dir", default="logs", help="Log directory path")
     parser.add_argument("--session", help="Filter by session ID")
     parser.add_argument("--limit", "-n", type=int, help="Limit number of entries")
+    parser.add_argument("--since", help="Only show entries at or after this ISO timestamp")
+    parser.add_argument("--until", help="Only show entries at or before this ISO timestamp")
+    parser.add_argument("--event-type", action="append", dest="event_types",
+                       help="Only show this event type (repeatable)")
+    parser.add_argument("--follow", "-f", action="store_true",
+                       help="Keep printing new events as they are logged")
     parser.add_argument("--create-unified", action="store_true",
                        help="Create unified log file for AI analysis")
     parser.add_argument("--output", help="Output file for unified log")
@@ -152,7 +329,15 @@ def main():
         output_file = Path(args.output) if args.output else None
         create_unified_log(log_dir, output_file)
     else:
-        view_timeline(log_dir, session_id=args.session, limit=args.limit)
+        view_timeline(
+            log_dir,
+            session_id=args.session,
+            limit=args.limit,
+            start=args.since,
+            end=args.until,
+            event_types=args.event_types,
+            follow=args.follow,
+        )
 
     return 0
 
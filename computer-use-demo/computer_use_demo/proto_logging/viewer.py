@@ -10,38 +10,31 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .segments import iter_stream, segment_stream
+from .unified import iter_merged_logs, merge_all_logs
+
 
 def load_logs(log_file: Path, session_id: str | None = None, limit: int | None = None) -> list[dict[str, Any]]:
     """
     Load logs from JSONL file with optional filtering.
 
+    Rotated segments of the same log are read first (oldest to newest);
+    segments that do not contain ``session_id`` are skipped.
+
     Args:
-        log_file: Path to log file
+        log_file: Path to the active log file
         session_id: Filter by session ID
         limit: Maximum number of entries to return
 
     Returns:
         List of log entries as dictionaries
     """
-    if not log_file.exists():
-        return []
-
     logs = []
-    with open(log_file) as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                entry = json.loads(line)
-                # Filter by session if specified
-                if session_id and entry.get("session_id") != session_id:
-                    continue
-                logs.append(entry)
-                # Stop if we've reached limit
-                if limit and len(logs) >= limit:
-                    break
-            except json.JSONDecodeError:
-                continue
+    for entry in iter_stream(log_file.parent, segment_stream(log_file), session_id=session_id):
+        logs.append(entry)
+        # Stop if we've reached limit
+        if limit and len(logs) >= limit:
+            break
 
     return logs
 
@@ -84,27 +77,18 @@ def view_session(log_dir: Path, session_id: str, verbose: bool = False) -> None:
     print(f"Session: {session_id}")
     print(f"{'=' * 80}\n")
 
-    # Load logs from all files
-    all_logs = []
-    for log_file in ["proto_sessions.jsonl", "proto_errors.jsonl", "proto_tools.jsonl", "proto_system.jsonl"]:
-        file_path = log_dir / log_file
-        if file_path.exists():
-            logs = load_logs(file_path, session_id=session_id)
-            all_logs.extend(logs)
-
-    # Sort by timestamp
-    all_logs.sort(key=lambda x: x.get("timestamp", ""))
+    # Stream logs from all files in timestamp order
+    total = 0
+    for entry in iter_merged_logs(log_dir, session_id=session_id):
+        total += 1
+        print(format_log_entry(entry, verbose=verbose))
 
-    if not all_logs:
+    if not total:
         print("No logs found for this session.")
         return
 
-    # Display logs
-    for entry in all_logs:
-        print(format_log_entry(entry, verbose=verbose))
-
     print(f"\n{'=' * 80}")
-    print(f"Total entries: {len(all_logs)}")
+    print(f"Total entries: {total}")
     print(f"{'=' * 80}\n")
 
 
@@ -171,14 +155,11 @@ def generate_summary(log_dir: Path, session_id: str) -> None:
     print(f"{'=' * 80}\n")
 
     # Load all logs for session
-    all_logs = []
-    for log_file in ["proto_sessions.jsonl", "proto_errors.jsonl", "proto_tools.jsonl"]:
-        file_path = log_dir / log_file
-        if file_path.exists():
-            logs = load_logs(file_path, session_id=session_id)
-            all_logs.extend(logs)
-
-    all_logs.sort(key=lambda x: x.get("timestamp", ""))
+    all_logs = merge_all_logs(
+        log_dir,
+        session_id=session_id,
+        streams=("proto_sessions", "proto_errors", "proto_tools"),
+    )
 
     if not all_logs:
         print("No logs found for this session.")
@@ -5,8 +5,8 @@ Enables distributed multi-computer control via SSH tunneling and REST API.
 """
 
 from .computer_registry import ComputerConfig, ComputerRegistry
-from .ssh_manager import SSHManager, SSHConnection
-from .remote_computer_tool import RemoteComputerTool
+from .ssh_manager import FanOutResult, HostResult, SSHManager, SSHConnection
+from .remote_computer_tool import RemoteComputerTool, run_action_on_computers
 from .vnc_tunnel import VNCTunnel
 
 __all__ = [
@@ -14,6 +14,9 @@ __all__ = [
     "ComputerRegistry",
     "SSHManager",
     "SSHConnection",
+    "HostResult",
+    "FanOutResult",
     "RemoteComputerTool",
+    "run_action_on_computers",
     "VNCTunnel",
 ]
@@ -72,8 +72,9 @@ class ComputerRegistry:
         # Add local computer if not present
         self._ensure_local_computer()
 
-        # Status monitoring task
+        # Status monitoring task, and the connections it checks with
         self._monitor_task: Optional[asyncio.Task] = None
+        self._ssh_manager = None
 
     def _ensure_local_computer(self) -> None:
         """Ensure local computer is registered."""
@@ -207,24 +208,34 @@ class ComputerRegistry:
                 pass
             self._monitor_task = None
             logger.info("Stopped computer status monitoring")
+        if self._ssh_manager is not None:
+            await self._ssh_manager.close_all()
 
     async def _check_all_statuses(self) -> None:
-        """Check status of all remote computers."""
+        """Check status of all remote computers, concurrently."""
         # Import here to avoid circular imports
         from .ssh_manager import SSHManager
 
-        ssh_manager = SSHManager()
+        if self._ssh_manager is None:
+            self._ssh_manager = SSHManager()
+        ssh_manager = self._ssh_manager
 
+        remote = []
         for computer in self.computers.values():
             if computer.type == "local":
                 self.set_status(computer.id, "online")
             else:
-                try:
-                    # Try to connect via SSH
-                    async with ssh_manager.get_connection(computer) as conn:
-                        if conn:
-                            self.set_status(computer.id, "online")
-                        else:
-                            self.set_status(computer.id, "offline", "Connection failed")
-                except Exception as e:
-                    self.set_status(computer.id, "offline", str(e))
+                remote.append(computer)
+
+        async def check(computer: ComputerConfig) -> bool:
+            # Try to connect via SSH
+            async with ssh_manager.get_connection(computer) as conn:
+                return bool(conn)
+
+        async for computer, connected, error in ssh_manager.fan_out(remote, check):
+            if error is not None:
+                self.set_status(computer.id, "offline", str(error))
+            elif connected:
+                self.set_status(computer.id, "online")
+            else:
+                self.set_status(computer.id, "offline", "Connection failed")
@@ -9,10 +9,11 @@ This tool executes computer actions on a remote computer by:
 
 import asyncio
 import json
+from collections.abc import AsyncIterator, Iterable
 from typing import Any, Literal
 
 from ..tools.base import BaseAnthropicTool, ToolResult
-from .ssh_manager import SSHManager
+from .ssh_manager import DEFAULT_FAN_OUT, SSHManager
 from .computer_registry import ComputerConfig
 
 
@@ -154,3 +155,39 @@ class RemoteComputerTool(BaseAnthropicTool):
         except Exception as e:
             import traceback
             return ToolResult(error=f"SSH execution failed: {e}\n{traceback.format_exc()}")
+
+
+async def run_action_on_computers(
+    ssh_manager: SSHManager,
+    computers: Iterable[ComputerConfig],
+    action: str = "screenshot",
+    max_concurrency: int = DEFAULT_FAN_OUT,
+    **params: Any,
+) -> AsyncIterator[tuple[ComputerConfig, ToolResult]]:
+    """
+    Run one computer action (a screenshot by default) on many computers.
+
+    Actions run concurrently, at most ``max_concurrency`` at once, and each
+    computer's result is yielded as soon as it arrives.
+
+    Usage:
+        async for computer, result in run_action_on_computers(ssh_manager, computers):
+            ...
+
+    Args:
+        ssh_manager: SSHManager used to reach the computers
+        computers: Target computers
+        action: Computer tool action
+        max_concurrency: Computers working at once
+        **params: Action parameters
+
+    Yields:
+        (computer, ToolResult) per computer, in completion order
+    """
+
+    async def run(computer: ComputerConfig) -> ToolResult:
+        tool = RemoteComputerTool(computer.id, ssh_manager, computer)
+        return await tool(action=action, **params)
+
+    async for computer, result, error in ssh_manager.fan_out(computers, run, max_concurrency):
+        yield computer, result if error is None else ToolResult(error=f"{action} failed: {error}")
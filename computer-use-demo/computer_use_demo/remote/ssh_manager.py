@@ -3,39 +3,151 @@ SSH connection manager for remote computer control.
 
 Provides SSH client with:
 - Connection pooling (reuse connections per computer)
-- Async execution of remote commands
+- Async execution of remote commands: paramiko's blocking calls run on a
+  thread pool per connection, never on the event loop, with each command on
+  its own multiplexed channel, streaming output and an optional timeout
+- A cap on concurrent commands per host
+- Fan-out of one command across many computers, with results streamed as
+  each host finishes
 - SSH tunneling for port forwarding (VNC, etc.)
 - Auto-reconnect with exponential backoff
 """
 
 import asyncio
+import codecs
+import select
 import socket
 import time
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 import paramiko
 
 from .computer_registry import ComputerConfig
 
 logger = logging.getLogger(__name__)
 
+# Commands run at once over one connection, and on one host
+DEFAULT_MAX_CHANNELS = 8
+
+# Seconds each host's command may run in a fan-out, so one hung host
+# cannot hold up the whole fan-out (single commands have no limit)
+DEFAULT_FAN_OUT_TIMEOUT = 30.0
+
+# Computers a fan-out works on at once
+DEFAULT_FAN_OUT = 32
+
+READ_SIZE = 32768
+POLL_INTERVAL = 0.5
+
+T = TypeVar("T")
+
+
+@dataclass
+class HostResult:
+    """Outcome of a fanned-out command on one computer."""
+
+    computer: ComputerConfig
+    exit_code: Optional[int] = None  # None if the command never completed
+    stdout: str = ""
+    stderr: str = ""
+    error: Optional[str] = None  # Connection failure, timeout, ...
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.exit_code == 0
+
+
+@dataclass
+class FanOutResult:
+    """Results of a command run across several computers, in completion order."""
+
+    results: List[HostResult] = field(default_factory=list)
+
+    @property
+    def exit_code(self) -> int:
+        """0 if every host succeeded, else the first failing host's code (255 if it never ran)."""
+        for result in self.results:
+            if not result.ok:
+                return result.exit_code if result.exit_code else 255
+        return 0
+
+    @property
+    def succeeded(self) -> List[HostResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[HostResult]:
+        return [result for result in self.results if not result.ok]
+
 
 class SSHConnection:
-    """Wrapper for a paramiko SSH connection."""
+    """
+    Wrapper for a paramiko SSH connection.
+
+    paramiko is blocking, so connecting and every command run on this
+    connection's own thread pool. Commands are multiplexed as separate
+    channels over the one transport, at most ``max_channels`` at a time.
+    """
 
-    def __init__(self, computer: ComputerConfig):
+    def __init__(self, computer: ComputerConfig, max_channels: int = DEFAULT_MAX_CHANNELS):
         """
         Initialize SSH connection.
 
         Args:
             computer: ComputerConfig with connection details
+            max_channels: Commands run concurrently over this connection
+                (OpenSSH allows 10 sessions per connection by default)
         """
         self.computer = computer
         self.client: Optional[paramiko.SSHClient] = None
         self.transport: Optional[paramiko.Transport] = None
         self.connected = False
         self.last_used = time.time()
+        self.active = 0  # Commands running
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_channels + 1, thread_name_prefix=f"ssh-{computer.id}"
+        )
+        self._channels = asyncio.Semaphore(max_channels)
+        self._connect_lock = asyncio.Lock()
+
+    def _is_alive(self) -> bool:
+        return (
+            self.connected
+            and self.client is not None
+            and (self.transport is None or self.transport.is_active())
+        )
+
+    def _connect_blocking(self) -> None:
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        # Load SSH key if provided
+        pkey = None
+        if self.computer.ssh_key_path:
+            pkey = paramiko.RSAKey.from_private_key_file(self.computer.ssh_key_path)
+
+        # Connect with timeout
+        client.connect(
+            hostname=self.computer.host,
+            port=self.computer.port,
+            username=self.computer.username,
+            pkey=pkey,
+            timeout=10,
+            banner_timeout=10,
+            auth_timeout=10,
+            allow_agent=True,  # Try SSH agent
+            look_for_keys=True,  # Try default key files
+        )
+        transport = client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(30)
+        self.client = client
+        self.transport = transport
 
     async def connect(self) -> bool:
         """
@@ -44,80 +156,154 @@ class SSHConnection:
         Returns:
             True if connection successful, False otherwise
         """
-        if self.connected and self.client:
+        if self._is_alive():
             self.last_used = time.time()
             return True
 
-        max_retries = 3
-        base_delay = 1.0
+        async with self._connect_lock:
+            if self._is_alive():
+                return True
+            self.connected = False
 
-        for attempt in range(max_retries):
-            try:
-                self.client = paramiko.SSHClient()
-                self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-                # Load SSH key if provided
-                pkey = None
-                if self.computer.ssh_key_path:
-                    pkey = paramiko.RSAKey.from_private_key_file(
-                        self.computer.ssh_key_path
-                    )
+            max_retries = 3
+            base_delay = 1.0
+            loop = asyncio.get_running_loop()
 
-                # Connect with timeout
-                self.client.connect(
-                    hostname=self.computer.host,
-                    port=self.computer.port,
-                    username=self.computer.username,
-                    pkey=pkey,
-                    timeout=10,
-                    allow_agent=True,  # Try SSH agent
-                    look_for_keys=True,  # Try default key files
-                )
+            for attempt in range(max_retries):
+                try:
+                    await loop.run_in_executor(self._executor, self._connect_blocking)
+                    self.connected = True
+                    self.last_used = time.time()
+                    logger.info(f"SSH connected to {self.computer.name} ({self.computer.host})")
+                    return True
 
-                self.transport = self.client.get_transport()
-                self.connected = True
-                self.last_used = time.time()
-                logger.info(f"SSH connected to {self.computer.name} ({self.computer.host})")
-                return True
+                except Exception as e:
+                    logger.warning(
+                        f"SSH connection attempt {attempt + 1} failed for {self.computer.name}: {e}"
+                    )
 
-            except Exception as e:
-                logger.warning(
-                    f"SSH connection attempt {attempt + 1} failed for {self.computer.name}: {e}"
-                )
+                    if attempt < max_retries - 1:
+                        # Exponential backoff
+                        delay = base_delay * (2 ** attempt)
+                        await asyncio.sleep(delay)
 
-                if attempt < max_retries - 1:
-                    # Exponential backoff
-                    delay = base_delay * (2 ** attempt)
-                    await asyncio.sleep(delay)
+            logger.error(f"Failed to connect to {self.computer.name} after {max_retries} attempts")
+            return False
 
-        logger.error(f"Failed to connect to {self.computer.name} after {max_retries} attempts")
-        return False
+    def _run_channel(
+        self,
+        channel: Any,
+        command: str,
+        timeout: float | None,
+        emit: Callable[[str, str], None] | None,
+    ) -> Tuple[int, str, str]:
+        """Run a command on an open channel, reading its output as it arrives."""
+        deadline = time.monotonic() + timeout if timeout else None
+        outputs = {"stdout": [], "stderr": []}
+        decoders = {name: codecs.getincrementaldecoder("utf-8")("replace") for name in outputs}
+
+        def take(name: str, data: bytes, final: bool = False) -> None:
+            text = decoders[name].decode(data, final)
+            if text:
+                outputs[name].append(text)
+                if emit is not None:
+                    emit(name, text)
+
+        channel.exec_command(command)
+        while True:
+            while channel.recv_ready():
+                take("stdout", channel.recv(READ_SIZE))
+            while channel.recv_stderr_ready():
+                take("stderr", channel.recv_stderr(READ_SIZE))
+            if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                break
+            if channel.closed:
+                raise RuntimeError("Channel closed")
+            wait = POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Command timed out after {timeout}s on {self.computer.name}"
+                    )
+                wait = min(wait, remaining)
+            # The channel's fd becomes readable on stdout or stderr data and on close
+            select.select([channel], [], [], wait)
+
+        take("stdout", b"", final=True)
+        take("stderr", b"", final=True)
+        return channel.recv_exit_status(), "".join(outputs["stdout"]), "".join(outputs["stderr"])
+
+    def _execute_blocking(
+        self,
+        command: str,
+        timeout: float | None,
+        emit: Callable[[str, str], None] | None,
+        opened: list,
+    ) -> Tuple[int, str, str]:
+        channel = self.transport.open_session(timeout=10)
+        opened.append(channel)
+        try:
+            return self._run_channel(channel, command, timeout, emit)
+        finally:
+            channel.close()
 
-    async def execute_command(self, command: str) -> Tuple[int, str, str]:
+    async def execute_command(
+        self,
+        command: str,
+        timeout: float | None = None,
+        on_output: Callable[[str, str], Any] | None = None,
+    ) -> Tuple[int, str, str]:
         """
         Execute a command on the remote computer.
 
+        The command runs on its own channel, on this connection's thread
+        pool, so the event loop is never blocked.
+
         Args:
             command: Command to execute
+            timeout: Seconds before the command is abandoned (None = no limit)
+            on_output: Called on the event loop with ("stdout" or "stderr",
+                text) as output arrives
 
         Returns:
             Tuple of (exit_code, stdout, stderr)
+
+        Raises:
+            TimeoutError: If the command runs longer than ``timeout``
         """
         if not await self.connect():
             raise RuntimeError(f"Not connected to {self.computer.name}")
 
-        try:
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=30)
-            exit_code = stdout.channel.recv_exit_status()
-            out = stdout.read().decode()
-            err = stderr.read().decode()
+        loop = asyncio.get_running_loop()
+        emit = None
+        if on_output is not None:
 
-            self.last_used = time.time()
-            return (exit_code, out, err)
+            def emit(stream: str, text: str) -> None:
+                loop.call_soon_threadsafe(on_output, stream, text)
 
-        except Exception as e:
-            self.connected = False
-            raise RuntimeError(f"Failed to execute command on {self.computer.name}: {e}")
+        opened: list = []
+        async with self._channels:
+            self.active += 1
+            try:
+                return await loop.run_in_executor(
+                    self._executor, self._execute_blocking, command, timeout, emit, opened
+                )
+
+            except asyncio.CancelledError:
+                # Closing the channel ends the read loop in the worker thread
+                for channel in opened:
+                    channel.close()
+                raise
+            except TimeoutError:
+                raise
+            except Exception as e:
+                # A failed channel leaves the transport (and the other
+                # commands on it) alone; _is_alive() notices a dead transport
+                raise RuntimeError(f"Failed to execute command on {self.computer.name}: {e}") from e
+            finally:
+                self.active -= 1
+                self.last_used = time.time()
 
     async def create_tunnel(
         self, local_port: int, remote_host: str, remote_port: int
@@ -167,28 +353,43 @@ class SSHConnection:
             self.client.close()
             self.connected = False
             logger.info(f"SSH connection closed for {self.computer.name}")
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 class SSHManager:
     """Manages SSH connections with pooling and lifecycle management."""
 
-    def __init__(self, pool_timeout: int = 300):
+    def __init__(self, pool_timeout: int = 300, max_per_host: int = DEFAULT_MAX_CHANNELS):
         """
         Initialize SSH manager.
 
         Args:
             pool_timeout: Timeout in seconds for idle connections (default 5 minutes)
+            max_per_host: Connections held or commands run at once per host
         """
         self.pool: Dict[str, SSHConnection] = {}
         self.pool_timeout = pool_timeout
+        self.max_per_host = max_per_host
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
         self._lock = asyncio.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
 
+    def _slots(self, computer: ComputerConfig) -> asyncio.Semaphore:
+        key = f"{computer.host}:{computer.port}"
+        slots = self._host_slots.get(key)
+        if slots is None:
+            slots = self._host_slots[key] = asyncio.Semaphore(self.max_per_host)
+        return slots
+
     @asynccontextmanager
     async def get_connection(self, computer: ComputerConfig):
         """
         Get or create an SSH connection (context manager).
 
+        At most ``max_per_host`` callers hold a connection to the same host
+        at once; the others wait. Connecting to one host never holds up
+        callers of another.
+
         Usage:
             async with ssh_manager.get_connection(computer) as conn:
                 exit_code, stdout, stderr = await conn.execute_command("ls")
@@ -202,25 +403,32 @@ class SSHManager:
         async with self._lock:
             # Get or create connection
             if computer.id not in self.pool:
-                self.pool[computer.id] = SSHConnection(computer)
+                self.pool[computer.id] = SSHConnection(computer, max_channels=self.max_per_host)
 
             conn = self.pool[computer.id]
 
+        async with self._slots(computer):
             # Ensure connected
             if not await conn.connect():
                 raise RuntimeError(f"Failed to connect to {computer.name}")
 
-        try:
-            yield conn
-        except Exception as e:
-            # Connection error - remove from pool so it's recreated next time
-            if computer.id in self.pool:
-                self.pool[computer.id].close()
-                del self.pool[computer.id]
-            raise e
+            try:
+                yield conn
+            except Exception:
+                # Other callers share the connection: drop it (to be recreated
+                # next time) only when its transport is dead, not because a
+                # command or the caller's own code failed
+                if not conn._is_alive() and self.pool.get(computer.id) is conn:
+                    conn.close()
+                    del self.pool[computer.id]
+                raise
 
     async def execute_command(
-        self, computer: ComputerConfig, command: str
+        self,
+        computer: ComputerConfig,
+        command: str,
+        timeout: float | None = None,
+        on_output: Callable[[str, str], Any] | None = None,
     ) -> Tuple[int, str, str]:
         """
         Execute a command on a remote computer.
@@ -228,12 +436,118 @@ class SSHManager:
         Args:
             computer: ComputerConfig for the target computer
             command: Command to execute
+            timeout: Seconds before the command is abandoned (None = no limit)
+            on_output: Called with ("stdout" or "stderr", text) as output arrives
 
         Returns:
             Tuple of (exit_code, stdout, stderr)
         """
         async with self.get_connection(computer) as conn:
-            return await conn.execute_command(command)
+            return await conn.execute_command(command, timeout=timeout, on_output=on_output)
+
+    async def fan_out(
+        self,
+        computers: Iterable[ComputerConfig],
+        operation: Callable[[ComputerConfig], Awaitable[T]],
+        max_concurrency: int = DEFAULT_FAN_OUT,
+    ) -> AsyncIterator[Tuple[ComputerConfig, Optional[T], Optional[BaseException]]]:
+        """
+        Run an operation on many computers concurrently.
+
+        At most ``max_concurrency`` operations run at once (and each host
+        stays within ``max_per_host``). Results are yielded as soon as each
+        finishes, so the whole fan-out takes about as long as its slowest
+        host. Leaving the loop early cancels the operations still running.
+
+        Usage:
+            async for computer, result, error in ssh_manager.fan_out(computers, check):
+                ...
+
+        Args:
+            computers: Target computers
+            operation: Coroutine function called with each computer
+            max_concurrency: Operations running at once
+
+        Yields:
+            (computer, result, None), or (computer, None, exception) if it raised
+        """
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def run(computer: ComputerConfig):
+            async with slots:
+                try:
+                    return computer, await operation(computer), None
+                except Exception as e:
+                    return computer, None, e
+
+        tasks = [asyncio.create_task(run(computer)) for computer in computers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fan_out_command(
+        self,
+        computers: Iterable[ComputerConfig],
+        command: str,
+        timeout: float | None = DEFAULT_FAN_OUT_TIMEOUT,
+        max_concurrency: int = DEFAULT_FAN_OUT,
+    ) -> AsyncIterator[HostResult]:
+        """
+        Run one command on many computers, yielding each host's result as it finishes.
+
+        Args:
+            computers: Target computers
+            command: Command to execute
+            timeout: Seconds each host's command may run (None = no limit)
+            max_concurrency: Hosts running the command at once
+
+        Yields:
+            HostResult per computer, in completion order
+        """
+
+        async def run(computer: ComputerConfig) -> HostResult:
+            started = time.monotonic()
+            try:
+                exit_code, stdout, stderr = await self.execute_command(
+                    computer, command, timeout=timeout
+                )
+            except Exception as e:
+                return HostResult(
+                    computer, error=str(e) or type(e).__name__, elapsed=time.monotonic() - started
+                )
+            return HostResult(computer, exit_code, stdout, stderr, elapsed=time.monotonic() - started)
+
+        async for _, result, _ in self.fan_out(computers, run, max_concurrency):
+            yield result
+
+    async def execute_on_all(
+        self,
+        computers: Iterable[ComputerConfig],
+        command: str,
+        timeout: float | None = DEFAULT_FAN_OUT_TIMEOUT,
+        max_concurrency: int = DEFAULT_FAN_OUT,
+    ) -> FanOutResult:
+        """
+        Run one command on many computers and aggregate the results.
+
+        Args:
+            computers: Target computers
+            command: Command to execute
+            timeout: Seconds each host's command may run (None = no limit)
+            max_concurrency: Hosts running the command at once
+
+        Returns:
+            FanOutResult with every host's result and the overall exit code
+        """
+        aggregate = FanOutResult()
+        async for result in self.fan_out_command(computers, command, timeout, max_concurrency):
+            aggregate.results.append(result)
+        return aggregate
 
     async def close_all(self) -> None:
         """Close all connections in the pool."""
@@ -263,7 +577,7 @@ class SSHManager:
                         to_close = [
                             cid
                             for cid, conn in self.pool.items()
-                            if now - conn.last_used > self.pool_timeout
+                            if not conn.active and now - conn.last_used > self.pool_timeout
                         ]
 
                         for cid in to_close:
@@ -1,16 +1,233 @@
 """
 Rule enforcer - checks actions against rules.
+
+Rules are compiled once, when they are loaded or added: for every tool
+name the enforcer keeps the rules that apply to it, with their patterns
+compiled. Each pattern is also indexed by a trigram of the literal text it
+requires, so a tool call only checks the rules whose trigrams occur in its
+input; a call that matches nothing, the common case, costs one set
+intersection no matter how many rules exist.
 """
 
 import fnmatch
 import re
 import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from .loader import load_all_rules
 from .types import Rule, RuleCheckResult, RuleScope, RuleSeverity, RuleViolation
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore[no-redef]
+
+
+# Tools that FILE scope rules apply to
+FILE_TOOLS = ("str_replace_editor", "edit", "write", "read")
+
+# Texts longer than this are probed for each key instead of split into trigrams
+_TRIGRAM_SPLIT_LIMIT = 4096
+
+
+def _required_literals(pattern: str, flags: int = 0) -> list[str]:
+    """
+    Literal runs every match of a regex contains, lowercased.
+
+    Runs only keep ASCII characters that are matched case-insensitively by
+    their ASCII case variants alone (not "i", "k" or "s", which also match
+    non-ASCII letters), so a match implies ``run in text.lower()``.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return []
+    runs: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def walk(items) -> None:
+        for op, av in items:
+            if op is sre_parse.LITERAL and av < 128 and chr(av) not in "iksIKS":
+                current.append(chr(av).lower())
+            elif op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in _REPEATS and av[0] >= 1:
+                flush()
+                walk(av[2])
+                flush()
+            else:
+                flush()
+
+    walk(parsed)
+    flush()
+    return runs
+
+
+_REPEATS = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+
+def _trigrams(literals: list[str]) -> set[str]:
+    """Trigrams of the literals; any one of them must occur in a match."""
+    return {literal[i : i + 3] for literal in literals for i in range(len(literal) - 2)}
+
+
+def _trigram_hits(keys: dict[str, list[int]], text: str) -> set[int]:
+    """Indexes listed under the keys that occur in ``text``."""
+    if len(text) > _TRIGRAM_SPLIT_LIMIT:
+        found = [key for key in keys if key in text]
+    else:
+        found = keys.keys() & {text[i : i + 3] for i in range(len(text) - 2)}
+    return {index for key in found for index in keys[key]}
+
+
+@dataclass
+class _CompiledRule:
+    """A rule with its file and match patterns compiled."""
+
+    rule: Rule
+    # (glob, regex) pairs, in rule order
+    file_patterns: list[tuple[str, re.Pattern[str]]] = field(default_factory=list)
+    # (pattern, regex or None if invalid, lowercased text), in rule order
+    match_patterns: list[tuple[str, re.Pattern[str] | None, str]] = field(default_factory=list)
+
+    @classmethod
+    def compile(cls, rule: Rule) -> "_CompiledRule":
+        compiled = cls(rule)
+        if rule.scope == RuleScope.FILE:
+            compiled.file_patterns = [
+                (pattern, re.compile(fnmatch.translate(pattern))) for pattern in rule.file_patterns
+            ]
+        for pattern in rule.match_patterns:
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                regex = None
+            compiled.match_patterns.append((pattern, regex, pattern.lower()))
+        return compiled
+
+    def check(
+        self,
+        tool_name: str,
+        tool_input: dict[str, Any],
+        file_path: str | None,
+        text: str | None,
+        lowered: str | None,
+    ) -> RuleViolation | None:
+        """Check the rule against a call's file path and input text."""
+        rule = self.rule
+
+        # If rule has a custom check function, use it
+        if rule.check:
+            context = {
+                "tool_name": tool_name,
+                "tool_input": tool_input,
+            }
+            if not rule.check(context):
+                return RuleViolation(
+                    rule=rule,
+                    message=f"Rule '{rule.name}' violated: {rule.description}",
+                    context=context,
+                    tool_name=tool_name,
+                    tool_input=tool_input,
+                )
+            return None
+
+        # Check file patterns
+        if file_path:
+            for pattern, regex in self.file_patterns:
+                if regex.match(file_path):
+                    return RuleViolation(
+                        rule=rule,
+                        message=f"Rule '{rule.name}': File '{file_path}' matches blocked pattern '{pattern}'",
+                        context={"file_path": file_path, "pattern": pattern},
+                        tool_name=tool_name,
+                        tool_input=tool_input,
+                    )
+
+        # Check match patterns (regex, or plain text if that fails)
+        if text is not None:
+            for pattern, regex, pattern_lower in self.match_patterns:
+                if (regex is not None and regex.search(text)) or pattern_lower in lowered:
+                    return RuleViolation(
+                        rule=rule,
+                        message=f"Rule '{rule.name}': Input matches blocked pattern",
+                        context={"pattern": pattern},
+                        tool_name=tool_name,
+                        tool_input=tool_input,
+                    )
+
+        return None
+
+
+class _ToolRules:
+    """
+    The compiled rules that apply to one tool, indexed by required trigrams.
+
+    Every file and match pattern gets a key: a trigram that any input it
+    matches must contain (lowercased). A call only checks the rules whose
+    keys occur in its input, plus the rules that have a pattern without a
+    key (or a check function).
+    """
+
+    def __init__(self, rules: list[_CompiledRule]):
+        self.rules = rules
+        self.plain_rules = [compiled.rule for compiled in rules]
+        self.text_keys: dict[str, list[int]] = {}
+        self.file_keys: dict[str, list[int]] = {}
+        self.always: set[int] = set()
+        self.has_match_patterns = False
+        self.has_file_patterns = False
+
+        # (rule index, keys dict, trigrams any of which a match requires)
+        requirements: list[tuple[int, dict[str, list[int]], set[str]]] = []
+        for index, compiled in enumerate(rules):
+            if compiled.rule.check:
+                self.always.add(index)
+                continue
+            for glob, _ in compiled.file_patterns:
+                self.has_file_patterns = True
+                requirements.append(
+                    (index, self.file_keys, _trigrams(_required_literals(fnmatch.translate(glob))))
+                )
+            for pattern, regex, pattern_lower in compiled.match_patterns:
+                self.has_match_patterns = True
+                # A pattern matches through its regex or as plain text
+                requirements.append((index, self.text_keys, _trigrams([pattern_lower])))
+                if regex is not None:
+                    requirements.append(
+                        (index, self.text_keys, _trigrams(_required_literals(pattern, re.IGNORECASE)))
+                    )
+
+        # Key each pattern by its trigram that the fewest other patterns share
+        counts = Counter(trigram for _, _, trigrams in requirements for trigram in trigrams)
+        for index, keys, trigrams in requirements:
+            if trigrams:
+                key = min(trigrams, key=lambda trigram: (counts[trigram], trigram))
+                keys.setdefault(key, []).append(index)
+            else:
+                self.always.add(index)
+
+    def candidates(self, file_path: str | None, lowered: str | None) -> list[int]:
+        """Indexes of the rules that may be violated, in rule order."""
+        indexes = set(self.always)
+        if file_path:
+            indexes |= _trigram_hits(self.file_keys, file_path.lower())
+        if lowered is not None:
+            indexes |= _trigram_hits(self.text_keys, lowered)
+        return sorted(indexes)
+
 
 class RuleEnforcer:
     """
@@ -37,6 +254,8 @@ class RuleEnforcer:
     ):
         self._project_root = project_root
         self._rules: list[Rule] = []
+        self._compiled: list[_CompiledRule] = []
+        self._by_tool: dict[str, _ToolRules] = {}
         self._lock = threading.Lock()
 
         if auto_load:
@@ -44,8 +263,12 @@ class RuleEnforcer:
 
     def reload_rules(self) -> None:
         """Reload rules from disk."""
+        rules = load_all_rules(self._project_root)
+        compiled = [_CompiledRule.compile(rule) for rule in rules]
         with self._lock:
-            self._rules = load_all_rules(self._project_root)
+            self._rules = rules
+            self._compiled = compiled
+            self._by_tool = {}
 
     @property
     def rules(self) -> list[Rule]:
@@ -54,8 +277,26 @@ class RuleEnforcer:
 
     def add_rule(self, rule: Rule) -> None:
         """Add a rule programmatically."""
+        compiled = _CompiledRule.compile(rule)
         with self._lock:
-            self._rules.append(rule)
+            self._rules = [*self._rules, rule]
+            self._compiled = [*self._compiled, compiled]
+            self._by_tool = {}
+
+    def _rules_for_tool(self, tool_name: str) -> _ToolRules:
+        """The compiled rules for a tool, built on its first call."""
+        tool_rules = self._by_tool.get(tool_name)
+        if tool_rules is None:
+            with self._lock:
+                tool_rules = _ToolRules(
+                    [
+                        compiled
+                        for compiled in self._compiled
+                        if self._rule_applies_to_tool(compiled.rule, tool_name)
+                    ]
+                )
+                self._by_tool[tool_name] = tool_rules
+        return tool_rules
 
     def check_tool_call(
         self,
@@ -73,23 +314,28 @@ class RuleEnforcer:
             RuleCheckResult
         """
         violations = []
-        passed = []
-
-        for rule in self._rules:
-            if not rule.enabled:
+        tool_rules = self._rules_for_tool(tool_name)
+
+        file_path = self._extract_file_path(tool_input) if tool_rules.has_file_patterns else None
+        text = lowered = None
+        if tool_rules.has_match_patterns:
+            text = str(tool_input)
+            lowered = text.lower()
+
+        # Only rules whose required text occurs in the input are checked
+        violated = set()
+        for index in tool_rules.candidates(file_path, lowered):
+            compiled = tool_rules.rules[index]
+            if not compiled.rule.enabled:
                 continue
-
-            # Check if rule applies to this tool
-            if not self._rule_applies_to_tool(rule, tool_name):
-                continue
-
-            # Check the rule
-            violation = self._check_rule(rule, tool_name, tool_input)
-
+            violation = compiled.check(tool_name, tool_input, file_path, text, lowered)
             if violation:
                 violations.append(violation)
-            else:
-                passed.append(rule)
+                violated.add(id(compiled.rule))
+
+        passed = [rule for rule in tool_rules.plain_rules if rule.enabled]
+        if violated:
+            passed = [rule for rule in passed if id(rule) not in violated]
 
         # Determine if action is allowed
         allowed = not any(
@@ -113,7 +359,7 @@ class RuleEnforcer:
             return True
         elif rule.scope == RuleScope.FILE:
             # File rules apply to edit, write, read tools
-            return tool_name in ["str_replace_editor", "edit", "write", "read"]
+            return tool_name in FILE_TOOLS
         elif rule.scope == RuleScope.COMMAND:
             # Command rules apply to bash
             return tool_name == "bash"
@@ -121,68 +367,6 @@ class RuleEnforcer:
             # ALL scope
             return True
 
-    def _check_rule(
-        self,
-        rule: Rule,
-        tool_name: str,
-        tool_input: dict[str, Any],
-    ) -> RuleViolation | None:
-        """
-        Check if a specific rule is violated.
-
-        Returns RuleViolation if violated, None if passed.
-        """
-        # If rule has a custom check function, use it
-        if rule.check:
-            context = {
-                "tool_name": tool_name,
-                "tool_input": tool_input,
-            }
-            if not rule.check(context):
-                return RuleViolation(
-                    rule=rule,
-                    message=f"Rule '{rule.name}' violated: {rule.description}",
-                    context=context,
-                    tool_name=tool_name,
-                    tool_input=tool_input,
-                )
-            return None
-
-        # Built-in checks based on rule configuration
-        violation = None
-
-        # Check file patterns
-        if rule.file_patterns and rule.scope == RuleScope.FILE:
-            file_path = self._extract_file_path(tool_input)
-            if file_path:
-                for pattern in rule.file_patterns:
-                    if fnmatch.fnmatch(file_path, pattern):
-                        violation = RuleViolation(
-                            rule=rule,
-                            message=f"Rule '{rule.name}': File '{file_path}' matches blocked pattern '{pattern}'",
-                            context={"file_path": file_path, "pattern": pattern},
-                            tool_name=tool_name,
-                            tool_input=tool_input,
-                        )
-                        break
-
-        # Check match patterns (general text matching)
-        if rule.match_patterns and not violation:
-            input_text = str(tool_input)
-            for pattern in rule.match_patterns:
-                # Check if pattern is a regex or simple text
-                if self._matches_pattern(input_text, pattern):
-                    violation = RuleViolation(
-                        rule=rule,
-                        message=f"Rule '{rule.name}': Input matches blocked pattern",
-                        context={"pattern": pattern},
-                        tool_name=tool_name,
-                        tool_input=tool_input,
-                    )
-                    break
-
-        return violation
-
     def _extract_file_path(self, tool_input: dict[str, Any]) -> str | None:
         """Extract file path from tool input."""
         # Try common parameter names
@@ -191,18 +375,6 @@ class RuleEnforcer:
                 return str(tool_input[key])
         return None
 
-    def _matches_pattern(self, text: str, pattern: str) -> bool:
-        """Check if text matches a pattern."""
-        # Try as regex first
-        try:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        except re.error:
-            pass
-
-        # Fall back to simple substring matching
-        return pattern.lower() in text.lower()
-
 
 # Global enforcer instance
 _global_enforcer: RuleEnforcer | None = None
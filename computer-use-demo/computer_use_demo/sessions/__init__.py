@@ -0,0 +1,34 @@
+"""
+Proto Sessions Module.
+
+Provides streaming and persistence primitives for web UI chat sessions.
+
+Usage:
+    from computer_use_demo.sessions import SessionEventLog, get_session_store
+
+    events = SessionEventLog()
+    sub = events.subscribe(delta=True, since=last_event_id)
+
+    # After mutating the session
+    events.publish(state, display_messages)
+
+    seq, frame = await sub.get()
+
+    # Append-only persistence
+    store = get_session_store(sessions_dir)
+    store.save(session_id, meta=meta, messages=messages, display_messages=display)
+    stored = store.load(session_id)
+"""
+
+from .events import SessionEventLog, Subscription
+from .store import SessionStore, StoredSession, get_session_store
+
+__all__ = [
+    # Events
+    "SessionEventLog",
+    "Subscription",
+    # Store
+    "SessionStore",
+    "StoredSession",
+    "get_session_store",
+]
@@ -0,0 +1,200 @@
+"""
+Versioned event log for streaming chat session updates.
+
+Every change to a session's display messages is diffed, JSON-encoded once and
+appended to a bounded log with a monotonically increasing sequence number.
+Subscribers (SSE streams, WebSockets) receive pre-encoded frames, so the cost
+of an update no longer depends on the history length or on the number of
+attached viewers.
+
+Two delivery modes are supported:
+- snapshot: legacy full-state frames (what the bundled React UI consumes).
+  The snapshot is assembled from cached per-message JSON, so it is only
+  re-encoded for the messages that actually changed.
+- delta: ``snapshot`` once, then ``upsert``/``remove``/``state`` events.
+  Clients can resume with ``Last-Event-ID`` as long as the requested sequence
+  number is still retained in the log.
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def _fingerprint(message: Any) -> tuple:
+    """Cheap shallow fingerprint used to detect changed messages."""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in vars(message).values()
+    )
+
+
+def _encode(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False)
+
+
+@dataclass
+class Subscription:
+    """A single viewer attached to a session event log."""
+
+    delta: bool
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=256))
+
+    async def get(self) -> tuple[int, str]:
+        """Wait for the next ``(seq, json)`` frame."""
+        return await self.queue.get()
+
+    def _push(self, frame: tuple[int, str]) -> bool:
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _reset(self, frame: tuple[int, str]) -> None:
+        """Drop everything queued and replace it with a single frame."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+
+class SessionEventLog:
+    """
+    Sequence-numbered change log for one chat session.
+
+    ``publish()`` must be called from the event loop that owns the
+    subscriptions; it diffs the current messages against the last published
+    version and fans the encoded frames out to all subscribers.
+    """
+
+    def __init__(self, retain: int = 1000):
+        self._seq = 0
+        self._events: deque[tuple[int, str]] = deque(maxlen=retain)
+        self._subscribers: list[Subscription] = []
+
+        # Last published version of every message, keyed by message id
+        self._order: list[str] = []
+        self._fingerprints: dict[str, tuple] = {}
+        self._encoded: dict[str, str] = {}
+        self._state: dict[str, Any] = {}
+        self._state_json = "{}"
+        self._snapshot_json: str | None = None
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the most recent event."""
+        return self._seq
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, *, delta: bool = False, since: int | None = None) -> Subscription:
+        """
+        Attach a viewer.
+
+        The subscription is primed with the current snapshot, or, for delta
+        subscribers resuming from ``since``, with the events they missed.
+        """
+        sub = Subscription(delta=delta)
+        replay = self._events_since(since) if delta and since is not None else None
+        if replay is None or len(replay) > sub.queue.maxsize:
+            sub._push((self._seq, self.snapshot_json(delta=delta)))
+        else:
+            for frame in replay:
+                sub._push(frame)
+        self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subscribers:
+            self._subscribers.remove(sub)
+
+    def snapshot_json(self, delta: bool = False) -> str:
+        """Full state as JSON, assembled from cached per-message encodings."""
+        if self._snapshot_json is None:
+            messages = ",".join(self._encoded[msg_id] for msg_id in self._order)
+            prefix = f"{self._state_json[:-1]}, " if self._state else "{"
+            self._snapshot_json = f'{prefix}"messages": [{messages}]}}'
+        if not delta:
+            return self._snapshot_json
+        return f'{{"type": "snapshot", "seq": {self._seq}, {self._snapshot_json[1:]}'
+
+    def publish(self, state: dict[str, Any], messages: list[Any]) -> int:
+        """
+        Record the current session state and broadcast what changed.
+
+        Args:
+            state: Session-level fields (everything but the message list).
+            messages: Display messages; each needs an ``id`` attribute and a
+                ``to_dict()`` method.
+
+        Returns:
+            Number of events emitted (0 when nothing changed).
+        """
+        # Event bodies are JSON object members without the enclosing braces,
+        # so the sequence number can be prepended without re-encoding.
+        events: list[str] = []
+
+        current_ids = [msg.id for msg in messages]
+        current_set = set(current_ids)
+        for msg_id in self._order:
+            if msg_id not in current_set:
+                events.append(f'"type": "remove", "id": {_encode(msg_id)}')
+                del self._fingerprints[msg_id]
+                del self._encoded[msg_id]
+
+        for index, msg in enumerate(messages):
+            fingerprint = _fingerprint(msg)
+            if self._fingerprints.get(msg.id) == fingerprint:
+                continue
+            self._fingerprints[msg.id] = fingerprint
+            self._encoded[msg.id] = _encode(msg.to_dict())
+            events.append(
+                f'"type": "upsert", "index": {index}, "message": {self._encoded[msg.id]}'
+            )
+
+        if state != self._state:
+            self._state = dict(state)
+            self._state_json = _encode(self._state)
+            events.append(f'"type": "state", "state": {self._state_json}')
+
+        if not events and current_ids == self._order:
+            return 0
+
+        self._order = current_ids
+        self._snapshot_json = None
+
+        frames = []
+        for body in events:
+            self._seq += 1
+            frame = (self._seq, f'{{"seq": {self._seq}, {body}}}')
+            self._events.append(frame)
+            frames.append(frame)
+
+        self._fan_out(frames)
+        return len(frames)
+
+    def _events_since(self, since: int) -> list[tuple[int, str]] | None:
+        """Frames after ``since``, or None if the gap is no longer retained."""
+        if since == self._seq:
+            return []
+        if since > self._seq or not self._events or self._events[0][0] > since + 1:
+            return None
+        return [frame for frame in self._events if frame[0] > since]
+
+    def _fan_out(self, frames: list[tuple[int, str]]) -> None:
+        snapshot: tuple[int, str] | None = None
+        for sub in self._subscribers:
+            if sub.delta:
+                if all(sub._push(frame) for frame in frames):
+                    continue
+                # Slow consumer fell behind: resynchronise with a snapshot
+                sub._reset((self._seq, self.snapshot_json(delta=True)))
+            else:
+                if snapshot is None:
+                    snapshot = (self._seq, self.snapshot_json())
+                if not sub._push(snapshot):
+                    sub._reset(snapshot)
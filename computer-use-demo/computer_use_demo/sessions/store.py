@@ -0,0 +1,485 @@
+"""
+Append-only persistence for web UI chat sessions.
+
+Each session lives in its own directory:
+
+    <root>/<session_id>/
+        meta.json           small header (model, timestamps, preview, counts)
+        journal-<gen>.jsonl append-only change records since the snapshot
+        snapshot.json       compacted state + name of the live journal
+        blobs/<sha256>      screenshots, stored once, content-addressed
+
+Saving only appends the records for messages that changed since the last
+save, so the cost of a save is proportional to the new turn rather than the
+whole conversation. Base64 images are moved out of line into ``blobs/`` and
+referenced by hash. Loading reads the snapshot and replays the journal tail;
+compaction folds the journal into a new snapshot on a background thread.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .events import _fingerprint
+
+# Journal records that trigger a background compaction
+COMPACT_EVERY = 200
+
+BLOB_KEY = "$blob"
+
+
+@dataclass
+class StoredSession:
+    """Materialized session state read back from the store."""
+
+    meta: dict[str, Any]
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    display_messages: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class _Cursor:
+    """What has already been written for one session."""
+
+    session_id: str
+    journal: str
+    messages: list[Any] = field(default_factory=list)
+    display_order: list[str] = field(default_factory=list)
+    display_fingerprints: dict[str, tuple] = field(default_factory=dict)
+    records: int = 0
+    rebase: bool = False
+    handle: Any = None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _journal_generation(name: str) -> int:
+    return int(name.removeprefix("journal-").removesuffix(".jsonl"))
+
+
+def _decode_base64(data: str) -> bytes | None:
+    """The bytes ``data`` encodes, or None unless it is base64 that re-encodes to itself."""
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return raw if base64.b64encode(raw).decode("ascii") == data else None
+
+
+class SessionStore:
+    """Append-only, content-addressed session store."""
+
+    def __init__(
+        self,
+        root: Path,
+        compact_every: int = COMPACT_EVERY,
+        export_dir: Path | None = None,
+    ):
+        """
+        Args:
+            root: Directory holding one sub-directory per session.
+            compact_every: Journal records after which a background
+                compaction is scheduled.
+            export_dir: If set, a readable JSON copy of the conversation
+                (display messages with image paths) is written here after
+                every compaction.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
+        self.export_dir = export_dir
+        self._cursors: dict[str, _Cursor] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session_compactor")
+        self._compacting: set[str] = set()
+
+    # ==================== Writing ====================
+
+    def save(
+        self,
+        session_id: str,
+        *,
+        meta: dict[str, Any],
+        messages: list[Any],
+        display_messages: list[Any],
+    ) -> int:
+        """
+        Persist changes since the previous save.
+
+        Args:
+            session_id: Session identifier.
+            meta: Small header fields (model, tool_version, timestamps...).
+            messages: API message history (list of dicts).
+            display_messages: UI messages; each needs ``id``, ``role``,
+                ``text`` and ``to_dict()``.
+
+        Returns:
+            Number of journal records appended.
+        """
+        with self._lock(session_id):
+            cursor = self._cursor(session_id)
+            records: list[dict[str, Any]] = []
+            if cursor.rebase:
+                # Nothing in memory matches what is on disk: start over
+                records += [{"op": "truncate", "n": 0}, {"op": "display_reset"}]
+                cursor.rebase = False
+            records += self._message_records(cursor, messages)
+            records += self._display_records(cursor, display_messages)
+
+            if records:
+                handle = self._journal_handle(cursor)
+                handle.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+                handle.flush()
+                cursor.records += len(records)
+
+            preview = next(
+                (msg.text[:100] for msg in display_messages if msg.role == "user" and msg.text),
+                "",
+            )
+            _write_atomic(
+                self._dir(session_id) / "meta.json",
+                json.dumps({
+                    **meta,
+                    "session_id": session_id,
+                    "message_count": len(display_messages),
+                    "preview": preview,
+                }),
+            )
+
+        if cursor.records >= self.compact_every:
+            self.compact_in_background(session_id)
+        return len(records)
+
+    def track(self, session_id: str, messages: list[Any], display_messages: list[Any]) -> None:
+        """
+        Declare that ``messages``/``display_messages`` are exactly what is
+        stored, so the next ``save()`` only appends what changes afterwards.
+
+        Call this right after ``load()`` with the objects the caller keeps.
+        """
+        with self._lock(session_id):
+            cursor = self._cursor(session_id)
+            cursor.rebase = False
+            cursor.messages = list(messages)
+            cursor.display_order = [msg.id for msg in display_messages]
+            cursor.display_fingerprints = {msg.id: _fingerprint(msg) for msg in display_messages}
+
+    def _message_records(self, cursor: _Cursor, messages: list[Any]) -> list[dict[str, Any]]:
+        persisted = cursor.messages
+        common = len(persisted)
+        # Fast path: history only grew since the last save
+        if common > len(messages) or (common and messages[common - 1] is not persisted[-1]):
+            common = 0
+            for old, new in zip(persisted, messages):
+                if old is not new:
+                    break
+                common += 1
+
+        records: list[dict[str, Any]] = []
+        if common < len(persisted):
+            records.append({"op": "truncate", "n": common})
+            del persisted[common:]
+        for message in messages[common:]:
+            records.append({"op": "append", "m": self._externalize(cursor, message)})
+            persisted.append(message)
+        return records
+
+    def _display_records(self, cursor: _Cursor, display_messages: list[Any]) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        current_ids = [msg.id for msg in display_messages]
+        current_set = set(current_ids)
+        for msg_id in cursor.display_order:
+            if msg_id not in current_set:
+                records.append({"op": "display_remove", "id": msg_id})
+                del cursor.display_fingerprints[msg_id]
+
+        for index, msg in enumerate(display_messages):
+            fingerprint = _fingerprint(msg)
+            if cursor.display_fingerprints.get(msg.id) == fingerprint:
+                continue
+            cursor.display_fingerprints[msg.id] = fingerprint
+            records.append({
+                "op": "display",
+                "i": index,
+                "d": self._externalize(cursor, msg.to_dict()),
+            })
+        cursor.display_order = current_ids
+        return records
+
+    # ==================== Reading ====================
+
+    def exists(self, session_id: str) -> bool:
+        return (self._dir(session_id) / "meta.json").exists()
+
+    def read_meta(self, session_id: str) -> dict[str, Any] | None:
+        try:
+            return json.loads((self._dir(session_id) / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """Headers of all stored sessions (no message bodies are read)."""
+        sessions = []
+        for meta_file in self.root.glob("*/meta.json"):
+            meta = self.read_meta(meta_file.parent.name)
+            if meta:
+                sessions.append(meta)
+        return sessions
+
+    def load(self, session_id: str) -> StoredSession:
+        """
+        Load a session from snapshot + journal tail.
+
+        Raises:
+            FileNotFoundError: If the session does not exist.
+        """
+        meta = self.read_meta(session_id)
+        if meta is None:
+            raise FileNotFoundError(session_id)
+
+        with self._lock(session_id):
+            state = self._read_snapshot(session_id)
+            self._replay(session_id, state)
+        blobs = self._dir(session_id) / "blobs"
+        return StoredSession(
+            meta=meta,
+            messages=[self._internalize(blobs, m) for m in state["messages"]],
+            display_messages=[self._internalize(blobs, d) for d in state["display_messages"]],
+        )
+
+    def _read_snapshot(self, session_id: str) -> dict[str, Any]:
+        snapshot_file = self._dir(session_id) / "snapshot.json"
+        if snapshot_file.exists():
+            state = json.loads(snapshot_file.read_text(encoding="utf-8"))
+        else:
+            state = {"journal": "journal-0.jsonl", "messages": [], "display_messages": []}
+        state["offset"] = 0
+        return state
+
+    def _replay(self, session_id: str, state: dict[str, Any]) -> None:
+        """Apply journal records from ``state["offset"]`` onwards, in place."""
+        journal_file = self._dir(session_id) / state["journal"]
+        if not journal_file.exists():
+            return
+        with open(journal_file, "rb") as f:
+            f.seek(state["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn or in-flight write at the tail
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._apply(record, state["messages"], state["display_messages"])
+                state["offset"] += len(line)
+
+    @staticmethod
+    def _apply(record: dict[str, Any], messages: list, display: list) -> None:
+        op = record.get("op")
+        if op == "append":
+            messages.append(record["m"])
+        elif op == "truncate":
+            del messages[record["n"]:]
+        elif op == "display":
+            data = record["d"]
+            for i, existing in enumerate(display):
+                if existing["id"] == data["id"]:
+                    display[i] = data
+                    break
+            else:
+                display.insert(record["i"], data)
+        elif op == "display_remove":
+            display[:] = [d for d in display if d["id"] != record["id"]]
+        elif op == "display_reset":
+            display.clear()
+
+    # ==================== Compaction ====================
+
+    def compact_in_background(self, session_id: str) -> None:
+        """Schedule a compaction unless one is already pending."""
+        with self._locks_guard:
+            if session_id in self._compacting:
+                return
+            self._compacting.add(session_id)
+        self._compactor.submit(self._compact_task, session_id)
+
+    def _compact_task(self, session_id: str) -> None:
+        try:
+            self.compact(session_id)
+        except Exception as e:
+            print(f"[SessionStore] Compaction of {session_id} failed: {e}")
+        finally:
+            with self._locks_guard:
+                self._compacting.discard(session_id)
+
+    def compact(self, session_id: str) -> None:
+        """Fold the journal into a fresh snapshot and start a new journal."""
+        session_dir = self._dir(session_id)
+
+        # Replay the bulk without blocking writers, then catch up under the lock
+        state = self._read_snapshot(session_id)
+        self._replay(session_id, state)
+
+        with self._lock(session_id):
+            if not session_dir.exists():
+                return
+            self._replay(session_id, state)
+            journal = state["journal"]
+            new_journal = f"journal-{_journal_generation(journal) + 1}.jsonl"
+
+            (session_dir / new_journal).touch()
+            _write_atomic(
+                session_dir / "snapshot.json",
+                json.dumps({
+                    "journal": new_journal,
+                    "messages": state["messages"],
+                    "display_messages": state["display_messages"],
+                }, ensure_ascii=False),
+            )
+
+            cursor = self._cursors.get(session_id)
+            if cursor:
+                if cursor.handle:
+                    cursor.handle.close()
+                    cursor.handle = None
+                cursor.journal = new_journal
+                cursor.records = 0
+            (session_dir / journal).unlink(missing_ok=True)
+
+        if self.export_dir:
+            self._export(session_id, state["display_messages"])
+
+    def _export(self, session_id: str, display: list[dict[str, Any]]) -> None:
+        blobs = self._dir(session_id) / "blobs"
+
+        def _image_path(value: Any) -> Any:
+            if isinstance(value, dict) and BLOB_KEY in value:
+                return str(blobs / value[BLOB_KEY])
+            return value
+
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            **(self.read_meta(session_id) or {}),
+            "messages": [
+                {**d, "images": [_image_path(img) for img in d.get("images", [])]}
+                for d in display
+            ],
+        }
+        _write_atomic(
+            self.export_dir / f"{session_id}.json",
+            json.dumps(data, indent=2, ensure_ascii=False),
+        )
+
+    # ==================== Housekeeping ====================
+
+    def delete(self, session_id: str) -> None:
+        with self._lock(session_id):
+            cursor = self._cursors.pop(session_id, None)
+            if cursor and cursor.handle:
+                cursor.handle.close()
+            shutil.rmtree(self._dir(session_id), ignore_errors=True)
+
+    def close(self) -> None:
+        """Wait for pending compactions and close journal handles."""
+        self._compactor.shutdown(wait=True)
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session_compactor")
+        for cursor in self._cursors.values():
+            if cursor.handle:
+                cursor.handle.close()
+                cursor.handle = None
+
+    # ==================== Internals ====================
+
+    def _dir(self, session_id: str) -> Path:
+        return self.root / session_id
+
+    def _lock(self, session_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(session_id, threading.Lock())
+
+    def _cursor(self, session_id: str) -> _Cursor:
+        cursor = self._cursors.get(session_id)
+        if cursor is None:
+            session_dir = self._dir(session_id)
+            journals = sorted(session_dir.glob("journal-*.jsonl"), key=lambda p: _journal_generation(p.name))
+            cursor = _Cursor(
+                session_id=session_id,
+                journal=journals[-1].name if journals else "journal-0.jsonl",
+                rebase=(session_dir / "meta.json").exists(),
+            )
+            session_dir.mkdir(parents=True, exist_ok=True)
+            self._cursors[session_id] = cursor
+        return cursor
+
+    def _journal_handle(self, cursor: _Cursor):
+        if cursor.handle is None:
+            cursor.handle = open(self._dir(cursor.session_id) / cursor.journal, "a", encoding="utf-8")
+        return cursor.handle
+
+    def _externalize(self, cursor: _Cursor, value: Any) -> Any:
+        """
+        Copy ``value`` with inline base64 images replaced by blob references.
+
+        Only data that round-trips exactly is moved out; anything else (text
+        that merely looks like a data URL) is kept as is.
+        """
+        if isinstance(value, dict):
+            if value.get("type") == "base64" and isinstance(value.get("data"), str):
+                raw = _decode_base64(value["data"])
+                if raw is not None:
+                    return {**value, "data": {BLOB_KEY: self._put_blob(cursor, value["data"], raw)}}
+            return {k: self._externalize(cursor, v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._externalize(cursor, v) for v in value]
+        if isinstance(value, str) and value.startswith("data:image/") and ";base64," in value:
+            prefix, data = value.split(";base64,", 1)
+            raw = _decode_base64(data)
+            if raw is not None:
+                return {BLOB_KEY: self._put_blob(cursor, data, raw), "prefix": f"{prefix};base64,"}
+        return value
+
+    def _internalize(self, blobs: Path, value: Any) -> Any:
+        """Inverse of ``_externalize``."""
+        if isinstance(value, dict):
+            if BLOB_KEY in value:
+                data = base64.b64encode((blobs / value[BLOB_KEY]).read_bytes()).decode("ascii")
+                return value.get("prefix", "") + data
+            return {k: self._internalize(blobs, v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._internalize(blobs, v) for v in value]
+        return value
+
+    def _put_blob(self, cursor: _Cursor, data: str, raw: bytes) -> str:
+        digest = hashlib.sha256(data.encode("ascii")).hexdigest()
+        blobs = self._dir(cursor.session_id) / "blobs"
+        path = blobs / digest
+        if not path.exists():
+            blobs.mkdir(exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+        return digest
+
+
+_session_stores: dict[Path, SessionStore] = {}
+
+
+def get_session_store(root: Path, export_dir: Path | None = None) -> SessionStore:
+    """Get the shared store for ``root`` (one per directory per process)."""
+    root = Path(root)
+    if root not in _session_stores:
+        _session_stores[root] = SessionStore(root, export_dir=export_dir)
+    return _session_stores[root]
@@ -8,6 +8,14 @@ from anthropic.types.beta import BetaToolUnionParam
 class BaseAnthropicTool(metaclass=ABCMeta):
     """Abstract base class for Anthropic-defined tools."""
 
+    # Read-only tools set this so several of their calls in one turn can run
+    # concurrently (see tools/scheduler.py)
+    parallel_safe: bool = False
+
+    def is_parallel_safe(self, tool_input: dict[str, Any]) -> bool:
+        """Whether this call may run concurrently with other parallel-safe calls."""
+        return self.parallel_safe
+
     @abstractmethod
     def __call__(self, **kwargs) -> Any:
         """Executes the tool with the given arguments."""
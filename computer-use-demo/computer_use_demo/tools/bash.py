@@ -1,41 +1,151 @@
 import asyncio
-import os
+import codecs
+import weakref
+from collections.abc import Callable
 from typing import Any, Literal
 
 from .base import BaseAnthropicTool, CLIResult, ToolError, ToolResult
+from .shell_pool import PipedProcess, ShellLease, ShellPool
+
+OutputCallback = Callable[[str], None]
+
+
+class _PipeReader:
+    """
+    Reads one pipe of the shell up to the next sentinel line.
+
+    Wakes up as soon as data arrives, scans only the newly read bytes for
+    the sentinel and keeps at most about ``limit`` bytes of output in
+    memory, dropping the oldest bytes of very large outputs.
+    """
+
+    _chunk_size: int = 64 * 1024
+
+    def __init__(self, stream: asyncio.StreamReader, sentinel: bytes, limit: int):
+        self._stream = stream
+        self._sentinel = sentinel
+        self._limit = limit
+        # Bytes read past the previous sentinel line
+        self._pending = bytearray()
+
+    async def read_until_sentinel(
+        self, on_output: OutputCallback | None = None
+    ) -> tuple[bytes, int, bytes | None]:
+        """
+        Read until a full sentinel line has arrived.
+
+        Args:
+            on_output: Called with decoded output as it arrives.
+
+        Returns:
+            Output before the sentinel, number of bytes dropped from its
+            start, and the rest of the sentinel line (None if the pipe was
+            closed before the sentinel arrived)
+        """
+        buffer, self._pending = self._pending, bytearray()
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        dropped = 0
+        scanned = 0  # buffer[:scanned] holds no part of the sentinel
+        streamed = 0
+        tail: bytes | None = None
+
+        while True:
+            index = buffer.find(self._sentinel, scanned)
+            if index != -1:
+                newline = buffer.find(b"\n", index + len(self._sentinel))
+                if newline != -1:
+                    tail = bytes(buffer[index + len(self._sentinel) : newline])
+                    self._pending = buffer[newline + 1 :]
+                    del buffer[index:]
+                    break
+                scanned = index
+            else:
+                scanned = len(buffer) - self._partial_sentinel(buffer)
+
+            if on_output and scanned > streamed:
+                self._emit(on_output, decoder, buffer[streamed:scanned])
+                streamed = scanned
+
+            chunk = await self._stream.read(self._chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+
+            # Trim in large steps so that dropping stays linear overall
+            if len(buffer) > 2 * self._limit:
+                excess = min(len(buffer) - self._limit, scanned)
+                del buffer[:excess]
+                dropped += excess
+                scanned -= excess
+                streamed = max(streamed - excess, 0)
+
+        if on_output:
+            self._emit(on_output, decoder, buffer[streamed:], final=True)
+
+        if len(buffer) > self._limit:
+            excess = len(buffer) - self._limit
+            del buffer[:excess]
+            dropped += excess
+        return bytes(buffer), dropped, tail
+
+    def _partial_sentinel(self, buffer: bytearray) -> int:
+        """Length of the longest start of the sentinel that ``buffer`` ends with."""
+        for size in range(min(len(self._sentinel) - 1, len(buffer)), 0, -1):
+            if buffer.endswith(self._sentinel[:size]):
+                return size
+        return 0
+
+    @staticmethod
+    def _emit(
+        on_output: OutputCallback,
+        decoder: codecs.IncrementalDecoder,
+        data: bytes | bytearray,
+        final: bool = False,
+    ) -> None:
+        text = decoder.decode(bytes(data), final)
+        if text:
+            on_output(text)
 
 
 class _BashSession:
     """A session of a bash shell."""
 
     _started: bool
-    _process: asyncio.subprocess.Process
+    _process: PipedProcess
 
     command: str = "/bin/bash"
-    _output_delay: float = 0.2  # seconds
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
+    _max_output_bytes: int = 1024 * 1024  # per stream
 
     def __init__(self):
         self._started = False
         self._timed_out = False
+        self.exit_code: int | None = None
 
     async def start(self):
         if self._started:
             return
 
-        self._process = await asyncio.create_subprocess_shell(
-            self.command,
-            preexec_fn=os.setsid,
-            shell=True,
-            bufsize=0,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        self._process = await PipedProcess.spawn(self.command, shell=True, bufsize=0)
+
+        # we know these are not None because we created the process with PIPEs
+        assert self._process.stdout
+        assert self._process.stderr
+        self._stdout = _PipeReader(
+            self._process.stdout, self._sentinel.encode(), self._max_output_bytes
+        )
+        self._stderr = _PipeReader(
+            self._process.stderr, self._sentinel.encode(), self._max_output_bytes
         )
 
         self._started = True
 
+    @property
+    def alive(self) -> bool:
+        """Whether the shell is running and can take commands."""
+        return self._started and not self._timed_out and self._process.returncode is None
+
     def stop(self):
         """Terminate the bash shell."""
         if not self._started:
@@ -44,8 +154,19 @@ class _BashSession:
             return
         self._process.terminate()
 
-    async def run(self, command: str):
-        """Execute a command in the bash shell."""
+    async def kill(self):
+        """Kill the shell and everything it started, then reap it."""
+        if self._started:
+            await self._process.close()
+
+    async def run(self, command: str, on_output: OutputCallback | None = None):
+        """
+        Execute a command in the bash shell.
+
+        Args:
+            command: Command line to run
+            on_output: Called with stdout text while the command runs
+        """
         if not self._started:
             raise ToolError("Session has not started.")
         if self._process.returncode is not None:
@@ -58,47 +179,76 @@ class _BashSession:
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             )
 
-        # we know these are not None because we created the process with PIPEs
+        # we know this is not None because we created the process with PIPEs
         assert self._process.stdin
-        assert self._process.stdout
-        assert self._process.stderr
 
-        # send command to the process
+        # send command to the process; the sentinel line on stdout carries the
+        # exit status, the one on stderr marks the end of the error output
         self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+            command.encode()
+            + f"; echo '{self._sentinel}'$?; echo '{self._sentinel}' >&2\n".encode()
         )
         await self._process.stdin.drain()
 
-        # read output from the process, until the sentinel is found
+        # read both pipes until their sentinels are found
         try:
             async with asyncio.timeout(self._timeout):
-                while True:
-                    await asyncio.sleep(self._output_delay)
-                    # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = self._process.stdout._buffer.decode()  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
-                        break
+                (output, output_dropped, status), (error, error_dropped, _) = (
+                    await asyncio.gather(
+                        self._stdout.read_until_sentinel(on_output),
+                        self._stderr.read_until_sentinel(),
+                    )
+                )
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             ) from None
 
-        if output.endswith("\n"):
-            output = output[:-1]
+        output_text = self._decode(output, output_dropped)
+        error_text = self._decode(error, error_dropped)
+
+        if status is None:
+            # the shell exited while running the command (e.g. `exit`)
+            self.exit_code = None
+            return CLIResult(
+                output=output_text, error=error_text, system="tool must be restarted"
+            )
+
+        try:
+            self.exit_code = int(status.strip())
+        except ValueError:
+            self.exit_code = None
+
+        return CLIResult(
+            output=output_text,
+            error=error_text,
+            system=f"exit code {self.exit_code}" if self.exit_code else None,
+        )
+
+    @staticmethod
+    def _decode(data: bytes, dropped: int) -> str:
+        text = data.decode(errors="replace")
+        if text.endswith("\n"):
+            text = text[:-1]
+        if dropped:
+            text = f"[... {dropped} bytes of output truncated ...]\n{text}"
+        return text
+
 
-        error = self._process.stderr._buffer.decode()  # pyright: ignore[reportAttributeAccessIssue]
-        if error.endswith("\n"):
-            error = error[:-1]
+# One shell pool per event loop, since shells are bound to the loop that started them
+_shell_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ShellPool]" = (
+    weakref.WeakKeyDictionary()
+)
 
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
 
-        return CLIResult(output=output, error=error)
+def get_shell_pool() -> ShellPool:
+    """Get the shell pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _shell_pools.get(loop)
+    if pool is None:
+        pool = _shell_pools[loop] = ShellPool(_BashSession)
+    return pool
 
 
 class BashTool20250124(BaseAnthropicTool):
@@ -108,14 +258,46 @@ class BashTool20250124(BaseAnthropicTool):
     """
 
     _session: _BashSession | None
+    _lease: ShellLease | None
 
     api_type: Literal["bash_20250124"] = "bash_20250124"
     name: Literal["bash"] = "bash"
 
-    def __init__(self):
+    def __init__(
+        self,
+        output_callback: OutputCallback | None = None,
+        pool: ShellPool | None = None,
+        owner: str | None = None,
+    ):
+        """
+        Args:
+            output_callback: Receives partial stdout while a command runs,
+                e.g. to stream it to the UI.
+            pool: Pool to lease shells from (default: the shared pool).
+            owner: Name the shell is leased under, e.g. the agent's session.
+        """
         self._session = None
+        self._lease = None
+        self._release_on_collect = None
+        self.output_callback = output_callback
+        self.pool = pool
+        self.owner = owner
         super().__init__()
 
+    async def _acquire_session(self) -> None:
+        pool = self.pool or get_shell_pool()
+        self._lease = await pool.acquire(self.owner or f"{self.name}-{id(self):x}")
+        self._session = self._lease.session
+        # don't keep a shell leased forever if the tool is dropped
+        self._release_on_collect = weakref.finalize(self, self._lease.release)
+
+    def _release_session(self) -> None:
+        if self._release_on_collect is not None:
+            self._release_on_collect()
+        self._release_on_collect = None
+        self._lease = None
+        self._session = None
+
     def to_params(self) -> Any:
         return {
             "type": self.api_type,
@@ -126,19 +308,24 @@ class BashTool20250124(BaseAnthropicTool):
         self, command: str | None = None, restart: bool = False, **kwargs
     ):
         if restart:
-            if self._session:
-                self._session.stop()
-            self._session = _BashSession()
-            await self._session.start()
+            self._release_session()
+            await self._acquire_session()
 
             return ToolResult(system="tool has been restarted.")
 
         if self._session is None:
-            self._session = _BashSession()
-            await self._session.start()
+            await self._acquire_session()
 
         if command is not None:
-            return await self._session.run(command)
+            session = self._session
+            assert session
+            try:
+                return await session.run(command, self.output_callback)
+            finally:
+                # hand a dead or timed-out shell back for recycling, the next
+                # command gets a fresh one
+                if not session.alive and session is self._session:
+                    self._release_session()
 
         raise ToolError("no command provided.")
 
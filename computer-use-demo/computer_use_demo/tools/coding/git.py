@@ -27,6 +27,9 @@ class GitTool(BaseAnthropicTool):
     name: Literal["git"] = "git"
     api_type: Literal["custom"] = "custom"
 
+    def is_parallel_safe(self, tool_input: dict[str, Any]) -> bool:
+        return tool_input.get("command") in ("status", "diff", "log", "show")
+
     def to_params(self) -> Any:
         return {
             "name": self.name,
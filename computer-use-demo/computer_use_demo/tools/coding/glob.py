@@ -5,12 +5,27 @@ Supports glob patterns like:
 - *.py (all Python files in current directory)
 - **/*.py (all Python files recursively)
 - src/**/*.{js,ts} (JavaScript and TypeScript files in src)
+
+Files are streamed from the walker (see walker.py), which skips ignored
+directories and stats each file once; only the newest ``offset + limit``
+matches are kept. Directory listings are cached per tool instance for a few
+seconds, so repeated globs over the same tree in a session are cheap. With
+PROTO_SEARCH_INDEX=true, files are listed from the project's search index
+(see search_index.py) instead.
 """
 
+import asyncio
+import heapq
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Literal
 
 from ..base import BaseAnthropicTool, CLIResult, ToolError
+from .search_index import get_search_index, search_index_enabled
+from .walker import StatCache, WalkEntry, compile_glob, glob_dir_filter, walk_files
+
+# Files listed when no limit is given
+DEFAULT_LIMIT = 200
 
 
 class GlobTool(BaseAnthropicTool):
@@ -21,6 +36,16 @@ class GlobTool(BaseAnthropicTool):
 
     name: Literal["glob"] = "glob"
     api_type: Literal["custom"] = "custom"
+    parallel_safe: bool = True
+
+    def __init__(self, use_index: bool | None = None):
+        """
+        Args:
+            use_index: List files from the project's search index
+                (default: PROTO_SEARCH_INDEX)
+        """
+        self.use_index = search_index_enabled() if use_index is None else use_index
+        self.stat_cache = StatCache()
 
     def to_params(self) -> Any:
         return {
@@ -47,6 +72,14 @@ class GlobTool(BaseAnthropicTool):
                             "Base directory to search from (absolute path). Defaults to current working directory if not specified."
                         ),
                     },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Maximum number of files to return (newest first). Default: {DEFAULT_LIMIT}.",
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of newest files to skip, for paging through results. Default: 0.",
+                    },
                 },
                 "required": ["pattern"],
             },
@@ -57,6 +90,8 @@ class GlobTool(BaseAnthropicTool):
         *,
         pattern: str,
         path: str | None = None,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
         **kwargs,
     ) -> CLIResult:
         """
@@ -65,6 +100,8 @@ class GlobTool(BaseAnthropicTool):
         Args:
             pattern: Glob pattern (e.g., "**/*.py", "src/**/*.ts")
             path: Base directory to search from (defaults to cwd)
+            limit: Maximum number of files to return
+            offset: Number of newest files to skip
 
         Returns:
             CLIResult with list of matching file paths
@@ -85,22 +122,31 @@ class GlobTool(BaseAnthropicTool):
             else:
                 base_path = Path.cwd()
 
-            # Execute glob search
-            matches = list(base_path.glob(pattern))
+            if limit < 1:
+                raise ToolError(f"limit must be at least 1. Got: {limit}")
+            if offset < 0:
+                raise ToolError(f"offset must not be negative. Got: {offset}")
 
-            # Filter to files only and sort by modification time (newest first)
-            files = [f for f in matches if f.is_file()]
-            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+            files, total = await asyncio.to_thread(
+                self._newest_matches, base_path, pattern, limit, offset
+            )
 
             # Format output
-            if not files:
+            if not total:
                 output = f"No files found matching pattern '{pattern}' in {base_path}"
-            else:
-                file_list = "\n".join(str(f) for f in files)
+            elif not files:
                 output = (
-                    f"Found {len(files)} file(s) matching '{pattern}' in {base_path}:\n"
-                    f"{file_list}"
+                    f"Found {total} file(s) matching '{pattern}' in {base_path}, "
+                    f"none past offset {offset}."
                 )
+            else:
+                file_list = "\n".join(entry.path for entry in files)
+                output = f"Found {total} file(s) matching '{pattern}' in {base_path}:\n{file_list}"
+                if offset + len(files) < total:
+                    output += (
+                        f"\n\n(Showing {offset + 1}-{offset + len(files)} of {total}, newest first. "
+                        f"Use offset={offset + len(files)} to see more.)"
+                    )
 
             return CLIResult(output=output)
 
@@ -108,3 +154,38 @@ class GlobTool(BaseAnthropicTool):
             if isinstance(e, ToolError):
                 raise
             raise ToolError(f"Glob search failed: {str(e)}") from e
+
+    def _newest_matches(
+        self, base_path: Path, pattern: str, limit: int, offset: int
+    ) -> tuple[list[WalkEntry], int]:
+        """The newest matching files in ``[offset, offset + limit)`` and the total count."""
+        entries = self._list_indexed(base_path, pattern) if self.use_index else None
+        if entries is None:
+            regex = compile_glob(pattern)
+            entries = (
+                entry
+                for entry in walk_files(
+                    base_path, dir_filter=glob_dir_filter(pattern), cache=self.stat_cache
+                )
+                if regex.match(entry.rel)
+            )
+        total = 0
+
+        def counted(items: Iterable[WalkEntry]) -> Iterable[WalkEntry]:
+            nonlocal total
+            for item in items:
+                total += 1
+                yield item
+
+        # A bounded heap keeps only the newest offset + limit entries
+        newest = heapq.nlargest(offset + limit, counted(entries), key=lambda entry: entry.mtime)
+        return newest[offset:], total
+
+    @staticmethod
+    def _list_indexed(base_path: Path, pattern: str) -> list[WalkEntry] | None:
+        """Matching files from the search index (None if the path is not indexed)."""
+        index = get_search_index(base_path)
+        if not index.covers(base_path):
+            return None
+        index.refresh()
+        return index.list_files(under=base_path, glob=pattern)
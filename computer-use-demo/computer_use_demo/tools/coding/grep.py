@@ -8,13 +8,18 @@ Features:
 - Glob filtering for file types
 - Case-insensitive search
 - Multiline pattern support
+- Parallel search that skips ignored (.gitignore, node_modules, ...) and binary files
+- Optional trigram index that narrows the files to search (PROTO_SEARCH_INDEX=true)
 """
 
+import asyncio
 import re
 from pathlib import Path
 from typing import Any, Literal
 
 from ..base import BaseAnthropicTool, CLIResult, ToolError
+from .search import iter_matches
+from .search_index import get_search_index, search_index_enabled
 
 
 class GrepTool(BaseAnthropicTool):
@@ -25,6 +30,15 @@ class GrepTool(BaseAnthropicTool):
 
     name: Literal["grep"] = "grep"
     api_type: Literal["custom"] = "custom"
+    parallel_safe: bool = True
+
+    def __init__(self, use_index: bool | None = None):
+        """
+        Args:
+            use_index: Narrow searches with the project's trigram index
+                (default: PROTO_SEARCH_INDEX)
+        """
+        self.use_index = search_index_enabled() if use_index is None else use_index
 
     def to_params(self) -> Any:
         return {
@@ -126,58 +140,16 @@ class GrepTool(BaseAnthropicTool):
             else:
                 search_path = Path.cwd()
 
-            # Get files to search
-            if search_path.is_file():
-                files = [search_path]
-            else:
-                # Use glob pattern if provided, otherwise search all files
-                glob_pattern = glob if glob else "**/*"
-                all_matches = list(search_path.glob(glob_pattern))
-                files = [f for f in all_matches if f.is_file()]
-
-            # Search files
-            matches = []
-            total_matches = 0
-
-            for file_path in files:
-                # Skip binary files and very large files
-                try:
-                    if file_path.stat().st_size > 10_000_000:  # Skip files > 10MB
-                        continue
-
-                    content = file_path.read_text(errors="ignore")
-                    lines = content.split("\n")
-
-                    # Search each line
-                    for line_num, line in enumerate(lines, 1):
-                        if compiled_pattern.search(line):
-                            total_matches += 1
-
-                            # Get context lines if requested
-                            if context_lines > 0:
-                                start = max(0, line_num - 1 - context_lines)
-                                end = min(len(lines), line_num + context_lines)
-                                context = lines[start:end]
-                                match_line_in_context = line_num - 1 - start
-
-                                context_text = "\n".join(
-                                    f"{'>' if i == match_line_in_context else ' '} {start + i + 1:6} | {context[i]}"
-                                    for i in range(len(context))
-                                )
-                                matches.append(f"{file_path}:{line_num}:\n{context_text}\n")
-                            else:
-                                matches.append(f"{file_path}:{line_num}: {line.strip()}")
-
-                            # Stop if we've reached max matches
-                            if total_matches >= max_matches:
-                                break
-
-                except (UnicodeDecodeError, PermissionError):
-                    # Skip files we can't read
-                    continue
-
-                if total_matches >= max_matches:
-                    break
+            # Search off the event loop; stops reading files at max_matches
+            matches, total_matches = await asyncio.to_thread(
+                self._collect_matches,
+                search_path,
+                compiled_pattern,
+                glob,
+                context_lines,
+                max_matches,
+                self.use_index,
+            )
 
             # Format output
             if not matches:
@@ -200,3 +172,45 @@ class GrepTool(BaseAnthropicTool):
             if isinstance(e, ToolError):
                 raise
             raise ToolError(f"Grep search failed: {str(e)}") from e
+
+    @staticmethod
+    def _collect_matches(
+        search_path: Path,
+        pattern: re.Pattern[str],
+        glob: str | None,
+        context_lines: int,
+        max_matches: int,
+        use_index: bool = False,
+    ) -> tuple[list[str], int]:
+        """Format matches until ``max_matches`` are found."""
+        matches: list[str] = []
+        files = None
+        if use_index and search_path.is_dir():
+            index = get_search_index(search_path)
+            if index.covers(search_path):
+                index.refresh()
+                files = index.candidates(pattern, under=search_path, glob=glob)
+        search = iter_matches(
+            search_path,
+            pattern,
+            glob=glob,
+            context_lines=context_lines,
+            max_matches=max_matches,
+            files=files,
+        )
+        try:
+            for match in search:
+                if context_lines > 0:
+                    context_text = "\n".join(
+                        f"{'>' if number == match.line_number else ' '} {number:6} | {text}"
+                        for number, text in match.context
+                    )
+                    matches.append(f"{match.path}:{match.line_number}:\n{context_text}\n")
+                else:
+                    matches.append(f"{match.path}:{match.line_number}: {match.line.strip()}")
+
+                if len(matches) >= max_matches:
+                    break
+        finally:
+            search.close()
+        return matches, len(matches)
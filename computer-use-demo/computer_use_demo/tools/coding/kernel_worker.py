@@ -0,0 +1,235 @@
+"""
+Worker process of the execute_python tool.
+
+Started as a plain script (``python kernel_worker.py``) so that it does not
+import the tool package. The worker pre-imports the data science libraries
+once and then keeps one persistent namespace, executing the requests it
+reads from stdin. Requests and responses are JSON lines; anything user code
+writes to file descriptor 1 directly is sent to stderr so that it cannot
+corrupt the responses.
+
+A request is ``{"id": int, "code": str}``; the response carries the same
+id, the captured ``output`` and ``error`` and, when the code evaluated to a
+DataFrame and pyarrow is available, a ``frame`` written as an Arrow IPC
+file to shared memory.
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import sys
+import tempfile
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any
+
+PRELOAD = """
+import sys
+import os
+import json
+import math
+import statistics
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+# Data science libraries (import only if available)
+try:
+    import pandas as pd
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+except ImportError:
+    pass
+
+try:
+    from scipy import stats
+except ImportError:
+    pass
+
+# Helper function for printing dataframes
+def display(obj):
+    '''Display an object with nice formatting'''
+    if 'pandas' in sys.modules:
+        import pandas as pd
+        if isinstance(obj, pd.DataFrame):
+            print(obj.to_string())
+            return
+        if isinstance(obj, pd.Series):
+            print(obj.to_string())
+            return
+    print(obj)
+"""
+
+# Output beyond this is cut to keep responses (and the context window) small
+MAX_OUTPUT_CHARS = 100_000
+
+# Rows of a DataFrame result shown inline; the full frame goes to shared memory
+FRAME_PREVIEW_ROWS = 20
+
+# Frame files kept per worker; older ones are deleted
+MAX_FRAMES = 5
+
+FRAME_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class Kernel:
+    """One persistent namespace and the frames it exported."""
+
+    def __init__(self):
+        self.namespace: dict[str, Any] = {"__name__": "__main__"}
+        self.frames: list[str] = []
+        self._frame_count = 0
+        try:
+            exec(PRELOAD, self.namespace)
+        except Exception:
+            # If preload fails, still allow basic Python
+            self.namespace = {"__name__": "__main__"}
+
+    def execute(self, code: str) -> dict[str, Any]:
+        stdout_capture = io.StringIO()
+        stderr_capture = io.StringIO()
+        value = None
+        error = ""
+
+        try:
+            tree = ast.parse(code, "<agent_code>")
+            # Evaluate a trailing expression instead of running it twice
+            last = None
+            if tree.body and isinstance(tree.body[-1], ast.Expr):
+                last = ast.Expression(tree.body.pop().value)
+            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                exec(compile(tree, "<agent_code>", "exec"), self.namespace)
+                if last is not None:
+                    value = eval(compile(last, "<agent_code>", "eval"), self.namespace)
+        except SyntaxError as e:
+            error = f"SyntaxError: {e.msg} (line {e.lineno})"
+            if e.text:
+                error += f"\n  {e.text.strip()}\n  {' ' * (e.offset - 1) if e.offset else ''}^"
+        except KeyboardInterrupt:
+            error = "KeyboardInterrupt: execution was interrupted"
+        except MemoryError:
+            error = "MemoryError: the code exceeded the kernel's memory limit"
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
+
+        output = stdout_capture.getvalue().rstrip("\n")
+        error = (stderr_capture.getvalue() + error).rstrip("\n")
+        frame = None
+
+        # Like before, the value is only shown when nothing was printed
+        if value is not None and not output and not error:
+            frame = self._export_frame(value)
+            if frame is not None:
+                output = frame.pop("preview")
+            else:
+                output = repr(value)
+
+        return {"output": _truncate(output), "error": _truncate(error), "frame": frame}
+
+    def _export_frame(self, value: Any) -> dict[str, Any] | None:
+        pd = sys.modules.get("pandas")
+        if pd is None or not isinstance(value, pd.DataFrame):
+            return None
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return None
+
+        self._frame_count += 1
+        path = os.path.join(FRAME_DIR, f"proto-frame-{os.getpid()}-{self._frame_count}.arrow")
+        try:
+            table = pa.Table.from_pandas(value)
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        except Exception:
+            _remove(path)
+            return None
+
+        self.frames.append(path)
+        while len(self.frames) > MAX_FRAMES:
+            _remove(self.frames.pop(0))
+
+        rows, columns = value.shape
+        preview = value.head(FRAME_PREVIEW_ROWS).to_string()
+        if rows > FRAME_PREVIEW_ROWS:
+            preview += f"\n... ({rows - FRAME_PREVIEW_ROWS} more rows)"
+        return {
+            "path": path,
+            "rows": rows,
+            "columns": [str(column) for column in value.columns],
+            "preview": f"{preview}\n[DataFrame {rows} rows x {columns} columns, Arrow IPC: {path}]",
+        }
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_OUTPUT_CHARS:
+        return text
+    return text[:MAX_OUTPUT_CHARS] + f"\n[... {len(text) - MAX_OUTPUT_CHARS} characters truncated ...]"
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _limit_memory(limit: int) -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    # RLIMIT_DATA counts heap and anonymous mappings but not shared libraries
+    kind = getattr(resource, "RLIMIT_DATA", resource.RLIMIT_AS)
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(kind, (limit, hard))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--memory-limit", type=int, default=0, help="Bytes, 0 for none")
+    args = parser.parse_args()
+
+    # Keep the real stdout for responses and send fd 1 to stderr
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    kernel = Kernel()
+    if args.memory_limit:
+        _limit_memory(args.memory_limit)
+
+    def respond(message: dict[str, Any]) -> None:
+        responses.write(json.dumps(message) + "\n")
+        responses.flush()
+
+    respond({"ready": True, "pid": os.getpid()})
+    try:
+        while True:
+            try:
+                line = sys.stdin.readline()
+            except KeyboardInterrupt:
+                continue  # Interrupt arrived between requests
+            if not line:
+                break
+            request = json.loads(line)
+            try:
+                response = kernel.execute(request["code"])
+            except KeyboardInterrupt:
+                response = {"output": "", "error": "KeyboardInterrupt: execution was interrupted", "frame": None}
+            respond({"id": request["id"], **response})
+    finally:
+        for path in kernel.frames:
+            _remove(path)
+
+
+if __name__ == "__main__":
+    main()
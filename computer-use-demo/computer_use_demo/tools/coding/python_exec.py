@@ -6,145 +6,228 @@ This tool allows agents to execute Python code with:
 - Pre-loaded data science libraries
 - Rich output support (dataframes, plots)
 - Clean error handling
+
+Code runs in a worker process per session (see kernel_worker.py) rather
+than on the event loop, so long computations don't stall the UI or other
+agents. Workers are leased from a pool that starts them (and imports the
+data science libraries) ahead of time, and are bounded by a wall-clock
+timeout and a memory limit.
 """
 
 import asyncio
+import json
 import os
+import signal
+import subprocess
 import sys
-import traceback
+import weakref
+from pathlib import Path
 from typing import Any, Literal
 
 from ..base import BaseAnthropicTool, CLIResult, ToolError, ToolResult
+from ..shell_pool import PipedProcess, ShellLease, ShellPool
+from .kernel_worker import FRAME_DIR
 
+try:
+    import pyarrow as pa
 
-class _PythonSession:
-    """A persistent Python interpreter session."""
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
 
-    _started: bool
-    _globals: dict[str, Any]
-    _locals: dict[str, Any]
-    _output_capture: list[str]
+WORKER_PATH = Path(__file__).with_name("kernel_worker.py")
 
-    def __init__(self):
-        self._started = False
-        self._globals = {}
-        self._locals = {}
-        self._output_capture = []
-        self._setup_environment()
-
-    def _setup_environment(self):
-        """Set up the Python environment with common imports."""
-        # Pre-load common data science libraries
-        preload_code = """
-import sys
-import os
-import json
-import math
-import statistics
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Tuple
+# Wall-clock limit of one execution
+DEFAULT_TIMEOUT = 300.0  # seconds
 
-# Data science libraries (import only if available)
-try:
-    import pandas as pd
-    import numpy as np
-except ImportError:
-    pass
+# Heap limit of a worker process, 0 for none
+DEFAULT_MEMORY_LIMIT = 4 * 1024**3
 
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend
-    import matplotlib.pyplot as plt
-except ImportError:
-    pass
+# Largest response line a worker may send
+_RESPONSE_LIMIT = 16 * 1024 * 1024
 
-try:
-    from scipy import stats
-except ImportError:
-    pass
-
-# Helper function for printing dataframes
-def display(obj):
-    '''Display an object with nice formatting'''
-    if 'pandas' in sys.modules:
-        import pandas as pd
-        if isinstance(obj, pd.DataFrame):
-            print(obj.to_string())
-            return
-        if isinstance(obj, pd.Series):
-            print(obj.to_string())
-            return
-    print(obj)
-"""
+
+def remove_frames(pid: int | None = None) -> int:
+    """
+    Delete the Arrow frame files of one worker, or of every worker that
+    is no longer running (pid None).
+
+    Workers are killed without a chance to clean up, and the files live in
+    shared memory, so they are removed from here.
+
+    Returns:
+        Number of files deleted
+    """
+    removed = 0
+    for path in Path(FRAME_DIR).glob(f"proto-frame-{pid if pid is not None else '*'}-*.arrow"):
+        if pid is None:
+            try:
+                owner = int(path.name.split("-")[2])
+                os.kill(owner, 0)
+                continue  # Still running
+            except (ValueError, PermissionError):
+                continue  # Not ours to judge
+            except ProcessLookupError:
+                pass
         try:
-            exec(preload_code, self._globals, self._locals)
-            self._started = True
-        except Exception as e:
-            # If preload fails, still allow basic Python
-            self._globals = {"__builtins__": __builtins__}
-            self._locals = {}
-            self._started = True
-
-    def reset(self):
-        """Reset the Python environment (clear all variables)."""
-        self._globals.clear()
-        self._locals.clear()
-        self._output_capture.clear()
-        self._setup_environment()
-
-    async def execute(self, code: str) -> CLIResult:
-        """Execute Python code and return the result."""
-        if not self._started:
-            raise ToolError("Session has not started.")
-
-        # Capture stdout/stderr
-        import io
-        from contextlib import redirect_stdout, redirect_stderr
-
-        stdout_capture = io.StringIO()
-        stderr_capture = io.StringIO()
-
-        output = ""
-        error = ""
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
 
+def load_frame(path: str) -> Any:
+    """
+    Load a DataFrame result exported by a kernel.
+
+    The Arrow IPC file is memory-mapped, so large frames are not copied
+    through a pipe or parsed from text.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ToolError("pyarrow is required to load DataFrame results.")
+    return pa.ipc.open_file(pa.memory_map(path)).read_pandas()
+
+
+class _PythonKernel:
+    """A worker process holding one persistent Python namespace."""
+
+    _started: bool
+    _process: PipedProcess
+
+    _start_timeout: float = 120.0  # seconds, includes importing pandas & co
+    _interrupt_grace: float = 5.0  # seconds
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.frames: list[dict[str, Any]] = []
+        self._started = False
+        self._broken = False
+        self._next_id = 0
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        if self._started:
+            return
+
+        self._process = await PipedProcess.spawn(
+            [sys.executable, "-u", str(WORKER_PATH), "--memory-limit", str(self.memory_limit)],
+            limit=_RESPONSE_LIMIT,
+            stderr=subprocess.DEVNULL,
+        )
         try:
-            # Compile the code first to check for syntax errors
-            compiled_code = compile(code, "<agent_code>", "exec")
-
-            # Execute with output capture
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(compiled_code, self._globals, self._locals)
-
-            # Get captured output
-            output = stdout_capture.getvalue()
-            error = stderr_capture.getvalue()
-
-            # Strip trailing newlines from output
-            if output:
-                output = output.rstrip('\n')
-
-            # If no output, try to get the last expression value
-            if not output and not error:
-                # Try to evaluate the last line as an expression
-                lines = code.strip().split('\n')
-                if lines:
-                    last_line = lines[-1].strip()
-                    if last_line and not last_line.startswith(('#', 'import', 'from', 'def', 'class', 'if', 'for', 'while', 'try', 'with')):
-                        try:
-                            result = eval(last_line, self._globals, self._locals)
-                            if result is not None:
-                                output = repr(result)
-                        except:
-                            pass  # Last line wasn't an expression, that's okay
-
-        except SyntaxError as e:
-            error = f"SyntaxError: {e.msg} (line {e.lineno})"
-            if e.text:
-                error += f"\n  {e.text.strip()}\n  {' ' * (e.offset - 1) if e.offset else ''}^"
-        except Exception as e:
-            error = f"{type(e).__name__}: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-
-        return CLIResult(output=output if output else None, error=error if error else None)
+            async with asyncio.timeout(self._start_timeout):
+                ready = await self._read_message()
+            if not ready.get("ready"):
+                raise ToolError("Python worker did not start.")
+        except BaseException:
+            await self._process.close()
+            raise
+
+        self._started = True
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker is running and responsive."""
+        return self._started and not self._broken and self._process.returncode is None
+
+    async def kill(self):
+        """Kill the worker; its namespace and exported frames are lost."""
+        if self._started:
+            self._broken = True
+            await self._process.close()
+            remove_frames(self._process.pid)
+            self.frames.clear()
+
+    async def run(self, code: str, timeout: float = DEFAULT_TIMEOUT) -> CLIResult:
+        """
+        Execute code in the worker's namespace.
+
+        On timeout or cancellation the worker is interrupted (KeyboardInterrupt),
+        which keeps its namespace; a worker that does not react is killed.
+        """
+        if not self.alive:
+            raise ToolError("Python worker is not running.")
+
+        async with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            assert self._process.stdin
+            self._process.stdin.write((json.dumps({"id": request_id, "code": code}) + "\n").encode())
+            await self._process.stdin.drain()
+
+            try:
+                async with asyncio.timeout(timeout):
+                    response = await self._read_response(request_id)
+            except asyncio.TimeoutError:
+                await self._interrupt(request_id)
+                message = f"timed out: execution did not finish in {timeout} seconds"
+                if not self.alive:
+                    message += "; the Python environment was reset"
+                return CLIResult(error=message)
+            except asyncio.CancelledError:
+                # Stop the work; the stale response is skipped by the next run
+                self._process.send_signal(signal.SIGINT)
+                raise
+
+        output = response.get("output") or None
+        error = response.get("error") or None
+        frame = response.get("frame")
+        if frame:
+            self.frames.append(frame)
+            del self.frames[:-5]
+        return CLIResult(output=output, error=error)
+
+    async def _interrupt(self, request_id: int) -> None:
+        self._process.send_signal(signal.SIGINT)
+        try:
+            async with asyncio.timeout(self._interrupt_grace):
+                await self._read_response(request_id)
+        except (asyncio.TimeoutError, ToolError):
+            await self.kill()
+
+    async def _read_response(self, request_id: int) -> dict[str, Any]:
+        while True:
+            message = await self._read_message()
+            # Responses to cancelled requests are skipped
+            if message.get("id") == request_id:
+                return message
+
+    async def _read_message(self) -> dict[str, Any]:
+        assert self._process.stdout
+        try:
+            line = await self._process.stdout.readline()
+        except ValueError:
+            line = b""  # Over the response limit; the stream can't be resynced
+        if not line:
+            self._broken = True
+            code = self._process.returncode
+            hint = " (memory limit exceeded?)" if code == -signal.SIGKILL else ""
+            raise ToolError(f"Python worker exited unexpectedly{hint}.")
+        return json.loads(line)
+
+
+# One kernel pool per event loop, since workers are bound to the loop that started them
+_kernel_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ShellPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_kernel_pool() -> ShellPool:
+    """
+    Get the Python kernel pool of the running event loop.
+
+    Every execute_python tool holds its kernel for as long as it lives, so
+    the pool only keeps one warm kernel ready and does not cap leases.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _kernel_pools.get(loop)
+    if pool is None:
+        # Frames of workers that died with an earlier process
+        remove_frames()
+        pool = _kernel_pools[loop] = ShellPool(_PythonKernel, min_idle=1)
+    return pool
 
 
 class PythonExecutionTool(BaseAnthropicTool):
@@ -183,15 +266,51 @@ class PythonExecutionTool(BaseAnthropicTool):
     ```
     """
 
-    _session: _PythonSession | None
+    _session: _PythonKernel | None
+    _lease: ShellLease | None
 
     api_type: Literal["python_exec_v1"] = "python_exec_v1"
     name: Literal["execute_python"] = "execute_python"
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool: ShellPool | None = None,
+        owner: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """
+        Args:
+            pool: Pool to lease kernels from (default: the shared pool).
+            owner: Name the kernel is leased under, e.g. the agent's session.
+            timeout: Wall-clock limit of one execution in seconds.
+        """
         self._session = None
+        self._lease = None
+        self._release_on_collect = None
+        self.pool = pool
+        self.owner = owner
+        self.timeout = timeout
         super().__init__()
 
+    @property
+    def frames(self) -> list[dict[str, Any]]:
+        """Recent DataFrame results of this session (see ``load_frame``)."""
+        return self._session.frames if self._session else []
+
+    async def _acquire_session(self) -> None:
+        pool = self.pool or get_kernel_pool()
+        self._lease = await pool.acquire(self.owner or f"{self.name}-{id(self):x}")
+        self._session = self._lease.session
+        # don't keep a worker leased forever if the tool is dropped
+        self._release_on_collect = weakref.finalize(self, self._lease.release)
+
+    def _release_session(self) -> None:
+        if self._release_on_collect is not None:
+            self._release_on_collect()
+        self._release_on_collect = None
+        self._lease = None
+        self._session = None
+
     def to_params(self) -> Any:
         return {
             "type": "custom",
@@ -221,12 +340,21 @@ class PythonExecutionTool(BaseAnthropicTool):
         self, code: str | None = None, reset: bool = False, **kwargs
     ):
         """Execute Python code with optional environment reset."""
-        if reset or self._session is None:
-            self._session = _PythonSession()
+        if reset:
+            self._release_session()
+        if self._session is None:
+            await self._acquire_session()
             if reset and code is None:
                 return ToolResult(system="Python environment has been reset.")
 
         if code is not None:
-            return await self._session.execute(code)
+            session = self._session
+            assert session
+            try:
+                return await session.run(code, self.timeout)
+            finally:
+                # a killed worker is replaced by a fresh one on the next call
+                if not session.alive and session is self._session:
+                    self._release_session()
 
         raise ToolError("No code provided.")
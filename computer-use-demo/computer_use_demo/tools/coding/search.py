@@ -0,0 +1,155 @@
+"""
+Content search engine behind GrepTool.
+
+Files come from the parallel walker (see walker.py) and are searched by a
+pool of threads, a bounded number of files ahead of the consumer. Matches
+are yielded in walk order as soon as they are found, so a search that
+stops at ``max_matches`` never reads the rest of the tree. Binary files are
+recognized by a NUL byte in their first block and skipped, and a file is
+only split into lines when the pattern matches it as a whole.
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .walker import DEFAULT_WORKERS, compile_glob, walk_files
+
+# Files larger than this are not searched
+MAX_FILE_SIZE = 10_000_000
+
+# A NUL byte in this many leading bytes marks a file as binary
+BINARY_SNIFF_BYTES = 8192
+
+
+@dataclass(frozen=True, slots=True)
+class LineMatch:
+    """A matching line, with its context lines if requested."""
+
+    path: str
+    line_number: int
+    line: str
+    # (line number, text) pairs around the match, including the match itself
+    context: tuple[tuple[int, str], ...] = ()
+
+
+def _whole_text_pattern(pattern: re.Pattern[str]) -> re.Pattern[str] | None:
+    """The pattern applied to a whole file, to skip files without any match."""
+    # \A and \Z mean line boundaries when lines are searched one at a time
+    if "\\A" in pattern.pattern or "\\Z" in pattern.pattern:
+        return None
+    return re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+
+
+def read_text(path: str) -> str | None:
+    """Read a text file, or None for binary and unreadable files."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return None
+            data = head + f.read()
+    except OSError:
+        return None
+    return data.decode("utf-8", errors="ignore")
+
+
+def search_file(
+    path: str,
+    pattern: re.Pattern[str],
+    context_lines: int = 0,
+    limit: int | None = None,
+    whole_text: re.Pattern[str] | None = None,
+) -> list[LineMatch]:
+    """
+    Search one file line by line.
+
+    Args:
+        path: File to search
+        pattern: Compiled regex, applied to each line
+        context_lines: Lines of context to keep around each match
+        limit: Stop after this many matches
+        whole_text: Pattern that must match the whole text first (see
+            ``_whole_text_pattern``)
+    """
+    content = read_text(path)
+    if content is None:
+        return []
+    if whole_text is not None and not whole_text.search(content):
+        return []
+
+    lines = content.split("\n")
+    matches: list[LineMatch] = []
+    for index, line in enumerate(lines):
+        if not pattern.search(line):
+            continue
+        context: tuple[tuple[int, str], ...] = ()
+        if context_lines > 0:
+            start = max(0, index - context_lines)
+            end = min(len(lines), index + context_lines + 1)
+            context = tuple((number + 1, lines[number]) for number in range(start, end))
+        matches.append(LineMatch(path, index + 1, line, context))
+        if limit is not None and len(matches) >= limit:
+            break
+    return matches
+
+
+def iter_matches(
+    root: str | Path,
+    pattern: re.Pattern[str],
+    glob: str | None = None,
+    context_lines: int = 0,
+    max_matches: int | None = None,
+    files: Iterable[str] | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[LineMatch]:
+    """
+    Yield matches of ``pattern`` in the files below ``root``.
+
+    Args:
+        root: File or directory to search
+        pattern: Compiled regex, applied to each line
+        glob: Only search files whose relative path matches this glob
+            (a glob without "/" matches file names at any depth)
+        context_lines: Lines of context to keep around each match
+        max_matches: Matches kept per file (the caller stops the iteration
+            once it has enough overall)
+        files: Candidate files to search instead of walking ``root``
+        workers: Number of search threads
+    """
+    whole_text = _whole_text_pattern(pattern)
+    root = Path(root)
+    if root.is_file():
+        yield from search_file(str(root), pattern, context_lines, max_matches, whole_text)
+        return
+
+    walker = None
+    if files is None:
+        glob_regex = compile_glob(glob, match_basename=True) if glob else None
+        files = walker = (
+            entry.path
+            for entry in walk_files(root)
+            if entry.size <= MAX_FILE_SIZE
+            and (glob_regex is None or glob_regex.match(entry.rel))
+        )
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grep") as pool:
+        pending: deque[Future] = deque()
+        try:
+            for path in files:
+                pending.append(
+                    pool.submit(search_file, path, pattern, context_lines, max_matches, whole_text)
+                )
+                # Keep a bounded number of files in flight, yielding in order
+                while len(pending) > workers * 4 or (pending and pending[0].done()):
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if walker is not None:
+                walker.close()
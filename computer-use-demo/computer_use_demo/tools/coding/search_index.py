@@ -0,0 +1,476 @@
+"""
+Persistent trigram index for repository search.
+
+An index covers one project root (the enclosing git repository of the
+searched path, or the path itself). It records the files the walker sees,
+with their size and mtime, and for every lowercase word trigram the ids of
+the files containing it. A regex search first extracts the literal text
+the pattern requires, looks up its trigrams and only runs the regex on the
+files that contain all of them; the glob tool lists files from the index
+instead of walking the tree.
+
+The index is brought up to date before every use: with watchdog installed,
+only the paths reported changed are re-read; otherwise the tree is
+re-walked (a stat per file) and files whose size or mtime changed are
+re-indexed. Indexes are saved under ~/.proto/search_index and
+loaded again by later processes.
+
+Enable it with PROTO_SEARCH_INDEX=true. The index is held in memory while
+in use, roughly four bytes per distinct word trigram of every file.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+from .search import BINARY_SNIFF_BYTES, MAX_FILE_SIZE
+from .walker import (
+    DEFAULT_IGNORED_DIRS,
+    IgnoreRules,
+    WalkEntry,
+    _repository_rules,
+    compile_glob,
+    walk_files,
+)
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore[no-redef]
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+INDEX_VERSION = 1
+
+# Trigrams are taken from runs of these (lowercased) characters only
+_WORD = re.compile(rb"[a-z0-9_]{3,}")
+
+
+def search_index_enabled() -> bool:
+    """Whether the grep and glob tools should use the index."""
+    return os.getenv("PROTO_SEARCH_INDEX", "false").lower() == "true"
+
+
+def project_root(path: str | Path) -> Path:
+    """The enclosing git repository of ``path``, or ``path`` itself."""
+    path = Path(path).resolve()
+    for directory in (path, *path.parents):
+        if (directory / ".git").exists():
+            return directory
+    return path
+
+
+def _trigrams(data: bytes) -> set[bytes]:
+    words = set(_WORD.findall(data.lower()))
+    return {word[i : i + 3] for word in words for i in range(len(word) - 2)}
+
+
+def _walk_order(rel: str) -> tuple:
+    """Sort key giving the walker's order: a directory's files before its subdirectories."""
+    parts = rel.split("/")
+    return (*((1, part) for part in parts[:-1]), (0, parts[-1]))
+
+
+def _literal_runs(items: list) -> list[str]:
+    """Literal strings every match of a parsed regex must contain."""
+    runs: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def walk(parsed: list) -> None:
+        for op, av in parsed:
+            if op is sre_parse.LITERAL:
+                current.append(chr(av))
+            elif op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in _REPEATS and av[0] >= 1:
+                # The repeated part occurs at least once, but not necessarily adjacent
+                flush()
+                walk(av[2])
+                flush()
+            else:
+                flush()
+
+    walk(items)
+    flush()
+    return runs
+
+
+_REPEATS = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+
+def query_trigrams(pattern: re.Pattern[str]) -> set[bytes] | None:
+    """Trigrams every file matching ``pattern`` contains, or None if unknown."""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    trigrams: set[bytes] = set()
+    for run in _literal_runs(list(parsed)):
+        if pattern.flags & re.IGNORECASE:
+            # These also match non-ASCII letters (e.g. "ſ", "K"), which break words
+            run = re.sub("[iks]", " ", run, flags=re.IGNORECASE)
+        trigrams |= _trigrams(run.encode("utf-8"))
+    return trigrams or None
+
+
+def _read_bytes(path: str) -> bytes | None:
+    """Contents of a text file, or None for binary and unreadable files."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return None
+            return head + f.read()
+    except OSError:
+        return None
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Collects the paths watchdog reports as changed."""
+
+    def __init__(self, index: "SearchIndex"):
+        self.index = index
+
+    def on_any_event(self, event) -> None:
+        with self.index._dirty_lock:
+            self.index._dirty.add(os.fsdecode(event.src_path))
+            dest = getattr(event, "dest_path", None)
+            if dest:
+                self.index._dirty.add(os.fsdecode(dest))
+
+
+class SearchIndex:
+    """Trigram index and file listing of one project root."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        index_dir: Path | None = None,
+        save_interval: float = 60.0,
+    ):
+        """
+        Args:
+            root: Project root to index
+            index_dir: Where indexes are saved (default: ~/.proto/search_index)
+            save_interval: Minimum seconds between saves of a changed index
+        """
+        self.root = Path(root).resolve()
+        index_dir = index_dir or Path.home() / ".proto" / "search_index"
+        digest = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+        self.index_path = index_dir / f"{digest}.idx"
+        self.save_interval = save_interval
+
+        self._lock = threading.RLock()
+        self._paths: list[str | None] = []  # File id -> relative path (None if removed)
+        self._files: dict[str, tuple[int, int, float]] = {}  # Path -> (id, size, mtime)
+        self._postings: dict[bytes, array] = {}
+        self._removed = 0
+        self._built = False
+        self._refreshed_at = 0.0
+        self._saved_at = 0.0
+        self._changed = False
+
+        self._observer = None
+        self._dirty: set[str] = set()
+        self._dirty_lock = threading.Lock()
+
+        self._load()
+
+    # ==================== Persistence ====================
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        self._paths = data["paths"]
+        self._files = data["files"]
+        self._postings = data["postings"]
+        self._removed = data["removed"]
+        self._built = True
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "root": str(self.root),
+                "paths": self._paths,
+                "files": self._files,
+                "postings": self._postings,
+                "removed": self._removed,
+            }
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+            self._saved_at = time.monotonic()
+            self._changed = False
+
+    # ==================== Updating ====================
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the tree."""
+        with self._lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            # A changed .gitignore can change what is listed anywhere below it
+            watched = self._observer is not None and self._built and self._refreshed_at
+            if watched and not any(os.path.basename(path) == ".gitignore" for path in dirty):
+                for path in sorted(dirty):
+                    self._refresh_path(path)
+            else:
+                # Unwatched trees are re-walked every time: a file written
+                # just before a search must be found
+                self._start_watching()
+                self._sync(walk_files(self.root), prefix="")
+                self._built = True
+            self._refreshed_at = time.monotonic()
+
+            if self._removed > max(1000, len(self._files)):
+                self._compact()
+            if self._changed and time.monotonic() - self._saved_at >= self.save_interval:
+                self.save()
+
+    def _sync(self, entries: Iterator[WalkEntry], prefix: str) -> None:
+        """Re-index changed files among ``entries`` and drop vanished ones under ``prefix``."""
+        seen = set()
+        for entry in entries:
+            rel = prefix + entry.rel
+            seen.add(rel)
+            known = self._files.get(rel)
+            if known is None or known[1] != entry.size or known[2] != entry.mtime:
+                self._index_file(rel, entry.path, entry.size, entry.mtime)
+        stale = [
+            rel
+            for rel in self._files
+            if rel not in seen and (not prefix or rel.startswith(prefix))
+        ]
+        for rel in stale:
+            self._remove_file(rel)
+
+    def _refresh_path(self, path: str) -> None:
+        try:
+            rel = str(Path(path).relative_to(self.root)).replace(os.sep, "/")
+        except ValueError:
+            return
+        if rel == "." or rel.split("/", 1)[0] == ".git":
+            return
+        if os.path.isdir(path):
+            self._sync(walk_files(path), prefix=rel + "/")
+            return
+        # List the parent so that ignore rules apply as in a full walk
+        entry = next(
+            (
+                entry
+                for entry in walk_files(os.path.dirname(path), dir_filter=lambda _: False)
+                if entry.path == path
+            ),
+            None,
+        )
+        if entry is not None:
+            known = self._files.get(rel)
+            if known is None or known[1] != entry.size or known[2] != entry.mtime:
+                self._index_file(rel, entry.path, entry.size, entry.mtime)
+            return
+        # Gone (or ignored now), possibly a whole directory
+        prefix = rel + "/"
+        for stale in [known for known in self._files if known == rel or known.startswith(prefix)]:
+            self._remove_file(stale)
+
+    def _index_file(self, rel: str, path: str, size: int, mtime: float) -> None:
+        if rel in self._files:
+            self._remove_file(rel)
+        # Binary and oversized files are listed but have no trigrams
+        data = _read_bytes(path) if size <= MAX_FILE_SIZE else None
+        file_id = len(self._paths)
+        self._paths.append(rel)
+        self._files[rel] = (file_id, size, mtime)
+        if data:
+            for trigram in _trigrams(data):
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    postings = self._postings[trigram] = array("I")
+                postings.append(file_id)
+        self._changed = True
+
+    def _remove_file(self, rel: str) -> None:
+        file_id = self._files.pop(rel)[0]
+        # Postings keep the id; lookups drop ids whose path is gone
+        self._paths[file_id] = None
+        self._removed += 1
+        self._changed = True
+
+    def _compact(self) -> None:
+        """Renumber files to drop removed ids from the postings."""
+        renumber = {}
+        paths: list[str | None] = []
+        for old_id, rel in enumerate(self._paths):
+            if rel is not None:
+                renumber[old_id] = len(paths)
+                paths.append(rel)
+        for trigram, postings in list(self._postings.items()):
+            kept = array("I", (renumber[i] for i in postings if i in renumber))
+            if kept:
+                self._postings[trigram] = kept
+            else:
+                del self._postings[trigram]
+        self._files = {
+            rel: (renumber[i], size, mtime) for rel, (i, size, mtime) in self._files.items()
+        }
+        self._paths = paths
+        self._removed = 0
+        self._changed = True
+
+    def _start_watching(self) -> None:
+        if not WATCHDOG_AVAILABLE or self._observer is not None:
+            return
+        try:
+            observer = Observer()
+            observer.schedule(_ChangeHandler(self), str(self.root), recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            print(f"[SearchIndex] Watching {self.root} failed, re-walking instead: {e}")
+            return
+        self._observer = observer
+
+    def close(self) -> None:
+        """Stop watching and save pending changes."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        if self._changed:
+            self.save()
+
+    # ==================== Queries ====================
+
+    def covers(self, path: str | Path) -> bool:
+        """Whether the index lists the files below ``path`` (not ignored, not outside)."""
+        path = Path(path).resolve()
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return False
+        if any(part in DEFAULT_IGNORED_DIRS for part in parts):
+            return False
+        # The rules the walker applies on its way from the root down to ``path``
+        rules = _repository_rules(str(self.root))
+        directory = self.root
+        for part in parts:
+            rules = IgnoreRules.load(str(directory), rules)
+            directory = directory / part
+            if rules is not None and rules.ignored(str(directory), True):
+                return False
+        return True
+
+    def candidates(
+        self,
+        pattern: re.Pattern[str],
+        under: str | Path | None = None,
+        glob: str | None = None,
+    ) -> list[str]:
+        """
+        Absolute paths of the files that may match ``pattern``.
+
+        Args:
+            pattern: Regex the files are searched for
+            under: Only files below this directory
+            glob: Only files whose path relative to ``under`` matches
+                (a glob without "/" matches file names at any depth)
+        """
+        trigrams = query_trigrams(pattern)
+        with self._lock:
+            if trigrams is None:
+                ids = None
+            else:
+                postings = sorted(
+                    (self._postings.get(trigram, array("I")) for trigram in trigrams), key=len
+                )
+                ids = set(postings[0])
+                for other in postings[1:]:
+                    if not ids:
+                        break
+                    ids.intersection_update(other)
+
+            if ids is None:
+                rels = [rel for rel, (_, size, _) in self._files.items() if size <= MAX_FILE_SIZE]
+            else:
+                rels = [rel for i in ids if (rel := self._paths[i]) is not None]
+        glob_regex = compile_glob(glob, match_basename=True) if glob else None
+        return self._select(sorted(rels, key=_walk_order), under, glob_regex)
+
+    def list_files(
+        self, under: str | Path | None = None, glob: str | None = None
+    ) -> list[WalkEntry]:
+        """Indexed files below ``under`` whose relative path matches ``glob``."""
+        glob_regex = compile_glob(glob) if glob else None
+        with self._lock:
+            files = sorted(self._files.items(), key=lambda item: _walk_order(item[0]))
+        base = self._base(under)
+        entries = []
+        for rel, (_, size, mtime) in files:
+            if base and not rel.startswith(base):
+                continue
+            sub_rel = rel[len(base) :]
+            if glob_regex is None or glob_regex.match(sub_rel):
+                entries.append(WalkEntry(str(self.root / rel), sub_rel, size, mtime))
+        return entries
+
+    def _base(self, under: str | Path | None) -> str:
+        if under is None:
+            return ""
+        rel = str(Path(under).resolve().relative_to(self.root)).replace(os.sep, "/")
+        return "" if rel == "." else rel + "/"
+
+    def _select(
+        self, rels: list[str], under: str | Path | None, glob_regex: re.Pattern[str] | None
+    ) -> list[str]:
+        base = self._base(under)
+        return [
+            str(self.root / rel)
+            for rel in rels
+            if (not base or rel.startswith(base))
+            and (glob_regex is None or glob_regex.match(rel[len(base) :]))
+        ]
+
+
+_indexes: dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(path: str | Path) -> SearchIndex:
+    """Get the (shared) index of the project containing ``path``."""
+    root = project_root(path)
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = SearchIndex(root)
+    return index
@@ -0,0 +1,380 @@
+"""
+Parallel, gitignore-aware file walker shared by the grep and glob tools.
+
+Directories are listed by a pool of worker threads (``os.scandir`` and
+``stat`` release the GIL), several levels ahead of the consumer, while
+entries are still yielded in a stable depth-first order. Directories that
+are never worth searching (``.git``, ``node_modules``, virtualenvs, caches)
+are skipped, as is everything excluded by ``.gitignore`` files of the
+searched tree and of its enclosing repository. A ``StatCache`` lets
+repeated walks of the same tree reuse directory listings and file stats.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+# Directories skipped regardless of ignore files
+DEFAULT_IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+
+@dataclass(frozen=True, slots=True)
+class WalkEntry:
+    """A file found by the walker."""
+
+    path: str  # Absolute path
+    rel: str  # Path relative to the walk root, with "/" separators
+    size: int
+    mtime: float
+
+
+# ==================== Glob and gitignore patterns ====================
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob (with ``**`` and ``{a,b}``) into a regex body."""
+    parts: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif c == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif c == "?":
+            parts.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+        elif c == "{":
+            end = pattern.find("}", i)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+            else:
+                options = pattern[i + 1 : end].split(",")
+                parts.append("(?:" + "|".join(_translate(option) for option in options) + ")")
+                i = end + 1
+        elif c == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+    return "".join(parts)
+
+
+def compile_glob(pattern: str, match_basename: bool = False) -> re.Pattern[str]:
+    """
+    Compile a glob pattern matched against "/"-separated relative paths.
+
+    Args:
+        pattern: Glob such as ``*.py``, ``src/**/*.{ts,tsx}``
+        match_basename: Let patterns without "/" match files at any depth
+            (like ripgrep's ``--glob``) instead of only at the top level
+    """
+    pattern = pattern.lstrip("/")
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    prefix = "(?:.*/)?" if match_basename and "/" not in pattern else ""
+    return re.compile(prefix + _translate(pattern) + r"\Z", re.DOTALL)
+
+
+def glob_dir_filter(pattern: str) -> Callable[[str], bool] | None:
+    """
+    A ``walk_files`` directory filter skipping directories a glob can't reach.
+
+    Returns None when every directory may contain matches (e.g. ``**/*.py``).
+    """
+    pattern = pattern.lstrip("/")
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    if re.search(r"\{[^}]*/", pattern):
+        return None  # Alternatives spanning directories
+    segments = pattern.split("/")
+    if segments[0] == "**":
+        return None
+    # Directory segments before the first "**", matched one level each
+    fixed = []
+    for segment in segments[:-1]:
+        if segment == "**":
+            break
+        fixed.append(compile_glob(segment))
+    recursive = "**" in segments[:-1] or "**" in segments[-1]
+
+    def dir_filter(rel: str) -> bool:
+        parts = rel.split("/")
+        if len(parts) > len(fixed) and not recursive:
+            return False
+        return all(regex.match(part) for regex, part in zip(fixed, parts))
+
+    return dir_filter
+
+
+@dataclass(frozen=True, slots=True)
+class _IgnoreRule:
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+class IgnoreRules:
+    """Rules of one ``.gitignore`` file, chained to those of parent directories."""
+
+    def __init__(self, base: str, rules: list[_IgnoreRule], parent: "IgnoreRules | None" = None):
+        self.base = base
+        self.rules = rules
+        self.parent = parent
+
+    @classmethod
+    def load(cls, directory: str, parent: "IgnoreRules | None" = None) -> "IgnoreRules | None":
+        """Rules for ``directory``: its own .gitignore chained to ``parent``."""
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="ignore") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return parent
+        rules = [rule for line in lines if (rule := cls._parse(line)) is not None]
+        return cls(directory, rules, parent) if rules else parent
+
+    @staticmethod
+    def _parse(line: str) -> _IgnoreRule | None:
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+        # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+        anchored = "/" in line
+        body = _translate(line.lstrip("/"))
+        if not anchored:
+            body = "(?:.*/)?" + body
+        # A matching directory also covers everything below it
+        return _IgnoreRule(re.compile(body + r"(/.*)?\Z", re.DOTALL), negate, dir_only)
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Whether an absolute path is ignored; deeper files and later rules win."""
+        node: IgnoreRules | None = self
+        while node is not None:
+            if path.startswith(node.base + os.sep):
+                rel = path[len(node.base) + 1 :].replace(os.sep, "/")
+                for rule in reversed(node.rules):
+                    match = rule.regex.match(rel)
+                    # A directory-only rule matches a file only through its parents
+                    if match and (is_dir or not rule.dir_only or match.group(1)):
+                        return not rule.negate
+            node = node.parent
+        return False
+
+
+def _repository_rules(root: str) -> IgnoreRules | None:
+    """Rules of .gitignore files between the enclosing repository root and ``root``."""
+    current = Path(root)
+    chain = []
+    for directory in (current, *current.parents):
+        chain.append(directory)
+        if (directory / ".git").exists():
+            break
+    else:
+        return None  # Not in a repository: only the tree's own files apply
+    rules = None
+    for directory in reversed(chain[1:]):
+        rules = IgnoreRules.load(str(directory), rules)
+    return rules
+
+
+# ==================== Walking ====================
+
+# A listed directory entry: (name, is_dir, size, mtime); files only have sizes
+_Listing = list[tuple[str, bool, int, float]]
+
+
+def _list_directory(directory: str) -> _Listing:
+    """Name-sorted entries of a directory, each stat'ed once."""
+    listing: _Listing = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    listing.append((entry.name, True, 0, 0.0))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    listing.append((entry.name, False, stat.st_size, stat.st_mtime))
+            except OSError:
+                continue
+    listing.sort()
+    return listing
+
+
+class StatCache:
+    """
+    Directory listings (with file sizes and mtimes) shared by repeated walks.
+
+    A listing is reused while its directory's mtime is unchanged, which
+    catches added, removed and renamed entries, and for at most ``ttl``
+    seconds, since a file rewritten in place does not touch its directory.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_dirs: int = 50_000):
+        """
+        Args:
+            ttl: Seconds a listing is trusted
+            max_dirs: Listings kept; the least recently used are dropped
+        """
+        self.ttl = ttl
+        self.max_dirs = max_dirs
+        self._listings: OrderedDict[str, tuple[int, float, _Listing]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def listing(self, directory: str) -> _Listing:
+        """The entries of ``directory``, from the cache when still valid."""
+        dir_mtime = os.stat(directory).st_mtime_ns
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(directory)
+            if cached is not None and cached[0] == dir_mtime and now - cached[1] < self.ttl:
+                self._listings.move_to_end(directory)
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+        listing = _list_directory(directory)
+        with self._lock:
+            self._listings[directory] = (dir_mtime, now, listing)
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.max_dirs:
+                self._listings.popitem(last=False)
+        return listing
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+
+def _scan(
+    directory: str,
+    rel: str,
+    rules: IgnoreRules | None,
+    respect_gitignore: bool,
+    ignored_dirs: frozenset[str],
+    cache: StatCache | None = None,
+) -> tuple[list[WalkEntry], list[tuple[str, str, IgnoreRules | None]]]:
+    if respect_gitignore:
+        rules = IgnoreRules.load(directory, rules)
+    files: list[WalkEntry] = []
+    subdirs: list[tuple[str, str, IgnoreRules | None]] = []
+    try:
+        listing = cache.listing(directory) if cache is not None else _list_directory(directory)
+    except OSError:
+        return files, subdirs
+
+    for name, is_dir, size, mtime in listing:
+        path = os.path.join(directory, name)
+        entry_rel = f"{rel}/{name}" if rel else name
+        if is_dir:
+            if name in ignored_dirs:
+                continue
+            if rules is not None and rules.ignored(path, True):
+                continue
+            subdirs.append((path, entry_rel, rules))
+        else:
+            if rules is not None and rules.ignored(path, False):
+                continue
+            files.append(WalkEntry(path, entry_rel, size, mtime))
+    return files, subdirs
+
+
+def walk_files(
+    root: str | Path,
+    respect_gitignore: bool = True,
+    ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    dir_filter: Callable[[str], bool] | None = None,
+    workers: int = DEFAULT_WORKERS,
+    cache: StatCache | None = None,
+) -> Iterator[WalkEntry]:
+    """
+    Yield the files below ``root`` in depth-first, name-sorted order.
+
+    Directory listings are prefetched by ``workers`` threads; closing the
+    iterator early cancels the listings not started yet.
+
+    Args:
+        root: Directory to walk
+        respect_gitignore: Skip files excluded by .gitignore files
+        ignored_dirs: Directory names that are never entered
+        dir_filter: Called with the relative path of each directory; return
+            False to skip it (e.g. when it can't match a glob)
+        workers: Number of listing threads
+        cache: Reuse (and record) directory listings across walks
+    """
+    root = os.path.abspath(root)
+    ignored = frozenset(ignored_dirs)
+    rules = _repository_rules(root) if respect_gitignore else None
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="walker") as pool:
+
+        def submit(directory: str, rel: str, parent_rules: IgnoreRules | None) -> Future:
+            return pool.submit(
+                _scan, directory, rel, parent_rules, respect_gitignore, ignored, cache
+            )
+
+        stack = [submit(root, "", rules)]
+        try:
+            while stack:
+                files, subdirs = stack.pop().result()
+                yield from files
+                children = [
+                    submit(*subdir)
+                    for subdir in subdirs
+                    if dir_filter is None or dir_filter(subdir[1])
+                ]
+                stack.extend(reversed(children))
+        finally:
+            for future in stack:
+                future.cancel()
@@ -1,5 +1,6 @@
 """Collection classes for managing multiple tools."""
 
+from collections.abc import Callable
 from typing import Any
 
 from anthropic.types.beta import BetaToolUnionParam
@@ -10,6 +11,7 @@ from .base import (
     ToolFailure,
     ToolResult,
 )
+from .scheduler import MAX_PARALLEL_TOOLS, run_tool_calls
 
 # Import hooks - wrapped in try/except to avoid breaking if hooks module has issues
 try:
@@ -48,6 +50,31 @@ class ToolCollection:
     ) -> list[BetaToolUnionParam]:
         return [tool.to_params() for tool in self.tools]
 
+    def is_parallel_safe(self, name: str, tool_input: dict[str, Any]) -> bool:
+        """Whether a call may run concurrently with other parallel-safe calls."""
+        tool = self.tool_map.get(name)
+        return bool(tool and tool.is_parallel_safe(tool_input))
+
+    async def run_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        max_concurrency: int = MAX_PARALLEL_TOOLS,
+        on_result: Callable[[int, ToolResult], None] | None = None,
+    ) -> list[ToolResult]:
+        """
+        Run the (name, input) tool calls of one assistant turn.
+
+        Consecutive parallel-safe calls run concurrently; results keep the
+        order of ``calls``.
+        """
+        return await run_tool_calls(
+            calls,
+            lambda call: self.run(name=call[0], tool_input=call[1]),
+            lambda call: self.is_parallel_safe(*call),
+            max_concurrency=max_concurrency,
+            on_result=on_result,
+        )
+
     async def run(self, *, name: str, tool_input: dict[str, Any]) -> ToolResult:
         tool = self.tool_map.get(name)
         if not tool:
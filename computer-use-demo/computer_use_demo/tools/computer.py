@@ -12,6 +12,14 @@ from anthropic.types.beta import BetaToolComputerUse20241022Param, BetaToolUnion
 
 from .base import BaseAnthropicTool, ToolError, ToolResult
 from .run import run
+from .screen_capture import (
+    PIL_AVAILABLE,
+    encode_file,
+    get_screen_capturer,
+    in_process_capture_available,
+    screenshot_format,
+    screenshot_quality,
+)
 
 OUTPUT_DIR = "/tmp/outputs"
 
@@ -221,6 +229,21 @@ class BaseComputerTool:
 
     async def screenshot(self):
         """Take a screenshot of the current screen and return the base64 encoded image."""
+        size = None
+        if self._scaling_enabled:
+            size = self.scale_coordinates(ScalingSource.COMPUTER, self.width, self.height)
+        image_format = screenshot_format()
+        quality = screenshot_quality()
+
+        # Grab and encode in memory when mss and Pillow are installed
+        if in_process_capture_available():
+            display = f":{self.display_num}" if self.display_num is not None else None
+            try:
+                image = await get_screen_capturer(display).capture(size, image_format, quality)
+                return ToolResult(base64_image=image)
+            except Exception:
+                pass  # Fall back to the screenshot commands
+
         output_dir = Path(OUTPUT_DIR)
         output_dir.mkdir(parents=True, exist_ok=True)
         path = output_dir / f"screenshot_{uuid4().hex}.png"
@@ -232,20 +255,22 @@ class BaseComputerTool:
             # Fall back to scrot if gnome-screenshot isn't available
             screenshot_cmd = f"{self._display_prefix}scrot -p {path}"
 
-        result = await self.shell(screenshot_cmd, take_screenshot=False)
-        if self._scaling_enabled:
-            x, y = self.scale_coordinates(
-                ScalingSource.COMPUTER, self.width, self.height
-            )
-            await self.shell(
-                f"convert {path} -resize {x}x{y}! {path}", take_screenshot=False
-            )
+        try:
+            result = await self.shell(screenshot_cmd, take_screenshot=False)
+            if path.exists():
+                if PIL_AVAILABLE:
+                    data = await asyncio.to_thread(encode_file, path, size, image_format, quality)
+                else:
+                    if size is not None:
+                        x, y = size
+                        await self.shell(
+                            f"convert {path} -resize {x}x{y}! {path}", take_screenshot=False
+                        )
+                    data = path.read_bytes()
+                return result.replace(base64_image=base64.b64encode(data).decode())
+        finally:
+            path.unlink(missing_ok=True)
 
-        if path.exists():
-            return result.replace(
-                base64_image=base64.b64encode(path.read_bytes()).decode()
-            )
-        
         error_msg = result.error or ""
         if "could not create image from display" in error_msg:
             error_msg += (
@@ -33,6 +33,10 @@ class EditTool20250124(BaseAnthropicTool):
 
     _file_history: dict[Path, list[str]]
 
+    def is_parallel_safe(self, tool_input: dict[str, Any]) -> bool:
+        # Viewing is read-only; every other command writes files
+        return tool_input.get("command") == "view"
+
     def __init__(self):
         self._file_history = defaultdict(list)
         super().__init__()
@@ -349,6 +353,10 @@ class EditTool20250429(BaseAnthropicTool):
 
     _file_history: dict[Path, list[str]]
 
+    def is_parallel_safe(self, tool_input: dict[str, Any]) -> bool:
+        # Viewing is read-only; every other command writes files
+        return tool_input.get("command") == "view"
+
     def __init__(self):
         self._file_history = defaultdict(list)
         super().__init__()
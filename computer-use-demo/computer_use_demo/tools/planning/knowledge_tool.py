@@ -24,6 +24,9 @@ class KnowledgeTool(BaseAnthropicTool):
     name: str = "manage_knowledge"
     api_type: str = "custom"
 
+    def is_parallel_safe(self, tool_input: dict[str, Any]) -> bool:
+        return tool_input.get("operation") in ("search", "get", "list", "summary")
+
     def to_params(self):
         """Return tool parameter schema for Anthropic API."""
         return {
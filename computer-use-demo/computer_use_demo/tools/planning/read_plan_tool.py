@@ -22,6 +22,7 @@ class ReadPlanningTool(BaseAnthropicTool):
 
     name: str = "read_planning"
     api_type: str = "custom"
+    parallel_safe: bool = True
 
     def to_params(self):
         """Return tool parameter schema for Anthropic API."""
@@ -0,0 +1,66 @@
+"""
+Scheduling of the tool_use blocks of one assistant turn.
+
+Consecutive calls whose tools report themselves as parallel-safe (read-only
+lookups such as grep, glob or file views) run concurrently, bounded by a
+semaphore. Any other call is exclusive: it starts only after everything
+before it finished, and nothing after it starts until it is done. Results
+are always returned in the original call order.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+# Maximum parallel-safe tool calls running at once
+MAX_PARALLEL_TOOLS = 4
+
+C = TypeVar("C")
+R = TypeVar("R")
+
+
+async def run_tool_calls(
+    calls: list[C],
+    run: Callable[[C], Awaitable[R]],
+    is_parallel_safe: Callable[[C], bool],
+    max_concurrency: int = MAX_PARALLEL_TOOLS,
+    on_result: Callable[[int, R], None] | None = None,
+) -> list[R]:
+    """
+    Run tool calls, batching consecutive parallel-safe ones.
+
+    Args:
+        calls: Tool calls (e.g. tool_use blocks) in the order the model emitted them
+        run: Executes one call
+        is_parallel_safe: Whether a call may overlap with other safe calls
+        max_concurrency: Maximum calls of one batch running at once
+        on_result: Called with (index, result) in call order as batches finish
+
+    Returns:
+        Results in the order of ``calls``
+    """
+    results: list[Any] = [None] * len(calls)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(index: int) -> None:
+        async with semaphore:
+            results[index] = await run(calls[index])
+
+    index = 0
+    while index < len(calls):
+        batch = [index]
+        if len(calls) > 1 and is_parallel_safe(calls[index]):
+            while index + len(batch) < len(calls) and is_parallel_safe(calls[index + len(batch)]):
+                batch.append(index + len(batch))
+
+        if len(batch) == 1:
+            results[index] = await run(calls[index])
+        else:
+            await asyncio.gather(*(run_one(i) for i in batch))
+
+        if on_result:
+            for i in batch:
+                on_result(i, results[i])
+        index += len(batch)
+
+    return results
@@ -0,0 +1,202 @@
+"""
+In-process screen capture and encoding for the computer tool.
+
+Screenshots used to cost three processes (gnome-screenshot or scrot, then
+ImageMagick ``convert`` to resize) and two round trips through
+``/tmp/outputs``. With ``mss`` (a ctypes binding to Xlib, no subprocess)
+and Pillow installed, the screen is grabbed straight into memory, resized
+there and encoded once, all on a dedicated thread per display.
+
+The encoding is configurable:
+
+    PROTO_SCREENSHOT_FORMAT   png (default), webp or jpeg
+    PROTO_SCREENSHOT_QUALITY  1-100 for webp and jpeg (default 80)
+
+Consumers that build API image blocks should take the media type from
+``image_media_type`` rather than assume PNG.
+"""
+
+import asyncio
+import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Literal, get_args
+
+try:
+    import mss
+
+    MSS_AVAILABLE = True
+except ImportError:
+    mss = None
+    MSS_AVAILABLE = False
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+ScreenshotFormat = Literal["png", "webp", "jpeg"]
+
+DEFAULT_QUALITY = 80
+
+# Leading bytes of each format, as raw bytes and as base64 text
+_SIGNATURES = {
+    "image/png": (b"\x89PNG", "iVBORw0KGgo"),
+    "image/jpeg": (b"\xff\xd8\xff", "/9j/"),
+    "image/webp": (b"RIFF", "UklGR"),
+}
+
+
+def screenshot_format() -> ScreenshotFormat:
+    """The configured screenshot format (``PROTO_SCREENSHOT_FORMAT``)."""
+    value = os.getenv("PROTO_SCREENSHOT_FORMAT", "png").lower()
+    if value == "jpg":
+        value = "jpeg"
+    return value if value in get_args(ScreenshotFormat) else "png"
+
+
+def screenshot_quality() -> int:
+    """The configured webp/jpeg quality (``PROTO_SCREENSHOT_QUALITY``)."""
+    try:
+        return max(1, min(100, int(os.getenv("PROTO_SCREENSHOT_QUALITY", DEFAULT_QUALITY))))
+    except ValueError:
+        return DEFAULT_QUALITY
+
+
+def image_media_type(data: bytes | str) -> str:
+    """
+    The media type of an encoded image, from its leading bytes.
+
+    Args:
+        data: Image bytes, or their base64 encoding
+
+    Returns:
+        "image/png", "image/jpeg" or "image/webp" (PNG if unrecognized)
+    """
+    for media_type, (raw, encoded) in _SIGNATURES.items():
+        if data.startswith(encoded if isinstance(data, str) else raw):
+            return media_type
+    return "image/png"
+
+
+def encode_image(
+    image: Any,
+    size: tuple[int, int] | None = None,
+    image_format: ScreenshotFormat = "png",
+    quality: int = DEFAULT_QUALITY,
+) -> bytes:
+    """
+    Resize and encode a Pillow image.
+
+    PNG is written with fast compression; lossy formats use ``quality``.
+
+    Args:
+        image: A ``PIL.Image.Image``
+        size: Target (width, height), or None to keep the image size
+        image_format: Output format
+        quality: 1-100, for webp and jpeg
+
+    Returns:
+        The encoded image
+    """
+    if size is not None and image.size != tuple(size):
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    if image_format == "jpeg":
+        image.save(buffer, format="JPEG", quality=quality)
+    elif image_format == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=2)
+    else:
+        image.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def encode_file(
+    path: str | os.PathLike,
+    size: tuple[int, int] | None = None,
+    image_format: ScreenshotFormat = "png",
+    quality: int = DEFAULT_QUALITY,
+) -> bytes:
+    """Load an image file and encode it like ``encode_image``."""
+    with Image.open(path) as image:
+        image.load()
+        return encode_image(image, size, image_format, quality)
+
+
+class ScreenCapturer:
+    """
+    Grabs one X display in-process.
+
+    ``mss`` handles are bound to the thread that created them, so every
+    grab and encode runs on this capturer's single worker thread, which
+    also keeps the event loop free while a frame is encoded.
+    """
+
+    def __init__(self, display: str | None = None):
+        """
+        Args:
+            display: X display such as ":1" (None uses ``$DISPLAY``)
+        """
+        self.display = display
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screen-capture")
+        self._sct: Any = None
+
+    def _grab(self) -> Any:
+        if self._sct is None:
+            self._sct = mss.mss(display=self.display) if self.display else mss.mss()
+        # Monitor 0 spans every screen of the display, like gnome-screenshot
+        shot = self._sct.grab(self._sct.monitors[0])
+        return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+
+    def _capture(self, size: tuple[int, int] | None, image_format: ScreenshotFormat, quality: int) -> bytes:
+        return encode_image(self._grab(), size, image_format, quality)
+
+    async def capture(
+        self,
+        size: tuple[int, int] | None = None,
+        image_format: ScreenshotFormat = "png",
+        quality: int = DEFAULT_QUALITY,
+    ) -> str:
+        """
+        Grab the screen and return it encoded as base64.
+
+        Args:
+            size: Target (width, height), or None for the screen size
+            image_format: Output format
+            quality: 1-100, for webp and jpeg
+        """
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self._executor, self._capture, size, image_format, quality)
+        return base64.b64encode(data).decode()
+
+    def close(self) -> None:
+        def release() -> None:
+            if self._sct is not None:
+                self._sct.close()
+                self._sct = None
+
+        self._executor.submit(release)
+        self._executor.shutdown(wait=True)
+
+
+def in_process_capture_available() -> bool:
+    """Whether screenshots can be taken without a subprocess."""
+    return MSS_AVAILABLE and PIL_AVAILABLE
+
+
+# Capturers by display
+_capturers: dict[str | None, ScreenCapturer] = {}
+
+
+def get_screen_capturer(display: str | None = None) -> ScreenCapturer:
+    """Get or create the shared capturer for an X display."""
+    capturer = _capturers.get(display)
+    if capturer is None:
+        capturer = _capturers[display] = ScreenCapturer(display)
+    return capturer
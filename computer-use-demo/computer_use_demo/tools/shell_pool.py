@@ -0,0 +1,362 @@
+"""
+Pool of pre-started shells shared by the bash tools.
+
+Starting /bin/bash costs a process spawn on the first command of every
+agent and again after every timeout (and a Python kernel also has to
+import its libraries, see tools/coding/python_exec.py). ``ShellPool`` keeps a few shells
+started ahead of time and leases them out. A lease owns its shell until
+it ends; then the shell is discarded, so no state leaks into another
+agent. Discarded and timed-out shells are killed and replaced in the
+background.
+
+Only the warm shells are bounded (by ``min_idle``): leases never wait
+unless the pool is given a ``max_shells`` cap, since bash tools hold
+their shell for as long as they live.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from .base import ToolError
+
+
+class PipedProcess:
+    """
+    A subprocess whose pipes are attached to the running event loop.
+
+    The process is spawned with ``subprocess.Popen`` and its pipes are
+    connected here, because cancelling ``asyncio.create_subprocess_*`` while
+    it connects its pipes hangs forever (Python 3.11), and pooled sessions
+    are started by background tasks that can be cancelled at any time.
+    """
+
+    def __init__(self, popen: subprocess.Popen[bytes]):
+        self.popen = popen
+        self.stdin: asyncio.StreamWriter | None = None
+        self.stdout: asyncio.StreamReader | None = None
+        self.stderr: asyncio.StreamReader | None = None
+        self._transports: list[asyncio.BaseTransport] = []
+
+    @classmethod
+    async def spawn(cls, args: Any, limit: int = 2**16, **kwargs: Any) -> "PipedProcess":
+        """
+        Start a process in its own process group.
+
+        Args:
+            args: Popen arguments
+            limit: Buffer limit of the stdout/stderr readers
+            **kwargs: Popen keyword arguments; stdin, stdout and stderr
+                default to pipes
+
+        Returns:
+            The started process
+        """
+        for name in ("stdin", "stdout", "stderr"):
+            kwargs.setdefault(name, subprocess.PIPE)
+        process = cls(subprocess.Popen(args, start_new_session=True, **kwargs))
+        popen = process.popen
+        loop = asyncio.get_running_loop()
+        try:
+            if popen.stdin:
+                protocol = asyncio.StreamReaderProtocol(asyncio.StreamReader())
+                transport, _ = await loop.connect_write_pipe(lambda: protocol, popen.stdin)
+                process._transports.append(transport)
+                process.stdin = asyncio.StreamWriter(transport, protocol, None, loop)
+            if popen.stdout:
+                process.stdout = await process._connect_reader(loop, popen.stdout, limit)
+            if popen.stderr:
+                process.stderr = await process._connect_reader(loop, popen.stderr, limit)
+        except BaseException:
+            process.kill()
+            process._close_transports()
+            raise
+        return process
+
+    async def _connect_reader(
+        self, loop: asyncio.AbstractEventLoop, pipe: Any, limit: int
+    ) -> asyncio.StreamReader:
+        reader = asyncio.StreamReader(limit=limit)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+        self._transports.append(transport)
+        return reader
+
+    @property
+    def pid(self) -> int:
+        return self.popen.pid
+
+    @property
+    def returncode(self) -> int | None:
+        """Exit status, or None while the process is running."""
+        return self.popen.poll()
+
+    def send_signal(self, sig: int) -> None:
+        if self.returncode is None:
+            self.popen.send_signal(sig)
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kill the process and everything it started."""
+        try:
+            os.killpg(self.popen.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    async def close(self) -> None:
+        """Kill the process group, close the pipes and reap the process."""
+        if self.returncode is None:
+            self.kill()
+        self._close_transports()
+        await asyncio.get_running_loop().run_in_executor(None, self.popen.wait)
+
+    def _close_transports(self) -> None:
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+
+
+class PooledShell(Protocol):
+    """What the pool needs from a shell session."""
+
+    @property
+    def alive(self) -> bool: ...
+
+    async def start(self) -> None: ...
+
+    async def run(self, command: str) -> Any: ...
+
+    async def kill(self) -> None: ...
+
+
+@dataclass
+class ShellLease:
+    """A shell leased to one owner (usually an agent's bash tool)."""
+
+    pool: "ShellPool"
+    session: Any
+    owner: str
+    wait_seconds: float
+    leased_at: float = field(default_factory=time.monotonic)
+
+    def release(self) -> None:
+        """Give the shell back; it is discarded and replaced in the background."""
+        self.pool.release(self)
+
+
+class ShellPool:
+    """Keeps warm shells ready and leases them out."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], PooledShell],
+        min_idle: int = 2,
+        max_shells: int | None = None,
+        acquire_timeout: float | None = 60.0,
+    ):
+        """
+        Args:
+            session_factory: Creates a (not yet started) shell session.
+            min_idle: Started shells kept ready for the next leases.
+            max_shells: Optional upper bound on idle, leased and starting
+                shells; leases wait when it is reached. None leaves leased
+                shells unbounded.
+            acquire_timeout: Seconds a lease waits for a free slot before
+                failing (None waits forever).
+        """
+        self.session_factory = session_factory
+        self.min_idle = min_idle
+        self.max_shells = max_shells
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: deque[PooledShell] = deque()
+        self._leased: dict[int, ShellLease] = {}
+        self._starting = 0
+        self._available = asyncio.Condition()
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closed = False
+
+        # Metrics
+        self._leases = 0
+        self._waited_leases = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._spawned = 0
+        self._recycled = 0
+
+    @property
+    def size(self) -> int:
+        """Shells that are idle, leased or starting."""
+        return len(self._idle) + len(self._leased) + self._starting
+
+    # ==================== Leasing ====================
+
+    async def acquire(self, owner: str) -> ShellLease:
+        """
+        Lease a shell, waiting up to ``acquire_timeout`` for one if the pool
+        is at ``max_shells``.
+
+        Args:
+            owner: Who holds the lease (for metrics)
+
+        Returns:
+            The lease; call ``release()`` when done with the shell
+
+        Raises:
+            ToolError: If no shell became free in time
+        """
+        if self._closed:
+            raise ToolError("Shell pool has been closed.")
+        self._loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        try:
+            async with asyncio.timeout(self.acquire_timeout), self._available:
+                while (session := self._pop_idle()) is None:
+                    if self._has_room():
+                        self._starting += 1
+                        break
+                    await self._available.wait()
+        except asyncio.TimeoutError:
+            raise ToolError(
+                f"No shell available: all {self.max_shells} shells are leased "
+                f"({', '.join(self.get_stats()['owners'])})."
+            ) from None
+
+        if session is None:
+            session = await self._start()
+        wait = time.monotonic() - started
+        self._replenish()
+
+        lease = ShellLease(pool=self, session=session, owner=owner, wait_seconds=wait)
+        self._leased[id(session)] = lease
+
+        self._leases += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        if wait >= 0.001:
+            self._waited_leases += 1
+        return lease
+
+    def release(self, lease: ShellLease) -> None:
+        """End a lease; its shell is killed and replaced in the background."""
+        if self._leased.pop(id(lease.session), None) is None:
+            return
+        self._background(self._discard(lease.session))
+
+    def _pop_idle(self) -> PooledShell | None:
+        while self._idle:
+            session = self._idle.popleft()
+            if session.alive:
+                return session
+            self._background(self._discard(session))
+        return None
+
+    def _has_room(self) -> bool:
+        return self.max_shells is None or self.size < self.max_shells
+
+    # ==================== Warming and recycling ====================
+
+    async def _start(self) -> PooledShell:
+        """Start a shell already counted in ``_starting``."""
+        try:
+            session = self.session_factory()
+            await session.start()
+            self._spawned += 1
+            return session
+        finally:
+            self._starting -= 1
+
+    def _replenish(self) -> None:
+        """Start shells in the background until ``min_idle`` are ready or starting."""
+        if self._closed or self._loop is None or self._loop.is_closed():
+            return
+        while (
+            len(self._idle) + self._starting < self.min_idle and self._has_room()
+        ):
+            self._starting += 1
+            self._background(self._warm())
+
+    async def _warm(self) -> None:
+        try:
+            session = await self._start()
+        except Exception as e:
+            print(f"[ShellPool] Failed to start shell: {e}")
+        else:
+            if self._closed:
+                await session.kill()
+                return
+            self._idle.append(session)
+        async with self._available:
+            self._available.notify_all()
+
+    async def _discard(self, session: PooledShell) -> None:
+        # Free the slot first so that waiting leases can start a new shell
+        async with self._available:
+            self._available.notify_all()
+        try:
+            await session.kill()
+        finally:
+            self._recycled += 1
+            self._replenish()
+
+    def _background(self, coro: Coroutine[Any, Any, None]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            coro.close()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._create_task(coro)
+            return
+        # Releases from weakref finalizers may run on any thread
+        try:
+            loop.call_soon_threadsafe(self._create_task, coro)
+        except RuntimeError:
+            coro.close()  # The loop closed meanwhile
+
+    def _create_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Kill all shells, including leased ones."""
+        self._closed = True
+        sessions = [*self._idle, *(lease.session for lease in self._leased.values())]
+        self._idle.clear()
+        self._leased.clear()
+        await asyncio.gather(*(session.kill() for session in sessions), return_exceptions=True)
+        for task in list(self._tasks):
+            task.cancel()
+
+    # ==================== Metrics ====================
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pool occupancy and lease wait time metrics."""
+        return {
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "starting": self._starting,
+            "max_shells": self.max_shells,
+            "owners": sorted({lease.owner for lease in self._leased.values()}),
+            "leases": self._leases,
+            "waited_leases": self._waited_leases,
+            "avg_wait_ms": (self._total_wait / self._leases * 1000) if self._leases else 0.0,
+            "max_wait_ms": self._max_wait * 1000,
+            "spawned": self._spawned,
+            "recycled": self._recycled,
+        }
@@ -10,7 +10,6 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import os
 import pickle
 import uuid
@@ -36,11 +35,13 @@ from anthropic.types.beta import BetaContentBlockParam, BetaMessageParam
 
 from .loop import APIProvider, sampling_loop
 from .tools import ToolResult, ToolVersion
+from .tools.screen_capture import image_media_type
 from .proto_logging import get_logger
 from .planning import ProjectManager
 from .daemon import WorkQueue
 from .remote import ComputerRegistry, SSHManager, VNCTunnel, RemoteComputerTool
 from .hetzner import HetznerManager, generate_cloud_init_script
+from .sessions import SessionEventLog, SessionStore, Subscription, get_session_store
 
 # Playwright for embedded browser
 try:
@@ -88,6 +89,29 @@ class DisplayMessage:
     agent_name: str | None = None      # ✅ Display name of agent (e.g., "Senior Developer")
     agent_role: str | None = None      # ✅ Agent role/type (e.g., "senior-developer")
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "role": self.role,
+            "label": self.label,
+            "text": self.text,
+            "images": self.images,
+            "agent_name": self.agent_name,    # ✅ Include agent identity
+            "agent_role": self.agent_role,    # ✅ Include agent role
+        }
+
+
+def _get_session_store(sessions_dir: Path) -> SessionStore:
+    """Session store for ``sessions_dir``.
+
+    Readable JSON copies for agents are written to the projects folder
+    (repo_root/projects/logs/conversations) whenever a session is compacted.
+    """
+    return get_session_store(
+        sessions_dir,
+        export_dir=ProjectManager.PLANNING_ROOT / "logs" / "conversations",
+    )
+
 
 class ChatSession:
     """In-memory conversation state shared by the FastAPI handlers."""
@@ -123,11 +147,8 @@ class ChatSession:
         self._current_agent_name: str | None = None     # Current specialist name (e.g., "Senior Developer")
         self._current_agent_role: str | None = None     # Current specialist role (e.g., "senior-developer")
 
-        # SSE streaming for real-time updates
-        self._sse_queues: list[asyncio.Queue] = []
-
-        # WebSocket connections for real-time updates
-        self._ws_connections: list[WebSocket] = []
+        # Versioned change log shared by all SSE and WebSocket viewers
+        self.events = SessionEventLog()
 
         # Stop/resume functionality
         self._stop_requested = False
@@ -332,7 +353,7 @@ class ChatSession:
                 final_text = "\n".join(text_parts) if text_parts else "(no parameters)"
 
                 images = (
-                    [f"data:image/png;base64,{result.base64_image}"]
+                    [f"data:{image_media_type(result.base64_image)};base64,{result.base64_image}"]
                     if result.base64_image
                     else []
                 )
@@ -525,35 +546,23 @@ class ChatSession:
 
             async with self._lock:
                 self._busy = False
-            # Final update when agent finishes - send multiple times to ensure delivery
-            for _ in range(3):
-                await self._broadcast_sse_update()
-                await asyncio.sleep(0.1)
-
-    async def _broadcast_sse_update(self):
-        """Broadcast current state to all SSE and WebSocket connections."""
-        data = self.serialize()
-
-        # Broadcast to SSE
-        for queue in self._sse_queues:
+            # Persist the finished turn (appends only what changed)
             try:
-                await queue.put(data)
-            except:
-                pass  # Queue might be closed
+                self.save(SESSIONS_DIR)
+            except Exception as e:
+                print(f"Failed to save session {self.session_id}: {e}")
+            # Final update when agent finishes. Late subscribers are primed
+            # with the current snapshot, so a single publish is enough.
+            await self._broadcast_sse_update()
 
-        # Broadcast to WebSocket
-        data_json = json.dumps(data)
-        disconnected = []
-        for ws in self._ws_connections:
-            try:
-                await ws.send_text(data_json)
-            except:
-                disconnected.append(ws)
+    async def _broadcast_sse_update(self):
+        """Publish changes since the last broadcast to all SSE and WebSocket viewers."""
+        self.events.publish(self._serialize_state(), self.display_messages)
 
-        # Remove disconnected WebSockets
-        for ws in disconnected:
-            if ws in self._ws_connections:
-                self._ws_connections.remove(ws)
+    def subscribe(self, *, delta: bool = False, since: int | None = None) -> Subscription:
+        """Attach a viewer to this session's event log, primed with current state."""
+        self.events.publish(self._serialize_state(), self.display_messages)
+        return self.events.subscribe(delta=delta, since=since)
 
     def _heartbeat_worker(self):
         """Background thread that sends periodic updates while agent is processing."""
@@ -599,44 +608,42 @@ class ChatSession:
         # Thread will exit on next iteration
 
     def save(self, sessions_dir: Path) -> None:
-        """Save session to disk."""
-        session_file = sessions_dir / f"{self.session_id}.pkl"
-        with open(session_file, "wb") as f:
-            pickle.dump({
-                "session_id": self.session_id,
-                "messages": self.messages,
-                "display_messages": self.display_messages,
-                "created_at": self.created_at,
-                "last_active": self.last_active,
+        """Append changes since the last save to the session store."""
+        _get_session_store(sessions_dir).save(
+            self.session_id,
+            meta={
                 "model": self.model,
                 "tool_version": self.tool_version,
-            }, f)
-
-        # Also save as JSON for easy access by agents
-        try:
-            # Save to default projects folder (repo_root/projects)
-            # Use ProjectManager.PLANNING_ROOT
-            from .planning import ProjectManager
-            proto_root = ProjectManager.PLANNING_ROOT
-            log_dir = proto_root / "logs" / "conversations"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            json_file = log_dir / f"{self.session_id}.json"
-            
-            # Use serializer but we might need to be careful about strict JSON compliance
-            # serialize() returns dict with datetimes as strings, which is good.
-            data = self.serialize()
-            
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
-        except Exception as e:
-            # Don't fail the main save if logging fails
-            print(f"Failed to save JSON log: {e}")
+                "created_at": self.created_at.isoformat(),
+                "last_active": self.last_active.isoformat(),
+            },
+            messages=self.messages,
+            display_messages=self.display_messages,
+        )
 
     @classmethod
     def load(cls, session_id: str, sessions_dir: Path, api_key: str) -> "ChatSession":
         """Load session from disk."""
+        store = _get_session_store(sessions_dir)
+        if not store.exists(session_id):
+            return cls._load_pickle(session_id, sessions_dir, api_key)
+
+        stored = store.load(session_id)
+        meta = stored.meta
+        session = cls(api_key=api_key, model=meta["model"], tool_version=meta["tool_version"])
+        session.session_id = session_id
+        session.display_messages = [DisplayMessage(**d) for d in stored.display_messages]
+        store.track(session_id, stored.messages, session.display_messages)
+
+        # Clean up messages to remove incomplete tool_use/tool_result pairs
+        session.messages = cls._clean_messages(stored.messages)
+        session.created_at = datetime.fromisoformat(meta["created_at"])
+        session.last_active = datetime.fromisoformat(meta["last_active"])
+        return session
+
+    @classmethod
+    def _load_pickle(cls, session_id: str, sessions_dir: Path, api_key: str) -> "ChatSession":
+        """Load a session saved by older versions as a single pickle."""
         session_file = sessions_dir / f"{session_id}.pkl"
         with open(session_file, "rb") as f:
             data = pickle.load(f)
@@ -678,6 +685,12 @@ class ChatSession:
         return messages
 
     def serialize(self) -> dict[str, Any]:
+        return {
+            **self._serialize_state(),
+            "messages": [msg.to_dict() for msg in self.display_messages],
+        }
+
+    def _serialize_state(self) -> dict[str, Any]:
         return {
             "model": self.model,
             "toolVersion": self.tool_version,
@@ -689,20 +702,8 @@ class ChatSession:
                 "enabled": True,
                 "verification": self.enable_verification,
                 "ceoAgent": self.use_ceo_agent,
-                "stats": self.session_stats,
+                "stats": dict(self.session_stats),
             },
-            "messages": [
-                {
-                    "id": msg.id,
-                    "role": msg.role,
-                    "label": msg.label,
-                    "text": msg.text,
-                    "images": msg.images,
-                    "agent_name": msg.agent_name,    # ✅ Include agent identity
-                    "agent_role": msg.agent_role,    # ✅ Include agent role
-                }
-                for msg in self.display_messages
-            ],
         }
 
 
@@ -954,6 +955,9 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "agent_executor"):
         app.state.agent_executor.shutdown(wait=True)
 
+    # Shutdown: finish pending session compactions
+    _get_session_store(SESSIONS_DIR).close()
+
 
 app = FastAPI(title="Proto AI Agent", lifespan=lifespan)
 app.add_middleware(
@@ -1098,10 +1102,24 @@ async def list_sessions():
             "preview": preview,
         })
 
-    # Also check for saved sessions on disk
+    # Also check for saved sessions on disk (headers only)
+    seen = {session["id"] for session in sessions}
+    for meta in _get_session_store(SESSIONS_DIR).list_sessions():
+        if meta["session_id"] not in seen:
+            seen.add(meta["session_id"])
+            sessions.append({
+                "id": meta["session_id"],
+                "createdAt": meta["created_at"],
+                "lastActive": meta["last_active"],
+                "messageCount": meta["message_count"],
+                "isCurrent": False,
+                "preview": meta["preview"],
+            })
+
+    # Sessions saved as pickles by older versions
     for session_file in SESSIONS_DIR.glob("*.pkl"):
         session_id = session_file.stem
-        if session_id not in app.state.sessions:
+        if session_id not in seen:
             try:
                 with open(session_file, "rb") as f:
                     data = pickle.load(f)
@@ -1164,6 +1182,7 @@ async def delete_session(session_id: str):
         del app.state.sessions[session_id]
 
     # Remove from disk
+    _get_session_store(SESSIONS_DIR).delete(session_id)
     session_file = SESSIONS_DIR / f"{session_id}.pkl"
     if session_file.exists():
         session_file.unlink()
@@ -1181,12 +1200,28 @@ async def delete_session(session_id: str):
     return JSONResponse({"status": "deleted"})
 
 
+def _parse_event_id(value: str | None) -> int | None:
+    """Parse a Last-Event-ID / ``since`` value, ignoring garbage."""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
 @app.get("/api/stream")
-async def stream_updates(request: Request):
-    """Server-Sent Events endpoint for real-time updates."""
+async def stream_updates(request: Request, mode: str = "snapshot", since: str | None = None):
+    """Server-Sent Events endpoint for real-time updates.
+
+    ``mode=snapshot`` (default) sends the full session state on every change.
+    ``mode=delta`` sends a snapshot once, then sequence-numbered
+    upsert/remove/state events; reconnecting clients resume from
+    ``Last-Event-ID`` (or ``since``).
+    """
     session = _get_current_session()
-    queue: asyncio.Queue = asyncio.Queue()
-    session._sse_queues.append(queue)
+    delta = mode == "delta"
+    if since is None:
+        since = request.headers.get("last-event-id")
+    sub = session.subscribe(delta=delta, since=_parse_event_id(since))
 
     async def event_generator():
         try:
@@ -1197,16 +1232,18 @@ async def stream_updates(request: Request):
 
                 try:
                     # Wait for updates with timeout
-                    data = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    # Send as JSON
-                    yield f"data: {json.dumps(data)}\n\n"
+                    seq, data = await asyncio.wait_for(sub.get(), timeout=30.0)
+                    # Frames are already JSON-encoded by the event log
+                    if delta:
+                        yield f"id: {seq}\ndata: {data}\n\n"
+                    else:
+                        yield f"data: {data}\n\n"
                 except asyncio.TimeoutError:
                     # Send keepalive
                     yield ": keepalive\n\n"
         finally:
-            # Clean up queue when client disconnects
-            if queue in session._sse_queues:
-                session._sse_queues.remove(queue)
+            # Clean up subscription when client disconnects
+            session.events.unsubscribe(sub)
 
     return StreamingResponse(
         event_generator(),
@@ -1220,19 +1257,22 @@ async def stream_updates(request: Request):
 
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates."""
+async def websocket_endpoint(websocket: WebSocket, mode: str = "snapshot", since: str | None = None):
+    """WebSocket endpoint for real-time updates (same modes as ``/api/stream``)."""
     await websocket.accept()
     session = _get_current_session()
-    session._ws_connections.append(websocket)
+    sub = session.subscribe(delta=mode == "delta", since=_parse_event_id(since))
 
-    try:
-        # Send initial state
-        initial_data = session.serialize()
-        await websocket.send_text(json.dumps(initial_data))
+    async def sender():
+        while True:
+            _, data = await sub.get()
+            await websocket.send_text(data)
 
+    # Initial state is already queued on the subscription
+    send_task = asyncio.create_task(sender())
+    try:
         # Keep connection alive and listen for close
-        while True:
+        while not send_task.done():
             # Wait for messages (mostly just to detect disconnect)
             try:
                 await websocket.receive_text()
@@ -1242,11 +1282,10 @@ async def websocket_endpoint(websocket: WebSocket):
         pass  # Connection closed
     finally:
         # Clean up
-        if websocket in session._ws_connections:
-            session._ws_connections.remove(websocket)
+        send_task.cancel()
+        session.events.unsubscribe(sub)
 
 
-# Dashboard API Endpoints
 @app.get("/api/dashboard/projects")
 async def get_projects():
     """Get all projects with task counts."""
@@ -1726,59 +1765,16 @@ async def get_session_history():
         loop = asyncio.get_event_loop()
 
         def _get_sessions_sync():
-            import json
-            from pathlib import Path
-            from collections import defaultdict
-
-            sessions_file = Path("logs/proto_sessions.jsonl")
-            if not sessions_file.exists():
-                return []
-
-            # Parse sessions log
-            sessions_data = defaultdict(dict)
-
-            with open(sessions_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        session_id = entry.get('session_id')
-                        event_type = entry.get('event_type')
-                        timestamp = entry.get('timestamp')
-
-                        # Only track webui sessions (not agent sessions)
-                        if not session_id or not session_id.startswith('webui-'):
-                            continue
-
-                        if event_type == 'session_created':
-                            sessions_data[session_id]['created_at'] = timestamp
-                            sessions_data[session_id]['id'] = session_id
-                        elif event_type == 'message_sent':
-                            # Store first user message as preview
-                            data = entry.get('data', {})
-                            if data.get('role') == 'user' and 'preview' not in sessions_data[session_id]:
-                                message = data.get('message', '')
-                                sessions_data[session_id]['preview'] = message[:100]
-                    except:
-                        continue
-
-            # Convert to list and sort by timestamp
-            # Only include sessions that have messages (have a preview)
-            sessions_list = [
+            # Only track webui sessions (not agent sessions) that have messages
+            return [
                 {
-                    'id': data.get('id', ''),
-                    'timestamp': data.get('created_at', ''),
-                    'preview': data.get('preview', '')
+                    'id': session['session_id'],
+                    'timestamp': session['created_at'],
+                    'preview': session['preview'],
                 }
-                for data in sessions_data.values()
-                if 'created_at' in data and 'preview' in data
+                for session in get_logger().list_session_history(prefix='webui-', limit=50)
             ]
 
-            # Sort by timestamp descending (newest first)
-            sessions_list.sort(key=lambda x: x['timestamp'], reverse=True)
-
-            # Return last 50 sessions
-            return sessions_list[:50]
-
         result = await loop.run_in_executor(None, _get_sessions_sync)
         return JSONResponse(result)
     except Exception as e:
@@ -1792,53 +1788,38 @@ async def get_session_messages(session_id: str):
         loop = asyncio.get_event_loop()
 
         def _get_messages_sync():
-            import json
-            from pathlib import Path
-
-            sessions_file = Path("logs/proto_sessions.jsonl")
-            if not sessions_file.exists():
-                return []
-
             messages = []
 
-            with open(sessions_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        if entry.get('session_id') != session_id:
-                            continue
-
-                        event_type = entry.get('event_type')
-                        data = entry.get('data', {})
-                        timestamp = entry.get('timestamp', '')
-
-                        if event_type == 'message_sent':
-                            role = data.get('role', 'user')
-                            message = data.get('message', '')
-                            if message:
-                                messages.append({
-                                    'role': role,
-                                    'content': message,
-                                    'timestamp': timestamp
-                                })
-                        elif event_type == 'assistant_response':
-                            content = data.get('content', '') or data.get('response', '')
-                            if content:
-                                messages.append({
-                                    'role': 'assistant',
-                                    'content': content,
-                                    'timestamp': timestamp
-                                })
-                        elif event_type == 'tool_use':
-                            tool_name = data.get('tool_name', 'Tool')
-                            tool_input = data.get('input', '')
-                            messages.append({
-                                'role': 'assistant',
-                                'content': f"🔧 {tool_name}\n{str(tool_input)[:200]}",
-                                'timestamp': timestamp
-                            })
-                    except:
-                        continue
+            for entry in get_logger().get_session_entries(session_id):
+                event_type = entry.get('event_type')
+                data = entry.get('data', {})
+                timestamp = entry.get('timestamp', '')
+
+                if event_type == 'message_sent':
+                    role = data.get('role', 'user')
+                    message = data.get('message', '')
+                    if message:
+                        messages.append({
+                            'role': role,
+                            'content': message,
+                            'timestamp': timestamp
+                        })
+                elif event_type == 'assistant_response':
+                    content = data.get('content', '') or data.get('response', '')
+                    if content:
+                        messages.append({
+                            'role': 'assistant',
+                            'content': content,
+                            'timestamp': timestamp
+                        })
+                elif event_type == 'tool_use':
+                    tool_name = data.get('tool_name', 'Tool')
+                    tool_input = data.get('input', '')
+                    messages.append({
+                        'role': 'assistant',
+                        'content': f"🔧 {tool_name}\n{str(tool_input)[:200]}",
+                        'timestamp': timestamp
+                    })
 
             return messages
 
@@ -3559,7 +3540,7 @@ def _html_shell() -> str:
             if (res.ok) {
                 const data = await res.json();
                 const screenshotEl = document.getElementById('live-screenshot');
-                screenshotEl.innerHTML = `<img src="data:image/png;base64,${data.image}" alt="Computer Screen" />`;
+                screenshotEl.innerHTML = `<img src="data:${data.mediaType || 'image/png'};base64,${data.image}" alt="Computer Screen" />`;
             }
         } catch (e) {
             console.error('Error loading screenshot:', e);
@@ -3726,7 +3707,12 @@ async def get_latest_screenshot_endpoint():
         tool = UniversalComputerTool()
         result = await tool(action="screenshot")
         if result.base64_image:
-            return JSONResponse(content={"image": result.base64_image})
+            return JSONResponse(
+                content={
+                    "image": result.base64_image,
+                    "mediaType": image_media_type(result.base64_image),
+                }
+            )
         return JSONResponse(status_code=500, content={"error": "Failed to take screenshot"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
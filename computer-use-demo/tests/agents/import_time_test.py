@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time (us) of every module loaded by a cold ``import module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_agents_package_is_lazy():
+    times = _import_times("computer_use_demo.agents")
+    loaded = {name for name in times if name.startswith("computer_use_demo.agents.")}
+    assert loaded == {"computer_use_demo.agents.registry", "computer_use_demo.agents.specialists"}
+
+
+def test_registry_imports_one_agent():
+    script = (
+        "import sys\n"
+        "from computer_use_demo.agents import AGENT_REGISTRY, CTOAgent\n"
+        "assert AGENT_REGISTRY['cto'] is CTOAgent\n"
+        "assert 'ceo-agent' in AGENT_REGISTRY and len(AGENT_REGISTRY) > 150\n"
+        "prefix = 'computer_use_demo.agents.specialists.'\n"
+        "print(sorted(m[len(prefix):] for m in sys.modules if m.startswith(prefix)))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "['base_specialist', 'cto_agent']"
+
+
+@pytest.mark.parametrize("module", ["computer_use_demo.webui", "computer_use_demo.cli"])
+def test_cold_start(module):
+    times = _import_times(module)
+    specialists = [name for name in times if name.startswith("computer_use_demo.agents.specialists.")]
+    assert specialists == [], f"{module} ({times[module] / 1000:.0f} ms cold import) loaded {specialists}"
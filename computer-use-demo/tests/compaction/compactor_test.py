@@ -0,0 +1,60 @@
+from computer_use_demo.compaction import ContextCompactor, has_tool_results
+
+
+def _turn(i):
+    return [
+        {"role": "assistant", "content": [
+            {"type": "text", "text": f"step {i} " + "x" * 400},
+            {"type": "tool_use", "id": f"t{i}", "name": "bash", "input": {"command": "ls"}},
+        ]},
+        {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"t{i}", "content": [{"type": "text", "text": "y" * 400}]},
+        ]},
+    ]
+
+
+def _history(turns):
+    messages = [{"role": "user", "content": "do the task"}]
+    for i in range(turns):
+        messages += _turn(i)
+    return messages
+
+
+def test_under_budget_is_untouched():
+    compactor = ContextCompactor(token_budget=10_000)
+    messages = _history(3)
+    assert compactor.maybe_compact(messages) is messages
+
+
+def test_compaction_keeps_tool_pairs_and_extends_summary():
+    compactor = ContextCompactor(token_budget=1_000, target_ratio=0.5, keep_recent=2)
+    messages = _history(10)
+    compacted = compactor.maybe_compact(messages)
+
+    assert compacted[0]["content"][0]["text"].startswith("Previous conversation summary:")
+    assert "User: do the task" in compacted[0]["content"][0]["text"]
+    assert not has_tool_results(compacted[1])
+    assert compacted[-1] is messages[-1]
+    assert compactor.total_tokens(compacted) <= 1_000
+
+    # The next compaction extends the same summary instead of rebuilding it
+    for i in range(10, 16):
+        compacted += _turn(i)
+    again = compactor.maybe_compact(compacted)
+    summary = again[0]["content"][0]["text"]
+    assert "User: do the task" in summary and "step 10" in summary
+    assert not has_tool_results(again[1])
+
+
+def test_reported_usage_triggers_compaction():
+    compactor = ContextCompactor(token_budget=100_000, keep_recent=2)
+    messages = _history(6)
+    compactor.record_usage(150_000)
+    assert len(compactor.maybe_compact(messages)) < len(messages)
+
+
+def test_reported_usage_includes_cached_tokens():
+    compactor = ContextCompactor(token_budget=100_000, keep_recent=2)
+    messages = _history(6)
+    compactor.record_usage(2_000, cache_read_input_tokens=140_000, cache_creation_input_tokens=None)
+    assert len(compactor.maybe_compact(messages)) < len(messages)
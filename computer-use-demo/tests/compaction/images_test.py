@@ -0,0 +1,69 @@
+from computer_use_demo.compaction import ImageIndex
+
+
+def _screenshot(i):
+    return {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": f"img{i}"}}
+
+
+def _tool_result(i):
+    return {"role": "user", "content": [{
+        "type": "tool_result",
+        "tool_use_id": f"t{i}",
+        "content": [{"type": "text", "text": f"shot {i}"}, _screenshot(i)],
+    }]}
+
+
+def _images(messages):
+    return [
+        item["source"]["data"]
+        for message in messages
+        for block in message["content"]
+        for item in block["content"]
+        if item["type"] == "image"
+    ]
+
+
+def test_prune_in_chunks_and_incremental_sync():
+    messages = [_tool_result(i) for i in range(5)]
+    index = ImageIndex()
+    index.sync(messages)
+    assert index.prune(images_to_keep=2, min_removal_threshold=2) == 2
+    assert _images(messages) == ["img2", "img3", "img4"]
+
+    messages += [_tool_result(5), _tool_result(6)]
+    index.sync(messages)
+    assert len(index) == 5
+    assert index.prune(images_to_keep=2, min_removal_threshold=1) == 3
+    assert _images(messages) == ["img5", "img6"]
+    assert messages[0]["content"][0]["content"] == [{"type": "text", "text": "shot 0"}]
+
+
+def test_reference_mode_and_rewritten_history():
+    messages = [_tool_result(i) for i in range(3)]
+    index = ImageIndex(mode="reference")
+    index.sync(messages)
+    index.prune(images_to_keep=1)
+    assert _images(messages) == ["img2"]
+    assert messages[0]["content"][0]["content"][1]["text"].startswith("[Earlier screenshot omitted")
+
+    # A compacted history is re-indexed; placeholders are not counted again
+    compacted = messages[1:] + [_tool_result(3)]
+    index.sync(compacted)
+    assert len(index) == 2
+
+
+def test_thumbnails_are_not_pruned_again_and_are_forgotten_with_their_messages():
+    messages = [_tool_result(i) for i in range(4)]
+    index = ImageIndex()
+    index._replacement = lambda image: _screenshot(f"-thumb{image['source']['data'][3:]}")
+    index.sync(messages)
+    index.prune(images_to_keep=1)
+    assert _images(messages) == ["img-thumb0", "img-thumb1", "img-thumb2", "img3"]
+    assert len(index._replacements) == 3
+
+    compacted = messages[2:] + [_tool_result(4)]
+    index.sync(compacted)
+    assert len(index) == 2
+    assert len(index._replacements) == 1
+    index.prune(images_to_keep=1)
+    assert _images(compacted) == ["img-thumb2", "img-thumb3", "img4"]
@@ -0,0 +1,13 @@
+import pytest
+
+from computer_use_demo.proto_logging import structured_logger
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    """Send the global logger to a temporary directory, not the repo's logs/."""
+    monkeypatch.setenv("PROTO_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setattr(structured_logger, "_logger", None)
+    yield tmp_path / "logs"
+    if structured_logger._logger is not None:
+        structured_logger._logger.close()
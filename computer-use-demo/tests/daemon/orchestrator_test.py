@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from computer_use_demo.daemon import orchestrator as orchestrator_module
+from computer_use_demo.daemon.orchestrator import CompanyOrchestrator
+from computer_use_demo.daemon.work_queue import WorkPriority, WorkQueue, WorkStatus
+
+
+@pytest.fixture
+def company(tmp_path, monkeypatch):
+    monkeypatch.setattr(orchestrator_module, "create_agent_by_name", lambda name: SimpleNamespace(name=name))
+    release = asyncio.Event()
+
+    async def run_agent(self, agent, work_item):
+        await release.wait()
+        return "done"
+
+    monkeypatch.setattr(CompanyOrchestrator, "_run_agent_on_work", run_agent)
+
+    def make(**kwargs):
+        orchestrator = CompanyOrchestrator(
+            work_queue=WorkQueue(tmp_path / "work_queue.json"),
+            project_manager=object(),
+            state_path=tmp_path / "state.json",
+            **kwargs,
+        )
+        return orchestrator, release
+
+    return make
+
+
+async def test_slots_are_shared_between_projects(company):
+    orchestrator, release = company(max_concurrent_work=2)
+    for i in range(3):
+        orchestrator.add_work(f"busy {i}", priority=WorkPriority.HIGH, project_name="busy")
+    quiet = orchestrator.add_work("quiet", priority=WorkPriority.LOW, project_name="quiet")
+
+    await orchestrator._process_work_queue()
+    assert quiet.id in orchestrator.active_work
+    assert {w.project_name for w in orchestrator.get_active_work()} == {"busy", "quiet"}
+
+    release.set()
+    await asyncio.gather(*orchestrator._tasks.values())
+    assert orchestrator.work_queue.get_work_by_id(quiet.id).status == WorkStatus.COMPLETED
+    assert not orchestrator.active_work
+
+
+async def test_per_agent_cap(company):
+    orchestrator, release = company(max_concurrent_work=5, max_per_agent=1)
+    orchestrator.add_work("a", assigned_agent="writer")
+    orchestrator.add_work("b", assigned_agent="writer")
+    orchestrator.add_work("c", assigned_agent="tester")
+
+    await orchestrator._process_work_queue()
+    assert sorted(w.assigned_agent for w in orchestrator.get_active_work()) == ["tester", "writer"]
+    release.set()
+    await asyncio.gather(*orchestrator._tasks.values())
+
+
+async def test_timeout_cancels_and_requeues(company):
+    orchestrator, _ = company(work_timeout=0)
+    work = orchestrator.add_work("slow")
+
+    await orchestrator._process_work_queue()
+    await asyncio.sleep(0.01)
+    await orchestrator._monitor_active_work()
+    await asyncio.gather(*orchestrator._tasks.values())
+
+    work = orchestrator.work_queue.get_work_by_id(work.id)
+    assert work.status == WorkStatus.PENDING
+    assert work.retry_count == 1
+    assert "timed out" in work.error
+
+    assert orchestrator.cancel_work(work.id)
+    assert orchestrator.work_queue.get_work_by_id(work.id).status == WorkStatus.CANCELLED
+
+
+async def test_repeated_dispatch_keeps_heaps_bounded(company):
+    orchestrator, _ = company()
+    queue = orchestrator.work_queue
+    for i in range(40):
+        orchestrator.add_work(f"task {i}", project_name=f"p{i % 4}")
+
+    for _ in range(1000):
+        work_item, _ = await orchestrator._pick_next_work()
+        queue.mark_in_progress(work_item.id)
+        queue.mark_failed(work_item.id, "retry")
+        work_item.retry_count = 0
+
+    assert max(map(len, queue._heaps.values())) <= 2 * 40 + 16
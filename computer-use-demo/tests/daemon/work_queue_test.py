@@ -0,0 +1,75 @@
+from computer_use_demo.daemon.work_queue import WorkPriority, WorkQueue, WorkStatus
+
+
+def test_next_work_follows_priority_and_filters(tmp_path):
+    queue = WorkQueue(tmp_path / "work_queue.json")
+    low = queue.add_work("low", priority=WorkPriority.LOW)
+    high = queue.add_work("high", priority=WorkPriority.HIGH, project_name="p")
+    agent = queue.add_work("agent", priority=WorkPriority.CRITICAL, assigned_agent="dev")
+
+    assert queue.get_next_work() is agent
+    assert queue.get_next_work(agent_name="dev") is agent
+    assert queue.get_next_work(project_name="p") is high
+    assert queue.get_next_work(agent_name="dev", project_name="p") is None
+
+    queue.mark_assigned(agent.id, "dev")
+    assert queue.get_next_work() is high
+    queue.mark_in_progress(high.id)
+    queue.mark_failed(high.id, "boom")  # Retried: pending again
+    assert queue.get_next_work() is high
+    queue.mark_completed(high.id)
+    assert queue.get_next_work() is low
+
+    summary = queue.get_queue_summary()
+    assert summary["by_status"]["completed"] == 1
+    assert summary["by_priority"] == {"low": 1, "medium": 0, "high": 0, "critical": 0}
+
+
+def test_journal_replay_and_snapshot(tmp_path):
+    path = tmp_path / "work_queue.json"
+    queue = WorkQueue(path, snapshot_every=5)
+    first = queue.add_work("first")
+    second = queue.add_work("second")
+    queue.mark_completed(first.id, "done")
+    assert not path.exists()
+
+    reloaded = WorkQueue(path)
+    assert reloaded.items[first.id].status == WorkStatus.COMPLETED
+    assert reloaded.items[first.id].result == "done"
+    assert reloaded.get_next_work().id == second.id
+
+    for i in range(3):
+        queue.add_work(f"more {i}")
+    assert path.exists()
+    # Snapshot taken at the fifth record; only the last add is journaled
+    assert len(queue.journal_path.read_text().splitlines()) == 1
+    assert len(WorkQueue(path).items) == 5
+
+
+def test_work_by_status_keeps_creation_order(tmp_path):
+    queue = WorkQueue(tmp_path / "work_queue.json")
+    items = [queue.add_work(f"task {i}") for i in range(20)]
+    for item in reversed(items[::2]):
+        queue.mark_in_progress(item.id)
+        queue.mark_failed(item.id, "retry")  # Back to pending, re-indexed
+
+    assert queue.get_work_by_status(WorkStatus.PENDING) == items
+    assert queue.get_pending_work() == items
+
+
+def test_heaps_stay_bounded_across_transitions(tmp_path):
+    queue = WorkQueue(tmp_path / "work_queue.json", snapshot_every=10**6)
+    pending = [queue.add_work(f"task {i}", project_name=f"p{i % 3}") for i in range(30)]
+    for i in range(2000):
+        item = pending[i % len(pending)]
+        # Only the first project's heap is ever read
+        assert next(queue.iter_project_work("p0")).project_name == "p0"
+        queue.mark_in_progress(item.id)
+        queue.mark_failed(item.id, "retry")
+        item.retry_count = 0
+
+    for key, heap in queue._heaps.items():
+        assert len(heap) <= 2 * queue._live[key] + 16, key
+    assert list(queue.iter_project_work("p1")) == [
+        item for item in queue.get_pending_work() if item.project_name == "p1"
+    ]
@@ -0,0 +1,181 @@
+import asyncio
+import sys
+import textwrap
+
+from computer_use_demo.hooks import (
+    HookConfig,
+    HookEvent,
+    HookExecutor,
+    HookFailBehavior,
+    HookRegistry,
+)
+
+WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+    for line in sys.stdin:
+        request = json.loads(line)
+        command = request["tool_input"].get("command", "")
+        if command == "hang":
+            time.sleep(5)
+        print(json.dumps({
+            "id": request["id"],
+            "output": f"{os.getpid()} {request['event']} {command}",
+            "abort": "rm -rf" in command,
+        }), flush=True)
+    """
+)
+
+
+def _executor(*hooks):
+    registry = HookRegistry()
+    registry._loaded = True
+    for hook in hooks:
+        registry.add_hook(hook)
+    return HookExecutor(registry)
+
+
+def test_lookup_is_cached_per_event_and_tool():
+    edit_hook = HookConfig(event=HookEvent.POST_EDIT, command="true")
+    bash_hook = HookConfig(event=HookEvent.PRE_TOOL_CALL, command="true", tool="bash", pattern="git ")
+    registry = HookRegistry()
+    registry._loaded = True
+    registry.add_hook(edit_hook)
+    registry.add_hook(bash_hook)
+
+    assert registry.get_hooks_for_event(HookEvent.POST_TOOL_CALL, "str_replace_editor", {}) == [edit_hook]
+    assert registry.get_hooks_for_event(HookEvent.PRE_TOOL_CALL, "bash", {"command": "git push"}) == [
+        bash_hook
+    ]
+    assert registry.get_hooks_for_event(HookEvent.PRE_TOOL_CALL, "bash", {"command": "ls"}) == []
+    assert (HookEvent.PRE_TOOL_CALL, "bash") in registry._lookup_cache
+
+    bash_hook.enabled = False
+    assert registry.get_hooks_for_event(HookEvent.PRE_TOOL_CALL, "bash", {"command": "git push"}) == []
+    registry.remove_hook(edit_hook)
+    assert registry.get_hooks_for_event(HookEvent.POST_TOOL_CALL, "str_replace_editor", {}) == []
+
+
+async def test_persistent_worker_serves_many_calls(tmp_path):
+    script = tmp_path / "worker.py"
+    script.write_text(WORKER)
+    hook = HookConfig(
+        event=HookEvent.PRE_BASH,
+        command=f"{sys.executable} {script}",
+        persistent=True,
+        fail_behavior=HookFailBehavior.ABORT,
+        description="guard",
+    )
+    executor = _executor(hook)
+    try:
+        assert await executor.run_pre_tool_hooks("bash", {"command": "ls"}) == (True, None)
+        allowed, error = await executor.run_pre_tool_hooks("bash", {"command": "rm -rf /"})
+        assert not allowed and "guard" in error
+        assert await executor.run_pre_tool_hooks("bash", {"command": "pwd"}) == (True, None)
+
+        stats = executor.get_stats()
+        assert stats["hooks"]["guard"]["calls"] == 3
+        assert stats["workers"] == 1
+    finally:
+        await executor.close()
+
+
+async def test_worker_is_replaced_after_a_timeout(tmp_path):
+    script = tmp_path / "worker.py"
+    script.write_text(WORKER)
+    hook = HookConfig(
+        event=HookEvent.PRE_BASH,
+        command=f"{sys.executable} {script}",
+        persistent=True,
+        timeout=1,
+        fail_behavior=HookFailBehavior.ABORT,
+        description="guard",
+    )
+    executor = _executor(hook)
+    try:
+        allowed, error = await executor.run_pre_tool_hooks("bash", {"command": "hang"})
+        assert not allowed and "timed out" in error
+        # The killed worker is reaped, so the next call starts a new one
+        assert await executor.run_pre_tool_hooks("bash", {"command": "ls"}) == (True, None)
+    finally:
+        await executor.close()
+
+
+async def test_non_blocking_hooks_run_in_background_batches(tmp_path):
+    script = tmp_path / "worker.py"
+    script.write_text(WORKER)
+    log = tmp_path / "log"
+    shell_hook = HookConfig(
+        event=HookEvent.POST_TOOL_CALL,
+        command=f"echo {{{{tool_name}}}} >> {log}",
+        blocking=False,
+        description="log",
+    )
+    worker_hook = HookConfig(
+        event=HookEvent.POST_TOOL_CALL,
+        command=f"{sys.executable} {script}",
+        persistent=True,
+        blocking=False,
+        description="worker",
+    )
+    executor = _executor(shell_hook, worker_hook)
+    try:
+        for _ in range(5):
+            await executor.run_post_tool_hooks("bash", {"command": "ls"}, tool_result=None)
+        await executor.flush()
+
+        assert log.read_text().split() == ["bash"] * 5
+        stats = executor.get_stats()
+        assert stats["hooks"]["worker"]["calls"] == 5
+        assert stats["hooks"]["worker"]["failures"] == 0
+        assert stats["queued"] == 0
+        assert stats["largest_batch"] > 1
+    finally:
+        await executor.close()
+
+
+async def test_timed_out_hook_is_reported():
+    hook = HookConfig(
+        event=HookEvent.PRE_TOOL_CALL,
+        command="sleep 5",
+        timeout=1,
+        fail_behavior=HookFailBehavior.ABORT,
+        description="slow",
+    )
+    executor = _executor(hook)
+    allowed, error = await executor.run_pre_tool_hooks("bash", {"command": "ls"})
+    assert not allowed and "timed out" in error
+    assert executor.get_stats()["hooks"]["slow"]["failures"] == 1
+
+
+async def test_slow_background_hook_does_not_hold_up_others(tmp_path):
+    log = tmp_path / "log"
+    slow = HookConfig(event=HookEvent.POST_TOOL_CALL, command="sleep 2", blocking=False, description="slow")
+    fast = HookConfig(
+        event=HookEvent.POST_TOOL_CALL,
+        command=f"echo {{{{tool_name}}}} >> {log}",
+        blocking=False,
+        description="fast",
+    )
+    executor = _executor(slow, fast)
+    try:
+        for _ in range(3):
+            await executor.run_post_tool_hooks("bash", {"command": "ls"}, tool_result=None)
+        await asyncio.sleep(1)
+        assert log.read_text().split().count("bash") == 3
+        assert executor.get_stats()["running"] == 3  # The slow hooks
+    finally:
+        await executor.close()
+
+
+async def test_timed_out_hook_children_are_killed(tmp_path):
+    marker = tmp_path / "marker"
+    hook = HookConfig(
+        event=HookEvent.PRE_TOOL_CALL,
+        command=f"(sleep 1.5; touch {marker}) & wait",
+        timeout=1,
+    )
+    executor = _executor(hook)
+    await executor.run_pre_tool_hooks("bash", {"command": "ls"})
+    await asyncio.sleep(1)
+    assert not marker.exists()
@@ -0,0 +1,143 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from computer_use_demo.jsonrpc import JSONRPCError, StdioTransport
+from computer_use_demo.jsonrpc.transport import read_message
+
+# A server answering "echo" after params["delay"] seconds, out of order,
+# recording cancellations; "big" returns params["size"] characters.
+SERVER = r"""
+import json, sys, threading, time
+
+framing = sys.argv[1]
+lock = threading.Lock()
+cancelled = []
+
+def read():
+    line = sys.stdin.buffer.readline()
+    if not line:
+        return None
+    if framing == "newline":
+        return json.loads(line)
+    length = int(line.split(b":")[1])
+    sys.stdin.buffer.readline()
+    return json.loads(sys.stdin.buffer.read(length))
+
+def write(message):
+    body = json.dumps(message).encode()
+    with lock:
+        if framing == "newline":
+            sys.stdout.buffer.write(body + b"\n")
+        else:
+            sys.stdout.buffer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        sys.stdout.buffer.flush()
+
+def answer(message):
+    params = message.get("params", {})
+    time.sleep(params.get("delay", 0))
+    if message["method"] == "big":
+        result = "x" * params["size"]
+    elif message["method"] == "cancelled":
+        result = cancelled
+    elif message["method"] == "fail":
+        write({"jsonrpc": "2.0", "id": message["id"], "error": {"code": 7, "message": "nope"}})
+        return
+    else:
+        result = params
+    write({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+while (message := read()) is not None:
+    if "id" not in message:
+        if message["method"] == "cancel":
+            cancelled.append(message["params"]["id"])
+        elif message["method"] == "ask":
+            write({"jsonrpc": "2.0", "id": "s1", "method": "roots/list"})
+            write({"jsonrpc": "2.0", "method": "log", "params": {"text": "hi"}})
+        continue
+    if "method" not in message:
+        write({"jsonrpc": "2.0", "method": "answered", "params": message})
+        continue
+    threading.Thread(target=answer, args=(message,)).start()
+"""
+
+
+async def _transport(framing, **kwargs):
+    transport = StdioTransport(
+        [sys.executable, "-c", SERVER, framing],
+        framing=framing,
+        cancel_notification=lambda request_id: ("cancel", {"id": request_id}),
+        **kwargs,
+    )
+    await transport.start()
+    return transport
+
+
+@pytest.mark.parametrize("framing", ["newline", "content-length"])
+async def test_concurrent_requests_and_errors(framing):
+    transport = await _transport(framing)
+    try:
+        results = await asyncio.gather(
+            *(transport.request("echo", {"delay": 0.3 - i * 0.05, "i": i}) for i in range(5))
+        )
+        assert [result["i"] for result in results] == list(range(5))
+        with pytest.raises(JSONRPCError) as error:
+            await transport.request("fail")
+        assert error.value.code == 7
+    finally:
+        await transport.close()
+
+
+async def test_timeout_cancels_on_the_server():
+    transport = await _transport("newline")
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await transport.request("echo", {"delay": 1}, timeout=0.1)
+        assert await transport.request("cancelled") == [1]
+    finally:
+        await transport.close()
+
+
+async def test_server_requests_and_notifications():
+    notifications = []
+    transport = await _transport("content-length", on_notification=notifications.append)
+    try:
+        await transport.notify("ask")
+        await transport.request("echo", {"delay": 0.2})
+        assert notifications[0] == {"jsonrpc": "2.0", "method": "log", "params": {"text": "hi"}}
+        assert notifications[1]["params"]["error"]["code"] == -32601
+    finally:
+        await transport.close()
+
+
+async def test_large_messages_and_exit():
+    transport = await _transport("content-length")
+    started = time.perf_counter()
+    result = await transport.request("big", {"size": 20 * 2**20})
+    elapsed = time.perf_counter() - started
+    assert len(result) == 20 * 2**20
+    assert elapsed < 5, f"20 MiB response took {elapsed * 1000:.0f} ms"
+
+    pending = asyncio.create_task(transport.request("echo", {"delay": 10}))
+    await asyncio.sleep(0.1)
+    transport.process.kill()
+    with pytest.raises(JSONRPCError):
+        await pending
+    await transport.close()
+
+
+async def test_stray_output_lines_are_skipped():
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"server starting\n"
+        b'{"jsonrpc": "2.0", "id": 1}\n'
+        b"listening on stdio\n\n"
+        b'Content-Length: 9\r\nContent-Type: application/json\r\n\r\n{"id": 2}\n'
+        b"bye"
+    )
+    reader.feed_eof()
+    assert await read_message(reader) == b'{"jsonrpc": "2.0", "id": 1}'
+    assert await read_message(reader) == b'{"id": 2}'
+    assert await read_message(reader) is None
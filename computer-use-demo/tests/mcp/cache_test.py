@@ -0,0 +1,157 @@
+import asyncio
+import sys
+from unittest.mock import patch
+
+from computer_use_demo.mcp import (
+    MCPClient,
+    MCPResultCache,
+    MCPServerConfig,
+    cache as cache_module,
+)
+from computer_use_demo.mcp.cache import RESOURCE, TOOL_CALL, TOOLS
+
+# An MCP server counting the requests it receives; "bump" changes the tool
+# list and announces it, "touch" reports a resource updated.
+SERVER = r"""
+import json, sys
+
+counts = {}
+version = 1
+
+def write(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+for line in sys.stdin:
+    message = json.loads(line)
+    method = message.get("method")
+    if "id" not in message:
+        continue
+    counts[method] = counts.get(method, 0) + 1
+    params = message.get("params") or {}
+    if method == "initialize":
+        result = {"protocolVersion": "2024-11-05", "capabilities": {}}
+    elif method == "tools/list":
+        result = {"tools": [
+            {"name": "lookup", "annotations": {"idempotentHint": True}},
+            {"name": "write", "annotations": {"idempotentHint": False}},
+            {"name": "v%d" % version},
+        ]}
+    elif method == "tools/call":
+        args = params["arguments"]
+        result = {"content": [{"type": "text", "text": str(counts[method])}], "isError": bool(args.get("fail"))}
+    elif method == "resources/read":
+        result = {"contents": [{"uri": params["uri"], "text": str(counts[method])}]}
+    elif method == "bump":
+        version += 1
+        write({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+        result = {}
+    elif method == "touch":
+        write({"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": params["uri"]}})
+        result = {}
+    else:
+        result = counts
+    write({"jsonrpc": "2.0", "id": message["id"], "result": result})
+"""
+
+
+def _loader(values, delay=0.0, cacheable=True):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return values[len(calls) - 1], cacheable
+
+    return load, calls
+
+
+async def test_ttl_expiry_and_stats():
+    cache = MCPResultCache()
+    load, calls = _loader(["a", "b"])
+    with patch.object(cache_module.time, "monotonic", return_value=100.0):
+        assert await cache.get_or_load(TOOLS, None, 10, load) == "a"
+        assert await cache.get_or_load(TOOLS, None, 10, load) == "a"
+    with patch.object(cache_module.time, "monotonic", return_value=111.0):
+        assert await cache.get_or_load(TOOLS, None, 10, load) == "b"
+    assert len(calls) == 2
+    assert cache.get_stats()[TOOLS] == {"hits": 1, "misses": 2, "hit_rate": 0.333}
+
+
+async def test_errors_and_zero_ttl_are_not_cached():
+    cache = MCPResultCache()
+    load, calls = _loader(["x", "y"], cacheable=False)
+    await cache.get_or_load(TOOLS, None, 10, load)
+    await cache.get_or_load(TOOLS, None, 10, load)
+    load, calls_uncached = _loader(["x", "y"])
+    await cache.get_or_load(RESOURCE, "u", 0, load)
+    await cache.get_or_load(RESOURCE, "u", 0, load)
+    assert len(calls) == 2 and len(calls_uncached) == 2
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = MCPResultCache()
+    load, calls = _loader(["a"], delay=0.05)
+    results = await asyncio.gather(*(cache.get_or_load(RESOURCE, "u", 10, load) for _ in range(5)))
+    assert results == ["a"] * 5
+    assert len(calls) == 1
+
+
+async def test_invalidation_during_load_is_not_overwritten():
+    cache = MCPResultCache()
+    load, calls = _loader(["stale", "fresh"], delay=0.05)
+    pending = asyncio.ensure_future(cache.get_or_load(TOOLS, None, 10, load))
+    await asyncio.sleep(0.01)
+    assert cache.handle_notification("notifications/tools/list_changed", None)
+    assert await pending == "stale"
+    assert await cache.get_or_load(TOOLS, None, 10, load) == "fresh"
+
+
+async def test_notifications_and_lru_eviction():
+    cache = MCPResultCache(max_entries=2)
+    for uri in ("a", "b", "c"):
+        load, _ = _loader([uri])
+        await cache.get_or_load(RESOURCE, uri, 10, load)
+    assert [key for _, key in cache._entries] == ["b", "c"]
+
+    cache.handle_notification("notifications/resources/updated", {"uri": "b"})
+    assert [key for _, key in cache._entries] == ["c"]
+    load, _ = _loader(["r"])
+    await cache.get_or_load(TOOL_CALL, ("lookup", "{}"), 10, load)
+    assert not cache.handle_notification("notifications/message", {})
+    cache.handle_notification("notifications/tools/list_changed", None)
+    assert [key for _, key in cache._entries] == ["c"]
+
+
+async def test_client_caches_and_invalidates():
+    config = MCPServerConfig(name="fake", command=sys.executable, args=["-c", SERVER], cache_tool_results=True)
+    client = MCPClient(config)
+    await client.start()
+    try:
+        assert [tool.name for tool in await client.list_tools()] == ["lookup", "write", "v1"]
+        await client.list_tools()
+
+        first = await client.call_tool("lookup", {"q": 1})
+        assert await client.call_tool("lookup", {"q": 1}) == first
+        assert await client.call_tool("lookup", {"q": 2}) != first
+        await client.call_tool("write", {})
+        await client.call_tool("write", {})
+        await client.call_tool("lookup", {"fail": True})
+        await client.call_tool("lookup", {"fail": True})
+
+        read = await client.read_resource("file:///a")
+        assert await client.read_resource("file:///a") == read
+        await client.request("touch", {"uri": "file:///a"})
+        assert await client.read_resource("file:///a") != read
+
+        await client.request("bump")
+        assert [tool.name for tool in await client.list_tools()][-1] == "v2"
+
+        counts = (await client.request("counts")).result
+        assert counts["tools/list"] == 2
+        assert counts["tools/call"] == 6
+        assert counts["resources/read"] == 2
+        assert client.cache.get_stats()[TOOLS]["hits"] == 1
+    finally:
+        await client.stop()
+    assert not client.cache._entries
@@ -0,0 +1,103 @@
+import json
+
+from computer_use_demo.proto_logging import SessionIndex, StructuredLogger
+from computer_use_demo.proto_logging.segments import (
+    LogSegmenter,
+    list_segments,
+    read_manifest,
+    tail_stream,
+)
+from computer_use_demo.proto_logging.unified import merge_all_logs
+
+
+def _write(path, entries):
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_daily_rotation_and_manifest_pruning(tmp_path):
+    segmenter = LogSegmenter(tmp_path, max_bytes=None, partition="daily", compression="gzip")
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _write(log_file, [
+        {"timestamp": "2025-01-01T10:00:00", "session_id": "a", "event_type": "x"},
+        {"timestamp": "2025-01-01T11:00:00", "session_id": "b", "event_type": "x"},
+    ])
+    assert not segmenter.should_rotate(log_file, "2025-01-01T12:00:00")
+    assert segmenter.should_rotate(log_file, "2025-01-02T00:00:01")
+    segmenter.rotate(log_file)
+    _write(log_file, [{"timestamp": "2025-01-02T09:00:00", "session_id": "a", "event_type": "y"}])
+    segmenter.close()
+
+    (info,) = read_manifest(tmp_path)
+    assert info.file.endswith(".jsonl.gz")
+    assert (info.min_ts, info.max_ts, info.entries) == ("2025-01-01T10:00:00", "2025-01-01T11:00:00", 2)
+    assert info.sessions == ["a", "b"]
+
+    assert list_segments(tmp_path, "proto_sessions", start="2025-01-02") == []
+    assert len(list_segments(tmp_path, "proto_sessions", session_id="b")) == 1
+
+    merged = merge_all_logs(tmp_path, session_id="a")
+    assert [e["event_type"] for e in merged] == ["x", "y"]
+
+
+def test_logger_rotates_by_size_and_keeps_index(tmp_path):
+    logger = StructuredLogger(
+        log_dir=str(tmp_path), enable_console=False, buffered=False, rotate_bytes=300
+    )
+    logger.log_event("session_created", session_id="s1")
+    for i in range(5):
+        logger.log_user_message("s1", f"message {i}", message_id=str(i))
+    logger.close()
+
+    assert list_segments(tmp_path, "proto_sessions")
+    entries = logger.get_session_entries("s1")
+    assert [e["data"]["message"] for e in entries] == [f"message {i}" for i in range(5)]
+    (session,) = logger.list_session_history()
+    assert session["preview"] == "message 0"
+
+
+def test_index_counts_survive_rotation_and_compression(tmp_path):
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _write(log_file, [
+        {"timestamp": "t1", "session_id": "s1", "event_type": "session_created"},
+        {"timestamp": "t2", "session_id": "s1", "event_type": "message_sent",
+         "data": {"role": "user", "message": "hi"}},
+        {"timestamp": "t3", "session_id": "s1", "event_type": "assistant_response"},
+    ])
+    index = SessionIndex(tmp_path / "index.sqlite")
+    index.sync(log_file)
+    assert index.list_sessions()[0]["message_count"] == 2
+
+    segmenter = LogSegmenter(tmp_path, max_bytes=None, partition=None)
+    segment = segmenter.rotate(log_file)
+    segmenter.close()
+    index.sync(log_file, segments=list_segments(tmp_path, "proto_sessions"))
+    assert index.list_sessions()[0]["message_count"] == 2
+
+    LogSegmenter(tmp_path, compression="gzip")._compress(segment)
+    index.sync(log_file, segments=list_segments(tmp_path, "proto_sessions"))
+    (session,) = index.list_sessions()
+    assert (session["message_count"], session["last_timestamp"]) == (2, "t3")
+
+    # Retention: the segment's entries no longer count
+    _write(log_file, [{"timestamp": "t4", "session_id": "s1", "event_type": "tool_use"}])
+    for path in list_segments(tmp_path, "proto_sessions"):
+        path.unlink()
+    index.sync(log_file, segments=list_segments(tmp_path, "proto_sessions"))
+    (session,) = index.list_sessions()
+    assert (session["message_count"], session["last_timestamp"]) == (1, "t4")
+
+
+def test_tail_reads_back_into_segments(tmp_path):
+    segmenter = LogSegmenter(tmp_path, max_bytes=None, partition=None, compression="gzip")
+    log_file = tmp_path / "proto_errors.jsonl"
+    for batch in range(3):
+        _write(log_file, [{"timestamp": f"t{batch}{i}", "event_type": "error"} for i in range(4)])
+        segmenter.rotate(log_file)
+    _write(log_file, [{"timestamp": "t30", "event_type": "error"}])
+    segmenter.close()
+
+    tail = tail_stream(tmp_path, "proto_errors", 6)
+    assert [e["timestamp"] for e in tail] == ["t11", "t12", "t13", "t20", "t21", "t22", "t23", "t30"][-6:]
+    assert len(tail_stream(tmp_path, "proto_errors", 100)) == 13
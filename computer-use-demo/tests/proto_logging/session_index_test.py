@@ -0,0 +1,70 @@
+import json
+
+from computer_use_demo.proto_logging import SessionIndex
+
+
+def _append(log_file, **entry):
+    with open(log_file, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def test_index_lists_sessions_and_seeks_entries(tmp_path):
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _append(log_file, timestamp="2025-01-01T00:00:00Z", event_type="session_created", session_id="webui-a")
+    _append(log_file, timestamp="2025-01-01T00:00:01Z", event_type="message_sent", session_id="webui-a",
+            data={"role": "user", "message": "first question"})
+    _append(log_file, timestamp="2025-01-02T00:00:00Z", event_type="session_created", session_id="webui-b")
+    _append(log_file, timestamp="2025-01-02T00:00:01Z", event_type="message_sent", session_id="agent-x",
+            data={"role": "user", "message": "not a webui session"})
+
+    index = SessionIndex(tmp_path / "index.sqlite")
+    assert index.sync(log_file) == 4
+    assert [s["session_id"] for s in index.list_sessions(prefix="webui-")] == ["webui-a"]
+
+    _append(log_file, timestamp="2025-01-02T00:00:02Z", event_type="message_sent", session_id="webui-b",
+            data={"role": "user", "message": "second"})
+    _append(log_file, timestamp="2025-01-02T00:00:03Z", event_type="message_sent", session_id="webui-a",
+            data={"role": "user", "message": "follow-up"})
+    # Only the appended lines are parsed
+    assert index.sync(log_file) == 2
+
+    sessions = index.list_sessions(prefix="webui-")
+    assert [(s["session_id"], s["preview"]) for s in sessions] == [
+        ("webui-b", "second"),
+        ("webui-a", "first question"),
+    ]
+
+    entries = index.read_entries("webui-a", event_types=("message_sent",))
+    assert [e["data"]["message"] for e in entries] == ["first question", "follow-up"]
+
+
+def test_index_rebuilds_truncated_file(tmp_path):
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _append(log_file, timestamp="t1", event_type="session_created", session_id="webui-a")
+    _append(log_file, timestamp="t2", event_type="message_sent", session_id="webui-a",
+            data={"role": "user", "message": "hello"})
+    index = SessionIndex(tmp_path / "index.sqlite")
+    index.sync(log_file)
+
+    log_file.write_text("")
+    _append(log_file, timestamp="t3", event_type="message_sent", session_id="webui-a",
+            data={"role": "user", "message": "x"})
+    index.sync(log_file)
+    assert [e["data"]["message"] for e in index.read_entries("webui-a")] == ["x"]
+    (session,) = index.list_sessions()
+    assert (session["message_count"], session["last_timestamp"]) == (1, "t3")
+
+
+def test_index_notices_replaced_file_that_grew_past_old_offset(tmp_path):
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _append(log_file, timestamp="t1", event_type="session_created", session_id="webui-a")
+    index = SessionIndex(tmp_path / "index.sqlite")
+    index.sync(log_file)
+
+    log_file.rename(tmp_path / "rotated.jsonl")
+    for i in range(3):
+        _append(log_file, timestamp=f"t{i + 2}", event_type="message_sent", session_id="webui-b",
+                data={"role": "user", "message": f"new {i}"})
+    assert index.sync(log_file) == 3
+    assert [e["data"]["message"] for e in index.read_entries("webui-b")] == ["new 0", "new 1", "new 2"]
+    assert index.read_entries("webui-a") == []
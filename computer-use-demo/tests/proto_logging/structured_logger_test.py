@@ -0,0 +1,78 @@
+import json
+import threading
+
+from computer_use_demo.proto_logging import StructuredLogger
+from computer_use_demo.proto_logging.structured_logger import _BufferedWriter
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_buffered_logger_batches_and_flushes(tmp_path):
+    logger = StructuredLogger(
+        log_dir=str(tmp_path), enable_console=False, buffered=True, flush_interval=60
+    )
+    for i in range(5):
+        logger.log_event("tool_executed", session_id="s", data={"i": i, "api_key": "x"})
+
+    logger.flush()
+    entries = _lines(tmp_path / "proto_tools.jsonl")
+    assert [e["data"]["i"] for e in entries] == list(range(5))
+    # Sanitization still applies on the writer thread
+    assert entries[0]["data"]["api_key"] == "[REDACTED]"
+
+    stats = logger.stats()
+    assert stats["written"] == 5
+    assert stats["dropped"] == 0
+    logger.close()
+
+
+def test_buffered_logger_copies_caller_dicts(tmp_path):
+    logger = StructuredLogger(
+        log_dir=str(tmp_path), enable_console=False, buffered=True, flush_interval=60
+    )
+    data = {"step": 1}
+    logger.log_event("tool_executed", session_id="s", data=data)
+    data["step"] = 2
+    data["handle"] = object()  # Not JSON-serializable
+
+    logger.flush()
+    assert _lines(tmp_path / "proto_tools.jsonl")[0]["data"] == {"step": 1}
+    logger.close()
+
+
+def test_buffered_writer_drops_when_queue_full(tmp_path):
+    release = threading.Event()
+
+    def prepare(path, line):
+        release.wait(5)
+        return path, line, ""
+
+    writer = _BufferedWriter(prepare, max_queue=1)
+    log_file = tmp_path / "out.jsonl"
+    assert writer.submit(("entry", log_file, "a\n"))
+    # The writer thread is stuck on the first entry; fill the queue
+    while writer._queue.qsize() < 1:
+        writer.submit(("entry", log_file, "b\n"))
+    assert writer.submit(("entry", log_file, "c\n")) is False
+    assert writer.stats()["dropped"] >= 1
+
+    release.set()
+    writer.flush()
+    assert log_file.read_text().startswith("a\n")
+    writer.close()
+
+
+def test_buffered_logger_formats_error_traceback(tmp_path):
+    logger = StructuredLogger(log_dir=str(tmp_path), enable_console=False, buffered=True)
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        error = e
+    # Logged outside the except block: the traceback comes from the exception
+    logger.log_error(session_id="s", error=error)
+    logger.flush()
+    (entry,) = _lines(tmp_path / "proto_errors.jsonl")
+    assert "ValueError: boom" in entry["error"]["stack_trace"]
+    logger.close()
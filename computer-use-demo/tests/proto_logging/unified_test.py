@@ -0,0 +1,53 @@
+import json
+import threading
+import time
+
+from computer_use_demo.proto_logging.segments import LogSegmenter
+from computer_use_demo.proto_logging.unified import follow_logs, iter_merged_logs
+
+
+def _write(path, entries):
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_merge_is_lazy_and_pushes_filters_down(tmp_path):
+    _write(tmp_path / "proto_sessions.jsonl", [
+        {"timestamp": "2025-01-01T00:00:01", "session_id": "a", "event_type": "message_sent"},
+        {"timestamp": "2025-01-01T00:00:04", "session_id": "b", "event_type": "message_sent"},
+    ])
+    _write(tmp_path / "proto_tools.jsonl", [
+        {"timestamp": "2025-01-01T00:00:02", "session_id": "a", "event_type": "tool_executed"},
+        {"timestamp": "2025-01-01T00:00:03", "session_id": "a", "event_type": "tool_failed"},
+    ])
+
+    merged = iter_merged_logs(tmp_path)
+    assert next(merged)["timestamp"] == "2025-01-01T00:00:01"
+    assert [e["timestamp"][-2:] for e in merged] == ["02", "03", "04"]
+
+    filtered = iter_merged_logs(
+        tmp_path, session_id="a", start="2025-01-01T00:00:02", event_types=["tool_failed"]
+    )
+    assert [e["event_type"] for e in filtered] == ["tool_failed"]
+
+
+def test_follow_yields_new_entries_across_rotation(tmp_path):
+    log_file = tmp_path / "proto_sessions.jsonl"
+    _write(log_file, [{"timestamp": "2025-01-01T00:00:00", "event_type": "old"}])
+
+    def writer():
+        time.sleep(0.1)
+        _write(log_file, [{"timestamp": "2025-01-01T00:00:01", "event_type": "before"}])
+        LogSegmenter(tmp_path, max_bytes=None).rotate(log_file)
+        _write(log_file, [{"timestamp": "2025-01-02T00:00:00", "event_type": "after"}])
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    seen = []
+    for entry in follow_logs(tmp_path, streams=("proto_sessions",), poll_interval=0.02, stop_after=1):
+        seen.append(entry["event_type"])
+        if len(seen) == 2:
+            break
+    thread.join()
+    assert seen == ["before", "after"]
@@ -0,0 +1,224 @@
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from computer_use_demo.remote.computer_registry import ComputerConfig
+from computer_use_demo.remote.remote_computer_tool import run_action_on_computers
+from computer_use_demo.remote.ssh_manager import FanOutResult, SSHConnection, SSHManager
+
+
+class FakeChannel:
+    """A paramiko-like channel running "sleep <s> <stdout> <stderr> <code>" on a thread."""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.closed = False
+        self._out = b""
+        self._err = b""
+        self._status = None
+        self._lock = threading.Lock()
+        self._read_fd, self._write_fd = os.pipe()
+
+    def fileno(self):
+        return self._read_fd
+
+    def _signal(self):
+        os.write(self._write_fd, b"x")
+
+    def exec_command(self, command):
+        _, delay, out, err, code = command.split()
+
+        def run():
+            with self.transport.lock:
+                self.transport.running += 1
+                self.transport.peak = max(self.transport.peak, self.transport.running)
+            for chunk in (out[: len(out) // 2], out[len(out) // 2 :]):
+                time.sleep(float(delay) / 2)
+                with self._lock:
+                    self._out += chunk.encode()
+                self._signal()
+            with self._lock:
+                self._err += err.encode()
+                self._status = int(code) if self.transport.exit_code is None else self.transport.exit_code
+            with self.transport.lock:
+                self.transport.running -= 1
+            self._signal()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def recv_ready(self):
+        return bool(self._out)
+
+    def recv_stderr_ready(self):
+        return bool(self._err)
+
+    def recv(self, size):
+        with self._lock:
+            data, self._out = self._out[:size], self._out[size:]
+        return data
+
+    def recv_stderr(self, size):
+        with self._lock:
+            data, self._err = self._err[:size], self._err[size:]
+        return data
+
+    def exit_status_ready(self):
+        return self._status is not None
+
+    def recv_exit_status(self):
+        return self._status
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._signal()
+
+
+class FakeTransport:
+    def __init__(self, exit_code=None):
+        self.exit_code = exit_code  # Overrides the command's
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def open_session(self, timeout=None):
+        return FakeChannel(self)
+
+
+class FakeClient:
+    def close(self):
+        pass
+
+
+def _fake_connect(transport):
+    def connect(self):
+        self.client = FakeClient()
+        self.transport = transport if isinstance(transport, FakeTransport) else transport[self.computer.host]
+
+    return patch.object(SSHConnection, "_connect_blocking", connect)
+
+
+COMPUTER = ComputerConfig(id="remote-1", name="remote", type="remote", host="10.0.0.2")
+
+
+async def test_commands_stream_without_blocking_the_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    chunks = []
+    with _fake_connect(FakeTransport()):
+        manager = SSHManager()
+        task = asyncio.create_task(ticker())
+        result = await manager.execute_command(
+            COMPUTER, "sleep 0.4 hello-world oops 3", on_output=lambda *chunk: chunks.append(chunk)
+        )
+        task.cancel()
+        await manager.close_all()
+
+    assert result == (3, "hello-world", "oops")
+    assert chunks == [("stdout", "hello"), ("stdout", "-world"), ("stderr", "oops")]
+    assert ticks >= 20
+
+
+async def test_timeout_keeps_the_connection():
+    with _fake_connect(FakeTransport()):
+        manager = SSHManager()
+        with pytest.raises(TimeoutError):
+            await manager.execute_command(COMPUTER, "sleep 2 out err 0", timeout=0.1)
+        assert "remote-1" in manager.pool
+        assert await manager.execute_command(COMPUTER, "sleep 0 ok - 0") == (0, "ok", "-")
+        await manager.close_all()
+
+
+async def test_only_dead_connections_are_dropped():
+    transport = FakeTransport()
+    with _fake_connect(transport):
+        manager = SSHManager()
+        with pytest.raises(ValueError):
+            async with manager.get_connection(COMPUTER):
+                raise ValueError("caller error")
+        assert "remote-1" in manager.pool
+
+        transport.active = False
+        with pytest.raises(RuntimeError):
+            async with manager.get_connection(COMPUTER):
+                raise RuntimeError("transport lost")
+        assert "remote-1" not in manager.pool
+        await manager.close_all()
+
+
+async def test_concurrency_is_capped_per_host():
+    transport = FakeTransport()
+    with _fake_connect(transport):
+        manager = SSHManager(max_per_host=2)
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(manager.execute_command(COMPUTER, f"sleep 0.2 out{i} - 0") for i in range(6))
+        )
+        elapsed = time.monotonic() - started
+        await manager.close_all()
+
+    assert [out for _, out, _ in results] == [f"out{i}" for i in range(6)]
+    assert transport.peak == 2
+    assert elapsed >= 0.55
+
+
+async def test_fan_out_runs_hosts_concurrently():
+    computers = [
+        ComputerConfig(id=f"box-{i}", name=f"box-{i}", type="remote", host=f"10.0.1.{i}") for i in range(8)
+    ]
+    transports = {computer.host: FakeTransport() for computer in computers}
+    transports["10.0.1.3"].exit_code = 7
+    with _fake_connect(transports):
+        manager = SSHManager()
+        started = time.monotonic()
+        aggregate = await manager.execute_on_all(computers, "sleep 0.3 up - 0", max_concurrency=4)
+        elapsed = time.monotonic() - started
+
+        timed_out = [
+            result
+            async for result in manager.fan_out_command(computers[:2], "sleep 5 up - 0", timeout=0.2)
+        ]
+        await manager.close_all()
+
+    # Two rounds of four hosts, not eight sequential commands
+    assert 0.6 <= elapsed < 1.5
+    assert len(aggregate.results) == 8
+    assert [result.computer.id for result in aggregate.failed] == ["box-3"]
+    assert aggregate.exit_code == 7
+    assert all(result.stdout == "up" for result in aggregate.results)
+    assert [result.exit_code for result in timed_out] == [None, None]
+    assert FanOutResult(timed_out).exit_code == 255
+
+
+async def test_actions_fan_out_to_remote_tools():
+    computers = [ComputerConfig(id=f"box-{i}", name=f"box-{i}", type="remote", host="10.0.2.1") for i in range(3)]
+    transport = FakeTransport()
+
+    with _fake_connect(transport), patch.object(SSHConnection, "execute_command", autospec=True) as execute:
+
+        async def run(self, command, timeout=30.0, on_output=None):
+            await asyncio.sleep(0.1)
+            return 0, '{"base64_image": "iVBOR"}', ""
+
+        execute.side_effect = run
+        manager = SSHManager()
+        results = [item async for item in run_action_on_computers(manager, computers)]
+        await manager.close_all()
+
+    assert sorted(computer.id for computer, _ in results) == ["box-0", "box-1", "box-2"]
+    assert all(result.base64_image == "iVBOR" for _, result in results)
+    assert '"action": "screenshot"' in execute.call_args.args[1]
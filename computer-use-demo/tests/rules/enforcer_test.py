@@ -0,0 +1,195 @@
+import fnmatch
+import random
+import re
+import time
+
+from computer_use_demo.rules import Rule, RuleEnforcer, RuleScope, RuleSeverity
+
+
+def _enforcer(rules):
+    enforcer = RuleEnforcer(auto_load=False)
+    for rule in rules:
+        enforcer.add_rule(rule)
+    return enforcer
+
+
+def _reference_violations(rules, tool_name, tool_input):
+    """Ids of the rules violated, checked one by one like the enforcer used to."""
+
+    def matches(text, pattern):
+        try:
+            if re.search(pattern, text, re.IGNORECASE):
+                return True
+        except re.error:
+            pass
+        return pattern.lower() in text.lower()
+
+    violated = []
+    for rule in rules:
+        if rule.tools:
+            if tool_name not in rule.tools:
+                continue
+        elif rule.scope == RuleScope.FILE and tool_name not in ("edit", "read", "str_replace_editor", "write"):
+            continue
+        elif rule.scope == RuleScope.COMMAND and tool_name != "bash":
+            continue
+        file_path = tool_input.get("path")
+        if rule.scope == RuleScope.FILE and file_path:
+            if any(fnmatch.fnmatch(file_path, pattern) for pattern in rule.file_patterns):
+                violated.append(rule.id)
+                continue
+        if any(matches(str(tool_input), pattern) for pattern in rule.match_patterns):
+            violated.append(rule.id)
+    return violated
+
+
+def _random_rules(count, seed=0):
+    rng = random.Random(seed)
+    words = ["rm", "sudo", "secret", "token", "drop", "table", "curl", "env", "key", "push"]
+    rules = []
+    for i in range(count):
+        kind = rng.choice(["literal", "regex", "invalid", "file", "command"])
+        word = f"{rng.choice(words)}{i}"
+        if kind == "literal":
+            rule = Rule(id=f"r{i}", name=f"r{i}", description="", match_patterns=[word.upper()])
+        elif kind == "regex":
+            rule = Rule(id=f"r{i}", name=f"r{i}", description="", match_patterns=[rf"{word}\s+-\w+"])
+        elif kind == "invalid":
+            rule = Rule(id=f"r{i}", name=f"r{i}", description="", match_patterns=[f"{word}(+"])
+        elif kind == "file":
+            rule = Rule(
+                id=f"r{i}",
+                name=f"r{i}",
+                description="",
+                scope=RuleScope.FILE,
+                file_patterns=[f"*/{word}.*"],
+            )
+        else:
+            rule = Rule(
+                id=f"r{i}",
+                name=f"r{i}",
+                description="",
+                scope=RuleScope.COMMAND,
+                match_patterns=[rf"^{{'command': '{word}"],
+            )
+        rules.append(rule)
+    return rules
+
+
+def test_blocks_and_warns():
+    enforcer = _enforcer(
+        [
+            Rule(
+                id="env",
+                name="No env files",
+                description="",
+                scope=RuleScope.FILE,
+                file_patterns=["*.env"],
+            ),
+            Rule(
+                id="push",
+                name="No force push",
+                description="",
+                scope=RuleScope.COMMAND,
+                match_patterns=[r"git push .*--force"],
+            ),
+            Rule(
+                id="sudo",
+                name="Careful with sudo",
+                description="",
+                severity=RuleSeverity.WARNING,
+                match_patterns=["SUDO"],
+            ),
+        ]
+    )
+
+    result = enforcer.check_tool_call("bash", {"command": "git push origin --force"})
+    assert not result.allowed
+    assert [v.rule.id for v in result.violations] == ["push"]
+
+    result = enforcer.check_tool_call("edit", {"path": "/app/.env", "command": "view"})
+    assert not result.allowed
+    assert result.violations[0].context == {"file_path": "/app/.env", "pattern": "*.env"}
+
+    result = enforcer.check_tool_call("bash", {"command": "sudo ls"})
+    assert result.allowed and result.has_warnings
+    assert [rule.id for rule in result.passed_rules] == ["push"]
+
+    # FILE and COMMAND rules don't apply to other tools
+    assert enforcer.check_tool_call("grep", {"path": "/app/.env", "pattern": "git push --force"}).allowed
+
+
+def test_invalid_regex_falls_back_to_substring():
+    enforcer = _enforcer([Rule(id="c", name="c", description="", match_patterns=["c++("])])
+    assert not enforcer.check_tool_call("bash", {"command": "g++ x.cpp && C++( y"}).allowed
+    assert enforcer.check_tool_call("bash", {"command": "g++ x.cpp"}).allowed
+
+
+def test_check_functions_and_disabled_rules():
+    rule = Rule(
+        id="small",
+        name="small",
+        description="Inputs must be small",
+        check=lambda context: len(str(context["tool_input"])) < 30,
+    )
+    enforcer = _enforcer([rule])
+    assert enforcer.check_tool_call("bash", {"command": "ls"}).allowed
+    assert not enforcer.check_tool_call("bash", {"command": "x" * 40}).allowed
+    rule.enabled = False
+    assert enforcer.check_tool_call("bash", {"command": "x" * 40}).allowed
+
+
+def test_group_references_and_flags():
+    enforcer = _enforcer(
+        [
+            Rule(id="repeat", name="repeat", description="", match_patterns=[r"(\w+) \1"]),
+            Rule(id="flags", name="flags", description="", match_patterns=[r"(?s)begin.*end"]),
+            Rule(id="named", name="named", description="", match_patterns=[r"(?P<x>ab)(?P=x)"]),
+        ]
+    )
+    assert [v.rule.id for v in enforcer.check_tool_call("bash", {"command": "go go"}).violations] == [
+        "repeat"
+    ]
+    assert [v.rule.id for v in enforcer.check_tool_call("bash", {"command": "begin\nend"}).violations] == [
+        "flags"
+    ]
+    assert [v.rule.id for v in enforcer.check_tool_call("bash", {"command": "abab"}).violations] == ["named"]
+    assert enforcer.check_tool_call("bash", {"command": "go stop"}).allowed
+
+
+def test_matches_rule_by_rule_checking():
+    rules = _random_rules(300)
+    enforcer = _enforcer(rules)
+    rng = random.Random(1)
+    blocked = 0
+    for _ in range(300):
+        rule = rng.choice(rules)
+        word = re.sub(r"[^a-z0-9]", "", (rule.match_patterns or rule.file_patterns)[0].lower())
+        tool_name = rng.choice(["bash", "edit", "grep"])
+        tool_input = rng.choice(
+            [
+                {"command": f"{word} -rf /"},
+                {"command": f"echo {word}(+ now"},
+                {"path": f"/src/{word}.py"},
+                {"command": "ls -la"},
+            ]
+        )
+        result = enforcer.check_tool_call(tool_name, tool_input)
+        assert [v.rule.id for v in result.violations] == _reference_violations(
+            rules, tool_name, tool_input
+        )
+        blocked += not result.allowed
+    assert blocked > 50
+
+
+def test_overhead_with_1000_rules():
+    enforcer = _enforcer(_random_rules(1000))
+    tool_input = {"command": "git status && python -m pytest -q tests/ --maxfail=1 " * 4}
+    enforcer.check_tool_call("bash", tool_input)  # Builds the bash rule set
+
+    calls = 200
+    started = time.perf_counter()
+    for _ in range(calls):
+        enforcer.check_tool_call("bash", tool_input)
+    per_call = (time.perf_counter() - started) / calls
+    assert per_call < 0.005, f"check_tool_call with 1000 rules: {per_call * 1e6:.0f} us per call"
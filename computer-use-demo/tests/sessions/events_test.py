@@ -0,0 +1,79 @@
+import json
+from dataclasses import dataclass, field
+
+from computer_use_demo.sessions import SessionEventLog
+
+
+@dataclass
+class Msg:
+    id: str
+    text: str
+    images: list[str] = field(default_factory=list)
+
+    def to_dict(self):
+        return {"id": self.id, "text": self.text, "images": self.images}
+
+
+def _drain(sub):
+    frames = []
+    while not sub.queue.empty():
+        frames.append(sub.queue.get_nowait())
+    return [(seq, json.loads(data)) for seq, data in frames]
+
+
+async def test_publish_emits_only_changes():
+    log = SessionEventLog()
+    messages = [Msg("a", "hello"), Msg("b", "thinking")]
+    assert log.publish({"running": True}, messages) == 3
+
+    sub = log.subscribe(delta=True, since=log.seq)
+    assert log.publish({"running": True}, messages) == 0
+
+    messages[1].text = "thinking (2s)"
+    messages.append(Msg("c", "done"))
+    log.publish({"running": True}, messages)
+    events = [event for _, event in _drain(sub)]
+    assert [e["type"] for e in events] == ["upsert", "upsert"]
+    assert events[0]["message"]["text"] == "thinking (2s)"
+    assert events[1]["index"] == 2
+
+    del messages[1]
+    log.publish({"running": False}, messages)
+    events = [event for _, event in _drain(sub)]
+    assert [e["type"] for e in events] == ["remove", "state"]
+    assert events[0]["id"] == "b"
+
+
+async def test_snapshot_subscriber_receives_full_state():
+    log = SessionEventLog()
+    log.publish({"running": True}, [Msg("a", "hello")])
+    sub = log.subscribe()
+    log.publish({"running": True}, [Msg("a", "hello"), Msg("b", "x")])
+
+    frames = _drain(sub)
+    assert len(frames) == 2
+    snapshot = frames[-1][1]
+    assert snapshot["running"] is True
+    assert [m["id"] for m in snapshot["messages"]] == ["a", "b"]
+
+
+async def test_resume_from_last_event_id():
+    log = SessionEventLog(retain=3)
+    messages = [Msg("a", "1")]
+    log.publish({}, messages)
+    resume_from = log.seq
+    messages.append(Msg("b", "2"))
+    log.publish({}, messages)
+
+    events = _drain(log.subscribe(delta=True, since=resume_from))
+    assert [event["message"]["id"] for _, event in events] == ["b"]
+
+    for i in range(5):
+        messages.append(Msg(f"m{i}", str(i)))
+        log.publish({}, messages)
+
+    # Gap is no longer retained, so the client gets a fresh snapshot
+    (seq, event), = _drain(log.subscribe(delta=True, since=resume_from))
+    assert event["type"] == "snapshot"
+    assert seq == log.seq
+    assert len(event["messages"]) == len(messages)
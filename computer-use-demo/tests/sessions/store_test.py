@@ -0,0 +1,130 @@
+import json
+from dataclasses import dataclass, field
+
+from computer_use_demo.sessions import SessionStore
+
+IMAGE = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR4nGNgYGD4DwABBAEAwS2OUAAAAABJRU5ErkJggg=="
+
+
+@dataclass
+class Msg:
+    id: str
+    role: str
+    text: str
+    images: list[str] = field(default_factory=list)
+
+    def to_dict(self):
+        return {"id": self.id, "role": self.role, "text": self.text, "images": self.images}
+
+
+def _tool_result(i):
+    return {
+        "role": "user",
+        "content": [
+            {
+                "type": "tool_result",
+                "tool_use_id": str(i),
+                "content": [
+                    {
+                        "type": "image",
+                        "source": {"type": "base64", "media_type": "image/png", "data": IMAGE},
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def _journal_lines(tmp_path, session_id="s1"):
+    (journal,) = (tmp_path / session_id).glob("journal-*.jsonl")
+    return journal.read_text().splitlines()
+
+
+def test_save_appends_only_new_records(tmp_path):
+    store = SessionStore(tmp_path)
+    messages = [{"role": "user", "content": "hi"}]
+    display = [Msg("a", "user", "hi")]
+    assert store.save("s1", meta={"model": "m"}, messages=messages, display_messages=display) == 2
+
+    # Nothing changed: nothing written
+    assert store.save("s1", meta={"model": "m"}, messages=messages, display_messages=display) == 0
+
+    messages.append(_tool_result(1))
+    display.append(Msg("b", "tool", "shot", images=[f"data:image/png;base64,{IMAGE}"]))
+    assert store.save("s1", meta={"model": "m"}, messages=messages, display_messages=display) == 2
+
+    # Screenshots are stored out of line, once
+    assert IMAGE not in "".join(_journal_lines(tmp_path))
+    assert len(list((tmp_path / "s1" / "blobs").iterdir())) == 1
+
+    meta = store.read_meta("s1")
+    assert meta["preview"] == "hi"
+    assert meta["message_count"] == 2
+
+
+def test_load_round_trip_with_truncate_and_removal(tmp_path):
+    store = SessionStore(tmp_path)
+    messages = [{"role": "user", "content": "hi"}, _tool_result(1), {"role": "assistant", "content": "x"}]
+    display = [Msg("a", "user", "hi"), Msg("t", "assistant", "Thinking")]
+    store.save("s1", meta={}, messages=messages, display_messages=display)
+
+    messages = messages[:2]
+    display[0].text = "hello"
+    del display[1]
+    store.save("s1", meta={}, messages=messages, display_messages=display)
+
+    stored = SessionStore(tmp_path).load("s1")
+    assert stored.messages == messages
+    assert stored.display_messages == [d.to_dict() for d in display]
+
+
+def test_compaction_preserves_state(tmp_path):
+    store = SessionStore(tmp_path, compact_every=10_000, export_dir=tmp_path / "export")
+    messages, display = [], []
+    for i in range(5):
+        messages.append(_tool_result(i))
+        display.append(Msg(str(i), "tool", f"step {i}"))
+        store.save("s1", meta={}, messages=messages, display_messages=display)
+
+    store.compact("s1")
+    assert _journal_lines(tmp_path) == []
+
+    messages.append({"role": "assistant", "content": "done"})
+    store.save("s1", meta={}, messages=messages, display_messages=display)
+    assert len(_journal_lines(tmp_path)) == 1
+
+    stored = SessionStore(tmp_path).load("s1")
+    assert stored.messages == messages
+    assert [d["text"] for d in stored.display_messages] == [f"step {i}" for i in range(5)]
+
+    exported = json.loads((tmp_path / "export" / "s1.json").read_text())
+    assert len(exported["messages"]) == 5
+
+
+def test_tracked_session_continues_journal(tmp_path):
+    store = SessionStore(tmp_path)
+    messages = [{"role": "user", "content": "hi"}]
+    store.save("s1", meta={}, messages=messages, display_messages=[Msg("a", "user", "hi")])
+
+    reopened = SessionStore(tmp_path)
+    stored = reopened.load("s1")
+    display = [Msg(**d) for d in stored.display_messages]
+    reopened.track("s1", stored.messages, display)
+
+    stored.messages.append({"role": "assistant", "content": "hey"})
+    assert reopened.save("s1", meta={}, messages=stored.messages, display_messages=display) == 1
+    assert SessionStore(tmp_path).load("s1").messages == stored.messages
+
+
+def test_text_that_looks_like_a_data_url_is_kept(tmp_path):
+    store = SessionStore(tmp_path)
+    texts = ["data:image/png;base64,not base64!", "data:text/plain;base64,aGk=", f"data:image/png;base64,{IMAGE}\n"]
+    messages = [{"role": "user", "content": text} for text in texts]
+    messages.append({"type": "base64", "data": "%%%"})
+    display = [Msg(str(i), "user", text, images=[text]) for i, text in enumerate(texts)]
+    store.save("s1", meta={}, messages=messages, display_messages=display)
+
+    assert not (tmp_path / "s1" / "blobs").exists()
+    stored = SessionStore(tmp_path).load("s1")
+    assert stored.messages == messages
+    assert stored.display_messages == [d.to_dict() for d in display]
@@ -69,3 +69,47 @@ async def test_bash_tool_timeout(bash_tool):
         match="timed out: bash has not returned in 0.1 seconds and must be restarted",
     ):
         await bash_tool(command="sleep 1")
+
+
+@pytest.mark.asyncio
+async def test_bash_tool_reports_exit_code(bash_tool):
+    result = await bash_tool(command="echo out; false")
+    assert result.output == "out"
+    assert result.system == "exit code 1"
+    assert bash_tool._session.exit_code == 1
+
+    result = await bash_tool(command="true")
+    assert result.system is None
+    assert bash_tool._session.exit_code == 0
+
+
+@pytest.mark.asyncio
+async def test_bash_tool_collects_all_stderr(bash_tool):
+    result = await bash_tool(command="echo one >&2; echo two >&2; echo done")
+    assert result.output == "done"
+    assert result.error == "one\ntwo"
+
+    # Nothing leaks into the next command
+    result = await bash_tool(command="echo next")
+    assert result.output == "next"
+    assert result.error == ""
+
+
+@pytest.mark.asyncio
+async def test_bash_tool_large_output_is_truncated(bash_tool):
+    await bash_tool(command="true")
+    bash_tool._session._stdout._limit = 1000
+    result = await bash_tool(command="seq 1 100000")
+    assert result.output.startswith("[... ")
+    assert "bytes of output truncated ...]" in result.output
+    assert result.output.endswith("99999\n100000")
+
+
+@pytest.mark.asyncio
+async def test_bash_tool_streams_output():
+    chunks = []
+    tool = BashTool20250124(output_callback=chunks.append)
+    result = await tool(command="echo first; sleep 0.2; echo second")
+    assert result.output == "first\nsecond"
+    assert "".join(chunks) == "first\nsecond\n"
+    assert len(chunks) >= 2
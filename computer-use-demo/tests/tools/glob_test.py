@@ -0,0 +1,64 @@
+import os
+
+from computer_use_demo.tools.coding.glob import GlobTool
+from computer_use_demo.tools.coding.walker import glob_dir_filter
+
+
+def _make_tree(root, count=5):
+    (root / ".gitignore").write_text("dist/\n")
+    for i in range(count):
+        path = root / "src" / f"m{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+        os.utime(path, (1000 + i, 1000 + i))
+    for name in ("dist/out.py", "node_modules/pkg/x.py", "top.py"):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+        os.utime(path, (1, 1))
+
+
+def _listed(result):
+    return [line.rsplit("/", 1)[-1] for line in result.output.splitlines() if line.startswith("/")]
+
+
+async def test_glob_newest_first_with_limit_and_offset(tmp_path):
+    _make_tree(tmp_path)
+    tool = GlobTool(use_index=False)
+
+    result = await tool(pattern="**/*.py", path=str(tmp_path), limit=2)
+    assert "Found 6 file(s)" in result.output
+    assert _listed(result) == ["m4.py", "m3.py"]
+    assert "Use offset=2" in result.output
+
+    result = await tool(pattern="**/*.py", path=str(tmp_path), limit=10, offset=4)
+    assert _listed(result) == ["m0.py", "top.py"]
+    assert "Use offset" not in result.output
+
+    result = await tool(pattern="*.py", path=str(tmp_path))
+    assert _listed(result) == ["top.py"]
+
+
+async def test_glob_reuses_directory_listings(tmp_path):
+    _make_tree(tmp_path)
+    tool = GlobTool(use_index=False)
+    await tool(pattern="src/*.py", path=str(tmp_path))
+    misses = tool.stat_cache.misses
+    await tool(pattern="src/*.py", path=str(tmp_path))
+    assert tool.stat_cache.misses == misses
+    assert tool.stat_cache.hits > 0
+
+    # A new file changes the directory's mtime and invalidates its listing
+    (tmp_path / "src" / "new.py").write_text("")
+    os.utime(tmp_path / "src", (5000, 5000))
+    result = await tool(pattern="src/*.py", path=str(tmp_path))
+    assert "new.py" in result.output
+
+
+def test_glob_dir_filter():
+    assert glob_dir_filter("**/*.py") is None
+    only_top = glob_dir_filter("*.py")
+    assert not only_top("src")
+    in_src = glob_dir_filter("src/**/*.ts")
+    assert in_src("src") and in_src("src/a/b")
+    assert not in_src("lib")
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from computer_use_demo.tools.coding.python_exec import (
+    FRAME_DIR,
+    PythonExecutionTool,
+    _PythonKernel,
+    remove_frames,
+)
+from computer_use_demo.tools.shell_pool import ShellPool
+
+
+@pytest.fixture
+async def pool():
+    pool = ShellPool(_PythonKernel, min_idle=1, max_shells=4)
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_python_tool_keeps_namespace(pool):
+    tool = PythonExecutionTool(pool=pool)
+    await tool(code="x = 20")
+    result = await tool(code="x * 2 + 2")
+    assert result.output == "42"
+    assert result.error is None
+
+    result = await tool(code="print('hi')\nx")
+    assert result.output == "hi"
+
+
+@pytest.mark.asyncio
+async def test_python_tool_reports_errors(pool):
+    tool = PythonExecutionTool(pool=pool)
+    result = await tool(code="print('hello'")
+    assert "SyntaxError" in result.error
+    assert not result.output
+
+    result = await tool(code="1 / 0")
+    assert "ZeroDivisionError" in result.error
+
+
+@pytest.mark.asyncio
+async def test_python_tool_does_not_block_event_loop(pool):
+    tool = PythonExecutionTool(pool=pool)
+    await tool(code="pass")
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.05)
+            ticks += 1
+
+    task = asyncio.create_task(heartbeat())
+    await tool(code="import time\nend = time.time() + 0.5\nwhile time.time() < end: pass")
+    task.cancel()
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_python_tool_timeout_interrupts_and_keeps_namespace(pool):
+    tool = PythonExecutionTool(pool=pool, timeout=0.3)
+    await tool(code="kept = 'still here'")
+
+    started = time.monotonic()
+    result = await tool(code="while True: pass")
+    assert time.monotonic() - started < 5
+    assert "timed out" in result.error
+
+    result = await tool(code="kept")
+    assert result.output == "'still here'"
+
+
+@pytest.mark.asyncio
+async def test_python_tool_reset(pool):
+    tool = PythonExecutionTool(pool=pool)
+    await tool(code="my_var = 42")
+
+    result = await tool(reset=True)
+    assert result.system == "Python environment has been reset."
+
+    result = await tool(code="print(my_var)")
+    assert "NameError" in result.error
+
+
+@pytest.mark.asyncio
+async def test_frames_are_removed_with_the_worker(pool):
+    lease = await pool.acquire("test")
+    kernel = lease.session
+    frame = Path(FRAME_DIR) / f"proto-frame-{kernel._process.pid}-1.arrow"
+    frame.write_bytes(b"arrow")
+
+    await kernel.kill()
+    assert not frame.exists()
+    lease.release()
+
+
+def test_orphaned_frames_are_removed():
+    dead = subprocess.Popen(["true"])
+    dead.wait()
+    orphan = Path(FRAME_DIR) / f"proto-frame-{dead.pid}-1.arrow"
+    alive = Path(FRAME_DIR) / f"proto-frame-{os.getpid()}-1.arrow"
+    orphan.write_bytes(b"arrow")
+    alive.write_bytes(b"arrow")
+    try:
+        remove_frames()
+        assert not orphan.exists()
+        assert alive.exists()
+    finally:
+        alive.unlink(missing_ok=True)
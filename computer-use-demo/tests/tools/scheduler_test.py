@@ -0,0 +1,37 @@
+import asyncio
+
+from computer_use_demo.tools.scheduler import run_tool_calls
+
+
+async def test_safe_calls_overlap_and_exclusive_calls_are_barriers():
+    running = 0
+    peak = []
+    events = []
+
+    async def run(call):
+        nonlocal running
+        name, _ = call
+        running += 1
+        peak.append(running)
+        events.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        events.append(f"end {name}")
+        running -= 1
+        return name.upper()
+
+    calls = [("grep", {}), ("glob", {}), ("view", {}), ("edit", {}), ("grep2", {})]
+    reported = []
+    results = await run_tool_calls(
+        calls,
+        run,
+        lambda call: call[0] != "edit",
+        max_concurrency=2,
+        on_result=lambda index, result: reported.append(index),
+    )
+
+    assert results == ["GREP", "GLOB", "VIEW", "EDIT", "GREP2"]
+    assert reported == [0, 1, 2, 3, 4]
+    assert max(peak) == 2
+    # The exclusive call starts after the batch before it and ends before the next one
+    assert events.index("start edit") > events.index("end view")
+    assert events.index("start grep2") > events.index("end edit")
@@ -0,0 +1,70 @@
+import base64
+import os
+from unittest import mock
+from unittest.mock import AsyncMock, patch
+
+from computer_use_demo.tools import computer
+from computer_use_demo.tools.base import ToolResult
+from computer_use_demo.tools.computer import ComputerTool20250124
+from computer_use_demo.tools.screen_capture import (
+    image_media_type,
+    screenshot_format,
+    screenshot_quality,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+
+
+def test_image_media_type():
+    jpeg = b"\xff\xd8\xff\xe0" + b"\x00" * 8
+    webp = b"RIFF\x10\x00\x00\x00WEBPVP8 "
+    for data, media_type in ((PNG, "image/png"), (jpeg, "image/jpeg"), (webp, "image/webp")):
+        assert image_media_type(data) == media_type
+        assert image_media_type(base64.b64encode(data).decode()) == media_type
+    assert image_media_type("unknown") == "image/png"
+
+
+def test_format_and_quality_settings():
+    with mock.patch.dict(os.environ, {"PROTO_SCREENSHOT_FORMAT": "JPG", "PROTO_SCREENSHOT_QUALITY": "500"}):
+        assert screenshot_format() == "jpeg"
+        assert screenshot_quality() == 100
+    with mock.patch.dict(os.environ, {"PROTO_SCREENSHOT_FORMAT": "bmp", "PROTO_SCREENSHOT_QUALITY": "x"}):
+        assert screenshot_format() == "png"
+        assert screenshot_quality() == 80
+
+
+async def test_command_fallback_leaves_no_files(tmp_path):
+    tool = ComputerTool20250124()
+    tool._scaling_enabled = False
+
+    async def shell(command, take_screenshot=True):
+        path = command.split()[-1] if "scrot" in command else command.split()[-2]
+        with open(path, "wb") as f:
+            f.write(PNG)
+        return ToolResult()
+
+    with (
+        patch.object(computer, "OUTPUT_DIR", str(tmp_path)),
+        patch.object(computer, "in_process_capture_available", return_value=False),
+        patch.object(computer, "PIL_AVAILABLE", False),
+        patch.object(tool, "shell", new=AsyncMock(side_effect=shell)),
+    ):
+        result = await tool.screenshot()
+
+    assert base64.b64decode(result.base64_image) == PNG
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_in_process_capture_skips_commands():
+    tool = ComputerTool20250124()
+    capturer = mock.Mock(capture=AsyncMock(return_value="UklGRdata"))
+    with (
+        patch.object(computer, "in_process_capture_available", return_value=True),
+        patch.object(computer, "get_screen_capturer", return_value=capturer) as get_capturer,
+        patch.object(tool, "shell", new=AsyncMock()) as shell,
+    ):
+        result = await tool.screenshot()
+
+    get_capturer.assert_called_once_with(":1")
+    shell.assert_not_called()
+    assert image_media_type(result.base64_image) == "image/webp"
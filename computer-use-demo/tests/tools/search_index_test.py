@@ -0,0 +1,83 @@
+import os
+import re
+
+from computer_use_demo.tools.coding.grep import GrepTool
+from computer_use_demo.tools.coding.search_index import SearchIndex, query_trigrams
+
+
+def _make_tree(root):
+    files = {
+        ".gitignore": "build/\n",
+        "a.py": "def handle_request(): pass\n",
+        "b.py": "def handle_response(): pass\n",
+        "src/c.py": "HANDLE_REQUEST = 1\n",
+        "build/d.py": "handle_request()\n",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def _rel(root, paths):
+    return [path[len(str(root)) + 1 :] for path in paths]
+
+
+def test_query_trigrams():
+    trigrams = query_trigrams(re.compile("handle_(request|response)"))
+    assert {b"han", b"and", b"ndl", b"dle", b"le_"} <= trigrams
+    assert b"que" not in trigrams and b"pon" not in trigrams
+    assert query_trigrams(re.compile(r"a+b*")) is None
+    assert b"foo" in query_trigrams(re.compile(r"(?:foo)+\d"))
+
+
+def test_candidates_are_narrowed_and_case_insensitive(tmp_path):
+    _make_tree(tmp_path)
+    index = SearchIndex(tmp_path, index_dir=tmp_path / ".index")
+    index.refresh()
+
+    assert _rel(tmp_path, index.candidates(re.compile("handle_request"))) == ["a.py", "src/c.py"]
+    assert _rel(tmp_path, index.candidates(re.compile("handle_request"), under=tmp_path / "src")) == [
+        "src/c.py"
+    ]
+    assert _rel(tmp_path, index.candidates(re.compile(".*"), glob="*.py")) == ["a.py", "b.py", "src/c.py"]
+    assert not index.covers(tmp_path / "build")
+
+
+def test_refresh_picks_up_changes_and_persists(tmp_path):
+    _make_tree(tmp_path)
+    index = SearchIndex(tmp_path, index_dir=tmp_path / ".index")
+    index.refresh()
+
+    (tmp_path / "b.py").write_text("handle_request()\n")
+    os.utime(tmp_path / "b.py", (1, 1))
+    (tmp_path / "a.py").unlink()
+    index.refresh()
+    assert _rel(tmp_path, index.candidates(re.compile("handle_request"))) == ["b.py", "src/c.py"]
+
+    index.save()
+    reloaded = SearchIndex(tmp_path, index_dir=tmp_path / ".index")
+    assert _rel(tmp_path, reloaded.candidates(re.compile("handle_request"))) == ["b.py", "src/c.py"]
+    assert [entry.rel for entry in reloaded.list_files(glob="**/*.py")] == ["b.py", "src/c.py"]
+
+
+async def test_grep_with_index_matches_full_search(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / ".git").mkdir()
+    for use_index in (False, True):
+        result = await GrepTool(use_index=use_index)(
+            pattern="handle_request", path=str(tmp_path), case_insensitive=True
+        )
+        assert "Found 2 match(es)" in result.output
+        assert "build" not in result.output
+
+
+async def test_grep_with_index_finds_file_written_just_before(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / ".git").mkdir()
+    grep = GrepTool(use_index=True)
+    assert "Found" in (await grep(pattern="handle_request", path=str(tmp_path))).output
+
+    (tmp_path / "e.py").write_text("hello\n")
+    result = await grep(pattern="hello", path=str(tmp_path))
+    assert "Found 1 match(es)" in result.output
@@ -0,0 +1,76 @@
+import re
+
+from computer_use_demo.tools.coding.grep import GrepTool
+from computer_use_demo.tools.coding.search import iter_matches
+from computer_use_demo.tools.coding.walker import compile_glob, walk_files
+
+
+def _make_tree(root):
+    files = {
+        ".gitignore": "*.log\nbuild/\n!keep.log\n",
+        "a.py": "import os\nTODO: one\n",
+        "keep.log": "TODO: kept\n",
+        "debug.log": "TODO: ignored\n",
+        "build/out.py": "TODO: built\n",
+        "node_modules/pkg/index.js": "TODO: vendored\n",
+        "src/b.py": "x = 1\nTODO: two\ny = 2\n",
+        "src/.gitignore": "/generated.py\n",
+        "src/generated.py": "TODO: generated\n",
+        "src/sub/generated.py": "TODO: nested\n",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (root / "image.bin").write_bytes(b"TODO\0binary")
+
+
+def test_walker_honors_gitignore(tmp_path):
+    _make_tree(tmp_path)
+    rels = [entry.rel for entry in walk_files(tmp_path)]
+    assert rels == [
+        ".gitignore",
+        "a.py",
+        "image.bin",
+        "keep.log",
+        "src/.gitignore",
+        "src/b.py",
+        "src/sub/generated.py",
+    ]
+
+
+def test_compile_glob():
+    assert compile_glob("*.py").match("a.py")
+    assert not compile_glob("*.py").match("src/a.py")
+    assert compile_glob("*.py", match_basename=True).match("src/a.py")
+    assert compile_glob("src/**/*.{ts,tsx}").match("src/x/y.tsx")
+    assert compile_glob("src/**/*.{ts,tsx}").match("src/y.ts")
+    assert not compile_glob("src/**/*.{ts,tsx}").match("lib/y.ts")
+
+
+def test_iter_matches_skips_binary_and_ignored(tmp_path):
+    _make_tree(tmp_path)
+    matches = list(iter_matches(tmp_path, re.compile("TODO")))
+    assert [(m.path[len(str(tmp_path)) + 1 :], m.line_number) for m in matches] == [
+        ("a.py", 2),
+        ("keep.log", 1),
+        ("src/b.py", 2),
+        ("src/sub/generated.py", 1),
+    ]
+
+
+def test_iter_matches_context_and_glob(tmp_path):
+    _make_tree(tmp_path)
+    matches = list(iter_matches(tmp_path, re.compile("TODO"), glob="*.py", context_lines=1))
+    assert [m.path.endswith(".py") for m in matches] == [True, True, True]
+    assert matches[1].context == ((1, "x = 1"), (2, "TODO: two"), (3, "y = 2"))
+
+
+async def test_grep_tool_stops_at_max_matches(tmp_path):
+    for index in range(50):
+        (tmp_path / f"f{index:02}.txt").write_text("needle\n" * 3)
+
+    result = await GrepTool()(pattern="needle", path=str(tmp_path), max_matches=5)
+    assert result.output.startswith("Found 5 match(es)")
+    assert "Limited to 5 matches" in result.output
+    assert f"{tmp_path}/f00.txt:1: needle" in result.output
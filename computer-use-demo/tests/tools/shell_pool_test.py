@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+import pytest
+
+from computer_use_demo.tools.base import ToolError
+from computer_use_demo.tools.bash import BashTool20250124, _BashSession
+from computer_use_demo.tools.shell_pool import ShellPool
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_keeps_warm_shells():
+    pool = ShellPool(_BashSession, min_idle=2, max_shells=4)
+    lease = await pool.acquire("agent-a")
+    await asyncio.sleep(0.2)
+
+    stats = pool.get_stats()
+    assert stats["leased"] == 1
+    assert stats["idle"] == 2
+    assert stats["owners"] == ["agent-a"]
+
+    # The next lease takes a started shell
+    second = await pool.acquire("agent-b")
+    assert second.session.alive
+    assert pool.get_stats()["spawned"] == 3
+
+    lease.release()
+    second.release()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_isolates_leases():
+    pool = ShellPool(_BashSession, min_idle=1, max_shells=4)
+    lease = await pool.acquire("agent-a")
+    await lease.session.run("export LEAKED=1")
+    lease.release()
+    await asyncio.sleep(0.2)
+
+    other = await pool.acquire("agent-b")
+    result = await other.session.run('echo "${LEAKED:-none}"')
+    assert result.output == "none"
+    assert pool.get_stats()["recycled"] == 1
+
+    other.release()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_leased_shells_are_not_capped_by_default():
+    pool = ShellPool(_BashSession, min_idle=1)
+    leases = [await asyncio.wait_for(pool.acquire(f"agent-{i}"), 5) for i in range(20)]
+    assert pool.get_stats()["leased"] == 20
+
+    for lease in leases:
+        lease.release()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_waits_at_capacity():
+    pool = ShellPool(_BashSession, min_idle=0, max_shells=1)
+    first = await pool.acquire("agent-a")
+
+    waiter = asyncio.create_task(pool.acquire("agent-b"))
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+
+    first.release()
+    second = await asyncio.wait_for(waiter, 5)
+    assert second.wait_seconds >= 0.1
+
+    stats = pool.get_stats()
+    assert stats["waited_leases"] >= 1
+    assert stats["max_wait_ms"] >= 100
+
+    second.release()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_acquire_times_out():
+    pool = ShellPool(_BashSession, min_idle=0, max_shells=1, acquire_timeout=0.1)
+    first = await pool.acquire("agent-a")
+    with pytest.raises(ToolError, match="agent-a"):
+        await pool.acquire("agent-b")
+
+    # A release from another thread (e.g. a weakref finalizer) frees the slot
+    thread = threading.Thread(target=first.release)
+    thread.start()
+    thread.join()
+    pool.acquire_timeout = 5
+    second = await pool.acquire("agent-b")
+    assert pool.get_stats()["owners"] == ["agent-b"]
+
+    second.release()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_bash_tool_recovers_after_timeout():
+    pool = ShellPool(_BashSession, min_idle=1, max_shells=4)
+    tool = BashTool20250124(pool=pool, owner="agent-a")
+    await tool(command="true")
+    tool._session._timeout = 0.1
+
+    with pytest.raises(Exception, match="timed out"):
+        await tool(command="sleep 5")
+    assert tool._session is None
+
+    result = await tool(command="echo 'fresh shell'")
+    assert result.output == "fresh shell"
+    await asyncio.sleep(0.2)
+    assert pool.get_stats()["recycled"] == 1
+
+    await pool.close()
@@ -120,7 +120,7 @@ export default function ComputerPanel({ isActive = true, selectedComputer = 'loc
             const response = await fetch('/api/computer/screenshot')
             if (response.ok) {
                 const data = await response.json()
-                setScreenshot(data.image)
+                setScreenshot(`data:${data.mediaType || 'image/png'};base64,${data.image}`)
                 setError(null)
             }
         } catch (err) {
@@ -311,7 +311,7 @@ export default function ComputerPanel({ isActive = true, selectedComputer = 'loc
                 ) : screenshot ? (
                     // Local screenshot mode
                     <div className="screen-container">
-                        <img src={`data:image/png;base64,${screenshot}`} alt="Computer Screen" className="screen-image" />
+                        <img src={screenshot} alt="Computer Screen" className="screen-image" />
                     </div>
                 ) : (
                     // Loading/connecting state
@@ -13,7 +13,7 @@ interface Computer {
 }
 
 interface ComputerWithPreview extends Computer {
-  screenshot?: string
+  screenshot?: string  // data: URL
   isLoading?: boolean
   error?: string
 }
@@ -52,7 +52,7 @@ export default function ComputersOverview({ onSelectComputer }: Props) {
       if (response.ok) {
         const data = await response.json()
         setComputers(prev => prev.map(c =>
-          c.id === 'local' ? { ...c, screenshot: data.image } : c
+          c.id === 'local' ? { ...c, screenshot: `data:${data.mediaType || 'image/png'};base64,${data.image}` } : c
         ))
       }
     } catch (err) {
@@ -200,7 +200,7 @@ export default function ComputersOverview({ onSelectComputer }: Props) {
             <div className="card-preview">
               {computer.screenshot ? (
                 <img
-                  src={`data:image/png;base64,${computer.screenshot}`}
+                  src={computer.screenshot}
                   alt={computer.name}
                   className="preview-image"
                 />
@@ -70,7 +70,7 @@ export default function Dashboard({ onOpenResource }: DashboardProps) {
       const response = await fetch('/api/computer/screenshot')
       if (response.ok) {
         const data = await response.json()
-        setLocalScreenshot(data.image)
+        setLocalScreenshot(`data:${data.mediaType || 'image/png'};base64,${data.image}`)
       }
     } catch (err) {
       console.error('Failed to fetch screenshot:', err)
@@ -584,7 +584,7 @@ export default function Dashboard({ onOpenResource }: DashboardProps) {
               <div
                 className="computer-card-preview"
                 style={localScreenshot ? {
-                  backgroundImage: `url(data:image/png;base64,${localScreenshot})`,
+                  backgroundImage: `url(${localScreenshot})`,
                   backgroundSize: 'cover',
                   backgroundPosition: 'center'
                 } : undefined}